@@ -0,0 +1,52 @@
+"""add callback receipts
+
+Revision ID: 3e9b7d1c5a28
+Revises: 8c2f4a6e1d93
+Create Date: 2026-10-19 16:42:13.580214
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e9b7d1c5a28"
+down_revision: Union[str, Sequence[str], None] = "8c2f4a6e1d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "callback_receipts",
+        sa.Column("callback_id", sa.String(length=64), nullable=False),
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["session_id"], ["agent_sessions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("callback_id"),
+    )
+    op.create_index(
+        op.f("ix_callback_receipts_created_at"),
+        "callback_receipts",
+        ["created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        op.f("ix_callback_receipts_created_at"), table_name="callback_receipts"
+    )
+    op.drop_table("callback_receipts")
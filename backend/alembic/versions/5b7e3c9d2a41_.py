@@ -0,0 +1,71 @@
+"""add agent message bodies
+
+Revision ID: 5b7e3c9d2a41
+Revises: d4f81b2c6e57
+Create Date: 2026-10-19 11:42:37.518204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e3c9d2a41"
+down_revision: Union[str, Sequence[str], None] = "d4f81b2c6e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "agent_message_bodies",
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("encoding", sa.String(length=16), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["message_id"], ["agent_messages.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("message_id"),
+    )
+    # A constant server default is stored in the catalog; existing rows are not
+    # rewritten. scripts.offload_message_bodies moves existing large messages.
+    op.add_column(
+        "agent_messages",
+        sa.Column(
+            "content_truncated",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tool_executions",
+        sa.Column(
+            "tool_input_truncated",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "tool_executions",
+        sa.Column(
+            "tool_output_truncated",
+            sa.Boolean(),
+            server_default=sa.false(),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("tool_executions", "tool_output_truncated")
+    op.drop_column("tool_executions", "tool_input_truncated")
+    op.drop_column("agent_messages", "content_truncated")
+    op.drop_table("agent_message_bodies")
@@ -0,0 +1,32 @@
+"""add agent_sessions.state_version
+
+Revision ID: 7c2d4e9a1f30
+Revises: 604f9cc61bd7
+Create Date: 2026-10-19 10:12:41.208113
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2d4e9a1f30"
+down_revision: Union[str, Sequence[str], None] = "604f9cc61bd7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "agent_sessions",
+        sa.Column("state_version", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("agent_sessions", "state_version")
@@ -0,0 +1,132 @@
+"""add usage rollups
+
+Revision ID: 8c2f4a6e1d93
+Revises: 5b7e3c9d2a41
+Create Date: 2026-10-19 14:08:51.204716
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c2f4a6e1d93"
+down_revision: Union[str, Sequence[str], None] = "5b7e3c9d2a41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_COUNTERS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def _total_columns() -> list[sa.Column]:
+    columns = [
+        sa.Column("log_count", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "total_cost_usd",
+            sa.Numeric(precision=16, scale=6),
+            server_default="0",
+            nullable=False,
+        ),
+        sa.Column(
+            "total_duration_ms", sa.BigInteger(), server_default="0", nullable=False
+        ),
+    ]
+    for name in TOKEN_COUNTERS:
+        columns.append(
+            sa.Column(name, sa.BigInteger(), server_default="0", nullable=False)
+        )
+    columns += [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    ]
+    return columns
+
+
+def _backfill(table: str, keys: str, key_exprs: str, group_by: str) -> None:
+    """Totals the existing usage logs into a rollup table."""
+    counters = ", ".join(TOKEN_COUNTERS)
+    # Only numeric counters are summed, as the callback does for new logs.
+    counter_sums = ", ".join(
+        f"SUM(CASE WHEN json_typeof(l.usage_json -> '{name}') = 'number' "
+        f"THEN (l.usage_json ->> '{name}')::numeric::bigint ELSE 0 END)"
+        for name in TOKEN_COUNTERS
+    )
+    op.execute(
+        f"""
+        INSERT INTO {table} (
+            {keys}, log_count, total_cost_usd, total_duration_ms, {counters}
+        )
+        SELECT
+            {key_exprs},
+            COUNT(*),
+            COALESCE(SUM(l.total_cost_usd), 0),
+            COALESCE(SUM(l.duration_ms), 0),
+            {counter_sums}
+        FROM usage_logs l
+        JOIN agent_sessions s ON s.id = l.session_id
+        {"WHERE l.run_id IS NOT NULL" if table == "run_usage_rollups" else ""}
+        GROUP BY {group_by}
+        """
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "run_usage_rollups",
+        sa.Column("run_id", sa.Uuid(), nullable=False),
+        *_total_columns(),
+        sa.ForeignKeyConstraint(["run_id"], ["agent_runs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("run_id"),
+    )
+    op.create_table(
+        "session_usage_rollups",
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        *_total_columns(),
+        sa.ForeignKeyConstraint(
+            ["session_id"], ["agent_sessions.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("session_id"),
+    )
+    op.create_table(
+        "user_daily_usage_rollups",
+        sa.Column("user_id", sa.String(length=255), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        *_total_columns(),
+        sa.PrimaryKeyConstraint("user_id", "day"),
+    )
+
+    _backfill("run_usage_rollups", "run_id", "l.run_id", "l.run_id")
+    _backfill("session_usage_rollups", "session_id", "l.session_id", "l.session_id")
+    day = "(l.created_at AT TIME ZONE 'UTC')::date"
+    _backfill(
+        "user_daily_usage_rollups",
+        "user_id, day",
+        f"s.user_id, {day}",
+        f"s.user_id, {day}",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("user_daily_usage_rollups")
+    op.drop_table("session_usage_rollups")
+    op.drop_table("run_usage_rollups")
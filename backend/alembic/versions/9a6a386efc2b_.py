@@ -0,0 +1,95 @@
+"""add hot path indexes
+
+Revision ID: 9a6a386efc2b
+Revises: 7c2d4e9a1f30
+Create Date: 2026-10-19 10:30:48.785122
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9a6a386efc2b"
+down_revision: Union[str, Sequence[str], None] = "7c2d4e9a1f30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial index predicate)
+INDEXES: list[tuple[str, str, list[str], str | None]] = [
+    (
+        "ix_agent_messages_session_id_created_at",
+        "agent_messages",
+        ["session_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_agent_runs_queued_scheduled_at",
+        "agent_runs",
+        ["scheduled_at", "created_at"],
+        "status = 'queued'",
+    ),
+    (
+        "ix_agent_runs_active_session_id",
+        "agent_runs",
+        ["session_id", "created_at"],
+        "status IN ('claimed', 'running')",
+    ),
+    (
+        "ix_agent_sessions_sdk_session_id",
+        "agent_sessions",
+        ["sdk_session_id"],
+        "sdk_session_id IS NOT NULL",
+    ),
+    (
+        "ix_agent_sessions_user_id_created_at",
+        "agent_sessions",
+        ["user_id", "created_at"],
+        "is_deleted IS false",
+    ),
+    (
+        "ix_tool_executions_session_id_created_at",
+        "tool_executions",
+        ["session_id", "created_at"],
+        None,
+    ),
+    ("ix_tool_executions_message_id", "tool_executions", ["message_id"], None),
+    (
+        "ix_usage_logs_session_id_created_at",
+        "usage_logs",
+        ["session_id", "created_at"],
+        None,
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the tables writable while large ones are indexed; it cannot
+    # run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,65 @@
+"""add session change versions
+
+Revision ID: d4f81b2c6e57
+Revises: 9a6a386efc2b
+Create Date: 2026-10-19 11:05:12.403918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4f81b2c6e57"
+down_revision: Union[str, Sequence[str], None] = "9a6a386efc2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default is stored in the catalog; existing rows are not
+    # rewritten.
+    op.add_column(
+        "agent_sessions",
+        sa.Column(
+            "change_version",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "agent_runs",
+        sa.Column(
+            "change_version",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_agent_messages_session_id_id",
+            "agent_messages",
+            ["session_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_agent_messages_session_id_id",
+            table_name="agent_messages",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("agent_runs", "change_version")
+    op.drop_column("agent_sessions", "change_version")
@@ -9,6 +9,7 @@ from app.api.v1 import (
     internal_mcp_config,
     internal_scheduled_tasks,
     internal_skill_config,
+    internal_storage,
     internal_user_input_requests,
     mcp_servers,
     messages,
@@ -23,6 +24,7 @@ from app.api.v1 import (
     skills,
     tasks,
     tool_executions,
+    usage,
     user_input_requests,
     user_mcp_installs,
 )
@@ -47,6 +49,7 @@ api_v1_router.include_router(internal_skill_config.router)
 api_v1_router.include_router(internal_scheduled_tasks.router)
 api_v1_router.include_router(internal_user_input_requests.router)
 api_v1_router.include_router(internal_slash_commands.router)
+api_v1_router.include_router(internal_storage.router)
 api_v1_router.include_router(mcp_servers.router)
 api_v1_router.include_router(user_mcp_installs.router)
 api_v1_router.include_router(skills.router)
@@ -55,6 +58,7 @@ api_v1_router.include_router(skill_installs.router)
 api_v1_router.include_router(slash_commands.router)
 api_v1_router.include_router(user_input_requests.router)
 api_v1_router.include_router(scheduled_tasks.router)
+api_v1_router.include_router(usage.router)
 
 
 @api_v1_router.get("/")
@@ -2,10 +2,15 @@ import logging
 
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-
-from app.core.deps import get_db
-from app.schemas.callback import AgentCallbackRequest, CallbackResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_async_db
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackBatchRequest,
+    CallbackBatchResponse,
+    CallbackResponse,
+)
 from app.schemas.response import Response, ResponseSchema
 from app.services.callback_service import CallbackService
 
@@ -19,16 +24,31 @@ callback_service = CallbackService()
 @router.post("", response_model=ResponseSchema[CallbackResponse])
 async def receive_callback(
     callback: AgentCallbackRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Receives executor callback and updates session status."""
-    result = callback_service.process_agent_callback(db, callback)
+    result = await db.run_sync(callback_service.process_agent_callback, callback)
     return Response.success(
         data=result,
         message="Callback processed successfully",
     )
 
 
+@router.post("/batch", response_model=ResponseSchema[CallbackBatchResponse])
+async def receive_callback_batch(
+    request: CallbackBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    """Receives an ordered batch of executor callbacks for one session."""
+    result = await db.run_sync(
+        callback_service.process_agent_callback_batch, request.callbacks
+    )
+    return Response.success(
+        data=result,
+        message="Callback batch processed",
+    )
+
+
 @router.get("/health")
 async def health_check():
     """Health check endpoint."""
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import JSONResponse
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
+from app.schemas.response import Response, ResponseSchema
+from app.services.storage_service import get_presign_cache
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+def require_internal_token(
+    x_internal_token: str | None = Header(default=None, alias="X-Internal-Token"),
+) -> None:
+    settings = get_settings()
+    if not settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Internal API token is not configured",
+        )
+    if not x_internal_token or x_internal_token != settings.internal_api_token:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Invalid internal token",
+        )
+
+
+@router.get("/storage/presign-cache", response_model=ResponseSchema[dict])
+async def get_presign_cache_stats(
+    _: None = Depends(require_internal_token),
+) -> JSONResponse:
+    """Get presigned URL cache counters of this process."""
+    return Response.success(
+        data=get_presign_cache().stats(), message="Presign cache stats retrieved"
+    )
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user_id, get_db
+from app.core.deps import get_async_db, get_current_user_id
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.message import MessageResponse
@@ -20,17 +20,20 @@ session_service = SessionService()
 async def get_message(
     message_id: int,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Gets a message by ID."""
-    message = message_service.get_message(db, message_id)
-    db_session = session_service.get_session(db, message.session_id)
+    """Gets a message by ID, with its full content even when lists truncate it."""
+    message = await message_service.get_message_async(db, message_id)
+    db_session = await session_service.get_session_async(db, message.session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Message does not belong to the user",
         )
+    content = await message_service.get_full_content_async(db, message)
     return Response.success(
-        data=MessageResponse.model_validate(message),
+        data=MessageResponse.model_validate(message).model_copy(
+            update={"content": content, "content_truncated": False}
+        ),
         message="Message retrieved successfully",
     )
@@ -1,10 +1,11 @@
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user_id, get_db
+from app.core.deps import get_async_db, get_current_user_id, get_db
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.response import Response, ResponseSchema
@@ -27,10 +28,10 @@ session_service = SessionService()
 @router.post("/claim", response_model=ResponseSchema[RunClaimResponse | None])
 async def claim_next_run(
     request: RunClaimRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Claim the next available run for execution."""
-    result = run_service.claim_next_run(db, request)
+    result = await db.run_sync(run_service.claim_next_run, request)
     return Response.success(data=result, message="Run claimed" if result else "No runs")
 
 
@@ -38,10 +39,10 @@ async def claim_next_run(
 async def start_run(
     run_id: uuid.UUID,
     request: RunStartRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Mark a run as running (after dispatch accepted)."""
-    result = run_service.start_run(db, run_id, request)
+    result = await db.run_sync(run_service.start_run, run_id, request)
     return Response.success(data=result, message="Run started")
 
 
@@ -49,10 +50,10 @@ async def start_run(
 async def fail_run(
     run_id: uuid.UUID,
     request: RunFailRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Mark a run as failed."""
-    result = run_service.fail_run(db, run_id, request)
+    result = await db.run_sync(run_service.fail_run, run_id, request)
     return Response.success(data=result, message="Run marked as failed")
 
 
@@ -77,16 +78,25 @@ async def get_run(
 async def list_runs_by_session(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    after_id: uuid.UUID | None = Query(default=None),
+    before_id: uuid.UUID | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """List runs for a session."""
+    """List runs for a session in schedule order, paged by `after_id`/`before_id`."""
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    runs = run_service.list_runs(db, session_id, limit=limit, offset=offset)
+    runs = run_service.list_runs(
+        db,
+        session_id,
+        limit=limit,
+        offset=offset,
+        after_id=after_id,
+        before_id=before_id,
+    )
     return Response.success(data=runs, message="Runs retrieved successfully")
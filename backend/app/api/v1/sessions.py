@@ -1,15 +1,24 @@
+import asyncio
+import json
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.deps import get_current_user_id, get_db
+from app.core.deps import get_async_db, get_current_user_id, get_db
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.session_events import SessionEvent, session_events
+from app.core.settings import get_settings
 from app.schemas.message import MessageResponse, MessageWithFilesResponse
 from app.schemas.response import Response, ResponseSchema
 from app.schemas.session import (
+    SessionChangesResponse,
     SessionCreateRequest,
     SessionResponse,
     SessionStateResponse,
@@ -23,6 +32,7 @@ from app.services.session_service import SessionService
 from app.services.storage_service import S3StorageService
 from app.services.tool_execution_service import ToolExecutionService
 from app.services.usage_service import UsageService
+from app.services.workspace_archive_service import WorkspaceArchiveService
 from app.utils.workspace import build_workspace_file_nodes
 from app.utils.workspace_manifest import (
     build_nodes_from_manifest,
@@ -37,6 +47,7 @@ message_service = MessageService()
 tool_execution_service = ToolExecutionService()
 usage_service = UsageService()
 storage_service = S3StorageService()
+workspace_archive_service = WorkspaceArchiveService(storage_service)
 
 
 @router.post("", response_model=ResponseSchema[SessionResponse])
@@ -53,25 +64,49 @@ async def create_session(
     )
 
 
+@router.post("/{session_id}/fork", response_model=ResponseSchema[SessionResponse])
+async def fork_session(
+    session_id: uuid.UUID,
+    user_id: str = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> JSONResponse:
+    """Creates a new session starting from a copy of this session's workspace."""
+    db_session = await asyncio.to_thread(
+        session_service.fork_session, db, user_id, session_id
+    )
+    return Response.success(
+        data=SessionResponse.model_validate(db_session),
+        message="Session forked successfully",
+    )
+
+
 @router.get("", response_model=ResponseSchema[list[SessionResponse]])
 async def list_sessions(
     user_id: str = Depends(get_current_user_id),
-    limit: int = 100,
-    offset: int = 0,
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    after_id: uuid.UUID | None = Query(default=None),
+    before_id: uuid.UUID | None = Query(default=None),
     project_id: uuid.UUID | None = Query(default=None),
     kind: str = Query(default="chat"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Lists sessions."""
+    """Lists sessions, newest first.
+
+    Page with `after_id` (older sessions) or `before_id` (newer sessions) set to a
+    session id from the previous page; `offset` is kept for existing clients.
+    """
     kind_filter = kind.strip().lower()
     kind_value = None if kind_filter in {"", "all"} else kind_filter
-    sessions = session_service.list_sessions(
+    sessions = await session_service.list_sessions_async(
         db,
         user_id,
         limit,
         offset,
         project_id,
         kind=kind_value,
+        after_id=after_id,
+        before_id=before_id,
     )
     return Response.success(
         data=[SessionResponse.model_validate(s) for s in sessions],
@@ -83,10 +118,10 @@ async def list_sessions(
 async def get_session(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Gets session details."""
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
@@ -102,10 +137,10 @@ async def get_session(
 async def get_session_state(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
     """Gets session state details."""
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
@@ -164,23 +199,139 @@ async def delete_session(
 async def get_session_messages(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
-    db: Session = Depends(get_db),
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_id: int | None = Query(default=None),
+    before_id: int | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_db),
 ) -> JSONResponse:
-    """Gets all messages for a session."""
+    """Gets one page of messages for a session, oldest first.
+
+    Page forward with `after_id` or backward with `before_id` set to a message id.
+    """
     # Verify session exists
-    db_session = session_service.get_session(db, session_id)
+    db_session = await session_service.get_session_async(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    messages = message_service.get_messages(db, session_id)
+    messages = await message_service.get_messages_async(
+        db, session_id, limit, after_id=after_id, before_id=before_id
+    )
     return Response.success(
         data=[MessageResponse.model_validate(m) for m in messages],
         message="Messages retrieved successfully",
     )
 
 
+@router.get(
+    "/{session_id}/changes", response_model=ResponseSchema[SessionChangesResponse]
+)
+async def get_session_changes(
+    session_id: uuid.UUID,
+    user_id: str = Depends(get_current_user_id),
+    since_version: int | None = Query(default=None, ge=0),
+    after_id: int | None = Query(default=None),
+    limit: int = Query(default=500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    """Gets what changed in a session since the client's last poll.
+
+    Pass the `change_version` of the previous response as `since_version` and the id
+    of the last message received as `after_id`. While nothing changed this costs one
+    primary-key lookup and returns no messages or runs.
+    """
+    row = await session_service.get_change_version_async(db, session_id)
+    if row.user_id != user_id:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Session does not belong to the user",
+        )
+    if since_version is not None and row.change_version <= since_version:
+        return Response.success(
+            data=SessionChangesResponse(
+                session_id=session_id,
+                status=row.status,
+                change_version=row.change_version,
+            ),
+            message="No changes",
+        )
+    changes = await db.run_sync(
+        session_service.get_changes,
+        session_id,
+        status=row.status,
+        change_version=row.change_version,
+        user_id=user_id,
+        since_version=since_version,
+        after_id=after_id,
+        limit=limit,
+    )
+    return Response.success(data=changes, message="Changes retrieved successfully")
+
+
+def _sse_frame(session_event: SessionEvent) -> str:
+    lines = [f"event: {session_event.type}"]
+    if session_event.change_version is not None:
+        lines.append(f"id: {session_event.change_version}")
+    lines.append(f"data: {json.dumps(asdict(session_event), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+@router.get("/{session_id}/events")
+async def stream_session_events(
+    session_id: uuid.UUID,
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> StreamingResponse:
+    """Streams a session's changes as Server-Sent Events.
+
+    The first event, `ready`, carries the current `change_version`; after it come
+    `message`, `run`, `session` (status and state) and `user_input_request` events as
+    they are committed. A `resync` event means events were dropped: re-read
+    `/changes`. Events only say what to refresh, so clients keep `/changes` polling
+    as the fallback whenever the stream is down.
+    """
+    row = await session_service.get_change_version_async(db, session_id)
+    if row.user_id != user_id:
+        raise AppException(
+            error_code=ErrorCode.FORBIDDEN,
+            message="Session does not belong to the user",
+        )
+    # Streams stay open for minutes; do not hold a pooled connection meanwhile.
+    await db.close()
+    keepalive = get_settings().session_events_keepalive_seconds
+
+    async def stream() -> AsyncIterator[str]:
+        async with session_events.subscribe(session_id) as queue:
+            # Clients sync through /changes on `ready`, which covers anything
+            # committed before the subscription started.
+            yield "retry: 3000\n" + _sse_frame(
+                SessionEvent(
+                    str(session_id),
+                    "ready",
+                    row.change_version,
+                    {"status": row.status},
+                )
+            )
+            while True:
+                try:
+                    session_event = await asyncio.wait_for(queue.get(), keepalive)
+                except TimeoutError:
+                    # Keeps proxies from closing an idle stream.
+                    yield ": keepalive\n\n"
+                    continue
+                yield _sse_frame(session_event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache, no-transform",
+            "X-Accel-Buffering": "no",
+        },
+    )
+
+
 @router.get(
     "/{session_id}/messages-with-files",
     response_model=ResponseSchema[list[MessageWithFilesResponse]],
@@ -188,9 +339,12 @@ async def get_session_messages(
 async def get_session_messages_with_files(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_id: int | None = Query(default=None),
+    before_id: int | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """Gets all messages for a session with per-message attachments."""
+    """Gets one page of messages for a session with per-message attachments."""
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
@@ -198,7 +352,14 @@ async def get_session_messages_with_files(
             message="Session does not belong to the user",
         )
 
-    messages = message_service.get_messages_with_files(db, session_id, user_id=user_id)
+    messages = message_service.get_messages_with_files(
+        db,
+        session_id,
+        user_id=user_id,
+        limit=limit,
+        after_id=after_id,
+        before_id=before_id,
+    )
     return Response.success(
         data=messages,
         message="Messages retrieved successfully",
@@ -212,9 +373,12 @@ async def get_session_messages_with_files(
 async def get_session_tool_executions(
     session_id: uuid.UUID,
     user_id: str = Depends(get_current_user_id),
+    limit: int = Query(default=100, ge=1, le=1000),
+    after_id: uuid.UUID | None = Query(default=None),
+    before_id: uuid.UUID | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """Gets all tool executions for a session."""
+    """Gets one page of tool executions for a session, oldest first."""
     # Verify session exists
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
@@ -222,7 +386,9 @@ async def get_session_tool_executions(
             error_code=ErrorCode.FORBIDDEN,
             message="Session does not belong to the user",
         )
-    executions = tool_execution_service.get_tool_executions(db, session_id)
+    executions = tool_execution_service.get_tool_executions(
+        db, session_id, limit, after_id=after_id, before_id=before_id
+    )
     return Response.success(
         data=[ToolExecutionResponse.model_validate(e) for e in executions],
         message="Tool executions retrieved successfully",
@@ -313,10 +479,18 @@ async def get_session_workspace_files(
 )
 async def get_session_workspace_archive(
     session_id: uuid.UUID,
+    background_tasks: BackgroundTasks,
+    archive_format: Literal["zip", "auto"] = Query(default="zip", alias="format"),
     user_id: str = Depends(get_current_user_id),
     db: Session = Depends(get_db),
 ) -> JSONResponse:
-    """Get a presigned download URL for the exported workspace archive."""
+    """Get a presigned download URL for the workspace archive.
+
+    The archive is assembled on first request from the exported per-file objects and
+    cached until the manifest changes. Returns 202 while the build is in progress.
+    Browser downloads get a zip by default, even if the export produced a tar.zst;
+    pass format=auto to accept whatever archive the export produced.
+    """
     db_session = session_service.get_session(db, session_id)
     if db_session.user_id != user_id:
         raise AppException(
@@ -325,19 +499,55 @@ async def get_session_workspace_archive(
         )
 
     filename = f"workspace-{session_id}.zip"
-    archive_key = (db_session.workspace_archive_key or "").strip()
-    if not archive_key or db_session.workspace_export_status != "ready":
+    manifest_key = (db_session.workspace_manifest_key or "").strip()
+    if db_session.workspace_export_status != "ready" or not manifest_key:
         return Response.success(
-            data=WorkspaceArchiveResponse(url=None, filename=filename),
+            data=WorkspaceArchiveResponse(
+                url=None, filename=filename, status="not_ready"
+            ),
             message="Workspace export not ready",
         )
 
+    # Archives produced eagerly by the Executor Manager are served as-is.
+    archive_key = (db_session.workspace_archive_key or "").strip()
+    if archive_format == "zip" and not archive_key.endswith(".zip"):
+        archive_key = ""
+    if not archive_key:
+        # HEAD requests to S3: kept off the event loop.
+        status, archive_key = await asyncio.to_thread(
+            workspace_archive_service.prepare_archive, manifest_key
+        )
+        if status == "pending" and archive_key:
+            background_tasks.add_task(
+                workspace_archive_service.build_archive,
+                manifest_key=manifest_key,
+                archive_key=archive_key,
+                files_prefix=db_session.workspace_files_prefix,
+            )
+            status = "building"
+        if status != "ready" or not archive_key:
+            return Response.success(
+                data=WorkspaceArchiveResponse(
+                    url=None, filename=filename, status=status
+                ),
+                message=(
+                    "Workspace archive is being prepared"
+                    if status == "building"
+                    else "Workspace archive not available"
+                ),
+                status_code=202 if status == "building" else 200,
+            )
+
+    content_type = "application/zip"
+    if archive_key.endswith(".tar.zst"):
+        filename = f"workspace-{session_id}.tar.zst"
+        content_type = "application/zstd"
     url = storage_service.presign_get(
         archive_key,
         response_content_disposition=f'attachment; filename="{filename}"',
-        response_content_type="application/zip",
+        response_content_type=content_type,
     )
     return Response.success(
-        data=WorkspaceArchiveResponse(url=url, filename=filename),
+        data=WorkspaceArchiveResponse(url=url, filename=filename, status="ready"),
         message="Workspace archive URL generated",
     )
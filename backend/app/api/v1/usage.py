@@ -0,0 +1,52 @@
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import get_async_db, get_current_user_id
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.schemas.response import Response, ResponseSchema
+from app.schemas.usage import UserUsageResponse
+from app.services.usage_service import UsageService
+
+router = APIRouter(prefix="/usage", tags=["usage"])
+
+usage_service = UsageService()
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+
+
+@router.get("", response_model=ResponseSchema[UserUsageResponse])
+async def get_user_usage(
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+    user_id: str = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> JSONResponse:
+    """Gets the current user's usage per UTC day over a date range.
+
+    Both dates are inclusive. The range defaults to the last 30 days and is at
+    most 366 days long.
+    """
+    if end_date is None:
+        end_date = datetime.now(timezone.utc).date()
+    if start_date is None:
+        start_date = end_date - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if end_date < start_date:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="end_date must not be before start_date",
+        )
+    if (end_date - start_date).days >= MAX_RANGE_DAYS:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message=f"Date range must be at most {MAX_RANGE_DAYS} days",
+        )
+    usage = await usage_service.get_user_usage_async(db, user_id, start_date, end_date)
+    return Response.success(
+        data=usage,
+        message="Usage statistics retrieved successfully",
+    )
@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, func, create_engine
+from sqlalchemy import DateTime, func, create_engine, make_url
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
 
 from app.core.settings import get_settings
@@ -20,6 +22,37 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def get_async_database_url() -> URL:
+    """ASYNC_DATABASE_URL, else DATABASE_URL switched to an async driver.
+
+    PostgreSQL uses psycopg 3, which reads the same libpq URL options as psycopg2.
+    """
+    if settings.async_database_url:
+        return make_url(settings.async_database_url)
+    url = make_url(settings.database_url)
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        return url.set(drivername="postgresql+psycopg")
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+
+async_engine = create_async_engine(
+    get_async_database_url(),
+    echo=settings.log_sql,
+    hide_parameters=True,
+    pool_pre_ping=True,
+    pool_size=settings.db_async_pool_size,
+    max_overflow=settings.db_async_max_overflow,
+)
+
+# Objects stay loaded after commit: an expired attribute cannot lazy-load outside
+# the greenlet, so responses are built from the values the transaction saw.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
 class Base(DeclarativeBase):
     pass
 
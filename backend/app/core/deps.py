@@ -1,9 +1,10 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import Header
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.database import SessionLocal
+from app.core.database import AsyncSessionLocal, SessionLocal
 
 DEFAULT_USER_ID = "default"
 
@@ -27,3 +28,13 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency for an async database session.
+
+    Used by the high-traffic endpoints so database waits do not block the event loop.
+    Sync service code runs on it through `AsyncSession.run_sync`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
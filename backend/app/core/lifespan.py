@@ -3,7 +3,8 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.core.database import engine
+from app.core.database import async_engine, engine
+from app.core.session_events import session_events
 
 logger = logging.getLogger(__name__)
 
@@ -14,8 +15,11 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting application...")
     logger.info("Database engine initialized")
+    await session_events.start()
     yield
     # Shutdown
+    await session_events.stop()
     logger.info("Shutting down database engine...")
     engine.dispose()
+    await async_engine.dispose()
     logger.info("Database engine disposed")
@@ -0,0 +1,215 @@
+"""In-process pub/sub for session events, with optional Postgres fan-out.
+
+Services `publish` an event inside the transaction that makes it true, and it is
+delivered only if that transaction commits. With the `memory` backend events go
+straight to this process's subscribers after the commit. With the `postgres`
+backend they are sent with `pg_notify` in the same transaction; every backend
+replica LISTENs on the channel and delivers what it receives (its own events
+included), so a client streaming from one replica sees callbacks handled by any
+other.
+
+Events tell clients what to refresh; they are not a durable log. A subscriber that
+falls behind, or a replica whose LISTEN connection dropped, gets a `resync` event
+and re-reads the session through the changes feed.
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from sqlalchemy import event, func, make_url, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "session_events"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_NOTIFY_BYTES = 7900
+LISTEN_RETRY_SECONDS = 2.0
+_PENDING_KEY = "session_events"
+
+
+@dataclass(frozen=True)
+class SessionEvent:
+    session_id: str
+    type: str
+    change_version: int | None = None
+    data: dict[str, Any] | None = None
+
+
+class SessionEventBus:
+    def __init__(self, backend: str, queue_size: int) -> None:
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue[SessionEvent]]] = defaultdict(
+            set
+        )
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listener: asyncio.Task[None] | None = None
+
+    def publish(
+        self,
+        db: Session,
+        session_id: uuid.UUID | str,
+        type: str,
+        data: dict[str, Any] | None = None,
+        *,
+        change_version: int | None = None,
+    ) -> None:
+        """Queues an event on `db`; it is delivered once `db` commits.
+
+        `data` must be JSON-serializable as given: it is captured now, not when the
+        transaction commits.
+        """
+        pending = db.info.setdefault(_PENDING_KEY, [])
+        pending.append(SessionEvent(str(session_id), type, change_version, data))
+
+    @asynccontextmanager
+    async def subscribe(
+        self, session_id: uuid.UUID | str
+    ) -> AsyncIterator[asyncio.Queue[SessionEvent]]:
+        """Yields a queue receiving the session's events until the block exits."""
+        key = str(session_id)
+        queue: asyncio.Queue[SessionEvent] = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[key].add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(key)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[key]
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        if self.backend == "postgres":
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self._loop = None
+
+    def _before_commit(self, db: Session) -> None:
+        if self.backend != "postgres":
+            return
+        events = db.info.pop(_PENDING_KEY, None)
+        if events:
+            db.execute(select(func.pg_notify(CHANNEL, self._notify_payload(events))))
+
+    def _after_commit(self, db: Session) -> None:
+        events = db.info.pop(_PENDING_KEY, None)
+        if events:
+            self._dispatch(events)
+
+    def _after_rollback(self, db: Session) -> None:
+        db.info.pop(_PENDING_KEY, None)
+
+    @staticmethod
+    def _notify_payload(events: list[SessionEvent]) -> str:
+        items = [asdict(e) for e in events]
+        payload = json.dumps(items, default=str)
+        # Too large to notify: the biggest events go without their data first;
+        # subscribers still learn what changed and fetch it.
+        by_size = sorted(
+            items, key=lambda item: len(json.dumps(item, default=str)), reverse=True
+        )
+        for item in by_size:
+            if len(payload.encode()) <= MAX_NOTIFY_BYTES:
+                break
+            item["data"] = None
+            payload = json.dumps(items, default=str)
+        return payload
+
+    def _dispatch(self, events: list[SessionEvent]) -> None:
+        """Hands events to the event loop; safe to call from any thread."""
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, events)
+        except RuntimeError:
+            # The loop closed during shutdown.
+            pass
+
+    def _deliver(self, events: list[SessionEvent]) -> None:
+        for session_event in events:
+            for queue in self._subscribers.get(session_event.session_id, ()):
+                self._put(queue, session_event)
+
+    def _resync_all(self) -> None:
+        for session_id, subscribers in self._subscribers.items():
+            for queue in subscribers:
+                self._put(queue, SessionEvent(session_id, "resync"))
+
+    @staticmethod
+    def _put(queue: asyncio.Queue[SessionEvent], session_event: SessionEvent) -> None:
+        try:
+            queue.put_nowait(session_event)
+        except asyncio.QueueFull:
+            # A slow consumer skips the backlog and reloads instead.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(SessionEvent(session_event.session_id, "resync"))
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        conninfo = (
+            make_url(get_settings().database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    conninfo, autocommit=True
+                ) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    logger.info("session_events_listening", extra={"channel": CHANNEL})
+                    # Anything sent while the connection was down is lost.
+                    self._resync_all()
+                    async for notify in conn.notifies():
+                        self._receive(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("session_events_listen_failed")
+                await asyncio.sleep(LISTEN_RETRY_SECONDS)
+
+    def _receive(self, payload: str) -> None:
+        try:
+            events = [SessionEvent(**item) for item in json.loads(payload)]
+        except (TypeError, ValueError):
+            logger.warning("session_events_bad_payload")
+            return
+        self._deliver(events)
+
+
+def _create_bus() -> SessionEventBus:
+    settings = get_settings()
+    bus = SessionEventBus(
+        backend=settings.session_events_backend,
+        queue_size=settings.session_events_queue_size,
+    )
+    event.listen(Session, "before_commit", bus._before_commit)
+    event.listen(Session, "after_commit", bus._after_commit)
+    event.listen(Session, "after_rollback", bus._after_rollback)
+    return bus
+
+
+session_events = _create_bus()
@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -16,6 +17,34 @@ class Settings(BaseSettings):
     port: int = Field(default=8000)
 
     database_url: str = Field(default="sqlite:///./opencowork.db")
+    # Async engine for the hot endpoints; derived from DATABASE_URL when unset.
+    async_database_url: str | None = Field(default=None, alias="ASYNC_DATABASE_URL")
+    db_async_pool_size: int = Field(default=10, alias="DB_ASYNC_POOL_SIZE")
+    db_async_max_overflow: int = Field(default=20, alias="DB_ASYNC_MAX_OVERFLOW")
+
+    # Session event stream: "memory" serves one process; "postgres" fans events out
+    # to every replica over LISTEN/NOTIFY.
+    session_events_backend: Literal["memory", "postgres"] = Field(
+        default="memory", alias="SESSION_EVENTS_BACKEND"
+    )
+    session_events_keepalive_seconds: int = Field(
+        default=15, alias="SESSION_EVENTS_KEEPALIVE_SECONDS"
+    )
+    session_events_queue_size: int = Field(
+        default=100, alias="SESSION_EVENTS_QUEUE_SIZE"
+    )
+
+    # Applied callback ids are kept this long to skip redelivered callbacks.
+    callback_receipt_retention_hours: int = Field(
+        default=168, alias="CALLBACK_RECEIPT_RETENTION_HOURS"
+    )
+
+    # Message content serialized larger than this is stored compressed outside the
+    # messages table; the row keeps its strings cut to MESSAGE_PREVIEW_CHARS.
+    message_inline_max_bytes: int = Field(
+        default=32768, alias="MESSAGE_INLINE_MAX_BYTES"
+    )
+    message_preview_chars: int = Field(default=2000, alias="MESSAGE_PREVIEW_CHARS")
 
     cors_origins: list[str] = Field(
         default=["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -30,6 +59,10 @@ class Settings(BaseSettings):
     executor_manager_url: str = Field(
         default="http://localhost:8001", alias="EXECUTOR_MANAGER_URL"
     )
+    # Forks fall back to a full copy on filesystems without reflink support.
+    workspace_fork_timeout_seconds: int = Field(
+        default=300, alias="WORKSPACE_FORK_TIMEOUT_SECONDS"
+    )
     s3_endpoint: str | None = Field(default=None, alias="S3_ENDPOINT")
     s3_public_endpoint: str | None = Field(default=None, alias="S3_PUBLIC_ENDPOINT")
     s3_access_key: str | None = Field(default=None, alias="S3_ACCESS_KEY")
@@ -38,6 +71,12 @@ class Settings(BaseSettings):
     s3_bucket: str | None = Field(default=None, alias="S3_BUCKET")
     s3_force_path_style: bool = Field(default=True, alias="S3_FORCE_PATH_STYLE")
     s3_presign_expires: int = Field(default=300, alias="S3_PRESIGN_EXPIRES")
+    s3_presign_cache_max_entries: int = Field(
+        default=20000, alias="S3_PRESIGN_CACHE_MAX_ENTRIES"
+    )
+    s3_presign_cache_margin_seconds: int = Field(
+        default=120, alias="S3_PRESIGN_CACHE_MARGIN_SECONDS"
+    )
     s3_connect_timeout_seconds: int = Field(
         default=5, alias="S3_CONNECT_TIMEOUT_SECONDS"
     )
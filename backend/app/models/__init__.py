@@ -1,9 +1,11 @@
 from app.core.database import Base, TimestampMixin
 
 from app.models.agent_message import AgentMessage
+from app.models.agent_message_body import AgentMessageBody
 from app.models.agent_run import AgentRun
 from app.models.agent_scheduled_task import AgentScheduledTask
 from app.models.agent_session import AgentSession
+from app.models.callback_receipt import CallbackReceipt
 from app.models.env_var import UserEnvVar
 from app.models.mcp_server import McpServer
 from app.models.project import Project
@@ -12,6 +14,11 @@ from app.models.skill_import_job import SkillImportJob
 from app.models.slash_command import SlashCommand
 from app.models.tool_execution import ToolExecution
 from app.models.usage_log import UsageLog
+from app.models.usage_rollup import (
+    RunUsageRollup,
+    SessionUsageRollup,
+    UserDailyUsageRollup,
+)
 from app.models.user_mcp_install import UserMcpInstall
 from app.models.user_input_request import UserInputRequest
 from app.models.user_skill_install import UserSkillInstall
@@ -20,9 +27,11 @@ __all__ = [
     "Base",
     "TimestampMixin",
     "AgentMessage",
+    "AgentMessageBody",
     "AgentRun",
     "AgentScheduledTask",
     "AgentSession",
+    "CallbackReceipt",
     "UserEnvVar",
     "McpServer",
     "Project",
@@ -31,6 +40,9 @@ __all__ = [
     "SlashCommand",
     "ToolExecution",
     "UsageLog",
+    "RunUsageRollup",
+    "SessionUsageRollup",
+    "UserDailyUsageRollup",
     "UserMcpInstall",
     "UserInputRequest",
     "UserSkillInstall",
@@ -1,18 +1,35 @@
 import uuid
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import JSON, BigInteger, ForeignKey, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    false,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
 
 if TYPE_CHECKING:
+    from app.models.agent_message_body import AgentMessageBody
     from app.models.agent_session import AgentSession
     from app.models.tool_execution import ToolExecution
 
 
 class AgentMessage(Base, TimestampMixin):
     __tablename__ = "agent_messages"
+    __table_args__ = (
+        Index(
+            "ix_agent_messages_session_id_created_at", "session_id", "created_at", "id"
+        ),
+        # Change feed: messages of a session past the last id a client has seen.
+        Index("ix_agent_messages_session_id_id", "session_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     session_id: Mapped[uuid.UUID] = mapped_column(
@@ -21,8 +38,15 @@ class AgentMessage(Base, TimestampMixin):
     role: Mapped[str] = mapped_column(String(50), nullable=False)
     content: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
     text_preview: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # When set, `content` is a preview stub and the full content is in `body`.
+    content_truncated: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=false(), nullable=False
+    )
 
     session: Mapped["AgentSession"] = relationship(back_populates="messages")
+    body: Mapped["AgentMessageBody | None"] = relationship(
+        back_populates="message", cascade="all, delete-orphan", passive_deletes=True
+    )
     tool_executions: Mapped[list["ToolExecution"]] = relationship(
         back_populates="message",
         cascade="all, delete-orphan",
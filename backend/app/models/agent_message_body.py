@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import BigInteger, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models import Base
+
+if TYPE_CHECKING:
+    from app.models.agent_message import AgentMessage
+
+
+class AgentMessageBody(Base):
+    """Compressed full content of a message too large to store inline."""
+
+    __tablename__ = "agent_message_bodies"
+
+    message_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("agent_messages.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    encoding: Mapped[str] = mapped_column(String(16), nullable=False)
+    # Uncompressed size of the serialized content, in bytes.
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+
+    message: Mapped["AgentMessage"] = relationship(back_populates="body")
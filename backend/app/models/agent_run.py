@@ -6,6 +6,7 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
@@ -26,6 +27,22 @@ if TYPE_CHECKING:
 
 class AgentRun(Base, TimestampMixin):
     __tablename__ = "agent_runs"
+    __table_args__ = (
+        # Queue scan in claim_next.
+        Index(
+            "ix_agent_runs_queued_scheduled_at",
+            "scheduled_at",
+            "created_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        # "Active run per session" checks and lookups.
+        Index(
+            "ix_agent_runs_active_session_id",
+            "session_id",
+            "created_at",
+            postgresql_where=text("status IN ('claimed', 'running')"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -75,6 +92,10 @@ class AgentRun(Base, TimestampMixin):
     )
 
     attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Session change_version of the last write to this run.
+    change_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
     last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
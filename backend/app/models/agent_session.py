@@ -1,7 +1,17 @@
 import uuid
 from typing import TYPE_CHECKING, Any, Optional
 
-from sqlalchemy import ForeignKey, JSON, Boolean, String, Text, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    ForeignKey,
+    Index,
+    Integer,
+    JSON,
+    String,
+    Text,
+    text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -17,6 +27,21 @@ if TYPE_CHECKING:
 
 class AgentSession(Base, TimestampMixin):
     __tablename__ = "agent_sessions"
+    __table_args__ = (
+        # Callback lookup by SDK session id.
+        Index(
+            "ix_agent_sessions_sdk_session_id",
+            "sdk_session_id",
+            postgresql_where=text("sdk_session_id IS NOT NULL"),
+        ),
+        # Per-user session list, newest first.
+        Index(
+            "ix_agent_sessions_user_id_created_at",
+            "user_id",
+            "created_at",
+            postgresql_where=text("is_deleted IS false"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True,
@@ -32,6 +57,12 @@ class AgentSession(Base, TimestampMixin):
     config_snapshot: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     workspace_archive_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     state_patch: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Version of state_patch as reported by the executor; deltas apply on top of it.
+    state_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Bumped by every write clients poll for (messages, run and status changes).
+    change_version: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default=text("0"), nullable=False
+    )
     workspace_files_prefix: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_manifest_key: Mapped[str | None] = mapped_column(Text, nullable=True)
     workspace_archive_key: Mapped[str | None] = mapped_column(Text, nullable=True)
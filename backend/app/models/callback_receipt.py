@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class CallbackReceipt(Base):
+    """Id of a callback already applied; a redelivery with the same id is skipped.
+
+    Executor Manager delivers callbacks at least once, so the id is recorded in the
+    transaction that applies the callback. Rows are pruned after the retention window.
+    """
+
+    __tablename__ = "callback_receipts"
+
+    callback_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"), nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
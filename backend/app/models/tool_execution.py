@@ -5,6 +5,7 @@ from sqlalchemy import (
     JSON,
     Boolean,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -27,6 +28,8 @@ class ToolExecution(Base, TimestampMixin):
             "tool_use_id",
             name="uq_tool_executions_session_tool_use_id",
         ),
+        Index("ix_tool_executions_session_id_created_at", "session_id", "created_at"),
+        Index("ix_tool_executions_message_id", "message_id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -42,6 +45,14 @@ class ToolExecution(Base, TimestampMixin):
     tool_name: Mapped[str] = mapped_column(String(100), nullable=False)
     tool_input: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     tool_output: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Set when the input/output is a preview of an offloaded message; the full value
+    # is in the content of message_id / result_message_id.
+    tool_input_truncated: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("false"), nullable=False
+    )
+    tool_output_truncated: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("false"), nullable=False
+    )
     result_message_id: Mapped[int | None] = mapped_column(
         ForeignKey("agent_messages.id", ondelete="SET NULL"), nullable=True
     )
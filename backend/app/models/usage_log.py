@@ -1,7 +1,7 @@
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, Integer, JSON, Numeric, text
+from sqlalchemy import ForeignKey, Index, Integer, JSON, Numeric, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base, TimestampMixin
@@ -13,6 +13,9 @@ if TYPE_CHECKING:
 
 class UsageLog(Base, TimestampMixin):
     __tablename__ = "usage_logs"
+    __table_args__ = (
+        Index("ix_usage_logs_session_id_created_at", "session_id", "created_at"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True, server_default=text("gen_random_uuid()")
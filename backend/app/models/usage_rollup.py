@@ -0,0 +1,62 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, Integer, Numeric, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base, TimestampMixin
+
+
+class UsageTotalsMixin:
+    """Running totals of the usage logs in one bucket.
+
+    Updated in the transaction that writes each usage log, so reading a bucket's
+    usage is a primary-key lookup instead of a scan of its logs.
+    """
+
+    log_count: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    total_cost_usd: Mapped[float] = mapped_column(
+        Numeric(16, 6), default=0, server_default="0", nullable=False
+    )
+    total_duration_ms: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    output_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    cache_creation_input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+    cache_read_input_tokens: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
+
+
+class RunUsageRollup(Base, UsageTotalsMixin, TimestampMixin):
+    __tablename__ = "run_usage_rollups"
+
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_runs.id", ondelete="CASCADE"), primary_key=True
+    )
+
+
+class SessionUsageRollup(Base, UsageTotalsMixin, TimestampMixin):
+    __tablename__ = "session_usage_rollups"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("agent_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+
+
+class UserDailyUsageRollup(Base, UsageTotalsMixin, TimestampMixin):
+    """Usage of one user on one UTC day."""
+
+    __tablename__ = "user_daily_usage_rollups"
+
+    user_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
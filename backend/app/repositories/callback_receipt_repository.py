@@ -0,0 +1,34 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.callback_receipt import CallbackReceipt
+
+
+class CallbackReceiptRepository:
+    """Data access layer for the ids of applied callbacks."""
+
+    @staticmethod
+    def record(session_db: Session, callback_id: str, session_id: uuid.UUID) -> bool:
+        """Records a callback id; returns False when it was recorded before.
+
+        One statement: an insert that does nothing on a known id. A concurrent
+        transaction holding the same id makes it wait, then report a duplicate.
+        """
+        stmt = (
+            insert(CallbackReceipt)
+            .values(callback_id=callback_id, session_id=session_id)
+            .on_conflict_do_nothing(index_elements=["callback_id"])
+            .returning(CallbackReceipt.callback_id)
+        )
+        return session_db.execute(stmt).scalar_one_or_none() is not None
+
+    @staticmethod
+    def delete_older_than(session_db: Session, cutoff: datetime) -> int:
+        result = session_db.execute(
+            delete(CallbackReceipt).where(CallbackReceipt.created_at < cutoff)
+        )
+        return result.rowcount
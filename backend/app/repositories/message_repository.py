@@ -1,9 +1,14 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.agent_message import AgentMessage
+from app.models.agent_message_body import AgentMessageBody
+from app.utils.message_content import offload_content
+from app.utils.pagination import in_page_order, keyset_page
 
 
 class MessageRepository:
@@ -17,35 +22,101 @@ class MessageRepository:
         content: dict[str, Any],
         text_preview: str | None = None,
     ) -> AgentMessage:
-        """Creates a new message."""
+        """Creates a new message.
+
+        Content over the inline size limit is stored in a compressed body row, and
+        `message.content` holds its preview stub.
+        """
+        inline_content, body = offload_content(content)
         message = AgentMessage(
             session_id=session_id,
             role=role,
-            content=content,
+            content=inline_content,
             text_preview=text_preview,
+            content_truncated=body is not None,
         )
+        if body is not None:
+            encoding, data, size = body
+            message.body = AgentMessageBody(encoding=encoding, data=data, size=size)
         session_db.add(message)
         return message
 
     @staticmethod
     def get_by_id(session_db: Session, message_id: int) -> AgentMessage | None:
         """Gets a message by ID."""
-        return (
-            session_db.query(AgentMessage).filter(AgentMessage.id == message_id).first()
+        return session_db.get(AgentMessage, message_id)
+
+    @staticmethod
+    async def get_by_id_async(
+        session_db: AsyncSession, message_id: int
+    ) -> AgentMessage | None:
+        """Gets a message by ID."""
+        return await session_db.get(AgentMessage, message_id)
+
+    @staticmethod
+    async def get_body_async(
+        session_db: AsyncSession, message_id: int
+    ) -> AgentMessageBody | None:
+        """Gets the offloaded full content of a message."""
+        return await session_db.get(AgentMessageBody, message_id)
+
+    @staticmethod
+    def _select_by_session(
+        session_id: uuid.UUID,
+        limit: int,
+        after_id: int | None,
+        before_id: int | None,
+    ) -> Select[tuple[AgentMessage]]:
+        return keyset_page(
+            select(AgentMessage).where(AgentMessage.session_id == session_id),
+            AgentMessage.id,
+            [AgentMessage.created_at],
+            limit=limit,
+            after_id=after_id,
+            before_id=before_id,
         )
 
     @staticmethod
     def list_by_session(
-        session_db: Session, session_id: uuid.UUID, limit: int = 100, offset: int = 0
+        session_db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
     ) -> list[AgentMessage]:
-        """Lists messages for a session."""
-        return (
-            session_db.query(AgentMessage)
-            .filter(AgentMessage.session_id == session_id)
-            .order_by(AgentMessage.created_at.asc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        """Lists one page of messages for a session, oldest first."""
+        stmt = MessageRepository._select_by_session(
+            session_id, limit, after_id, before_id
+        )
+        return in_page_order(session_db.scalars(stmt).all(), before_id=before_id)
+
+    @staticmethod
+    async def list_by_session_async(
+        session_db: AsyncSession,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> list[AgentMessage]:
+        """Lists one page of messages for a session, oldest first."""
+        stmt = MessageRepository._select_by_session(
+            session_id, limit, after_id, before_id
+        )
+        result = await session_db.scalars(stmt)
+        return in_page_order(result.all(), before_id=before_id)
+
+    @staticmethod
+    def list_since(
+        session_db: Session, session_id: uuid.UUID, after_id: int | None, limit: int
+    ) -> list[AgentMessage]:
+        """Lists messages of a session inserted after `after_id`, in id order."""
+        stmt = select(AgentMessage).where(AgentMessage.session_id == session_id)
+        if after_id is not None:
+            stmt = stmt.where(AgentMessage.id > after_id)
+        return list(
+            session_db.scalars(stmt.order_by(AgentMessage.id.asc()).limit(limit))
         )
 
     @staticmethod
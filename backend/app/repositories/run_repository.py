@@ -5,6 +5,8 @@ from sqlalchemy import exists, select, update
 from sqlalchemy.orm import Session, aliased
 
 from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+from app.utils.pagination import in_page_order, keyset_page
 
 
 class RunRepository:
@@ -45,20 +47,70 @@ class RunRepository:
         """Gets a run by ID."""
         return session_db.query(AgentRun).filter(AgentRun.id == run_id).first()
 
+    @staticmethod
+    def get_active_by_session(
+        session_db: Session, session_id: uuid.UUID
+    ) -> AgentRun | None:
+        """Gets the latest claimed or running run of a session."""
+        return (
+            session_db.query(AgentRun)
+            .filter(
+                AgentRun.session_id == session_id,
+                AgentRun.status.in_(["claimed", "running"]),
+            )
+            .order_by(AgentRun.created_at.desc())
+            .first()
+        )
+
     @staticmethod
     def list_by_session(
         session_db: Session,
         session_id: uuid.UUID,
         limit: int = 100,
         offset: int = 0,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
+    ) -> list[AgentRun]:
+        """Lists one page of runs for a session, in schedule order."""
+        stmt = keyset_page(
+            select(AgentRun).where(AgentRun.session_id == session_id),
+            AgentRun.id,
+            [AgentRun.scheduled_at, AgentRun.created_at],
+            limit=limit,
+            after_id=after_id,
+            before_id=before_id,
+        )
+        if offset:
+            stmt = stmt.offset(offset)
+        return in_page_order(session_db.scalars(stmt).all(), before_id=before_id)
+
+    @staticmethod
+    def list_changed_since(
+        session_db: Session, session_id: uuid.UUID, change_version: int
     ) -> list[AgentRun]:
-        """Lists runs for a session."""
+        """Lists runs of a session written after the given session change version."""
         return (
             session_db.query(AgentRun)
-            .filter(AgentRun.session_id == session_id)
+            .filter(
+                AgentRun.session_id == session_id,
+                AgentRun.change_version > change_version,
+            )
+            .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
+            .all()
+        )
+
+    @staticmethod
+    def list_by_user_message_ids(
+        session_db: Session, user_message_ids: list[int]
+    ) -> list[AgentRun]:
+        """Lists the runs triggered by the given user messages."""
+        if not user_message_ids:
+            return []
+        return (
+            session_db.query(AgentRun)
+            .filter(AgentRun.user_message_id.in_(user_message_ids))
             .order_by(AgentRun.scheduled_at.asc(), AgentRun.created_at.asc())
-            .limit(limit)
-            .offset(offset)
             .all()
         )
 
@@ -103,11 +155,13 @@ class RunRepository:
         worker_id: str,
         lease_seconds: int = 30,
         schedule_modes: list[str] | None = None,
+        exclude_user_ids: list[str] | None = None,
     ) -> AgentRun | None:
         """Claims the next available run for execution.
 
         Uses SELECT ... FOR UPDATE SKIP LOCKED to support multiple workers.
-        Ensures only one claimed/running run per session at a time.
+        Ensures only one claimed/running run per session at a time. Runs of
+        `exclude_user_ids` are skipped and stay queued.
         """
         if lease_seconds <= 0:
             lease_seconds = 30
@@ -136,6 +190,14 @@ class RunRepository:
         )
         if schedule_modes:
             stmt = stmt.where(AgentRun.schedule_mode.in_(schedule_modes))
+        if exclude_user_ids:
+            stmt = stmt.where(
+                AgentRun.session_id.not_in(
+                    select(AgentSession.id).where(
+                        AgentSession.user_id.in_(exclude_user_ids)
+                    )
+                )
+            )
 
         run = session_db.execute(stmt).scalars().first()
         if not run:
@@ -1,9 +1,12 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import Row, Select, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.models.agent_session import AgentSession
+from app.utils.pagination import in_page_order, keyset_page
 
 
 class SessionRepository:
@@ -32,15 +35,69 @@ class SessionRepository:
         session_db.add(db_session)
         return db_session
 
+    @staticmethod
+    def _select_by_id(session_id: uuid.UUID) -> Select[tuple[AgentSession]]:
+        return select(AgentSession).where(
+            AgentSession.id == session_id,
+            AgentSession.is_deleted.is_(False),
+        )
+
     @staticmethod
     def get_by_id(session_db: Session, session_id: uuid.UUID) -> AgentSession | None:
         """Gets a session by ID."""
+        return session_db.scalars(SessionRepository._select_by_id(session_id)).first()
+
+    @staticmethod
+    async def get_by_id_async(
+        session_db: AsyncSession, session_id: uuid.UUID
+    ) -> AgentSession | None:
+        """Gets a session by ID."""
+        result = await session_db.scalars(SessionRepository._select_by_id(session_id))
+        return result.first()
+
+    @staticmethod
+    async def get_change_version_async(
+        session_db: AsyncSession, session_id: uuid.UUID
+    ) -> Row[tuple[str, str, int]] | None:
+        """Gets (user_id, status, change_version) of a session without its payload."""
+        result = await session_db.execute(
+            select(
+                AgentSession.user_id,
+                AgentSession.status,
+                AgentSession.change_version,
+            ).where(AgentSession.id == session_id, AgentSession.is_deleted.is_(False))
+        )
+        return result.first()
+
+    @staticmethod
+    def bump_change_version(session_db: Session, session_id: uuid.UUID) -> int:
+        """Advances a session's change version and returns the new value.
+
+        Incremented in SQL, so the row stays locked until the caller commits: writers
+        to one session are serialized from here on, and the ids of messages they
+        insert afterwards follow the version order. Call it before those inserts.
+        """
+        return session_db.execute(
+            update(AgentSession)
+            .where(AgentSession.id == session_id)
+            .values(change_version=AgentSession.change_version + 1)
+            .returning(AgentSession.change_version)
+        ).scalar_one()
+
+    @staticmethod
+    def get_by_sdk_session_id_or_id(
+        session_db: Session, session_id: str
+    ) -> AgentSession | None:
+        """Gets a session by SDK session ID, else by UUID, in one query."""
+        conditions = [AgentSession.sdk_session_id == session_id]
+        try:
+            conditions.append(AgentSession.id == uuid.UUID(session_id))
+        except ValueError:
+            pass
         return (
             session_db.query(AgentSession)
-            .filter(
-                AgentSession.id == session_id,
-                AgentSession.is_deleted.is_(False),
-            )
+            .filter(or_(*conditions), AgentSession.is_deleted.is_(False))
+            .order_by((AgentSession.sdk_session_id == session_id).desc())
             .first()
         )
 
@@ -58,6 +115,34 @@ class SessionRepository:
             .first()
         )
 
+    @staticmethod
+    def _select_list(
+        user_id: str | None,
+        limit: int,
+        offset: int,
+        project_id: uuid.UUID | None,
+        kind: str | None,
+        after_id: uuid.UUID | None,
+        before_id: uuid.UUID | None,
+    ) -> Select[tuple[AgentSession]]:
+        stmt = select(AgentSession).where(AgentSession.is_deleted.is_(False))
+        if user_id is not None:
+            stmt = stmt.where(AgentSession.user_id == user_id)
+        if kind:
+            stmt = stmt.where(AgentSession.kind == kind)
+        if project_id is not None:
+            stmt = stmt.where(AgentSession.project_id == project_id)
+        stmt = keyset_page(
+            stmt,
+            AgentSession.id,
+            [AgentSession.created_at],
+            limit=limit,
+            after_id=after_id,
+            before_id=before_id,
+            descending=True,
+        )
+        return stmt.offset(offset) if offset else stmt
+
     @staticmethod
     def list_by_user(
         session_db: Session,
@@ -66,22 +151,34 @@ class SessionRepository:
         offset: int = 0,
         project_id: uuid.UUID | None = None,
         kind: str | None = None,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
     ) -> list[AgentSession]:
-        """Lists sessions for a user."""
-        query = session_db.query(AgentSession).filter(
-            AgentSession.user_id == user_id,
-            AgentSession.is_deleted.is_(False),
+        """Lists one page of a user's sessions, newest first."""
+        stmt = SessionRepository._select_list(
+            user_id, limit, offset, project_id, kind, after_id, before_id
         )
-        if kind:
-            query = query.filter(AgentSession.kind == kind)
-        if project_id is not None:
-            query = query.filter(AgentSession.project_id == project_id)
-        return (
-            query.order_by(AgentSession.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        return in_page_order(session_db.scalars(stmt).all(), before_id=before_id)
+
+    @staticmethod
+    async def list_by_user_async(
+        session_db: AsyncSession,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        project_id: uuid.UUID | None = None,
+        kind: str | None = None,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
+    ) -> list[AgentSession]:
+        """Lists one page of a user's sessions, newest first."""
+        stmt = SessionRepository._select_list(
+            user_id, limit, offset, project_id, kind, after_id, before_id
         )
+        result = await session_db.scalars(stmt)
+        return in_page_order(result.all(), before_id=before_id)
 
     @staticmethod
     def list_all(
@@ -90,21 +187,33 @@ class SessionRepository:
         offset: int = 0,
         project_id: uuid.UUID | None = None,
         kind: str | None = None,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
     ) -> list[AgentSession]:
-        """Lists all sessions."""
-        query = session_db.query(AgentSession).filter(
-            AgentSession.is_deleted.is_(False)
+        """Lists one page of all sessions, newest first."""
+        stmt = SessionRepository._select_list(
+            None, limit, offset, project_id, kind, after_id, before_id
         )
-        if kind:
-            query = query.filter(AgentSession.kind == kind)
-        if project_id is not None:
-            query = query.filter(AgentSession.project_id == project_id)
-        return (
-            query.order_by(AgentSession.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        return in_page_order(session_db.scalars(stmt).all(), before_id=before_id)
+
+    @staticmethod
+    async def list_all_async(
+        session_db: AsyncSession,
+        limit: int = 100,
+        offset: int = 0,
+        project_id: uuid.UUID | None = None,
+        kind: str | None = None,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
+    ) -> list[AgentSession]:
+        """Lists one page of all sessions, newest first."""
+        stmt = SessionRepository._select_list(
+            None, limit, offset, project_id, kind, after_id, before_id
         )
+        result = await session_db.scalars(stmt)
+        return in_page_order(result.all(), before_id=before_id)
 
     @staticmethod
     def count_by_user(session_db: Session, user_id: str) -> int:
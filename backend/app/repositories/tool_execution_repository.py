@@ -1,9 +1,12 @@
 import uuid
 from typing import Any
 
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models.tool_execution import ToolExecution
+from app.utils.pagination import in_page_order, keyset_page
 
 
 class ToolExecutionRepository:
@@ -37,6 +40,98 @@ class ToolExecutionRepository:
         session_db.add(tool_execution)
         return tool_execution
 
+    @staticmethod
+    def upsert_tool_uses(
+        session_db: Session,
+        session_id: uuid.UUID,
+        message_id: int,
+        tool_uses: list[dict[str, Any]],
+    ) -> None:
+        """Inserts or updates tool calls in one statement.
+
+        Each item has `tool_use_id`, `tool_name`, `tool_input` and
+        `tool_input_truncated`; tool_use_ids must be unique within the call.
+        Rows created earlier by a result placeholder get the real name, input
+        and message.
+        """
+        if not tool_uses:
+            return
+        stmt = insert(ToolExecution).values(
+            [
+                {
+                    "session_id": session_id,
+                    "message_id": message_id,
+                    "tool_use_id": item["tool_use_id"],
+                    "tool_name": item["tool_name"],
+                    "tool_input": item["tool_input"],
+                    "tool_input_truncated": item["tool_input_truncated"],
+                    "is_error": False,
+                }
+                for item in tool_uses
+            ]
+        )
+        session_db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_tool_executions_session_tool_use_id",
+                set_={
+                    "tool_name": stmt.excluded.tool_name,
+                    "tool_input": stmt.excluded.tool_input,
+                    "tool_input_truncated": stmt.excluded.tool_input_truncated,
+                    "message_id": stmt.excluded.message_id,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+    @staticmethod
+    def upsert_tool_results(
+        session_db: Session,
+        session_id: uuid.UUID,
+        message_id: int,
+        tool_results: list[dict[str, Any]],
+    ) -> None:
+        """Records tool results in one statement, creating placeholders if needed.
+
+        Each item has `tool_use_id`, `tool_output`, `tool_output_truncated` and
+        `is_error`; tool_use_ids must be unique within the call. The duration is
+        set once, from the row's creation.
+        """
+        if not tool_results:
+            return
+        stmt = insert(ToolExecution).values(
+            [
+                {
+                    "session_id": session_id,
+                    "message_id": message_id,
+                    "tool_use_id": item["tool_use_id"],
+                    "tool_name": "unknown",
+                    "tool_output": item["tool_output"],
+                    "tool_output_truncated": item["tool_output_truncated"],
+                    "result_message_id": message_id,
+                    "is_error": item["is_error"],
+                }
+                for item in tool_results
+            ]
+        )
+        elapsed_ms = func.floor(
+            func.extract("epoch", func.now() - ToolExecution.created_at) * 1000
+        )
+        session_db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_tool_executions_session_tool_use_id",
+                set_={
+                    "tool_output": stmt.excluded.tool_output,
+                    "tool_output_truncated": stmt.excluded.tool_output_truncated,
+                    "result_message_id": stmt.excluded.result_message_id,
+                    "is_error": stmt.excluded.is_error,
+                    "duration_ms": func.coalesce(
+                        ToolExecution.duration_ms, cast(elapsed_ms, Integer)
+                    ),
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
     @staticmethod
     def get_by_id(session_db: Session, execution_id: uuid.UUID) -> ToolExecution | None:
         """Gets a tool execution by ID."""
@@ -64,17 +159,23 @@ class ToolExecutionRepository:
 
     @staticmethod
     def list_by_session(
-        session_db: Session, session_id: uuid.UUID, limit: int = 100, offset: int = 0
+        session_db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
     ) -> list[ToolExecution]:
-        """Lists tool executions for a session."""
-        return (
-            session_db.query(ToolExecution)
-            .filter(ToolExecution.session_id == session_id)
-            .order_by(ToolExecution.created_at.asc())
-            .limit(limit)
-            .offset(offset)
-            .all()
+        """Lists one page of tool executions for a session, oldest first."""
+        stmt = keyset_page(
+            select(ToolExecution).where(ToolExecution.session_id == session_id),
+            ToolExecution.id,
+            [ToolExecution.created_at],
+            limit=limit,
+            after_id=after_id,
+            before_id=before_id,
         )
+        return in_page_order(session_db.scalars(stmt).all(), before_id=before_id)
 
     @staticmethod
     def list_by_message(session_db: Session, message_id: int) -> list[ToolExecution]:
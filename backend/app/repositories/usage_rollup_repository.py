@@ -0,0 +1,128 @@
+import uuid
+from datetime import date
+from typing import Any
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.usage_rollup import (
+    RunUsageRollup,
+    SessionUsageRollup,
+    UserDailyUsageRollup,
+)
+
+# Token counters of the SDK usage report that rollups total.
+USAGE_COUNTERS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def _counter(usage_json: dict[str, Any] | None, key: str) -> int:
+    value = (usage_json or {}).get(key)
+    if isinstance(value, bool) or not isinstance(value, int | float):
+        return 0
+    return int(value)
+
+
+class UsageRollupRepository:
+    """Data access layer for per-run, per-session and per-user-day usage totals."""
+
+    @staticmethod
+    def add(
+        session_db: Session,
+        *,
+        session_id: uuid.UUID,
+        run_id: uuid.UUID | None,
+        user_id: str,
+        day: date,
+        total_cost_usd: float | None,
+        duration_ms: int | None,
+        usage_json: dict[str, Any] | None,
+    ) -> None:
+        """Adds one usage log to the rollups of its run, session and user-day.
+
+        Each rollup is one upsert that increments in place, so concurrent writers
+        (a user's sessions share a day bucket) never lose an update.
+        """
+        increments: dict[str, Any] = {
+            "log_count": 1,
+            "total_cost_usd": total_cost_usd or 0,
+            "total_duration_ms": duration_ms or 0,
+        }
+        for key in USAGE_COUNTERS:
+            increments[key] = _counter(usage_json, key)
+
+        targets: list[tuple[Any, dict[str, Any]]] = [
+            (SessionUsageRollup, {"session_id": session_id}),
+            (UserDailyUsageRollup, {"user_id": user_id, "day": day}),
+        ]
+        if run_id is not None:
+            targets.insert(0, (RunUsageRollup, {"run_id": run_id}))
+
+        for model, keys in targets:
+            stmt = insert(model).values(**keys, **increments)
+            set_ = {
+                name: getattr(model, name) + stmt.excluded[name] for name in increments
+            }
+            set_["updated_at"] = func.now()
+            session_db.execute(
+                stmt.on_conflict_do_update(index_elements=list(keys), set_=set_)
+            )
+
+    @staticmethod
+    def get_by_run(session_db: Session, run_id: uuid.UUID) -> RunUsageRollup | None:
+        return session_db.get(RunUsageRollup, run_id)
+
+    @staticmethod
+    def list_by_run_ids(
+        session_db: Session, run_ids: list[uuid.UUID]
+    ) -> list[RunUsageRollup]:
+        if not run_ids:
+            return []
+        return list(
+            session_db.scalars(
+                select(RunUsageRollup).where(RunUsageRollup.run_id.in_(run_ids))
+            )
+        )
+
+    @staticmethod
+    def get_by_session(
+        session_db: Session, session_id: uuid.UUID
+    ) -> SessionUsageRollup | None:
+        return session_db.get(SessionUsageRollup, session_id)
+
+    @staticmethod
+    def _select_user_days(
+        user_id: str, start_date: date, end_date: date
+    ) -> Select[tuple[UserDailyUsageRollup]]:
+        return (
+            select(UserDailyUsageRollup)
+            .where(
+                UserDailyUsageRollup.user_id == user_id,
+                UserDailyUsageRollup.day >= start_date,
+                UserDailyUsageRollup.day <= end_date,
+            )
+            .order_by(UserDailyUsageRollup.day.asc())
+        )
+
+    @staticmethod
+    def list_user_days(
+        session_db: Session, user_id: str, start_date: date, end_date: date
+    ) -> list[UserDailyUsageRollup]:
+        """Lists a user's daily rollups in a date range (inclusive), oldest first."""
+        stmt = UsageRollupRepository._select_user_days(user_id, start_date, end_date)
+        return list(session_db.scalars(stmt))
+
+    @staticmethod
+    async def list_user_days_async(
+        session_db: AsyncSession, user_id: str, start_date: date, end_date: date
+    ) -> list[UserDailyUsageRollup]:
+        """Lists a user's daily rollups in a date range (inclusive), oldest first."""
+        stmt = UsageRollupRepository._select_user_days(user_id, start_date, end_date)
+        result = await session_db.scalars(stmt)
+        return list(result.all())
@@ -61,15 +61,44 @@ class AgentCurrentState(BaseModel):
     current_step: str | None = None
 
 
+class WorkspaceStateDelta(BaseModel):
+    """Workspace changes since the previous callback, grouped by path."""
+
+    repository: str | None = None
+    branch: str | None = None
+    total_added_lines: int = 0
+    total_deleted_lines: int = 0
+    last_change: datetime
+    file_changes: list[FileChange] = Field(default_factory=list)
+    removed_paths: list[str] = Field(default_factory=list)
+
+
+class AgentStateDelta(BaseModel):
+    """Changes to AgentCurrentState on top of state version `base_version`."""
+
+    version: int
+    base_version: int
+    todo_count: int
+    todos: dict[int, TodoItem] = Field(default_factory=dict)
+    mcp_status: list[McpStatus] | None = None
+    workspace_state: WorkspaceStateDelta | None = None
+    current_step: str | None = None
+
+
 class AgentCallbackRequest(BaseModel):
     """Agent execution callback request."""
 
     session_id: str
+    run_id: str | None = None
+    # Set by Executor Manager when spooling; redeliveries carry the same id.
+    callback_id: str | None = Field(default=None, max_length=64)
     time: datetime
     status: CallbackStatus
     progress: int
     new_message: Any | None = None
     state_patch: AgentCurrentState | None = None
+    state_delta: AgentStateDelta | None = None
+    state_version: int | None = None
     sdk_session_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
@@ -84,3 +113,19 @@ class CallbackResponse(BaseModel):
     status: str
     callback_status: CallbackStatus | None = None
     message: str | None = None
+
+
+class CallbackBatchRequest(BaseModel):
+    """Ordered callbacks for one session, forwarded together by Executor Manager."""
+
+    callbacks: list[AgentCallbackRequest]
+
+
+class CallbackBatchResponse(BaseModel):
+    """Result of a callback batch; `processed` leading callbacks were applied."""
+
+    processed: int
+    results: list[CallbackResponse] = Field(default_factory=list)
+    error: str | None = None
+    # True when processing stopped on a failure that may clear up (not bad data).
+    retryable: bool = False
@@ -19,6 +19,8 @@ class MessageResponse(BaseModel):
     role: str
     content: dict[str, Any]
     text_preview: str | None
+    # `content` has long strings cut short; GET /messages/{id} returns it in full.
+    content_truncated: bool = False
     created_at: datetime
     updated_at: datetime
 
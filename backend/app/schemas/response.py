@@ -38,12 +38,13 @@ class Response:
     def success(
         data: T | None = None,
         message: str = "Success",
+        status_code: int = 200,
     ) -> JSONResponse:
         return Response._build_response(
             code=0,
             message=message,
             data=data,
-            status_code=200,
+            status_code=status_code,
         )
 
     @staticmethod
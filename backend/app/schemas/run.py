@@ -50,6 +50,9 @@ class RunClaimRequest(BaseModel):
     worker_id: str
     lease_seconds: int = 30
     schedule_modes: list[str] | None = None
+    # Users whose runs this worker cannot take (e.g. over its disk quota); their
+    # runs stay queued for a later claim.
+    exclude_user_ids: list[str] | None = None
 
 
 class RunClaimResponse(BaseModel):
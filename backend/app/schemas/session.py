@@ -5,6 +5,8 @@ from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 from app.schemas.callback import AgentCurrentState
 from app.schemas.input_file import InputFile
+from app.schemas.message import MessageWithFilesResponse
+from app.schemas.run import RunResponse
 
 
 class TaskConfig(BaseModel):
@@ -36,6 +38,7 @@ class SessionUpdateRequest(BaseModel):
     workspace_archive_url: str | None = None
     project_id: UUID | None = None
     state_patch: dict[str, Any] | None = None
+    state_version: int | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
     workspace_archive_key: str | None = None
@@ -55,6 +58,7 @@ class SessionResponse(BaseModel):
     state_patch: AgentCurrentState | None = None
     workspace_export_status: str | None = None
     status: str
+    change_version: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -68,6 +72,24 @@ class SessionStateResponse(BaseModel):
     status: str
     state_patch: AgentCurrentState | None = None
     workspace_export_status: str | None = None
+    change_version: int = 0
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
+
+
+class SessionChangesResponse(BaseModel):
+    """What changed in a session since a client's last poll.
+
+    `messages` are the messages after the client's last message id, oldest first;
+    when `has_more` is set the client asks again from the last one. `runs` are the
+    runs written after the client's change version. Clients send `change_version`
+    back on the next poll.
+    """
+
+    session_id: UUID
+    status: str
+    change_version: int
+    messages: list[MessageWithFilesResponse] = Field(default_factory=list)
+    runs: list[RunResponse] = Field(default_factory=list)
+    has_more: bool = False
@@ -14,6 +14,12 @@ class ToolExecutionResponse(BaseModel):
     tool_name: str
     tool_input: dict[str, Any] | None
     tool_output: dict[str, Any] | None
+    # Large outputs are previews; the full result is in this message.
+    result_message_id: int | None = None
+    # Inputs/outputs cut to previews; GET /messages/{id} of message_id /
+    # result_message_id returns the full value.
+    tool_input_truncated: bool = False
+    tool_output_truncated: bool = False
     is_error: bool
     duration_ms: int | None
     created_at: datetime
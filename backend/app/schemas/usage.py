@@ -1,3 +1,4 @@
+from datetime import date
 from typing import Any
 
 from pydantic import BaseModel
@@ -9,3 +10,19 @@ class UsageResponse(BaseModel):
     total_cost_usd: float | None
     total_duration_ms: int | None
     usage_json: dict[str, Any] | None
+
+
+class DailyUsageResponse(UsageResponse):
+    """Usage statistics of one UTC day."""
+
+    day: date
+
+
+class UserUsageResponse(BaseModel):
+    """A user's usage over a date range, with one entry per day that had usage."""
+
+    user_id: str
+    start_date: date
+    end_date: date
+    total: UsageResponse
+    days: list[DailyUsageResponse]
@@ -22,3 +22,5 @@ class WorkspaceArchiveResponse(BaseModel):
 
     url: str | None = None
     filename: str
+    # "not_ready" | "building" | "ready" | "failed"
+    status: str = "ready"
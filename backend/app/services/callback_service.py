@@ -1,29 +1,54 @@
 import logging
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from pydantic import ValidationError
+from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
+from app.core.session_events import session_events
+from app.core.settings import get_settings
+from app.models.agent_message import AgentMessage
 from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+from app.repositories.callback_receipt_repository import CallbackReceiptRepository
 from app.repositories.scheduled_task_repository import ScheduledTaskRepository
+from app.repositories.session_repository import SessionRepository
 from app.repositories.message_repository import MessageRepository
+from app.repositories.run_repository import RunRepository
 from app.repositories.tool_execution_repository import ToolExecutionRepository
 from app.repositories.usage_log_repository import UsageLogRepository
+from app.repositories.usage_rollup_repository import UsageRollupRepository
 from app.schemas.callback import (
     AgentCallbackRequest,
+    CallbackBatchResponse,
     CallbackResponse,
     CallbackStatus,
 )
-from app.schemas.session import SessionUpdateRequest
-from app.services.session_service import SessionService
+from app.schemas.message import MessageResponse
+from app.services.run_service import run_event_data
+from app.utils.message_content import preview_value
+from app.utils.state_patch import apply_state_delta
 
 logger = logging.getLogger(__name__)
 
+# Expired callback receipts are deleted at most this often per process.
+RECEIPT_PRUNE_INTERVAL_SECONDS = 600
+
+# Failures caused by the callback itself: resending it fails the same way. Anything
+# else (connection loss, deadlocks, pool timeouts) may clear up on a retry.
+REJECTED_CALLBACK_ERRORS = (ValidationError, IntegrityError, DataError)
+
 
 class CallbackService:
     """Service layer for processing executor callbacks."""
 
+    def __init__(self) -> None:
+        self._receipts_pruned_at: float | None = None
+
     def _sync_scheduled_task_last_status(self, db: Session, db_run: AgentRun) -> None:
         """Keep AgentScheduledTask.last_run_status in sync with the latest run state.
 
@@ -93,11 +118,25 @@ class CallbackService:
         message: dict[str, Any],
         session_id: uuid.UUID,
         message_id: int,
+        preview_chars: int | None = None,
     ) -> None:
+        """Upserts the tool calls and results of a message's full content.
+
+        With `preview_chars` (the message was offloaded) inputs and outputs are
+        stored as previews, flagged so clients fetch the full message for them.
+        """
         content = message.get("content", [])
         if not isinstance(content, list):
             return
 
+        def stored(value: Any) -> tuple[Any, bool]:
+            if preview_chars is None:
+                return value, False
+            return preview_value(value, preview_chars)
+
+        # Keyed by tool_use_id: a repeated id keeps its last block, as row updates did.
+        tool_uses: dict[str, dict[str, Any]] = {}
+        tool_results: dict[str, dict[str, Any]] = {}
         for block in content:
             if not isinstance(block, dict):
                 continue
@@ -107,105 +146,75 @@ class CallbackService:
             if "ToolUseBlock" in block_type:
                 tool_use_id = block.get("id")
                 tool_name = block.get("name")
-                tool_input = block.get("input")
-
                 if not tool_use_id or not tool_name:
                     continue
-
-                existing = ToolExecutionRepository.get_by_session_and_tool_use_id(
-                    session_db=session_db,
-                    session_id=session_id,
-                    tool_use_id=tool_use_id,
-                )
-                if existing:
-                    existing.tool_name = tool_name
-                    existing.tool_input = tool_input
-                    existing.message_id = message_id
-                    logger.debug(
-                        f"Updated tool execution (tool_use_id={tool_use_id}) in message {message_id}"
-                    )
-                    continue
-
-                ToolExecutionRepository.create(
-                    session_db=session_db,
-                    session_id=session_id,
-                    message_id=message_id,
-                    tool_use_id=tool_use_id,
-                    tool_name=tool_name,
-                    tool_input=tool_input,
-                )
-                logger.debug(
-                    f"Created tool execution (tool_use_id={tool_use_id}, tool={tool_name}) in message {message_id}"
-                )
+                tool_input, input_truncated = stored(block.get("input"))
+                tool_uses[tool_use_id] = {
+                    "tool_use_id": tool_use_id,
+                    "tool_name": tool_name,
+                    "tool_input": tool_input,
+                    "tool_input_truncated": input_truncated,
+                }
 
             elif "ToolResultBlock" in block_type:
                 tool_use_id = block.get("tool_use_id")
-                result_content = block.get("content")
-                is_error = block.get("is_error", False)
-
                 if not tool_use_id:
                     continue
-
-                tool_output = {"content": result_content} if result_content else None
-                existing = ToolExecutionRepository.get_by_session_and_tool_use_id(
-                    session_db=session_db,
-                    session_id=session_id,
-                    tool_use_id=tool_use_id,
-                )
-
-                if not existing:
-                    ToolExecutionRepository.create(
-                        session_db=session_db,
-                        session_id=session_id,
-                        message_id=message_id,
-                        tool_use_id=tool_use_id,
-                        tool_name="unknown",
-                        tool_output=tool_output,
-                        result_message_id=message_id,
-                        is_error=bool(is_error),
-                    )
-                    logger.debug(
-                        f"Created tool execution placeholder (tool_use_id={tool_use_id}) in message {message_id}"
-                    )
-                    continue
-
-                existing.tool_output = tool_output
-                existing.result_message_id = message_id
-                existing.is_error = bool(is_error)
-
-                if existing.duration_ms is None and existing.created_at is not None:
-                    duration = datetime.now(timezone.utc) - existing.created_at
-                    existing.duration_ms = int(duration.total_seconds() * 1000)
-
-                logger.debug(
-                    f"Updated tool execution result (tool_use_id={tool_use_id}) in message {message_id}"
+                result_content = block.get("content")
+                tool_output, output_truncated = stored(
+                    {"content": result_content} if result_content else None
                 )
+                tool_results[tool_use_id] = {
+                    "tool_use_id": tool_use_id,
+                    "tool_output": tool_output,
+                    "tool_output_truncated": output_truncated,
+                    "is_error": bool(block.get("is_error", False)),
+                }
+
+        # One upsert per kind instead of a SELECT plus INSERT/UPDATE per block.
+        ToolExecutionRepository.upsert_tool_uses(
+            session_db, session_id, message_id, list(tool_uses.values())
+        )
+        ToolExecutionRepository.upsert_tool_results(
+            session_db, session_id, message_id, list(tool_results.values())
+        )
+        if tool_uses or tool_results:
+            logger.debug(
+                "tool_executions_upserted",
+                extra={
+                    "session_id": str(session_id),
+                    "message_id": message_id,
+                    "tool_uses": len(tool_uses),
+                    "tool_results": len(tool_results),
+                },
+            )
 
     def _extract_and_persist_usage(
-        self, db: Session, session_id: uuid.UUID, message: dict[str, Any]
-    ) -> None:
-        """Extracts and persists usage data from a ResultMessage."""
+        self,
+        db: Session,
+        db_session: AgentSession,
+        message: dict[str, Any],
+        db_run: AgentRun | None,
+    ) -> bool:
+        """Extracts and persists usage data from a ResultMessage.
+
+        The log is added to the run, session and user-day rollups in the same
+        transaction. Returns whether a usage log was written.
+        """
+        session_id = db_session.id
         message_type = message.get("_type", "")
 
         if "ResultMessage" not in message_type:
-            return
+            return False
 
         usage_data = message.get("usage")
         if not usage_data or not isinstance(usage_data, dict):
             logger.debug(f"No usage data in ResultMessage for session {session_id}")
-            return
+            return False
 
         total_cost_usd = message.get("total_cost_usd")
         duration_ms = message.get("duration_ms")
 
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == session_id)
-            .filter(AgentRun.status.in_(["claimed", "running"]))
-            .order_by(AgentRun.created_at.desc())
-            .first()
-        )
-
         UsageLogRepository.create(
             session_db=db,
             session_id=session_id,
@@ -214,7 +223,16 @@ class CallbackService:
             duration_ms=duration_ms,
             usage_json=usage_data,
         )
-        db.commit()
+        UsageRollupRepository.add(
+            db,
+            session_id=session_id,
+            run_id=db_run.id if db_run else None,
+            user_id=db_session.user_id,
+            day=datetime.now(timezone.utc).date(),
+            total_cost_usd=total_cost_usd,
+            duration_ms=duration_ms,
+            usage_json=usage_data,
+        )
 
         input_tokens = usage_data.get("input_tokens")
         output_tokens = usage_data.get("output_tokens")
@@ -230,10 +248,11 @@ class CallbackService:
                 "duration_ms": duration_ms,
             },
         )
+        return True
 
     def _persist_message_and_tools(
         self, db: Session, session_id: uuid.UUID, message: dict[str, Any]
-    ) -> None:
+    ) -> AgentMessage:
         role = self._extract_role_from_message(message)
 
         text_preview = None
@@ -254,9 +273,20 @@ class CallbackService:
 
         db.flush()
 
-        self._extract_tool_executions(db, message, session_id, db_message.id)
+        # From the full content; an offloaded message's tool inputs and outputs are
+        # kept as flagged previews instead of copying the payload a second time.
+        self._extract_tool_executions(
+            db,
+            message,
+            session_id,
+            db_message.id,
+            preview_chars=(
+                get_settings().message_preview_chars
+                if db_message.content_truncated
+                else None
+            ),
+        )
 
-        db.commit()
         logger.debug(
             "message_persisted",
             extra={
@@ -265,26 +295,32 @@ class CallbackService:
                 "role": role,
             },
         )
+        return db_message
+
+    @staticmethod
+    def _find_run(
+        db: Session, db_session: AgentSession, run_id: str | None
+    ) -> AgentRun | None:
+        """The claimed/running run a callback belongs to, by primary key if known."""
+        if run_id:
+            try:
+                db_run = db.get(AgentRun, uuid.UUID(run_id))
+            except ValueError:
+                db_run = None
+            if (
+                db_run is not None
+                and db_run.session_id == db_session.id
+                and db_run.status in ("claimed", "running")
+            ):
+                return db_run
+            if db_run is not None:
+                return None
+        # Executors that do not send run_id yet.
+        return RunRepository.get_active_by_session(db, db_session.id)
 
-    def process_agent_callback(
-        self, db: Session, callback: AgentCallbackRequest
-    ) -> CallbackResponse:
-        session_service = SessionService()
-        db_session = session_service.find_session_by_sdk_id_or_uuid(
-            db, callback.session_id
-        )
-
-        if not db_session:
-            logger.warning(
-                "callback_session_not_found",
-                extra={"callback_session_id": callback.session_id},
-            )
-            return CallbackResponse(
-                session_id=callback.session_id,
-                status="callback_received",
-                message="Session not found yet",
-            )
-
+    def _apply_session_updates(
+        self, db_session: AgentSession, callback: AgentCallbackRequest
+    ) -> None:
         derived_sdk_session_id = callback.sdk_session_id
         if (
             not derived_sdk_session_id
@@ -295,83 +331,263 @@ class CallbackService:
                 callback.new_message
             )
 
-        update_data: dict[str, Any] = {}
-
         if (
             derived_sdk_session_id
             and derived_sdk_session_id != db_session.sdk_session_id
         ):
-            update_data["sdk_session_id"] = derived_sdk_session_id
+            db_session.sdk_session_id = derived_sdk_session_id
+            logger.info(
+                "session_sdk_session_id_updated",
+                extra={
+                    "session_id": str(db_session.id),
+                    "sdk_session_id": derived_sdk_session_id,
+                },
+            )
 
         if callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]:
-            update_data["status"] = callback.status.value
+            db_session.status = callback.status.value
+            logger.info(
+                "session_status_updated_via_callback",
+                extra={
+                    "session_id": str(db_session.id),
+                    "status": callback.status.value,
+                    "callback_session_id": callback.session_id,
+                },
+            )
 
         if callback.state_patch is not None:
-            update_data["state_patch"] = callback.state_patch.model_dump(mode="json")
+            db_session.state_patch = callback.state_patch.model_dump(mode="json")
+            db_session.state_version = callback.state_version
+        elif callback.state_delta is not None:
+            delta = callback.state_delta
+            if db_session.state_version == delta.base_version:
+                db_session.state_patch = apply_state_delta(
+                    db_session.state_patch or {}, delta
+                )
+                # Merged into the loaded dict, which is not change-tracked.
+                flag_modified(db_session, "state_patch")
+                db_session.state_version = delta.version
+            else:
+                # A report was lost; the next full snapshot brings the state back.
+                logger.warning(
+                    "callback_state_delta_skipped",
+                    extra={
+                        "session_id": str(db_session.id),
+                        "state_version": db_session.state_version,
+                        "base_version": delta.base_version,
+                    },
+                )
 
         if callback.workspace_files_prefix is not None:
-            update_data["workspace_files_prefix"] = callback.workspace_files_prefix
+            db_session.workspace_files_prefix = callback.workspace_files_prefix
         if callback.workspace_manifest_key is not None:
-            update_data["workspace_manifest_key"] = callback.workspace_manifest_key
+            db_session.workspace_manifest_key = callback.workspace_manifest_key
         if callback.workspace_archive_key is not None:
-            update_data["workspace_archive_key"] = callback.workspace_archive_key
+            db_session.workspace_archive_key = callback.workspace_archive_key
+        elif callback.workspace_export_status == "ready":
+            # Archives are built lazily on download; drop a key left by an older export.
+            db_session.workspace_archive_key = ""
         if callback.workspace_export_status is not None:
-            update_data["workspace_export_status"] = callback.workspace_export_status
+            db_session.workspace_export_status = callback.workspace_export_status
+
+    @staticmethod
+    def _session_event_data(
+        db_session: AgentSession, callback: AgentCallbackRequest
+    ) -> dict[str, Any]:
+        """Status and state for the event stream; a delta instead of the whole state
+        when the callback carried one that applied."""
+        data: dict[str, Any] = {
+            "status": db_session.status,
+            "state_version": db_session.state_version,
+        }
+        if callback.state_patch is not None:
+            data["state_patch"] = db_session.state_patch
+        elif (
+            callback.state_delta is not None
+            and db_session.state_version == callback.state_delta.version
+        ):
+            data["state_delta"] = callback.state_delta.model_dump(mode="json")
+        return data
 
-        if update_data:
-            db_session = session_service.update_session(
-                db, db_session.id, SessionUpdateRequest(**update_data)
-            )
-            if "sdk_session_id" in update_data:
-                logger.info(
-                    "session_sdk_session_id_updated",
-                    extra={
-                        "session_id": str(db_session.id),
-                        "sdk_session_id": derived_sdk_session_id,
-                    },
-                )
-            if "status" in update_data:
-                logger.info(
-                    "session_status_updated_via_callback",
-                    extra={
-                        "session_id": str(db_session.id),
-                        "status": callback.status.value,
-                        "callback_session_id": callback.session_id,
-                    },
-                )
+    def _apply_run_updates(
+        self, db: Session, db_run: AgentRun, callback: AgentCallbackRequest
+    ) -> None:
+        progress = int(callback.progress or 0)
+        status_changed = False
 
-        if callback.new_message:
-            self._persist_message_and_tools(db, db_session.id, callback.new_message)
-            # Extract and persist usage data if this is a ResultMessage
-            self._extract_and_persist_usage(db, db_session.id, callback.new_message)
-
-        db_run = (
-            db.query(AgentRun)
-            .filter(AgentRun.session_id == db_session.id)
-            .filter(AgentRun.status.in_(["claimed", "running"]))
-            .order_by(AgentRun.created_at.desc())
-            .first()
+        if callback.status == CallbackStatus.RUNNING and db_run.status == "claimed":
+            db_run.status = "running"
+            status_changed = True
+            if db_run.started_at is None:
+                db_run.started_at = datetime.now(timezone.utc)
+
+        if callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]:
+            db_run.status = callback.status.value
+            db_run.finished_at = datetime.now(timezone.utc)
+            status_changed = True
+            if callback.status == CallbackStatus.COMPLETED:
+                progress = 100
+
+        if db_run.progress != progress:
+            db_run.progress = progress
+        # Scheduled tasks only track run status, so progress ticks skip the lookup.
+        if status_changed:
+            self._sync_scheduled_task_last_status(db, db_run)
+
+    def process_agent_callback(
+        self, db: Session, callback: AgentCallbackRequest
+    ) -> CallbackResponse:
+        """Applies one callback in a single transaction.
+
+        A streamed message costs one session lookup, the session change-version bump,
+        one callback receipt insert (when it carries callback_id), one run lookup (by
+        primary key when the callback carries run_id), the message insert, at most
+        two tool execution upserts and one commit (plus one NOTIFY with the postgres
+        session event backend); usage and scheduled-task writes only happen for
+        result and status-changing callbacks.
+
+        A callback whose callback_id was already applied is a redelivery and is
+        skipped without changing anything.
+        """
+        db_session = SessionRepository.get_by_sdk_session_id_or_id(
+            db, callback.session_id
         )
 
-        if db_run:
-            db_run.progress = int(callback.progress or 0)
+        if not db_session:
+            logger.warning(
+                "callback_session_not_found",
+                extra={"callback_session_id": callback.session_id},
+            )
+            return CallbackResponse(
+                session_id=callback.session_id,
+                status="callback_received",
+                message="Session not found yet",
+            )
 
-            if callback.status == CallbackStatus.RUNNING and db_run.status == "claimed":
-                db_run.status = "running"
-                if db_run.started_at is None:
-                    db_run.started_at = datetime.now(timezone.utc)
+        # Before any other write: takes the session row lock for this transaction.
+        change_version = SessionRepository.bump_change_version(db, db_session.id)
+        if callback.callback_id and not CallbackReceiptRepository.record(
+            db, callback.callback_id, db_session.id
+        ):
+            response = CallbackResponse(
+                session_id=str(db_session.id),
+                status=db_session.status,
+                callback_status=callback.status,
+                message="Duplicate callback ignored",
+            )
+            db.rollback()
+            logger.info(
+                "callback_duplicate_skipped",
+                extra={
+                    "callback_session_id": callback.session_id,
+                    "callback_id": callback.callback_id,
+                },
+            )
+            return response
+        self._apply_session_updates(db_session, callback)
+        # Checked before the message flush clears the attribute history.
+        if db.is_modified(db_session):
+            session_events.publish(
+                db,
+                db_session.id,
+                "session",
+                self._session_event_data(db_session, callback),
+                change_version=change_version,
+            )
+        db_run = self._find_run(db, db_session, callback.run_id)
 
-            if callback.status in [CallbackStatus.COMPLETED, CallbackStatus.FAILED]:
-                db_run.status = callback.status.value
-                db_run.finished_at = datetime.now(timezone.utc)
-                if callback.status == CallbackStatus.COMPLETED:
-                    db_run.progress = 100
+        usage_logged = False
+        if callback.new_message:
+            db_message = self._persist_message_and_tools(
+                db, db_session.id, callback.new_message
+            )
+            session_events.publish(
+                db,
+                db_session.id,
+                "message",
+                MessageResponse.model_validate(db_message).model_dump(mode="json"),
+                change_version=change_version,
+            )
+            # Extract and persist usage data if this is a ResultMessage
+            usage_logged = self._extract_and_persist_usage(
+                db, db_session, callback.new_message, db_run
+            )
 
-            self._sync_scheduled_task_last_status(db, db_run)
-            db.commit()
+        if db_run:
+            self._apply_run_updates(db, db_run, callback)
+            if usage_logged or db.is_modified(db_run):
+                db_run.change_version = change_version
+                session_events.publish(
+                    db,
+                    db_session.id,
+                    "run",
+                    run_event_data(db_run),
+                    change_version=change_version,
+                )
 
-        return CallbackResponse(
+        # Read before commit: committed objects expire and would be reloaded.
+        response = CallbackResponse(
             session_id=str(db_session.id),
             status=db_session.status,
             callback_status=callback.status,
         )
+        db.commit()
+        return response
+
+    def process_agent_callback_batch(
+        self, db: Session, callbacks: list[AgentCallbackRequest]
+    ) -> CallbackBatchResponse:
+        """Applies callbacks in order, stopping at the first failure.
+
+        The caller retries from the first unprocessed callback, so a failure never
+        reorders the ones already applied. Retries can resend callbacks that were
+        applied (the response was lost); their callback_id makes them no-ops.
+
+        `retryable` is False only when the failing callback itself was rejected
+        (bad data); the executor manager may eventually dead-letter those, but
+        never callbacks that failed on a transient database error.
+        """
+        self._prune_receipts(db)
+        results: list[CallbackResponse] = []
+        for callback in callbacks:
+            try:
+                results.append(self.process_agent_callback(db, callback))
+            except Exception as exc:
+                db.rollback()
+                logger.exception(
+                    "callback_batch_item_failed",
+                    extra={
+                        "callback_session_id": callback.session_id,
+                        "processed": len(results),
+                        "batch_size": len(callbacks),
+                    },
+                )
+                return CallbackBatchResponse(
+                    processed=len(results),
+                    results=results,
+                    error=str(exc),
+                    retryable=not isinstance(exc, REJECTED_CALLBACK_ERRORS),
+                )
+        return CallbackBatchResponse(processed=len(results), results=results)
+
+    def _prune_receipts(self, db: Session) -> None:
+        """Deletes callback receipts past their retention, at most every interval."""
+        now = time.monotonic()
+        if (
+            self._receipts_pruned_at is not None
+            and now - self._receipts_pruned_at < RECEIPT_PRUNE_INTERVAL_SECONDS
+        ):
+            return
+        self._receipts_pruned_at = now
+        retention = timedelta(hours=get_settings().callback_receipt_retention_hours)
+        try:
+            deleted = CallbackReceiptRepository.delete_older_than(
+                db, datetime.now(timezone.utc) - retention
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("callback_receipt_prune_failed")
+            return
+        if deleted:
+            logger.info("callback_receipts_pruned", extra={"deleted": deleted})
@@ -0,0 +1,76 @@
+import json
+import logging
+from typing import Any
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+from app.core.observability.request_context import get_request_id, get_trace_id
+from app.core.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorManagerClient:
+    """Minimal synchronous client for Executor Manager workspace APIs."""
+
+    def __init__(self, base_url: str | None = None) -> None:
+        settings = get_settings()
+        self.base_url = (base_url or settings.executor_manager_url).rstrip("/")
+        self.fork_timeout_seconds = settings.workspace_fork_timeout_seconds
+
+    def fork_workspace(
+        self,
+        *,
+        user_id: str,
+        source_session_id: str,
+        target_session_id: str,
+    ) -> dict[str, Any]:
+        """Clone a session workspace into a new session on the manager host."""
+        return self._post(
+            "/api/v1/workspace/fork",
+            {
+                "user_id": user_id,
+                "source_session_id": source_session_id,
+                "target_session_id": target_session_id,
+            },
+            timeout=self.fork_timeout_seconds,
+        )
+
+    def _post(self, path: str, payload: dict[str, Any], timeout: float) -> Any:
+        headers = {"accept": "application/json", "content-type": "application/json"}
+        request_id = get_request_id()
+        if request_id:
+            headers["X-Request-ID"] = request_id
+        trace_id = get_trace_id()
+        if trace_id:
+            headers["X-Trace-ID"] = trace_id
+
+        request = Request(
+            f"{self.base_url}{path}",
+            data=json.dumps(payload).encode("utf-8"),
+            headers=headers,
+            method="POST",
+        )
+        try:
+            with urlopen(request, timeout=timeout) as resp:  # noqa: S310
+                body = json.loads(resp.read().decode("utf-8"))
+        except HTTPError as e:
+            message = f"Executor Manager request failed: {e.code}"
+            try:
+                detail = json.loads(e.read().decode("utf-8"))
+                if isinstance(detail, dict) and detail.get("message"):
+                    message = f"{message} ({detail['message']})"
+            except Exception:
+                pass
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR, message=message
+            ) from e
+        except URLError as e:
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message=f"Executor Manager unavailable: {e.reason}",
+            ) from e
+
+        return body.get("data", body) if isinstance(body, dict) else body
@@ -1,8 +1,10 @@
 import logging
 import uuid
+from typing import Any
 
 from pydantic import ValidationError
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
@@ -17,6 +19,8 @@ from app.schemas.message import (
     MessageWithFilesResponse,
 )
 from app.services.storage_service import S3StorageService
+from app.utils.message_content import load_content
+from app.utils.pagination import validate_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +28,57 @@ logger = logging.getLogger(__name__)
 class MessageService:
     """Service layer for message queries."""
 
-    def get_messages(self, db: Session, session_id: uuid.UUID) -> list[AgentMessage]:
-        """Gets all messages for a session.
+    _storage_service: S3StorageService | None = None
+
+    def _get_storage_service(self) -> S3StorageService:
+        # Built on first use (the constructor fails when S3 is not configured) and
+        # then kept, instead of creating boto3 clients on every poll.
+        if self._storage_service is None:
+            self._storage_service = S3StorageService()
+        return self._storage_service
+
+    def get_messages(
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> list[AgentMessage]:
+        """Gets one page of messages for a session.
 
         Args:
             db: Database session
             session_id: Session ID
+            limit: Page size
+            after_id: Return messages after this one
+            before_id: Return the page just before this one
 
         Returns:
             List of messages ordered by creation time
         """
-        messages = MessageRepository.list_by_session(db, session_id)
+        validate_cursor(after_id, before_id)
+        messages = MessageRepository.list_by_session(
+            db, session_id, limit, after_id=after_id, before_id=before_id
+        )
+        logger.debug(f"Retrieved {len(messages)} messages for session {session_id}")
+        return messages
+
+    async def get_messages_async(
+        self,
+        db: AsyncSession,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: int | None = None,
+        before_id: int | None = None,
+    ) -> list[AgentMessage]:
+        """Gets one page of messages for a session, ordered by creation time."""
+        validate_cursor(after_id, before_id)
+        messages = await MessageRepository.list_by_session_async(
+            db, session_id, limit, after_id=after_id, before_id=before_id
+        )
         logger.debug(f"Retrieved {len(messages)} messages for session {session_id}")
         return messages
 
@@ -59,20 +103,80 @@ class MessageService:
             )
         return message
 
+    async def get_message_async(
+        self, db: AsyncSession, message_id: int
+    ) -> AgentMessage:
+        """Gets a message by ID.
+
+        Raises:
+            AppException: If message not found
+        """
+        message = await MessageRepository.get_by_id_async(db, message_id)
+        if not message:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Message not found: {message_id}",
+            )
+        return message
+
+    async def get_full_content_async(
+        self, db: AsyncSession, message: AgentMessage
+    ) -> dict[str, Any]:
+        """The message content, loading the offloaded body of a truncated one."""
+        if not message.content_truncated:
+            return message.content
+        body = await MessageRepository.get_body_async(db, message.id)
+        if body is None:
+            return message.content
+        return load_content(body.encoding, body.data, body.size)
+
     def get_messages_with_files(
-        self, db: Session, session_id: uuid.UUID, *, user_id: str
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        *,
+        user_id: str,
+        limit: int = 100,
+        after_id: int | None = None,
+        before_id: int | None = None,
     ) -> list[MessageWithFilesResponse]:
-        """Gets messages for a session and attaches per-run uploaded files.
+        """Gets one page of messages for a session with per-run uploaded files.
 
         Attachments are derived from the run snapshot to avoid coupling the
-        message content schema to any upstream agent SDK format.
+        message content schema to any upstream agent SDK format. Only the runs
+        triggered by messages on the page are loaded.
         """
-
-        storage_service = S3StorageService()
+        validate_cursor(after_id, before_id)
+        messages = MessageRepository.list_by_session(
+            db, session_id, limit, after_id=after_id, before_id=before_id
+        )
+        return self._with_files(db, session_id, messages, user_id=user_id)
+
+    def get_messages_since(
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        *,
+        user_id: str,
+        after_id: int | None,
+        limit: int,
+    ) -> list[MessageWithFilesResponse]:
+        """Gets messages inserted after `after_id`, with attachments, in id order."""
+        messages = MessageRepository.list_since(db, session_id, after_id, limit)
+        return self._with_files(db, session_id, messages, user_id=user_id)
+
+    def _with_files(
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        messages: list[AgentMessage],
+        *,
+        user_id: str,
+    ) -> list[MessageWithFilesResponse]:
+        storage_service = self._get_storage_service()
         key_prefix = f"attachments/{user_id}/"
 
-        messages = MessageRepository.list_by_session(db, session_id, limit=1000)
-        runs = RunRepository.list_by_session(db, session_id, limit=1000)
+        runs = RunRepository.list_by_user_message_ids(db, [msg.id for msg in messages])
 
         message_id_to_attachments: dict[int, list[InputFile]] = {}
         for run in runs:
@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Any
 
 from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.session_events import session_events
+from app.models.agent_run import AgentRun
 from app.repositories.scheduled_task_repository import ScheduledTaskRepository
 from app.repositories.message_repository import MessageRepository
 from app.repositories.run_repository import RunRepository
@@ -17,10 +20,21 @@ from app.schemas.run import (
     RunStartRequest,
 )
 from app.services.usage_service import UsageService
+from app.utils.pagination import validate_cursor
 
 usage_service = UsageService()
 
 
+def run_event_data(db_run: AgentRun) -> dict[str, Any]:
+    """The fields of a run that session event subscribers are sent on changes."""
+    return {
+        "run_id": str(db_run.id),
+        "user_message_id": db_run.user_message_id,
+        "status": db_run.status,
+        "progress": db_run.progress,
+    }
+
+
 class RunService:
     """Service layer for run queue operations."""
 
@@ -46,6 +60,25 @@ class RunService:
         elif db_run.status == "completed":
             db_task.last_error = None
 
+    @staticmethod
+    def _publish_run_change(
+        db: Session, db_run: AgentRun, session_status: str, change_version: int
+    ) -> None:
+        session_events.publish(
+            db,
+            db_run.session_id,
+            "run",
+            run_event_data(db_run),
+            change_version=change_version,
+        )
+        session_events.publish(
+            db,
+            db_run.session_id,
+            "session",
+            {"status": session_status},
+            change_version=change_version,
+        )
+
     def _extract_prompt_from_message(self, message_content: object) -> str | None:
         if not isinstance(message_content, dict):
             return None
@@ -80,8 +113,31 @@ class RunService:
         session_id: uuid.UUID,
         limit: int = 100,
         offset: int = 0,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
+    ) -> list[RunResponse]:
+        validate_cursor(after_id, before_id)
+        runs = RunRepository.list_by_session(
+            db,
+            session_id,
+            limit=limit,
+            offset=offset,
+            after_id=after_id,
+            before_id=before_id,
+        )
+        return self._with_usage(db, runs)
+
+    def list_changed_runs(
+        self, db: Session, session_id: uuid.UUID, since_version: int | None
     ) -> list[RunResponse]:
-        runs = RunRepository.list_by_session(db, session_id, limit=limit, offset=offset)
+        """Runs written after the given session change version (all when None)."""
+        runs = RunRepository.list_changed_since(
+            db, session_id, -1 if since_version is None else since_version
+        )
+        return self._with_usage(db, runs)
+
+    def _with_usage(self, db: Session, runs: list[AgentRun]) -> list[RunResponse]:
         responses = [RunResponse.model_validate(r) for r in runs]
         usage_by_run_id = usage_service.get_usage_summaries_by_run_ids(
             db, [r.id for r in runs]
@@ -110,11 +166,16 @@ class RunService:
             else None
         )
 
+        exclude_user_ids = [
+            u.strip() for u in request.exclude_user_ids or [] if u and u.strip()
+        ]
+
         db_run = RunRepository.claim_next(
             session_db=db,
             worker_id=worker_id,
             lease_seconds=request.lease_seconds,
             schedule_modes=schedule_modes,
+            exclude_user_ids=exclude_user_ids or None,
         )
 
         if not db_run:
@@ -197,19 +258,23 @@ class RunService:
                 message="Run is claimed by another worker",
             )
 
-        now = datetime.now(timezone.utc)
-        db_run.status = "running"
-        db_run.started_at = now
-        db_run.lease_expires_at = None
-        db_run.attempts += 1
-
         db_session = SessionRepository.get_by_id(db, db_run.session_id)
         if not db_session:
             raise AppException(
                 error_code=ErrorCode.NOT_FOUND,
                 message=f"Session not found: {db_run.session_id}",
             )
+        # Session row lock first, in the same order as callbacks.
+        change_version = SessionRepository.bump_change_version(db, db_session.id)
+
+        now = datetime.now(timezone.utc)
+        db_run.status = "running"
+        db_run.started_at = now
+        db_run.lease_expires_at = None
+        db_run.attempts += 1
+        db_run.change_version = change_version
         db_session.status = "running"
+        self._publish_run_change(db, db_run, "running", change_version)
 
         self._sync_scheduled_task_last_status(db, db_run.id)
         db.commit()
@@ -243,15 +308,20 @@ class RunService:
                 message="Run is claimed by another worker",
             )
 
+        # Session row lock first, in the same order as callbacks.
+        change_version = SessionRepository.bump_change_version(db, db_run.session_id)
+
         now = datetime.now(timezone.utc)
         db_run.status = "failed"
         db_run.last_error = request.error_message
         db_run.finished_at = now
         db_run.lease_expires_at = None
+        db_run.change_version = change_version
 
         db_session = SessionRepository.get_by_id(db, db_run.session_id)
         if db_session:
             db_session.status = "failed"
+        self._publish_run_change(db, db_run, "failed", change_version)
 
         self._sync_scheduled_task_last_status(db, db_run.id)
         db.commit()
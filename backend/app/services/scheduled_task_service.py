@@ -427,8 +427,10 @@ class ScheduledTaskService:
             if existing_run:
                 return None
 
+        change_version = SessionRepository.bump_change_version(db, session_id)
         # Clear previous execution state so the UI doesn't show stale file changes.
         db_session.state_patch = {}
+        db_session.state_version = None
         db_session.status = "pending"
 
         user_message_content = self._build_user_message_content(prompt)
@@ -455,6 +457,8 @@ class ScheduledTaskService:
             config_snapshot=run_snapshot or None,
         )
         db_run.scheduled_task_id = task.id
+        db_run.change_version = change_version
         db.flush()
+        TaskService.publish_enqueued(db, db_message, db_run, change_version)
 
         return db_run
@@ -1,17 +1,32 @@
 import logging
 import uuid
 
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import flag_modified
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.session_events import session_events
 from app.models.agent_session import AgentSession
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.session_repository import SessionRepository
-from app.schemas.session import SessionCreateRequest, SessionUpdateRequest
+from app.schemas.session import (
+    SessionChangesResponse,
+    SessionCreateRequest,
+    SessionUpdateRequest,
+)
+from app.services.executor_manager_client import ExecutorManagerClient
+from app.services.message_service import MessageService
+from app.services.run_service import RunService
+from app.utils.pagination import validate_cursor
 
 logger = logging.getLogger(__name__)
 
+message_service = MessageService()
+run_service = RunService()
+
 
 class SessionService:
     """Service layer for session management."""
@@ -44,6 +59,60 @@ class SessionService:
         logger.info(f"Created session {db_session.id} for user {user_id}")
         return db_session
 
+    def fork_session(
+        self,
+        db: Session,
+        user_id: str,
+        source_session_id: uuid.UUID,
+        manager_client: ExecutorManagerClient | None = None,
+    ) -> AgentSession:
+        """Creates a new session whose workspace is a copy of an existing one.
+
+        The fork keeps the source's config, project and exported workspace files (so
+        the file panel is populated before its first run), but starts a new
+        conversation.
+        """
+        source = self.get_session(db, source_session_id)
+        if source.user_id != user_id:
+            raise AppException(
+                error_code=ErrorCode.FORBIDDEN,
+                message="Session does not belong to the user",
+            )
+
+        db_session = SessionRepository.create(
+            session_db=db,
+            user_id=user_id,
+            config=source.config_snapshot,
+            project_id=source.project_id,
+            kind=source.kind,
+        )
+        db_session.title = f"{source.title} (fork)"[:255] if source.title else None
+        db_session.workspace_files_prefix = source.workspace_files_prefix
+        db_session.workspace_manifest_key = source.workspace_manifest_key
+        db_session.workspace_archive_key = source.workspace_archive_key
+        db_session.workspace_export_status = source.workspace_export_status
+        db.flush()
+
+        try:
+            result = (manager_client or ExecutorManagerClient()).fork_workspace(
+                user_id=user_id,
+                source_session_id=str(source.id),
+                target_session_id=str(db_session.id),
+            )
+        except Exception:
+            db.rollback()
+            raise
+
+        db.commit()
+        db.refresh(db_session)
+
+        logger.info(
+            f"Forked session {source.id} -> {db_session.id} for user {user_id} "
+            f"(method={result.get('method')}, files={result.get('files')}, "
+            f"duration_ms={result.get('duration_ms')})"
+        )
+        return db_session
+
     def get_session(self, db: Session, session_id: uuid.UUID) -> AgentSession:
         """Gets a session by ID.
 
@@ -58,11 +127,77 @@ class SessionService:
             )
         return db_session
 
+    async def get_session_async(
+        self, db: AsyncSession, session_id: uuid.UUID
+    ) -> AgentSession:
+        """Gets a session by ID.
+
+        Raises:
+            AppException: If session not found.
+        """
+        db_session = await SessionRepository.get_by_id_async(db, session_id)
+        if not db_session:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Session not found: {session_id}",
+            )
+        return db_session
+
+    async def get_change_version_async(
+        self, db: AsyncSession, session_id: uuid.UUID
+    ) -> Row[tuple[str, str, int]]:
+        """Gets (user_id, status, change_version) of a session.
+
+        Raises:
+            AppException: If session not found.
+        """
+        row = await SessionRepository.get_change_version_async(db, session_id)
+        if row is None:
+            raise AppException(
+                error_code=ErrorCode.NOT_FOUND,
+                message=f"Session not found: {session_id}",
+            )
+        return row
+
+    def get_changes(
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        *,
+        status: str,
+        change_version: int,
+        user_id: str,
+        since_version: int | None,
+        after_id: int | None,
+        limit: int,
+    ) -> SessionChangesResponse:
+        """Collects the messages and runs a poller at `since_version` has not seen.
+
+        `status` and `change_version` must be read before calling: anything committed
+        after that read is then sent again on the next poll instead of being skipped.
+        """
+        messages = message_service.get_messages_since(
+            db, session_id, user_id=user_id, after_id=after_id, limit=limit + 1
+        )
+        runs = run_service.list_changed_runs(db, session_id, since_version)
+        return SessionChangesResponse(
+            session_id=session_id,
+            status=status,
+            change_version=change_version,
+            messages=messages[:limit],
+            runs=runs,
+            has_more=len(messages) > limit,
+        )
+
     def update_session(
         self, db: Session, session_id: uuid.UUID, request: SessionUpdateRequest
     ) -> AgentSession:
         """Updates session fields."""
         db_session = self.get_session(db, session_id)
+        change_version = None
+        if request.status is not None:
+            # Chat pollers only refetch when the change version moves.
+            change_version = SessionRepository.bump_change_version(db, session_id)
         if "project_id" in request.model_fields_set:
             project_id = request.project_id
             if project_id is None:
@@ -84,6 +219,10 @@ class SessionService:
             db_session.workspace_archive_url = request.workspace_archive_url
         if request.state_patch is not None:
             db_session.state_patch = request.state_patch
+            # Deltas are merged into the loaded dict, which is not change-tracked.
+            flag_modified(db_session, "state_patch")
+        if request.state_version is not None:
+            db_session.state_version = request.state_version
         if request.workspace_files_prefix is not None:
             db_session.workspace_files_prefix = request.workspace_files_prefix
         if request.workspace_manifest_key is not None:
@@ -92,6 +231,17 @@ class SessionService:
             db_session.workspace_archive_key = request.workspace_archive_key
         if request.workspace_export_status is not None:
             db_session.workspace_export_status = request.workspace_export_status
+        if change_version is not None:
+            session_events.publish(
+                db,
+                session_id,
+                "session",
+                {
+                    "status": db_session.status,
+                    "state_version": db_session.state_version,
+                },
+                change_version=change_version,
+            )
 
         db.commit()
         db.refresh(db_session)
@@ -119,25 +269,69 @@ class SessionService:
         project_id: uuid.UUID | None = None,
         *,
         kind: str | None = None,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
     ) -> list[AgentSession]:
         """Lists sessions, optionally filtered by user."""
+        validate_cursor(after_id, before_id)
         if user_id:
             return SessionRepository.list_by_user(
-                db, user_id, limit, offset, project_id, kind=kind
+                db,
+                user_id,
+                limit,
+                offset,
+                project_id,
+                kind=kind,
+                after_id=after_id,
+                before_id=before_id,
             )
-        return SessionRepository.list_all(db, limit, offset, project_id, kind=kind)
+        return SessionRepository.list_all(
+            db,
+            limit,
+            offset,
+            project_id,
+            kind=kind,
+            after_id=after_id,
+            before_id=before_id,
+        )
+
+    async def list_sessions_async(
+        self,
+        db: AsyncSession,
+        user_id: str | None = None,
+        limit: int = 100,
+        offset: int = 0,
+        project_id: uuid.UUID | None = None,
+        *,
+        kind: str | None = None,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
+    ) -> list[AgentSession]:
+        """Lists sessions, optionally filtered by user."""
+        validate_cursor(after_id, before_id)
+        if user_id:
+            return await SessionRepository.list_by_user_async(
+                db,
+                user_id,
+                limit,
+                offset,
+                project_id,
+                kind=kind,
+                after_id=after_id,
+                before_id=before_id,
+            )
+        return await SessionRepository.list_all_async(
+            db,
+            limit,
+            offset,
+            project_id,
+            kind=kind,
+            after_id=after_id,
+            before_id=before_id,
+        )
 
     def find_session_by_sdk_id_or_uuid(
         self, db: Session, session_id: str
     ) -> AgentSession | None:
         """Finds session by SDK session ID or UUID."""
-        db_session = SessionRepository.get_by_sdk_session_id(db, session_id)
-
-        if not db_session:
-            try:
-                session_uuid = uuid.UUID(session_id)
-                db_session = SessionRepository.get_by_id(db, session_uuid)
-            except ValueError:
-                pass
-
-        return db_session
+        return SessionRepository.get_by_sdk_session_id_or_id(db, session_id)
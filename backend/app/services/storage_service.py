@@ -1,19 +1,32 @@
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from poco_shared.s3_multipart import S3MultipartWriter as BaseS3MultipartWriter
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.core.settings import get_settings
+from app.utils.presign_cache import PresignCache
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache
+def get_presign_cache() -> PresignCache:
+    """The presigned URL cache shared by every S3StorageService in the process."""
+    settings = get_settings()
+    return PresignCache(
+        max_entries=settings.s3_presign_cache_max_entries,
+        refresh_margin_seconds=settings.s3_presign_cache_margin_seconds,
+    )
+
+
 class S3StorageService:
     def __init__(self) -> None:
         settings = get_settings()
@@ -35,6 +48,7 @@ class S3StorageService:
 
         self.bucket = settings.s3_bucket
         self.presign_expires = settings.s3_presign_expires
+        self.presign_cache = get_presign_cache()
 
         endpoint = settings.s3_endpoint.rstrip("/")
         public_endpoint = (settings.s3_public_endpoint or "").strip()
@@ -91,6 +105,86 @@ class S3StorageService:
                 details={"key": key, "error": str(exc)},
             ) from exc
 
+    def head_object(self, key: str) -> dict[str, Any] | None:
+        """Return object metadata, or None when the object does not exist."""
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            status = exc.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+            if status == 404:
+                return None
+            logger.error(f"Failed to head object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object metadata",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+        except BotoCoreError as exc:
+            logger.error(f"Failed to head object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to read object metadata",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def get_object_stream(self, key: str) -> Any:
+        """Return a streaming body for the object (caller must close it)."""
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"]
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to fetch object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to fetch object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def list_keys(self, prefix: str) -> list[str]:
+        keys: list[str] = []
+        try:
+            paginator = self.client.get_paginator("list_objects_v2")
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+                for item in page.get("Contents", []) or []:
+                    key = item.get("Key")
+                    if key:
+                        keys.append(key)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to list objects for {prefix}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to list objects",
+                details={"prefix": prefix, "error": str(exc)},
+            ) from exc
+        return keys
+
+    def delete_object(self, key: str) -> None:
+        try:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to delete object {key}: {exc}")
+            raise AppException(
+                error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+                message="Failed to delete object",
+                details={"key": key, "error": str(exc)},
+            ) from exc
+
+    def open_multipart_writer(
+        self,
+        *,
+        key: str,
+        content_type: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+    ) -> "S3MultipartWriter":
+        """Open a write-only stream that uploads to `key` as a multipart upload."""
+        return S3MultipartWriter.start(
+            client=self.client,
+            bucket=self.bucket,
+            key=key,
+            content_type=content_type,
+            part_size=part_size,
+        )
+
     def presign_get(
         self,
         key: str,
@@ -98,6 +192,33 @@ class S3StorageService:
         expires_in: int | None = None,
         response_content_disposition: str | None = None,
         response_content_type: str | None = None,
+    ) -> str:
+        """Returns a presigned GET URL, reusing a cached one while it is fresh."""
+        expires_in = expires_in or self.presign_expires
+        return self.presign_cache.get_or_sign(
+            (
+                self.bucket,
+                key,
+                response_content_disposition,
+                response_content_type,
+                expires_in,
+            ),
+            expires_in,
+            lambda: self._sign_get(
+                key,
+                expires_in=expires_in,
+                response_content_disposition=response_content_disposition,
+                response_content_type=response_content_type,
+            ),
+        )
+
+    def _sign_get(
+        self,
+        key: str,
+        *,
+        expires_in: int,
+        response_content_disposition: str | None,
+        response_content_type: str | None,
     ) -> str:
         params: dict[str, Any] = {"Bucket": self.bucket, "Key": key}
         if response_content_disposition:
@@ -108,7 +229,7 @@ class S3StorageService:
             return self.presign_client.generate_presigned_url(
                 "get_object",
                 Params=params,
-                ExpiresIn=expires_in or self.presign_expires,
+                ExpiresIn=expires_in,
             )
         except (ClientError, BotoCoreError) as exc:
             logger.error(f"Failed to presign object {key}: {exc}")
@@ -154,3 +275,15 @@ class S3StorageService:
                 message="Failed to download file",
                 details={"key": key, "error": str(exc)},
             ) from exc
+
+
+class S3MultipartWriter(BaseS3MultipartWriter):
+    """Multipart upload writer that fails with this service's AppException."""
+
+    @classmethod
+    def _error(cls, message: str, details: dict[str, Any]) -> Exception:
+        return AppException(
+            error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+            message=message,
+            details=details,
+        )
@@ -5,6 +5,9 @@ from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.session_events import session_events
+from app.models.agent_message import AgentMessage
+from app.models.agent_run import AgentRun
 from app.repositories.message_repository import MessageRepository
 from app.repositories.project_repository import ProjectRepository
 from app.repositories.run_repository import RunRepository
@@ -12,7 +15,9 @@ from app.repositories.session_repository import SessionRepository
 from app.repositories.user_mcp_install_repository import UserMcpInstallRepository
 from app.repositories.user_skill_install_repository import UserSkillInstallRepository
 from app.schemas.session import TaskConfig
+from app.schemas.message import MessageResponse
 from app.schemas.task import TaskEnqueueRequest, TaskEnqueueResponse
+from app.services.run_service import run_event_data
 
 
 class TaskService:
@@ -80,6 +85,34 @@ class TaskService:
 
         return schedule_mode, scheduled_at
 
+    @staticmethod
+    def publish_enqueued(
+        db: Session, db_message: AgentMessage, db_run: AgentRun, change_version: int
+    ) -> None:
+        """Queues the session events of a new (user message, run) pair."""
+        session_id = db_run.session_id
+        session_events.publish(
+            db,
+            session_id,
+            "message",
+            MessageResponse.model_validate(db_message).model_dump(mode="json"),
+            change_version=change_version,
+        )
+        session_events.publish(
+            db,
+            session_id,
+            "run",
+            run_event_data(db_run),
+            change_version=change_version,
+        )
+        session_events.publish(
+            db,
+            session_id,
+            "session",
+            {"status": "pending", "state_version": None, "state_patch": {}},
+            change_version=change_version,
+        )
+
     def enqueue_task(
         self, db: Session, user_id: str, request: TaskEnqueueRequest
     ) -> TaskEnqueueResponse:
@@ -98,9 +131,11 @@ class TaskService:
                     error_code=ErrorCode.FORBIDDEN,
                     message="Session does not belong to the user",
                 )
+            change_version = SessionRepository.bump_change_version(db, db_session.id)
             # Clear previous execution state so the UI doesn't show stale file changes
             # while a new run is queued/starting.
             db_session.state_patch = {}
+            db_session.state_version = None
             if project_id is not None and db_session.project_id != project_id:
                 raise AppException(
                     error_code=ErrorCode.BAD_REQUEST,
@@ -131,6 +166,7 @@ class TaskService:
                 kind="chat",
             )
             db.flush()
+            change_version = SessionRepository.bump_change_version(db, db_session.id)
         if merged_config is not None:
             db_session.config_snapshot = merged_config
 
@@ -188,8 +224,11 @@ class TaskService:
             scheduled_at=scheduled_at,
             config_snapshot=run_config_snapshot,
         )
+        db_run.change_version = change_version
 
         db_session.status = "pending"
+        db.flush()
+        self.publish_enqueued(db, db_message, db_run, change_version)
 
         db.commit()
         db.refresh(db_session)
@@ -7,6 +7,7 @@ from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.models.tool_execution import ToolExecution
 from app.repositories.tool_execution_repository import ToolExecutionRepository
+from app.utils.pagination import validate_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +16,30 @@ class ToolExecutionService:
     """Service layer for tool execution queries."""
 
     def get_tool_executions(
-        self, db: Session, session_id: uuid.UUID
+        self,
+        db: Session,
+        session_id: uuid.UUID,
+        limit: int = 100,
+        *,
+        after_id: uuid.UUID | None = None,
+        before_id: uuid.UUID | None = None,
     ) -> list[ToolExecution]:
-        """Gets all tool executions for a session.
+        """Gets one page of tool executions for a session.
 
         Args:
             db: Database session
             session_id: Session ID
+            limit: Page size
+            after_id: Return executions after this one
+            before_id: Return the page just before this one
 
         Returns:
             List of tool executions ordered by creation time
         """
-        executions = ToolExecutionRepository.list_by_session(db, session_id)
+        validate_cursor(after_id, before_id)
+        executions = ToolExecutionRepository.list_by_session(
+            db, session_id, limit, after_id=after_id, before_id=before_id
+        )
         logger.debug(
             f"Retrieved {len(executions)} tool executions for session {session_id}"
         )
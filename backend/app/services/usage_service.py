@@ -1,53 +1,39 @@
 import logging
 import uuid
-from typing import Any
+from datetime import date
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.repositories.usage_log_repository import UsageLogRepository
-from app.schemas.usage import UsageResponse
+from app.models.usage_rollup import UsageTotalsMixin
+from app.repositories.usage_rollup_repository import (
+    USAGE_COUNTERS,
+    UsageRollupRepository,
+)
+from app.schemas.usage import DailyUsageResponse, UsageResponse, UserUsageResponse
 
 logger = logging.getLogger(__name__)
 
 
 class UsageService:
-    """Service layer for usage statistics."""
+    """Service layer for usage statistics.
+
+    Reads the rollups that the callback transaction maintains next to each usage
+    log, so no request scans the logs themselves.
+    """
 
     @staticmethod
-    def _aggregate_logs(logs) -> UsageResponse:
-        if not logs:
+    def _to_response(rollup: UsageTotalsMixin | None) -> UsageResponse:
+        if rollup is None or not rollup.log_count:
             return UsageResponse(
                 total_cost_usd=None,
                 total_duration_ms=None,
                 usage_json=None,
             )
-
-        # Aggregate scalar fields
-        total_cost_usd = 0.0
-        total_duration_ms = 0
-
-        # Aggregate usage_json fields
-        aggregated_usage: dict[str, Any] = {}
-
-        for log in logs:
-            if log.total_cost_usd is not None:
-                total_cost_usd += float(log.total_cost_usd)
-            if log.duration_ms is not None:
-                total_duration_ms += log.duration_ms
-
-            # Merge usage_json fields
-            if log.usage_json:
-                for key, value in log.usage_json.items():
-                    if isinstance(value, int | float):
-                        aggregated_usage[key] = aggregated_usage.get(key, 0) + value
-                    else:
-                        # For non-numeric fields, keep the last value
-                        aggregated_usage[key] = value
-
         return UsageResponse(
-            total_cost_usd=total_cost_usd,
-            total_duration_ms=total_duration_ms,
-            usage_json=aggregated_usage if aggregated_usage else None,
+            total_cost_usd=float(rollup.total_cost_usd),
+            total_duration_ms=rollup.total_duration_ms,
+            usage_json={key: getattr(rollup, key) for key in USAGE_COUNTERS},
         )
 
     def get_usage_summary(self, db: Session, session_id: uuid.UUID) -> UsageResponse:
@@ -60,9 +46,9 @@ class UsageService:
         Returns:
             Aggregated usage statistics
         """
-        logs = UsageLogRepository.list_by_session(db, session_id)
+        rollup = UsageRollupRepository.get_by_session(db, session_id)
 
-        usage = self._aggregate_logs(logs)
+        usage = self._to_response(rollup)
 
         if usage.total_cost_usd is not None or usage.total_duration_ms is not None:
             logger.debug(
@@ -76,22 +62,55 @@ class UsageService:
     def get_usage_summary_by_run(
         self, db: Session, run_id: uuid.UUID
     ) -> UsageResponse | None:
-        logs = UsageLogRepository.list_by_run(db, run_id)
-        if not logs:
+        rollup = UsageRollupRepository.get_by_run(db, run_id)
+        if rollup is None:
             return None
-        return self._aggregate_logs(logs)
+        return self._to_response(rollup)
 
     def get_usage_summaries_by_run_ids(
         self, db: Session, run_ids: list[uuid.UUID]
     ) -> dict[uuid.UUID, UsageResponse]:
-        logs = UsageLogRepository.list_by_run_ids(db, run_ids)
-        if not logs:
-            return {}
+        rollups = UsageRollupRepository.list_by_run_ids(db, run_ids)
+        return {rollup.run_id: self._to_response(rollup) for rollup in rollups}
+
+    async def get_user_usage_async(
+        self, db: AsyncSession, user_id: str, start_date: date, end_date: date
+    ) -> UserUsageResponse:
+        """Gets a user's usage per UTC day and in total over a date range.
 
-        by_run: dict[uuid.UUID, list] = {}
-        for log in logs:
-            if log.run_id is None:
-                continue
-            by_run.setdefault(log.run_id, []).append(log)
+        Args:
+            db: Database session
+            user_id: User ID
+            start_date: First day of the range
+            end_date: Last day of the range (inclusive)
 
-        return {rid: self._aggregate_logs(items) for rid, items in by_run.items()}
+        Returns:
+            Totals of the range and one entry per day that had usage
+        """
+        rollups = await UsageRollupRepository.list_user_days_async(
+            db, user_id, start_date, end_date
+        )
+        rollups = [rollup for rollup in rollups if rollup.log_count]
+
+        total = self._to_response(None)
+        if rollups:
+            # Summed as Numeric before the float conversion, like a single rollup.
+            total = UsageResponse(
+                total_cost_usd=float(sum(rollup.total_cost_usd for rollup in rollups)),
+                total_duration_ms=sum(rollup.total_duration_ms for rollup in rollups),
+                usage_json={
+                    key: sum(getattr(rollup, key) for rollup in rollups)
+                    for key in USAGE_COUNTERS
+                },
+            )
+        days = [
+            DailyUsageResponse(day=rollup.day, **self._to_response(rollup).model_dump())
+            for rollup in rollups
+        ]
+        return UserUsageResponse(
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            total=total,
+            days=days,
+        )
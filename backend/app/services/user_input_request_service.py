@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
+from app.core.session_events import session_events
 from app.models.user_input_request import UserInputRequest
 from app.repositories.session_repository import SessionRepository
 from app.repositories.user_input_request_repository import UserInputRequestRepository
@@ -18,6 +19,16 @@ DEFAULT_EXPIRES_SECONDS = 60
 
 
 class UserInputRequestService:
+    @staticmethod
+    def _publish(db: Session, entry: UserInputRequest) -> None:
+        db.flush()
+        session_events.publish(
+            db,
+            entry.session_id,
+            "user_input_request",
+            UserInputRequestResponse.model_validate(entry).model_dump(mode="json"),
+        )
+
     def create_request(
         self, db: Session, request: UserInputRequestCreateRequest
     ) -> UserInputRequestResponse:
@@ -40,6 +51,7 @@ class UserInputRequestService:
             expires_at=expires_at,
         )
         UserInputRequestRepository.create(db, entry)
+        self._publish(db, entry)
         db.commit()
         db.refresh(entry)
         return UserInputRequestResponse.model_validate(entry)
@@ -58,6 +70,7 @@ class UserInputRequestService:
             now = datetime.now(timezone.utc)
             if entry.expires_at and entry.expires_at <= now:
                 entry.status = "expired"
+                self._publish(db, entry)
                 db.commit()
                 db.refresh(entry)
 
@@ -101,6 +114,7 @@ class UserInputRequestService:
         now = datetime.now(timezone.utc)
         if entry.expires_at and entry.expires_at <= now:
             entry.status = "expired"
+            self._publish(db, entry)
             db.commit()
             db.refresh(entry)
             raise AppException(
@@ -111,6 +125,7 @@ class UserInputRequestService:
         entry.answers = answer_request.answers
         entry.status = "answered"
         entry.answered_at = now
+        self._publish(db, entry)
         db.commit()
         db.refresh(entry)
         return UserInputRequestResponse.model_validate(entry)
@@ -0,0 +1,160 @@
+import logging
+import shutil
+import threading
+import zipfile
+from datetime import datetime
+from typing import Literal
+
+from app.core.errors.exceptions import AppException
+from app.services.storage_service import S3StorageService
+from app.utils.workspace_manifest import extract_manifest_files, normalize_manifest_path
+
+logger = logging.getLogger(__name__)
+
+ArchiveStatus = Literal["not_ready", "pending", "building", "ready", "failed"]
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class WorkspaceArchiveService:
+    """Builds workspace archives lazily from the exported per-file objects.
+
+    Archives are keyed by the manifest ETag, so a cached archive stays valid until the
+    next export rewrites the manifest. Builds are deduplicated per process.
+    """
+
+    def __init__(self, storage_service: S3StorageService | None = None) -> None:
+        self.storage_service = storage_service or S3StorageService()
+        self._lock = threading.Lock()
+        self._builds: dict[str, Literal["building", "failed"]] = {}
+
+    @staticmethod
+    def archive_prefix(manifest_key: str) -> str:
+        return f"{manifest_key.rsplit('/', 1)[0]}/archives/"
+
+    def prepare_archive(self, manifest_key: str) -> tuple[ArchiveStatus, str | None]:
+        """Resolve the archive for the current manifest.
+
+        Returns ("pending", key) when the caller should schedule `build_archive`.
+        """
+        manifest_head = self.storage_service.head_object(manifest_key)
+        if manifest_head is None:
+            return "not_ready", None
+
+        etag = str(manifest_head.get("ETag") or "").strip('"')
+        if not etag:
+            return "not_ready", None
+        archive_key = f"{self.archive_prefix(manifest_key)}{etag}.zip"
+
+        with self._lock:
+            state = self._builds.get(archive_key)
+        if state == "building":
+            return "building", archive_key
+
+        if self.storage_service.head_object(archive_key) is not None:
+            return "ready", archive_key
+
+        with self._lock:
+            # A failed build is reported once; the next request retries it.
+            if self._builds.get(archive_key) == "failed":
+                self._builds.pop(archive_key, None)
+                return "failed", archive_key
+            if self._builds.get(archive_key) == "building":
+                return "building", archive_key
+            self._builds[archive_key] = "building"
+        return "pending", archive_key
+
+    def build_archive(
+        self,
+        *,
+        manifest_key: str,
+        archive_key: str,
+        files_prefix: str | None,
+    ) -> None:
+        """Stream every manifest file from object storage into a zip upload."""
+        started = datetime.now()
+        try:
+            manifest = self.storage_service.get_manifest(manifest_key)
+            prefix = (files_prefix or "").rstrip("/")
+            file_count = 0
+
+            with self.storage_service.open_multipart_writer(
+                key=archive_key, content_type="application/zip"
+            ) as writer:
+                with zipfile.ZipFile(
+                    writer, "w", compression=zipfile.ZIP_DEFLATED
+                ) as zipf:
+                    for entry in extract_manifest_files(manifest):
+                        file_path = normalize_manifest_path(entry.get("path"))
+                        if not file_path:
+                            continue
+                        object_key = entry.get("key") or (
+                            f"{prefix}/{file_path.lstrip('/')}" if prefix else None
+                        )
+                        if not object_key:
+                            continue
+
+                        zinfo = zipfile.ZipInfo(
+                            filename=f"workspace{file_path}",
+                            date_time=self._zip_date_time(entry.get("last_modified")),
+                        )
+                        zinfo.compress_type = zipfile.ZIP_DEFLATED
+                        zinfo.external_attr = 0o644 << 16
+                        size = entry.get("size")
+                        if isinstance(size, int):
+                            zinfo.file_size = size
+
+                        body = self.storage_service.get_object_stream(object_key)
+                        try:
+                            with zipf.open(zinfo, "w") as dst:
+                                shutil.copyfileobj(body, dst, _COPY_CHUNK_SIZE)
+                        finally:
+                            body.close()
+                        file_count += 1
+
+            with self._lock:
+                self._builds.pop(archive_key, None)
+            logger.info(
+                "workspace_archive_built",
+                extra={
+                    "archive_key": archive_key,
+                    "file_count": file_count,
+                    "duration_ms": int(
+                        (datetime.now() - started).total_seconds() * 1000
+                    ),
+                },
+            )
+            self._delete_stale_archives(manifest_key, archive_key)
+        except Exception as exc:
+            message = exc.message if isinstance(exc, AppException) else str(exc)
+            logger.error(f"Workspace archive build failed for {archive_key}: {message}")
+            with self._lock:
+                self._builds[archive_key] = "failed"
+
+    def _delete_stale_archives(self, manifest_key: str, current_key: str) -> None:
+        try:
+            for key in self.storage_service.list_keys(
+                self.archive_prefix(manifest_key)
+            ):
+                if key != current_key:
+                    self.storage_service.delete_object(key)
+        except AppException as exc:
+            logger.warning(f"Failed to delete stale workspace archives: {exc.message}")
+
+    @staticmethod
+    def _zip_date_time(value: object) -> tuple[int, int, int, int, int, int]:
+        if isinstance(value, str):
+            try:
+                parsed = datetime.fromisoformat(value)
+                if parsed.year >= 1980:
+                    return (
+                        parsed.year,
+                        parsed.month,
+                        parsed.day,
+                        parsed.hour,
+                        parsed.minute,
+                        parsed.second,
+                    )
+            except ValueError:
+                pass
+        return (1980, 1, 1, 0, 0, 0)
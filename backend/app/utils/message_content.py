@@ -0,0 +1,55 @@
+"""Storage layout of large agent message payloads.
+
+SDK messages carry whole tool results (file reads, command logs), so a few rows would
+dominate the messages table and every session query that reads it. A message whose
+serialized content exceeds the inline limit is stored compressed in a separate body
+row, and the message row keeps a stub: the same structure with every long string cut
+to a preview, which is what lists and tool executions are built from.
+"""
+
+import json
+from typing import Any
+
+from poco_shared.wire import compress, decompress, supported_encodings
+
+from app.core.settings import get_settings
+
+
+def truncate_strings(value: Any, max_chars: int) -> Any:
+    """A copy of a JSON value with every string cut to `max_chars`."""
+    if isinstance(value, str):
+        return value[:max_chars] if len(value) > max_chars else value
+    if isinstance(value, dict):
+        return {key: truncate_strings(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [truncate_strings(item, max_chars) for item in value]
+    return value
+
+
+def preview_value(value: Any, max_chars: int) -> tuple[Any, bool]:
+    """`truncate_strings` of a value, and whether anything was cut."""
+    preview = truncate_strings(value, max_chars)
+    return preview, preview != value
+
+
+def offload_content(
+    content: dict[str, Any],
+) -> tuple[dict[str, Any], tuple[str, bytes, int] | None]:
+    """Splits message content into what the row stores and an optional body.
+
+    Returns the inline content and, when the content is over the inline limit,
+    `(encoding, data, size)` of the compressed full content.
+    """
+    settings = get_settings()
+    raw = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    if len(raw) <= settings.message_inline_max_bytes:
+        return content, None
+    # zstd when available, else gzip: both are what wire.decompress reads.
+    encoding = supported_encodings()[0]
+    body = (encoding, compress(raw, encoding), len(raw))
+    return truncate_strings(content, settings.message_preview_chars), body
+
+
+def load_content(encoding: str, data: bytes, size: int) -> dict[str, Any]:
+    """The full content of an offloaded message body."""
+    return json.loads(decompress(data, encoding, max_bytes=size))
@@ -0,0 +1,67 @@
+"""Keyset (cursor) pagination helpers for list queries.
+
+A page is addressed by the id of an item already seen: `after_id` returns the items
+that follow it in the list's order, `before_id` the page immediately preceding it
+(still returned in list order). Items are compared on the list's sort columns plus the
+primary key, so ordering is total and a page costs one index range scan no matter how
+deep into the list it is, unlike OFFSET which has to walk every skipped row.
+"""
+
+from collections.abc import Sequence
+from typing import Any, TypeVar
+
+from sqlalchemy import ColumnElement, Select, literal, select, tuple_
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+
+T = TypeVar("T")
+
+
+def validate_cursor(after_id: Any | None, before_id: Any | None) -> None:
+    """Rejects requests that pass both cursors."""
+    if after_id is not None and before_id is not None:
+        raise AppException(
+            error_code=ErrorCode.BAD_REQUEST,
+            message="Use either after_id or before_id, not both",
+        )
+
+
+def keyset_page(
+    stmt: Select[tuple[T]],
+    id_column: ColumnElement[Any],
+    sort_columns: Sequence[ColumnElement[Any]],
+    *,
+    limit: int,
+    after_id: Any | None = None,
+    before_id: Any | None = None,
+    descending: bool = False,
+) -> Select[tuple[T]]:
+    """Orders, bounds and limits `stmt` to one keyset page.
+
+    The cursor row's sort values are looked up by primary key inside the query, so
+    callers only pass ids. An id that does not exist yields an empty page. Rows of a
+    `before_id` page come back in reverse; pass them through `in_page_order`.
+    """
+    keys = [*sort_columns, id_column]
+    cursor = before_id if before_id is not None else after_id
+    # A before_id page is read backwards from the cursor, then flipped.
+    scan_descending = descending != (before_id is not None)
+    if cursor is not None:
+        bound = tuple_(
+            *(
+                select(column).where(id_column == cursor).scalar_subquery()
+                for column in sort_columns
+            ),
+            literal(cursor, id_column.type),
+        )
+        row = tuple_(*keys)
+        stmt = stmt.where(row < bound if scan_descending else row > bound)
+    return stmt.order_by(
+        *(key.desc() if scan_descending else key.asc() for key in keys)
+    ).limit(limit)
+
+
+def in_page_order(rows: Sequence[T], *, before_id: Any | None) -> list[T]:
+    """Returns the rows of a `keyset_page` query in list order."""
+    return list(reversed(rows)) if before_id is not None else list(rows)
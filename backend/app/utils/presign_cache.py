@@ -0,0 +1,69 @@
+"""Process-wide cache of presigned S3 URLs.
+
+Signing is pure CPU (SigV4 over the canonical request), and file listings re-sign
+every file on every poll. A presigned URL stays valid until it expires, so a cached
+one is handed out again until `refresh_margin_seconds` before its expiry; callers
+always get at least that much lifetime. The cache is bounded and evicts the least
+recently used entries.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class PresignCache:
+    def __init__(self, max_entries: int, refresh_margin_seconds: int) -> None:
+        self.max_entries = max_entries
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self._lock = threading.Lock()
+        # cache key -> (url, monotonic time after which it is re-signed)
+        self._entries: OrderedDict[Hashable, tuple[str, float]] = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "refreshes": 0,
+            "evictions": 0,
+        }
+
+    def get_or_sign(
+        self, cache_key: Hashable, expires_in: int, sign: Callable[[], str]
+    ) -> str:
+        """Returns the cached URL for `cache_key`, or signs and caches a new one."""
+        ttl = expires_in - self.refresh_margin_seconds
+        if self.max_entries <= 0 or ttl <= 0:
+            return sign()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(cache_key)
+                self._counters["hits"] += 1
+                return entry[0]
+            self._counters["refreshes" if entry is not None else "misses"] += 1
+
+        # Signed outside the lock; concurrent misses for one key both sign, and the
+        # later URL wins, which is as valid as the other.
+        url = sign()
+        with self._lock:
+            self._entries[cache_key] = (url, now + ttl)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+        return url
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            data: dict[str, int | float] = dict(self._counters)
+            data["entries"] = len(self._entries)
+        data["max_entries"] = self.max_entries
+        lookups = data["hits"] + data["misses"] + data["refreshes"]
+        data["hit_rate"] = round(data["hits"] / lookups, 4) if lookups else 0.0
+        return data
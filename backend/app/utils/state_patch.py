@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any
+
+from app.schemas.callback import AgentStateDelta
+
+
+def apply_state_delta(state: dict[str, Any], delta: AgentStateDelta) -> dict[str, Any]:
+    """Merge an executor state delta into a stored state_patch dict, in place.
+
+    Changed todos replace their index and the list is cut to `todo_count`. File
+    entries are replaced per path, keeping the position of the path's first entry;
+    new paths are appended. Totals are recomputed from the merged entries.
+    """
+    todos: list[Any] = state.get("todos") or []
+    del todos[delta.todo_count :]
+    for index, todo in sorted(delta.todos.items()):
+        item = todo.model_dump(mode="json")
+        if index < len(todos):
+            todos[index] = item
+        elif index == len(todos):
+            todos.append(item)
+    state["todos"] = todos
+
+    if delta.mcp_status is not None:
+        state["mcp_status"] = [
+            item.model_dump(mode="json") for item in delta.mcp_status
+        ]
+    state["current_step"] = delta.current_step
+
+    workspace_delta = delta.workspace_state
+    if workspace_delta is not None:
+        workspace: dict[str, Any] = state.get("workspace_state") or {}
+        replaced: dict[str, list[dict[str, Any]]] = {}
+        for change in workspace_delta.file_changes:
+            replaced.setdefault(change.path, []).append(change.model_dump(mode="json"))
+        dropped = set(workspace_delta.removed_paths)
+
+        file_changes: list[dict[str, Any]] = []
+        for entry in workspace.get("file_changes") or []:
+            path = entry.get("path")
+            if path in dropped:
+                continue
+            if path in replaced:
+                file_changes.extend(replaced.pop(path))
+                dropped.add(path)
+                continue
+            file_changes.append(entry)
+        for entries in replaced.values():
+            file_changes.extend(entries)
+
+        workspace.update(
+            repository=workspace_delta.repository,
+            branch=workspace_delta.branch,
+            last_change=workspace_delta.last_change.isoformat(),
+            file_changes=file_changes,
+            total_added_lines=sum(
+                int(entry.get("added_lines") or 0) for entry in file_changes
+            ),
+            total_deleted_lines=sum(
+                int(entry.get("deleted_lines") or 0) for entry in file_changes
+            ),
+        )
+        state["workspace_state"] = workspace
+
+    return state
@@ -0,0 +1,157 @@
+"""Measure callback ingestion throughput and SQL statements per callback.
+
+Creates a throwaway session, then feeds it callbacks whose assistant messages carry
+`--tools` parallel ToolUseBlocks, each followed by a user message with the matching
+ToolResultBlocks, through CallbackService.process_agent_callback. Callbacks carry the
+run_id of a running run and a callback_id, like forwarded executor callbacks do. Needs a migrated database
+(DATABASE_URL); the session and its rows are deleted afterwards.
+
+`--max-statements` turns the run into a check: it exits non-zero when the average
+number of SQL statements per callback exceeds the budget. tests/test_callback_ingest.py
+enforces STATEMENTS_PER_CALLBACK_BUDGET the same way.
+
+Usage (from backend/):
+    uv run python -m scripts.benchmark_callback_ingest --callbacks 400 --tools 8
+    uv run python -m scripts.benchmark_callback_ingest --tools 8 --max-statements 6
+"""
+
+import argparse
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import event
+
+from app.core.database import SessionLocal, engine
+from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+from app.repositories.message_repository import MessageRepository
+from app.repositories.run_repository import RunRepository
+from app.schemas.callback import AgentCallbackRequest, CallbackStatus
+from app.services.callback_service import CallbackService
+
+# Statements per callback process_agent_callback may issue for the default workload.
+STATEMENTS_PER_CALLBACK_BUDGET = 6
+
+
+def _callbacks(
+    session_id: str, run_id: str, count: int, tools: int
+) -> list[AgentCallbackRequest]:
+    callbacks: list[AgentCallbackRequest] = []
+    for index in range(count):
+        ids = [f"toolu_{index:06d}_{n:02d}" for n in range(tools)]
+        if index % 2 == 0:
+            message = {
+                "_type": "AssistantMessage",
+                "model": "benchmark",
+                "content": [
+                    {
+                        "_type": "ToolUseBlock",
+                        "id": tool_use_id,
+                        "name": "Read",
+                        "input": {"file_path": f"/workspace/file_{n}.py"},
+                    }
+                    for n, tool_use_id in enumerate(ids)
+                ],
+            }
+        else:
+            ids = [f"toolu_{index - 1:06d}_{n:02d}" for n in range(tools)]
+            message = {
+                "_type": "UserMessage",
+                "content": [
+                    {
+                        "_type": "ToolResultBlock",
+                        "tool_use_id": tool_use_id,
+                        "content": "ok",
+                        "is_error": False,
+                    }
+                    for tool_use_id in ids
+                ],
+            }
+        callbacks.append(
+            AgentCallbackRequest(
+                session_id=session_id,
+                run_id=run_id,
+                callback_id=uuid.uuid4().hex,
+                time=datetime.now(timezone.utc),
+                status=CallbackStatus.RUNNING,
+                progress=0,
+                new_message=message,
+            )
+        )
+    return callbacks
+
+
+def measure(callbacks: int, tools: int) -> dict[str, float]:
+    """Ingests the workload into a throwaway session; returns rates and counts."""
+    statements = 0
+
+    def count_statement(*_args) -> None:
+        nonlocal statements
+        statements += 1
+
+    db = SessionLocal()
+    db_session = AgentSession(user_id="benchmark-callback-ingest", status="running")
+    db.add(db_session)
+    db.flush()
+    user_message = MessageRepository.create(
+        db, session_id=db_session.id, role="user", content={"_type": "UserMessage"}
+    )
+    db.flush()
+    db_run = RunRepository.create(db, db_session.id, user_message.id)
+    db_run.status = "running"
+    db.commit()
+    session_id = str(db_session.id)
+    run_id = str(db_run.id)
+
+    try:
+        workload = _callbacks(session_id, run_id, callbacks, tools)
+        service = CallbackService()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            started = time.perf_counter()
+            for callback in workload:
+                service.process_agent_callback(db, callback)
+            elapsed = time.perf_counter() - started
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+    finally:
+        db.rollback()
+        db.delete(db.get(AgentRun, db_run.id))
+        db.delete(db.get(AgentSession, db_session.id))
+        db.commit()
+        db.close()
+
+    return {
+        "callbacks": len(workload),
+        "callbacks_per_second": len(workload) / elapsed,
+        "ms_per_callback": elapsed / len(workload) * 1000,
+        "statements_per_callback": statements / len(workload),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--callbacks", type=int, default=400)
+    parser.add_argument("--tools", type=int, default=8, help="tool calls per message")
+    parser.add_argument(
+        "--max-statements",
+        type=float,
+        help="fail if the average statements per callback exceed this",
+    )
+    args = parser.parse_args()
+
+    result = measure(args.callbacks, args.tools)
+    per_callback = result["statements_per_callback"]
+    print(f"callbacks:            {result['callbacks']} ({args.tools} tools each)")
+    print(f"callbacks/second:     {result['callbacks_per_second']:.1f}")
+    print(f"ms/callback:          {result['ms_per_callback']:.2f}")
+    print(f"statements/callback:  {per_callback:.1f}")
+    if args.max_statements is not None and per_callback > args.max_statements:
+        print(f"over budget: {per_callback:.1f} > {args.max_statements}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
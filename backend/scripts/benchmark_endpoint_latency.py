@@ -0,0 +1,172 @@
+"""Load-test the hot Backend endpoints and report latency percentiles.
+
+`--clients` concurrent clients each send `--requests` requests against a running
+Backend, mixing executor callbacks, session reads, message listings, session lists
+and run claims roughly in the proportions a busy deployment sees. Every client works
+on its own throwaway session (soft-deleted afterwards). Run claims only ask for the
+`benchmark` schedule mode, so real queued runs are never claimed.
+
+Compare before/after by pointing it at two servers (e.g. two checkouts), each started
+with a single uvicorn worker so event-loop blocking shows up in the tail latency.
+Requests that fail or exceed `--timeout` count as errors at their elapsed time.
+
+Usage (from backend/):
+    uv run uvicorn app.main:app --port 8000
+    uv run python -m scripts.benchmark_endpoint_latency --clients 200 --requests 25
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+
+OPERATIONS = [
+    ("callback", 50),
+    ("session", 15),
+    ("session_state", 10),
+    ("messages", 10),
+    ("sessions_list", 10),
+    ("runs_claim", 5),
+]
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _request(
+    client: httpx.AsyncClient, op: str, session_id: str, seq: int
+) -> httpx.Response:
+    if op == "callback":
+        return await client.post(
+            "/api/v1/callback",
+            json={
+                "session_id": session_id,
+                "time": datetime.now(timezone.utc).isoformat(),
+                "status": "running",
+                "progress": seq % 100,
+                "new_message": {
+                    "_type": "AssistantMessage",
+                    "content": [{"_type": "TextBlock", "text": f"step {seq}"}],
+                    "model": "benchmark",
+                },
+            },
+        )
+    if op == "session":
+        return await client.get(f"/api/v1/sessions/{session_id}")
+    if op == "session_state":
+        return await client.get(f"/api/v1/sessions/{session_id}/state")
+    if op == "messages":
+        return await client.get(f"/api/v1/sessions/{session_id}/messages")
+    if op == "sessions_list":
+        return await client.get("/api/v1/sessions", params={"limit": 20})
+    return await client.post(
+        "/api/v1/runs/claim",
+        json={"worker_id": "benchmark", "schedule_modes": ["benchmark"]},
+    )
+
+
+async def _client(
+    client: httpx.AsyncClient,
+    session_id: str,
+    requests: int,
+    rng: random.Random,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    ops, weights = zip(*OPERATIONS)
+    for seq in range(requests):
+        op = rng.choices(ops, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await _request(client, op, session_id, seq)
+            ok = response.is_success
+        except httpx.HTTPError:
+            ok = False
+        latencies[op].append((time.perf_counter() - started) * 1000)
+        if not ok:
+            errors[op] += 1
+
+
+async def _run(args: argparse.Namespace) -> None:
+    user_id = f"benchmark-{uuid.uuid4().hex[:8]}"
+    limits = httpx.Limits(
+        max_connections=args.clients, max_keepalive_connections=args.clients
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"X-User-Id": user_id},
+        limits=limits,
+        timeout=args.timeout,
+    ) as client:
+        session_ids: list[str] = []
+        for _ in range(args.clients):
+            response = await client.post("/api/v1/sessions", json={})
+            response.raise_for_status()
+            session_ids.append(response.json()["data"]["session_id"])
+
+        latencies: dict[str, list[float]] = defaultdict(list)
+        errors: dict[str, int] = defaultdict(int)
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    _client(
+                        client,
+                        session_id,
+                        args.requests,
+                        random.Random(rng.random()),
+                        latencies,
+                        errors,
+                    )
+                    for session_id in session_ids
+                )
+            )
+            elapsed = time.perf_counter() - started
+        finally:
+            for session_id in session_ids:
+                try:
+                    await client.delete(f"/api/v1/sessions/{session_id}")
+                except httpx.HTTPError:
+                    print(f"could not delete session {session_id}")
+                    break
+
+    total = sum(len(values) for values in latencies.values())
+    print(f"clients: {args.clients}  requests: {total}  elapsed: {elapsed:.1f}s")
+    print(f"throughput: {total / elapsed:.0f} req/s")
+    print(
+        f"{'endpoint':<16}{'count':>7}{'errors':>8}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    )
+    rows = [(op, latencies[op]) for op, _ in OPERATIONS if latencies[op]]
+    rows.append(("all", [v for values in latencies.values() for v in values]))
+    for op, values in rows:
+        failed = sum(errors.values()) if op == "all" else errors[op]
+        print(
+            f"{op:<16}{len(values):>7}{failed:>8}"
+            f"{statistics.median(values):>10.1f}{_percentile(values, 95):>10.1f}"
+            f"{_percentile(values, 99):>10.1f}{max(values):>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=25, help="per client")
+    parser.add_argument("--timeout", type=float, default=60, help="per request")
+    parser.add_argument("--seed", type=int, default=7)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+"""Check that hot-path queries are planned on their supporting indexes.
+
+Seeds a throwaway schema with realistic volumes (tens of thousands of sessions,
+hundreds of thousands of messages and tool executions, one very long session, a
+small queue of runs), runs ANALYZE, then calls the real repository methods, captures
+the SQL they emit and EXPLAINs it. Each check names the indexes its plan must use,
+and no plan may sequentially scan a table; the script exits non-zero otherwise, so a
+dropped index or a rewritten query that no longer matches it is caught before it
+reaches production. tests/test_query_plans.py runs the same checks under pytest.
+
+Needs PostgreSQL (DATABASE_URL). Nothing outside the scratch schema is touched, and
+the schema is dropped afterwards.
+
+Usage (from backend/):
+    uv run python -m scripts.check_query_plans
+    uv run python -m scripts.check_query_plans --scale 0.2 --verbose
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.core.database import Base, engine
+from app.repositories.message_repository import MessageRepository
+from app.repositories.run_repository import RunRepository
+from app.repositories.session_repository import SessionRepository
+from app.repositories.tool_execution_repository import ToolExecutionRepository
+from app.repositories.usage_rollup_repository import UsageRollupRepository
+
+MESSAGES_PER_SESSION = 20
+TOOLS_PER_SESSION = 15
+LONG_SESSION_MESSAGES = 20000
+USERS = 200
+QUEUED_RUNS = 50
+RUNNING_RUNS = 30
+
+
+@dataclass
+class PlanCheck:
+    """Outcome of one check: the indexes its plans used and what was wrong."""
+
+    name: str
+    used: set[str] = field(default_factory=set)
+    missing: set[str] = field(default_factory=set)
+    seq_scans: set[str] = field(default_factory=set)
+    plans: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.missing or self.seq_scans)
+
+
+def _session_uuid(index: int) -> uuid.UUID:
+    return uuid.UUID(int=index)
+
+
+def _seed(conn: Connection, sessions: int) -> None:
+    params = {
+        "sessions": sessions,
+        "users": USERS,
+        "per_session": MESSAGES_PER_SESSION,
+        "tools": TOOLS_PER_SESSION,
+        "long_messages": LONG_SESSION_MESSAGES,
+        "queued": QUEUED_RUNS,
+        "running": RUNNING_RUNS,
+    }
+    statements = [
+        # Session i has id UUID(int=i); every 50th is soft-deleted, 10% have no
+        # SDK session id yet.
+        """
+        INSERT INTO agent_sessions
+            (id, user_id, sdk_session_id, kind, status, is_deleted,
+             created_at, updated_at)
+        SELECT lpad(to_hex(s), 32, '0')::uuid,
+               'user-' || (s %% %(users)s),
+               CASE WHEN s %% 10 = 0 THEN NULL ELSE 'sdk-' || s END,
+               'chat', 'completed', s %% 50 = 0,
+               now() - (%(sessions)s - s) * interval '1 minute',
+               now() - (%(sessions)s - s) * interval '1 minute'
+        FROM generate_series(1, %(sessions)s) AS s
+        """,
+        """
+        INSERT INTO agent_messages
+            (session_id, role, content, text_preview, created_at, updated_at)
+        SELECT lpad(to_hex(s), 32, '0')::uuid,
+               CASE WHEN m %% 2 = 1 THEN 'user' ELSE 'assistant' END,
+               '{"_type": "AssistantMessage", "content": []}'::json,
+               'message ' || m,
+               now() - (%(sessions)s - s) * interval '1 minute'
+                     + m * interval '1 second',
+               now()
+        FROM generate_series(1, %(sessions)s) AS s,
+             generate_series(1, %(per_session)s) AS m
+        ORDER BY s, m
+        """,
+        # One long-running session (session 1).
+        """
+        INSERT INTO agent_messages
+            (session_id, role, content, text_preview, created_at, updated_at)
+        SELECT lpad(to_hex(1), 32, '0')::uuid, 'assistant',
+               '{"_type": "AssistantMessage", "content": []}'::json,
+               'message ' || m,
+               now() - (%(long_messages)s - m) * interval '1 second', now()
+        FROM generate_series(1, %(long_messages)s) AS m
+        """,
+        # One run per session, triggered by the session's first message. The last
+        # sessions hold the live queue: a few queued, a few running.
+        """
+        INSERT INTO agent_runs
+            (session_id, user_message_id, status, permission_mode, progress,
+             schedule_mode, attempts, scheduled_at, created_at, updated_at)
+        SELECT lpad(to_hex(s), 32, '0')::uuid,
+               first_id + (s - 1) * %(per_session)s,
+               CASE
+                   WHEN s > %(sessions)s - %(queued)s THEN 'queued'
+                   WHEN s > %(sessions)s - %(queued)s - %(running)s THEN 'running'
+                   ELSE 'completed'
+               END,
+               'default', 0, 'immediate', 1,
+               now() - (%(sessions)s - s) * interval '1 minute',
+               now() - (%(sessions)s - s) * interval '1 minute',
+               now()
+        FROM generate_series(1, %(sessions)s) AS s,
+             (SELECT min(id) AS first_id FROM agent_messages) AS f
+        """,
+        """
+        INSERT INTO tool_executions
+            (session_id, message_id, tool_use_id, tool_name, is_error,
+             created_at, updated_at)
+        SELECT lpad(to_hex(s), 32, '0')::uuid,
+               first_id + (s - 1) * %(per_session)s + t,
+               'toolu_' || s || '_' || t, 'Bash', false,
+               now() - (%(sessions)s - s) * interval '1 minute'
+                     + t * interval '1 second',
+               now()
+        FROM generate_series(1, %(sessions)s) AS s,
+             generate_series(1, %(tools)s) AS t,
+             (SELECT min(id) AS first_id FROM agent_messages) AS f
+        """,
+        """
+        INSERT INTO usage_logs (session_id, run_id, duration_ms, created_at, updated_at)
+        SELECT session_id, id, 1000, created_at, now() FROM agent_runs
+        """,
+        """
+        INSERT INTO run_usage_rollups (run_id, log_count, total_duration_ms)
+        SELECT run_id, count(*), sum(duration_ms) FROM usage_logs GROUP BY run_id
+        """,
+        """
+        INSERT INTO session_usage_rollups (session_id, log_count, total_duration_ms)
+        SELECT session_id, count(*), sum(duration_ms) FROM usage_logs
+        GROUP BY session_id
+        """,
+        # A year of daily usage for every user.
+        """
+        INSERT INTO user_daily_usage_rollups (user_id, day, log_count, input_tokens)
+        SELECT 'user-' || u, current_date - d, 3, 1000
+        FROM generate_series(0, %(users)s - 1) AS u,
+             generate_series(0, 364) AS d
+        """,
+        "ANALYZE",
+    ]
+    for statement in statements:
+        conn.exec_driver_sql(statement, params)
+
+
+def _capture(conn: Connection, call: Callable[[], Any]) -> list[tuple[str, Any]]:
+    """Run `call` and return the SQL statements it sent."""
+    captured: list[tuple[str, Any]] = []
+
+    def before_cursor_execute(_conn, _cursor, statement, parameters, _ctx, _many):
+        if not statement.lstrip().upper().startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(conn, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def _plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def _explain(conn: Connection, statement: str, parameters: Any) -> dict[str, Any]:
+    row = conn.exec_driver_sql(
+        "EXPLAIN (FORMAT JSON) " + statement, parameters
+    ).scalar_one()
+    plan = row if isinstance(row, list) else json.loads(row)
+    return plan[0]["Plan"]
+
+
+def _checks(
+    db: Session, sessions: int
+) -> list[tuple[str, Callable[[], Any], set[str]]]:
+    long_session = _session_uuid(1)
+    recent_session = _session_uuid(sessions - QUEUED_RUNS - 1)
+    first_message_id = MessageRepository.list_by_session(db, recent_session, limit=1)[
+        0
+    ].id
+    page_run_ids = [
+        run.id
+        for index in range(sessions - QUEUED_RUNS - 20, sessions - QUEUED_RUNS)
+        for run in RunRepository.list_by_session(db, _session_uuid(index))
+    ]
+    deep_message_id = MessageRepository.list_by_session(
+        db, long_session, limit=LONG_SESSION_MESSAGES // 2
+    )[-1].id
+    older_session_id = SessionRepository.list_by_user(db, "user-7", limit=50)[-1].id
+    first_execution_id = ToolExecutionRepository.list_by_session(
+        db, recent_session, limit=1
+    )[0].id
+    return [
+        (
+            "messages of a long session",
+            lambda: MessageRepository.list_by_session(db, long_session),
+            {"ix_agent_messages_session_id_created_at"},
+        ),
+        (
+            "deep page of a long session",
+            lambda: MessageRepository.list_by_session(
+                db, long_session, after_id=deep_message_id
+            ),
+            {"ix_agent_messages_session_id_created_at"},
+        ),
+        (
+            "page before a message",
+            lambda: MessageRepository.list_by_session(
+                db, long_session, before_id=deep_message_id
+            ),
+            {"ix_agent_messages_session_id_created_at"},
+        ),
+        (
+            "new messages of a session",
+            lambda: MessageRepository.list_since(
+                db, recent_session, first_message_id, 500
+            ),
+            {"ix_agent_messages_session_id_id"},
+        ),
+        (
+            "runs changed since a version",
+            lambda: RunRepository.list_changed_since(db, recent_session, 0),
+            {"ix_agent_runs_session_id"},
+        ),
+        (
+            "callback session lookup",
+            lambda: SessionRepository.get_by_sdk_session_id_or_id(
+                db, f"sdk-{sessions - 1}"
+            ),
+            {"ix_agent_sessions_sdk_session_id"},
+        ),
+        (
+            "sessions of a user",
+            lambda: SessionRepository.list_by_user(db, "user-7", kind="chat"),
+            {"ix_agent_sessions_user_id_created_at"},
+        ),
+        (
+            "older sessions of a user",
+            lambda: SessionRepository.list_by_user(
+                db, "user-7", kind="chat", after_id=older_session_id
+            ),
+            {"ix_agent_sessions_user_id_created_at"},
+        ),
+        (
+            "claim next run",
+            lambda: RunRepository.claim_next(db, worker_id="query-plan-check"),
+            # Lease release and the active-run anti-join may pick either status
+            # index; they only must not scan.
+            {"ix_agent_runs_queued_scheduled_at"},
+        ),
+        (
+            "active run of a session",
+            lambda: RunRepository.get_active_by_session(db, recent_session),
+            {"ix_agent_runs_active_session_id"},
+        ),
+        (
+            "tool executions of a session",
+            lambda: ToolExecutionRepository.list_by_session(db, recent_session),
+            {"ix_tool_executions_session_id_created_at"},
+        ),
+        (
+            "next page of tool executions",
+            lambda: ToolExecutionRepository.list_by_session(
+                db, recent_session, limit=5, after_id=first_execution_id
+            ),
+            {"ix_tool_executions_session_id_created_at"},
+        ),
+        (
+            "tool executions of a message",
+            lambda: ToolExecutionRepository.list_by_message(db, first_message_id),
+            {"ix_tool_executions_message_id"},
+        ),
+        (
+            "usage of a session",
+            lambda: UsageRollupRepository.get_by_session(db, recent_session),
+            {"session_usage_rollups_pkey"},
+        ),
+        (
+            "usage of a page of runs",
+            lambda: UsageRollupRepository.list_by_run_ids(db, page_run_ids),
+            {"run_usage_rollups_pkey"},
+        ),
+        (
+            "usage of a user by day",
+            lambda: UsageRollupRepository.list_user_days(
+                db, "user-7", date.today() - timedelta(days=89), date.today()
+            ),
+            {"user_daily_usage_rollups_pkey"},
+        ),
+    ]
+
+
+def run_checks(scale: float = 1.0) -> list[PlanCheck]:
+    """Seeds a scratch schema at `scale`, EXPLAINs every check, drops the schema."""
+    sessions = max(QUEUED_RUNS + RUNNING_RUNS + 10, int(20000 * scale))
+    schema = f"query_plan_check_{uuid.uuid4().hex[:8]}"
+    results: list[PlanCheck] = []
+    with engine.connect() as conn:
+        try:
+            conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+            conn.exec_driver_sql(f"SET search_path TO {schema}")
+            Base.metadata.create_all(conn)
+            started = time.perf_counter()
+            _seed(conn, sessions)
+            conn.commit()
+            print(f"seeded {sessions} sessions in {time.perf_counter() - started:.1f}s")
+
+            db = Session(bind=conn, join_transaction_mode="rollback_only")
+            for name, call, expected in _checks(db, sessions):
+                result = PlanCheck(name)
+                for statement, parameters in _capture(conn, call):
+                    plan = _explain(conn, statement, parameters)
+                    result.plans.append(plan)
+                    for node in _plan_nodes(plan):
+                        if node.get("Index Name"):
+                            result.used.add(node["Index Name"])
+                        if node.get("Node Type") == "Seq Scan":
+                            result.seq_scans.add(node["Relation Name"])
+                result.missing = expected - result.used
+                results.append(result)
+            db.rollback()
+            db.close()
+        finally:
+            conn.rollback()
+            conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+            conn.exec_driver_sql("RESET search_path")
+            conn.commit()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="1.0 = 20k sessions, ~420k messages, 300k tool executions",
+    )
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    failures = 0
+    for result in run_checks(args.scale):
+        if args.verbose:
+            for plan in result.plans:
+                print(json.dumps(plan, indent=2))
+        failures += result.failed
+        status = "FAIL" if result.failed else "ok"
+        print(
+            f"{status:<5}{result.name:<32}uses: {', '.join(sorted(result.used)) or '-'}"
+        )
+        if result.missing:
+            print(f"     missing: {', '.join(sorted(result.missing))}")
+        if result.seq_scans:
+            print(f"     seq scan: {', '.join(sorted(result.seq_scans))}")
+
+    if failures:
+        print(f"{failures} check(s) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
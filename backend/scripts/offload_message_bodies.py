@@ -0,0 +1,122 @@
+"""Move existing oversized message payloads out of the agent_messages table.
+
+New messages over MESSAGE_INLINE_MAX_BYTES are offloaded when they are written; this
+does the same for rows stored before that: the full content goes to a compressed
+agent_message_bodies row, the message keeps a preview stub, and the tool executions
+created from it keep flagged previews of their input and output. Batches are committed one
+at a time, so the script can be stopped and rerun; finished rows are skipped.
+
+PostgreSQL reuses the freed space after the next (auto)vacuum; returning it to the
+operating system needs VACUUM FULL or pg_repack on agent_messages and
+tool_executions.
+
+Usage (from backend/):
+    uv run python -m scripts.offload_message_bodies --dry-run
+    uv run python -m scripts.offload_message_bodies --batch-size 200
+"""
+
+import argparse
+import time
+
+from sqlalchemy import Text, cast, func, or_, select
+
+from app.core.database import SessionLocal
+from app.core.settings import get_settings
+from app.models.agent_message import AgentMessage
+from app.models.agent_message_body import AgentMessageBody
+from app.models.tool_execution import ToolExecution
+from app.utils.message_content import offload_content, preview_value
+
+
+def _offload_batch(
+    after_id: int, batch_size: int, dry_run: bool
+) -> tuple[int, int, int]:
+    """Offloads the next batch of large messages.
+
+    Returns the last message id examined (0 when none were left), the number of
+    messages offloaded and their uncompressed size in bytes.
+    """
+    settings = get_settings()
+    preview_chars = settings.message_preview_chars
+    count = 0
+    moved = 0
+    last_id = 0
+    with SessionLocal() as db:
+        messages = db.scalars(
+            select(AgentMessage)
+            .where(
+                AgentMessage.id > after_id,
+                AgentMessage.content_truncated.is_(False),
+                func.octet_length(cast(AgentMessage.content, Text))
+                > settings.message_inline_max_bytes,
+            )
+            .order_by(AgentMessage.id)
+            .limit(batch_size)
+        ).all()
+        for message in messages:
+            last_id = message.id
+            inline_content, body = offload_content(message.content)
+            if body is None:
+                continue
+            encoding, data, size = body
+            count += 1
+            moved += size
+            if dry_run:
+                continue
+            message.content = inline_content
+            message.content_truncated = True
+            message.body = AgentMessageBody(encoding=encoding, data=data, size=size)
+            executions = db.scalars(
+                select(ToolExecution).where(
+                    or_(
+                        ToolExecution.message_id == message.id,
+                        ToolExecution.result_message_id == message.id,
+                    )
+                )
+            )
+            for execution in executions:
+                if execution.message_id == message.id:
+                    execution.tool_input, cut = preview_value(
+                        execution.tool_input, preview_chars
+                    )
+                    execution.tool_input_truncated |= cut
+                if execution.result_message_id == message.id:
+                    execution.tool_output, cut = preview_value(
+                        execution.tool_output, preview_chars
+                    )
+                    execution.tool_output_truncated |= cut
+        if not dry_run:
+            db.commit()
+    return last_id, count, moved
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would move"
+    )
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    after_id = 0
+    total_messages = 0
+    total_bytes = 0
+    while True:
+        last_id, count, moved = _offload_batch(after_id, args.batch_size, args.dry_run)
+        if last_id == 0:
+            break
+        after_id = last_id
+        total_messages += count
+        total_bytes += moved
+        print(f"up to message {after_id}: {total_messages} messages")
+
+    verb = "would move" if args.dry_run else "moved"
+    print(
+        f"{verb} {total_messages} messages ({total_bytes / 1e6:.1f} MB of content) "
+        f"in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
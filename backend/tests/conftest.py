@@ -0,0 +1,16 @@
+import pytest
+from sqlalchemy import make_url
+
+from app.core.settings import get_settings
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skips `postgres` tests unless DATABASE_URL points at PostgreSQL."""
+    if make_url(get_settings().database_url).get_backend_name() == "postgresql":
+        return
+    skip = pytest.mark.skip(reason="needs PostgreSQL (DATABASE_URL)")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,54 @@
+"""Which batch failures the executor manager may treat as a rejected callback."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackBatchResponse,
+    CallbackResponse,
+)
+from app.services.callback_service import CallbackService
+
+
+def _callback() -> AgentCallbackRequest:
+    return AgentCallbackRequest(
+        session_id="session-1",
+        time="2026-01-01T00:00:00Z",
+        status="running",
+        progress=10,
+    )
+
+
+def _run_batch(error: Exception) -> tuple[CallbackBatchResponse, MagicMock]:
+    service = CallbackService()
+    applied = CallbackResponse(session_id="session-1", status="running")
+    service.process_agent_callback = MagicMock(side_effect=[applied, error])
+    db = MagicMock()
+    return service.process_agent_callback_batch(db, [_callback(), _callback()]), db
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        OperationalError("UPDATE agent_sessions", {}, Exception("server closed")),
+        TimeoutError("QueuePool limit reached"),
+    ],
+)
+def test_transient_failure_is_retryable(error: Exception) -> None:
+    result, db = _run_batch(error)
+
+    assert result.processed == 1
+    assert result.retryable is True
+    db.rollback.assert_called_once()
+
+
+def test_bad_callback_data_is_not_retryable() -> None:
+    result, _ = _run_batch(
+        IntegrityError("INSERT INTO agent_messages", {}, Exception("violates"))
+    )
+
+    assert result.processed == 1
+    assert result.retryable is False
@@ -0,0 +1,16 @@
+"""Statement budget of callback ingestion (scripts/benchmark_callback_ingest.py).
+
+Needs a migrated PostgreSQL database: `alembic upgrade head` first.
+"""
+
+import pytest
+
+from scripts.benchmark_callback_ingest import STATEMENTS_PER_CALLBACK_BUDGET, measure
+
+pytestmark = pytest.mark.postgres
+
+
+def test_statements_per_callback_within_budget() -> None:
+    result = measure(callbacks=100, tools=8)
+
+    assert result["statements_per_callback"] <= STATEMENTS_PER_CALLBACK_BUDGET
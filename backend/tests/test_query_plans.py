@@ -0,0 +1,32 @@
+"""Index coverage of hot-path queries (scripts/check_query_plans.py).
+
+Seeds and drops its own scratch schema, so any PostgreSQL database works.
+"""
+
+import pytest
+
+from scripts.check_query_plans import PlanCheck, run_checks
+
+pytestmark = pytest.mark.postgres
+
+# Large enough that the planner prefers the indexes, small enough for CI.
+SCALE = 0.2
+
+
+@pytest.fixture(scope="module")
+def plan_checks() -> dict[str, PlanCheck]:
+    return {result.name: result for result in run_checks(SCALE)}
+
+
+def test_hot_queries_use_their_indexes(plan_checks: dict[str, PlanCheck]) -> None:
+    failed = {
+        name: {
+            "missing": sorted(result.missing),
+            "seq_scans": sorted(result.seq_scans),
+        }
+        for name, result in plan_checks.items()
+        if result.failed
+    }
+
+    assert plan_checks
+    assert not failed
@@ -0,0 +1,85 @@
+"""Runs of users a worker excludes (e.g. over its disk quota) stay queued.
+
+Needs a migrated PostgreSQL database: `alembic upgrade head` first.
+"""
+
+import uuid
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.models.agent_message import AgentMessage
+from app.models.agent_run import AgentRun
+from app.models.agent_session import AgentSession
+from app.repositories.run_repository import RunRepository
+
+pytestmark = pytest.mark.postgres
+
+# Keeps the claims below off whatever else is queued in the database.
+SCHEDULE_MODE = f"test-{uuid.uuid4().hex[:8]}"
+
+
+@pytest.fixture
+def db() -> Iterator[Session]:
+    """A session whose writes are rolled back after the test."""
+    with engine.connect() as conn:
+        session = Session(bind=conn, join_transaction_mode="rollback_only")
+        try:
+            yield session
+        finally:
+            session.close()
+            conn.rollback()
+
+
+def _queue_run(db: Session, user_id: str) -> AgentRun:
+    session = AgentSession(user_id=user_id)
+    db.add(session)
+    db.flush()
+    message = AgentMessage(session_id=session.id, role="user", content={})
+    db.add(message)
+    db.flush()
+    run = AgentRun(
+        session_id=session.id,
+        user_message_id=message.id,
+        schedule_mode=SCHEDULE_MODE,
+    )
+    db.add(run)
+    db.flush()
+    return run
+
+
+def test_excluded_user_run_stays_queued(db: Session) -> None:
+    over_quota = _queue_run(db, "user-over-quota")
+
+    claimed = RunRepository.claim_next(
+        db,
+        worker_id="worker-1",
+        schedule_modes=[SCHEDULE_MODE],
+        exclude_user_ids=["user-over-quota"],
+    )
+
+    assert claimed is None
+    assert over_quota.status == "queued"
+
+    # Once the user is back under quota the run is claimed as usual.
+    claimed = RunRepository.claim_next(
+        db, worker_id="worker-1", schedule_modes=[SCHEDULE_MODE]
+    )
+    assert claimed is over_quota
+    assert claimed.status == "claimed"
+
+
+def test_other_users_are_still_claimed(db: Session) -> None:
+    _queue_run(db, "user-over-quota")
+    other = _queue_run(db, "user-ok")
+
+    claimed = RunRepository.claim_next(
+        db,
+        worker_id="worker-1",
+        schedule_modes=[SCHEDULE_MODE],
+        exclude_user_ids=["user-over-quota"],
+    )
+
+    assert claimed is other
@@ -27,7 +27,7 @@ async def run_task(req: TaskRun, background_tasks: BackgroundTasks) -> dict:
     Returns:
         Accepted status with session ID.
     """
-    callback_client = CallbackClient(callback_url=req.callback_url)
+    callback_client = CallbackClient.create(req.callback_url)
     base_url = UserInputClient.resolve_base_url(
         callback_url=req.callback_url, callback_base_url=req.callback_base_url
     )
@@ -35,7 +35,7 @@ async def run_task(req: TaskRun, background_tasks: BackgroundTasks) -> dict:
     hooks = [
         WorkspaceHook(),
         TodoHook(),
-        CallbackHook(client=callback_client),
+        CallbackHook(client=callback_client, run_id=req.run_id),
         RunSnapshotHook(run_id=req.run_id),
     ]
     executor = AgentExecutor(
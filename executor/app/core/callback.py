@@ -1,4 +1,13 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import uuid
+from collections import deque
+
 import httpx
+from poco_shared.wire import WireEncoder
 
 from app.schemas.callback import AgentCallbackRequest
 from app.core.observability.request_context import (
@@ -8,23 +17,268 @@ from app.core.observability.request_context import (
     get_trace_id,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return float(raw.strip())
+    except Exception:
+        return default
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw.strip())
+    except Exception:
+        return default
+
+
+def _wire_encoder() -> WireEncoder:
+    wire_format = (os.getenv("CALLBACK_WIRE_FORMAT") or "json").strip().lower()
+    compression = (os.getenv("CALLBACK_COMPRESSION") or "auto").strip().lower()
+    return WireEncoder(
+        wire_format="msgpack" if wire_format == "msgpack" else "json",
+        compression=(
+            compression  # type: ignore[arg-type]
+            if compression in ("auto", "zstd", "gzip", "none")
+            else "auto"
+        ),
+        min_bytes=_env_int("CALLBACK_COMPRESSION_MIN_BYTES", 1024),
+    )
+
+
+def _trace_headers() -> dict[str, str]:
+    return {
+        "X-Request-ID": get_request_id() or generate_request_id(),
+        "X-Trace-ID": get_trace_id() or generate_trace_id(),
+    }
+
 
 class CallbackClient:
     def __init__(self, callback_url: str, timeout: float = 30.0):
         self.callback_url = callback_url
         self.timeout = timeout
+        # Starts as plain JSON; compression/msgpack once the manager advertises them.
+        self.encoder = _wire_encoder()
 
     async def send(self, report: AgentCallbackRequest) -> bool:
         try:
             async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    self.callback_url,
-                    json=report.model_dump(mode="json"),
-                    headers={
-                        "X-Request-ID": get_request_id() or generate_request_id(),
-                        "X-Trace-ID": get_trace_id() or generate_trace_id(),
-                    },
+                response = await self._post_encoded(
+                    client, self.callback_url, report.model_dump(mode="json")
                 )
                 return response.is_success
         except httpx.RequestError:
             return False
+
+    async def _post_encoded(
+        self, client: httpx.AsyncClient, url: str, payload: dict
+    ) -> httpx.Response:
+        for _ in range(2):
+            body, headers = self.encoder.encode(payload)
+            response = await client.post(
+                url, content=body, headers={**headers, **_trace_headers()}
+            )
+            if response.status_code != 415:
+                break
+            self.encoder.reject(response.headers)
+        self.encoder.observe(response.headers)
+        return response
+
+    async def close(self) -> bool:
+        return True
+
+    @staticmethod
+    def create(callback_url: str) -> "CallbackClient":
+        """Build the transport selected by CALLBACK_STREAM_ENABLED (default on)."""
+        if _env_bool("CALLBACK_STREAM_ENABLED", True):
+            return CallbackStreamClient(callback_url=callback_url)
+        return CallbackClient(callback_url=callback_url)
+
+
+class CallbackStreamClient(CallbackClient):
+    """Streams callbacks to Executor Manager over one keep-alive connection per run.
+
+    `send` only snapshots the report and queues it with a sequence number, so the agent
+    loop never waits on the network. A background sender posts everything queued so far
+    as one NDJSON request to `<callback_url>/stream`; Executor Manager replies
+    with the highest sequence it has durably accepted, and unacked events are resent
+    after a backoff (the manager drops sequences it has already seen). If the manager
+    has no stream endpoint, events fall back to one POST each to `callback_url`.
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        timeout: float = 30.0,
+        max_batch: int | None = None,
+        drain_timeout: float | None = None,
+    ):
+        super().__init__(callback_url=callback_url, timeout=timeout)
+        self.stream_url = f"{callback_url.rstrip('/')}/stream"
+        self.stream_id = uuid.uuid4().hex
+        self.max_batch = max(
+            1, int(max_batch or _env_float("CALLBACK_STREAM_MAX_BATCH", 200))
+        )
+        self.drain_timeout = (
+            drain_timeout
+            if drain_timeout is not None
+            else _env_float("CALLBACK_STREAM_DRAIN_TIMEOUT_SECONDS", 60)
+        )
+
+        self._next_seq = 1
+        self._acked = 0
+        self._pending: deque[tuple[int, bytes]] = deque()
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._drained.set()
+        self._sender: asyncio.Task[None] | None = None
+        self._client: httpx.AsyncClient | None = None
+        self._fallback = False
+        self._closed = False
+
+    async def send(self, report: AgentCallbackRequest) -> bool:
+        if self._closed:
+            return await super().send(report)
+        seq = self._next_seq
+        self._next_seq += 1
+        # Serialized now: the state the report points at keeps changing after send.
+        self._pending.append((seq, report.model_dump_json().encode("utf-8")))
+        self._drained.clear()
+        self._wakeup.set()
+        if self._sender is None:
+            self._sender = asyncio.create_task(
+                self._run(), name=f"callback-stream-{self.stream_id}"
+            )
+        return True
+
+    async def close(self) -> bool:
+        """Wait for queued events to be acked, then stop. False if some were dropped."""
+        self._closed = True
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "callback_stream_drain_timeout",
+                extra={"stream_id": self.stream_id, "pending": len(self._pending)},
+            )
+        if self._sender is not None:
+            self._sender.cancel()
+            await asyncio.gather(self._sender, return_exceptions=True)
+            self._sender = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        return not self._pending
+
+    async def _run(self) -> None:
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+        )
+        attempts = 0
+        while True:
+            if not self._pending:
+                self._drained.set()
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            batch = [
+                self._pending[i] for i in range(min(self.max_batch, len(self._pending)))
+            ]
+            try:
+                if self._fallback:
+                    acked = await self._post_each(batch)
+                else:
+                    acked = await self._post_stream(batch)
+                error = None
+            except (httpx.HTTPError, ValueError) as exc:
+                acked, error = self._acked, f"{type(exc).__name__}: {exc}"
+
+            while self._pending and self._pending[0][0] <= acked:
+                self._pending.popleft()
+            self._acked = max(self._acked, acked)
+
+            sent_all = not self._pending or self._pending[0][0] > batch[-1][0]
+            if error is None and sent_all:
+                attempts = 0
+                continue
+
+            attempts += 1
+            delay = min(10.0, 0.2 * 2 ** (attempts - 1)) * random.uniform(0.8, 1.2)
+            logger.warning(
+                "callback_stream_retry",
+                extra={
+                    "stream_id": self.stream_id,
+                    "acked": self._acked,
+                    "pending": len(self._pending),
+                    "attempt": attempts,
+                    "retry_in_seconds": round(delay, 2),
+                    "error": error,
+                },
+            )
+            await asyncio.sleep(delay)
+
+    async def _post_stream(self, batch: list[tuple[int, bytes]]) -> int:
+        assert self._client is not None
+        # Records are framed as they are sent, so the body never sits in memory whole.
+        size_hint = sum(len(callback) + 24 for _, callback in batch)
+        for _ in range(2):
+            body, headers = self.encoder.encode_stream_chunks(
+                (
+                    b'{"seq":%d,"callback":%b}' % (seq, callback)
+                    for seq, callback in batch
+                ),
+                size_hint=size_hint,
+            )
+            response = await self._client.post(
+                self.stream_url,
+                content=body,
+                headers={
+                    **headers,
+                    "X-Callback-Stream-ID": self.stream_id,
+                    **_trace_headers(),
+                },
+            )
+            if response.status_code != 415:
+                break
+            self.encoder.reject(response.headers)
+        self.encoder.observe(response.headers)
+
+        if response.status_code in (404, 405):
+            logger.warning(
+                "callback_stream_unsupported",
+                extra={"stream_id": self.stream_id, "status": response.status_code},
+            )
+            self._fallback = True
+            return await self._post_each(batch)
+        response.raise_for_status()
+        data = response.json().get("data") or {}
+        return int(data.get("ack") or 0)
+
+    async def _post_each(self, batch: list[tuple[int, bytes]]) -> int:
+        assert self._client is not None
+        acked = self._acked
+        for seq, callback in batch:
+            response = await self._post_encoded(
+                self._client, self.callback_url, json.loads(callback)
+            )
+            if not response.is_success:
+                break
+            acked = seq
+        return acked
@@ -1,3 +1,4 @@
+import os
 from typing import Any, Optional
 
 from claude_agent_sdk.types import ResultMessage, SystemMessage
@@ -6,14 +7,51 @@ from app.core.callback import CallbackClient
 from app.hooks.base import AgentHook, ExecutionContext
 from app.schemas.callback import AgentCallbackRequest
 from app.schemas.enums import CallbackStatus, TodoStatus
+from app.schemas.state import (
+    AgentCurrentState,
+    AgentStateDelta,
+    FileChange,
+    WorkspaceStateDelta,
+)
 from app.utils.serializer import serialize_message
 
 
+def _snapshot_interval() -> int:
+    try:
+        return max(1, int(os.getenv("CALLBACK_STATE_SNAPSHOT_INTERVAL", "50")))
+    except ValueError:
+        return 50
+
+
+def _group_file_changes(
+    state: AgentCurrentState,
+) -> dict[str, list[FileChange]]:
+    groups: dict[str, list[FileChange]] = {}
+    if state.workspace_state:
+        for change in state.workspace_state.file_changes:
+            groups.setdefault(change.path, []).append(change)
+    return groups
+
+
 class CallbackHook(AgentHook):
-    def __init__(self, client: CallbackClient):
+    """Reports progress to Executor Manager.
+
+    State goes out as versioned deltas against the previous report (changed todos and
+    the file entries of changed paths only), with a full `state_patch` snapshot on the
+    first report, every CALLBACK_STATE_SNAPSHOT_INTERVAL reports and at teardown.
+    """
+
+    def __init__(self, client: CallbackClient, run_id: Optional[str] = None):
         self.client = client
+        self.run_id = run_id
         self.execution_error: Optional[Exception] = None
         self.sdk_session_id: Optional[str] = None
+        self.snapshot_interval = _snapshot_interval()
+        self._state_version = 0
+        self._since_snapshot = 0
+        # Hooks replace state fields wholesale, so a shallow copy is a stable record
+        # of what was last reported.
+        self._sent_state: Optional[AgentCurrentState] = None
 
     def _build_report(
         self,
@@ -21,16 +59,99 @@ class CallbackHook(AgentHook):
         status: str,
         progress: int,
         new_message: Optional[Any] = None,
+        snapshot: bool = False,
     ) -> AgentCallbackRequest:
-        return AgentCallbackRequest(
+        state = context.current_state
+        report = AgentCallbackRequest(
             session_id=context.session_id,
+            run_id=self.run_id,
             status=status,
             progress=progress,
             new_message=serialize_message(new_message),
-            state_patch=context.current_state,
             sdk_session_id=self.sdk_session_id,
         )
 
+        if (
+            snapshot
+            or self._sent_state is None
+            or self._since_snapshot >= self.snapshot_interval
+        ):
+            self._state_version += 1
+            self._since_snapshot = 0
+            report.state_patch = state
+            report.state_version = self._state_version
+        else:
+            delta = self._diff_state(self._sent_state, state)
+            if delta is None:
+                return report
+            self._state_version += 1
+            self._since_snapshot += 1
+            report.state_delta = delta
+            report.state_version = self._state_version
+
+        self._sent_state = state.model_copy()
+        return report
+
+    def _diff_state(
+        self, previous: AgentCurrentState, current: AgentCurrentState
+    ) -> Optional[AgentStateDelta]:
+        todos = {
+            index: todo
+            for index, todo in enumerate(current.todos)
+            if index >= len(previous.todos) or previous.todos[index] != todo
+        }
+        mcp_status = (
+            current.mcp_status if current.mcp_status != previous.mcp_status else None
+        )
+
+        workspace_delta = None
+        workspace = current.workspace_state
+        if workspace is not None and workspace is not previous.workspace_state:
+            before = _group_file_changes(previous)
+            after = _group_file_changes(current)
+            changed = [
+                change
+                for path, changes in after.items()
+                if before.get(path) != changes
+                for change in changes
+            ]
+            removed = [path for path in before if path not in after]
+            previous_workspace = previous.workspace_state
+            if (
+                changed
+                or removed
+                or previous_workspace is None
+                or previous_workspace.repository != workspace.repository
+                or previous_workspace.branch != workspace.branch
+            ):
+                workspace_delta = WorkspaceStateDelta(
+                    repository=workspace.repository,
+                    branch=workspace.branch,
+                    total_added_lines=workspace.total_added_lines,
+                    total_deleted_lines=workspace.total_deleted_lines,
+                    last_change=workspace.last_change,
+                    file_changes=changed,
+                    removed_paths=removed,
+                )
+
+        if (
+            not todos
+            and len(current.todos) == len(previous.todos)
+            and mcp_status is None
+            and workspace_delta is None
+            and current.current_step == previous.current_step
+        ):
+            return None
+        return AgentStateDelta(
+            version=self._state_version + 1,
+            base_version=self._state_version,
+            todo_count=len(current.todos),
+            todos=todos,
+            mcp_status=mcp_status,
+            workspace_state=workspace_delta,
+            current_step=current.current_step,
+        )
+
     def _calculate_progress(self, todos) -> int:
         if not todos:
             return 0
@@ -67,8 +188,10 @@ class CallbackHook(AgentHook):
                 context=context,
                 status=status,
                 progress=progress,
+                snapshot=True,
             )
         )
+        await self.client.close()
 
     async def on_error(self, context: ExecutionContext, error: Exception):
         self.execution_error = error
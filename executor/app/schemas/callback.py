@@ -4,16 +4,19 @@ from typing import Any, Optional
 from pydantic import BaseModel, Field
 
 from app.schemas.enums import CallbackStatus
-from app.schemas.state import AgentCurrentState
+from app.schemas.state import AgentCurrentState, AgentStateDelta
 
 
 class AgentCallbackRequest(BaseModel):
     """Callback request sent during agent execution."""
 
     session_id: str
+    run_id: Optional[str] = None
     time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: CallbackStatus
     progress: int
     new_message: Optional[Any] = None
     state_patch: Optional[AgentCurrentState] = None
+    state_delta: Optional[AgentStateDelta] = None
+    state_version: Optional[int] = None
     sdk_session_id: Optional[str] = None
@@ -51,3 +51,31 @@ class AgentCurrentState(BaseModel):
     mcp_status: list[McpStatus] = Field(default_factory=list)
     workspace_state: WorkspaceState | None = None
     current_step: str | None = None
+
+
+class WorkspaceStateDelta(BaseModel):
+    """Workspace changes since the previous callback.
+
+    `file_changes` carries every entry for each path that changed (a path can be both
+    modified and staged); `removed_paths` lists paths that no longer have any entry.
+    """
+
+    repository: str | None = None
+    branch: str | None = None
+    total_added_lines: int = 0
+    total_deleted_lines: int = 0
+    last_change: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    file_changes: list[FileChange] = Field(default_factory=list)
+    removed_paths: list[str] = Field(default_factory=list)
+
+
+class AgentStateDelta(BaseModel):
+    """Changes to AgentCurrentState, applied on top of state version `base_version`."""
+
+    version: int
+    base_version: int
+    todo_count: int
+    todos: dict[int, TodoItem] = Field(default_factory=dict)
+    mcp_status: list[McpStatus] | None = None
+    workspace_state: WorkspaceStateDelta | None = None
+    current_step: str | None = None
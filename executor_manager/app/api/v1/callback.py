@@ -1,11 +1,15 @@
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Request
 from fastapi.responses import JSONResponse
 
-from app.schemas.callback import AgentCallbackRequest, CallbackReceiveResponse
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackReceiveResponse,
+    CallbackStreamAck,
+)
 from app.schemas.response import Response, ResponseSchema
-from app.services.callback_service import CallbackService
+from app.services.callback_service import CallbackService, callback_forwarder
 
 logger = logging.getLogger(__name__)
 
@@ -18,3 +22,21 @@ async def receive_callback(callback: AgentCallbackRequest) -> JSONResponse:
     """Receive callback from Executor and forward to Backend."""
     result = await callback_service.process_callback(callback)
     return Response.success(data=result.model_dump(), message="Callback received")
+
+
+@router.post("/stream", response_model=ResponseSchema[CallbackStreamAck])
+async def receive_callback_stream(
+    request: Request,
+    stream_id: str = Header(..., alias="X-Callback-Stream-ID"),
+) -> JSONResponse:
+    """Receive a chunked NDJSON stream of sequence-numbered callbacks from Executor."""
+    result = await callback_service.process_callback_stream(stream_id, request.stream())
+    return Response.success(
+        data=result.model_dump(), message="Callback stream received"
+    )
+
+
+@router.get("/queue", response_model=ResponseSchema[dict])
+async def get_callback_queue_stats() -> JSONResponse:
+    """Get callback spool and forwarding counters."""
+    return Response.success(data=callback_forwarder.stats())
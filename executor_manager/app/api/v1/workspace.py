@@ -1,29 +1,67 @@
-from fastapi import APIRouter, Query
-from fastapi.responses import FileResponse
+import asyncio
+import os
+
+from fastapi import APIRouter, Header, Query
 from fastapi.responses import JSONResponse
+from fastapi.responses import Response as HTTPResponse
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
 from app.schemas.response import Response, ResponseSchema
-from app.schemas.workspace import FileNode
+from app.schemas.workspace import (
+    FileNode,
+    WorkspaceDirListing,
+    WorkspaceForkRequest,
+    WorkspaceForkResult,
+)
+from app.services.callback_service import workspace_export_queue
+from app.services.workspace_cleanup_runner import workspace_cleanup_runner
 from app.services.workspace_manager import WorkspaceManager
+from app.utils.file_response import (
+    WorkspaceFileResponse,
+    etag_matches,
+    file_transfer_stats,
+    strong_file_etag,
+)
 
 router = APIRouter(prefix="/workspace", tags=["workspace"])
 workspace_manager = WorkspaceManager()
 
 
 @router.get("/stats", response_model=ResponseSchema[dict])
-async def get_workspace_stats() -> JSONResponse:
-    """Get workspace disk usage statistics."""
-    stats = workspace_manager.get_disk_usage()
+async def get_workspace_stats(
+    refresh: bool = Query(default=False),
+) -> JSONResponse:
+    """Get workspace disk usage statistics (cached; see `computed_at`)."""
+    if refresh:
+        stats = await asyncio.to_thread(workspace_manager.recount_disk_usage)
+    else:
+        stats = workspace_manager.get_disk_usage()
     return Response.success(data=stats)
 
 
-@router.get("/users/{user_id}", response_model=ResponseSchema[list])
+@router.get("/export-queue", response_model=ResponseSchema[dict])
+async def get_workspace_export_queue_stats() -> JSONResponse:
+    """Get workspace export queue depth and throughput counters."""
+    return Response.success(data=workspace_export_queue.stats())
+
+
+@router.get("/cleanup", response_model=ResponseSchema[dict])
+async def get_workspace_cleanup_stats() -> JSONResponse:
+    """Get progress of the running cleanup and stats of the last completed run."""
+    return Response.success(data=workspace_cleanup_runner.stats())
+
+
+@router.get("/users/{user_id}", response_model=ResponseSchema[dict])
 async def get_user_workspaces(user_id: str) -> JSONResponse:
-    """Get all workspaces for a user."""
+    """Get all workspaces for a user along with their quota usage."""
     workspaces = workspace_manager.get_user_workspaces(user_id)
-    return Response.success(data=workspaces)
+    return Response.success(
+        data={
+            "workspaces": workspaces,
+            "usage": workspace_manager.get_user_usage(user_id),
+        }
+    )
 
 
 @router.post("/archive/{user_id}/{session_id}", response_model=ResponseSchema[dict])
@@ -48,6 +86,18 @@ async def archive_workspace(
         raise AppException(error_code=ErrorCode.WORKSPACE_ARCHIVE_FAILED)
 
 
+@router.post("/fork", response_model=ResponseSchema[WorkspaceForkResult])
+async def fork_workspace(request: WorkspaceForkRequest) -> JSONResponse:
+    """Create a new session workspace as a copy-on-write clone of another."""
+    result = await asyncio.to_thread(
+        workspace_manager.fork_workspace,
+        request.user_id,
+        request.source_session_id,
+        request.target_session_id,
+    )
+    return Response.success(data=result, message="Workspace forked")
+
+
 @router.delete("/{user_id}/{session_id}", response_model=ResponseSchema[dict])
 async def delete_workspace(
     user_id: str,
@@ -82,21 +132,79 @@ async def list_workspace_files(user_id: str, session_id: str) -> JSONResponse:
     return Response.success(data=files)
 
 
+@router.get(
+    "/dir/{user_id}/{session_id}",
+    response_model=ResponseSchema[WorkspaceDirListing],
+)
+async def list_workspace_dir(
+    user_id: str,
+    session_id: str,
+    path: str = Query(default="/", description="Directory path within the workspace"),
+    cursor: str | None = Query(default=None),
+    limit: int = Query(default=500, ge=1, le=5000),
+    if_none_match: str | None = Header(default=None),
+) -> JSONResponse | HTTPResponse:
+    """List one workspace directory level (paginated, with ETag revalidation)."""
+    listing = workspace_manager.list_workspace_dir(
+        user_id=user_id,
+        session_id=session_id,
+        path=path,
+        cursor=cursor,
+        limit=limit,
+    )
+    if listing is None:
+        raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
+
+    etag = listing["etag"]
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return HTTPResponse(status_code=304, headers=headers)
+
+    response = Response.success(data=listing)
+    response.headers.update(headers)
+    return response
+
+
 @router.get("/file/{user_id}/{session_id}")
 async def get_workspace_file(
     user_id: str,
     session_id: str,
     path: str = Query(..., description="File path within the workspace"),
-) -> FileResponse:
-    """Serve a single file from workspace for preview/download."""
+    if_none_match: str | None = Header(default=None),
+) -> HTTPResponse:
+    """Serve a single file from workspace for preview/download.
+
+    Supports ETag revalidation (304) and Range requests for partial reads and tailing.
+    """
     file_path = workspace_manager.resolve_workspace_file(
         user_id=user_id, session_id=session_id, file_path=path
     )
     if not file_path:
         raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
 
-    return FileResponse(
+    try:
+        st = await asyncio.to_thread(os.stat, file_path)
+    except OSError:
+        raise AppException(error_code=ErrorCode.WORKSPACE_NOT_FOUND)
+
+    etag = strong_file_etag(st)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Accept-Ranges": "bytes"}
+    if etag_matches(if_none_match, etag):
+        file_transfer_stats.record(
+            file_size=st.st_size, bytes_sent=0, kind="not_modified"
+        )
+        return HTTPResponse(status_code=304, headers=headers)
+
+    return WorkspaceFileResponse(
         path=str(file_path),
+        stat_result=st,
+        headers=headers,
         filename=file_path.name,
         content_disposition_type="inline",
     )
+
+
+@router.get("/file-stats", response_model=ResponseSchema[dict])
+async def get_workspace_file_stats() -> JSONResponse:
+    """Get bytes served by file previews and bytes saved by 304s and ranges."""
+    return Response.success(data=file_transfer_stats.snapshot())
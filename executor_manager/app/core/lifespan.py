@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager, suppress
+from datetime import datetime, timezone
 
 from fastapi import FastAPI
 
@@ -13,6 +15,14 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     settings = get_settings()
 
+    from app.services.callback_service import (
+        callback_forwarder,
+        workspace_export_queue,
+    )
+
+    callback_forwarder.start()
+    workspace_export_queue.start()
+
     logger.info("Starting APScheduler...")
     scheduler.start()
     logger.info("APScheduler started")
@@ -46,6 +56,53 @@ async def lifespan(app: FastAPI):
         CleanupService(scheduler)
         logger.info("Workspace cleanup service initialized")
 
+    from app.services.workspace_manager import WorkspaceManager
+
+    usage_workspace_manager = WorkspaceManager()
+
+    async def recount_workspace_usage() -> None:
+        try:
+            await asyncio.to_thread(usage_workspace_manager.recount_disk_usage)
+        except Exception:
+            logger.exception("workspace_disk_usage_recount_failed")
+
+    scheduler.add_job(
+        recount_workspace_usage,
+        trigger="interval",
+        minutes=max(1, settings.workspace_usage_recount_interval_minutes),
+        id="recount-workspace-usage",
+        replace_existing=True,
+        next_run_time=datetime.now(timezone.utc),
+    )
+
+    if settings.workspace_user_soft_quota_mb > 0:
+        from app.scheduler.task_dispatcher import TaskDispatcher
+
+        async def enforce_workspace_quotas() -> None:
+            try:
+                container_pool = TaskDispatcher.get_container_pool()
+                live = await asyncio.to_thread(container_pool.list_live_session_ids)
+
+                def is_session_live(session_id: str) -> bool:
+                    return (
+                        session_id in live
+                        or session_id in container_pool.session_to_container
+                    )
+
+                await asyncio.to_thread(
+                    usage_workspace_manager.enforce_user_quotas, is_session_live
+                )
+            except Exception:
+                logger.exception("workspace_quota_enforcement_failed")
+
+        scheduler.add_job(
+            enforce_workspace_quotas,
+            trigger="interval",
+            minutes=max(1, settings.workspace_quota_check_interval_minutes),
+            id="enforce-workspace-quotas",
+            replace_existing=True,
+        )
+
     if settings.scheduled_tasks_enabled:
         from app.services.scheduled_task_dispatch_service import (
             ScheduledTaskDispatchService,
@@ -77,6 +134,19 @@ async def lifespan(app: FastAPI):
         await pull_service.shutdown()
         logger.info("Run pull service stopped")
 
+    if settings.workspace_cleanup_enabled:
+        from app.services.workspace_cleanup_runner import workspace_cleanup_runner
+
+        await workspace_cleanup_runner.shutdown()
+
+    logger.info("Draining workspace export queue...")
+    await workspace_export_queue.shutdown()
+    logger.info("Workspace export queue stopped")
+
+    logger.info("Draining callback forwarder...")
+    await callback_forwarder.shutdown()
+    logger.info("Callback forwarder stopped")
+
     logger.info("Shutting down APScheduler...")
     scheduler.shutdown()
     logger.info("APScheduler shut down")
@@ -0,0 +1,16 @@
+from poco_shared.wire_middleware import (
+    WireDecodingMiddleware as BaseWireDecodingMiddleware,
+)
+from starlette.types import ASGIApp
+
+from app.core.errors.error_codes import ErrorCode
+from app.schemas.response import Response
+
+
+class WireDecodingMiddleware(BaseWireDecodingMiddleware):
+    """Shared wire decoding, with errors in this service's response envelope."""
+
+    def error_response(self, message: str, *, status_code: int) -> ASGIApp:
+        return Response.error(
+            code=ErrorCode.BAD_REQUEST.code, message=message, status_code=status_code
+        )
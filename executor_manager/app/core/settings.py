@@ -1,4 +1,5 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -29,6 +30,41 @@ class Settings(BaseSettings):
     internal_api_token: str = Field(
         default="change-this-token-in-production", alias="INTERNAL_API_TOKEN"
     )
+    # Callbacks are acked to the executor once written to this local WAL and forwarded
+    # to Backend in the background (default: <WORKSPACE_ROOT>/callback_spool).
+    callback_spool_dir: str = Field(default="", alias="CALLBACK_SPOOL_DIR")
+    callback_spool_fsync: bool = Field(default=True, alias="CALLBACK_SPOOL_FSYNC")
+    callback_spool_segment_mb: int = Field(
+        default=16, alias="CALLBACK_SPOOL_SEGMENT_MB"
+    )
+    callback_forward_batch_size: int = Field(
+        default=50, alias="CALLBACK_FORWARD_BATCH_SIZE"
+    )
+    callback_forward_concurrency: int = Field(
+        default=8, alias="CALLBACK_FORWARD_CONCURRENCY"
+    )
+    callback_forward_max_backoff_seconds: float = Field(
+        default=30, alias="CALLBACK_FORWARD_MAX_BACKOFF_SECONDS"
+    )
+    # Rejections of one callback by Backend before it is moved to the dead-letter
+    # file; 0 retries forever.
+    callback_forward_max_attempts: int = Field(
+        default=20, alias="CALLBACK_FORWARD_MAX_ATTEMPTS"
+    )
+    callback_forward_drain_timeout_seconds: int = Field(
+        default=15, alias="CALLBACK_FORWARD_DRAIN_TIMEOUT_SECONDS"
+    )
+    # Body encoding for callbacks forwarded to Backend; compression is only used once
+    # Backend advertises it (Accept-Encoding) and for bodies of at least MIN_BYTES.
+    callback_forward_wire_format: Literal["json", "msgpack"] = Field(
+        default="json", alias="CALLBACK_FORWARD_WIRE_FORMAT"
+    )
+    callback_forward_compression: Literal["auto", "zstd", "gzip", "none"] = Field(
+        default="auto", alias="CALLBACK_FORWARD_COMPRESSION"
+    )
+    callback_forward_compression_min_bytes: int = Field(
+        default=1024, alias="CALLBACK_FORWARD_COMPRESSION_MIN_BYTES"
+    )
     task_pull_enabled: bool = Field(default=True, alias="TASK_PULL_ENABLED")
     # Backward compatible default pull interval (used when per-queue intervals are unset)
     task_pull_interval_seconds: int = Field(
@@ -121,6 +157,62 @@ class Settings(BaseSettings):
     workspace_ignore_dot_files: bool = Field(
         default=True, alias="WORKSPACE_IGNORE_DOT_FILES"
     )
+    workspace_cleanup_workers: int = Field(default=2, alias="WORKSPACE_CLEANUP_WORKERS")
+    # Bytes of workspace deleted/archived per second across all workers (0 = unlimited).
+    workspace_cleanup_io_budget_mb_per_second: int = Field(
+        default=100, alias="WORKSPACE_CLEANUP_IO_BUDGET_MB_PER_SECOND"
+    )
+    workspace_cleanup_checkpoint_interval_seconds: int = Field(
+        default=10, alias="WORKSPACE_CLEANUP_CHECKPOINT_INTERVAL_SECONDS"
+    )
+    workspace_usage_recount_interval_minutes: int = Field(
+        default=60, alias="WORKSPACE_USAGE_RECOUNT_INTERVAL_MINUTES"
+    )
+    # Per-user limits on active workspace disk usage (0 = unlimited). Over the soft limit
+    # idle workspaces are archived early; over the hard limit new runs are refused.
+    workspace_user_soft_quota_mb: int = Field(
+        default=0, alias="WORKSPACE_USER_SOFT_QUOTA_MB"
+    )
+    workspace_user_hard_quota_mb: int = Field(
+        default=0, alias="WORKSPACE_USER_HARD_QUOTA_MB"
+    )
+    workspace_quota_idle_minutes: int = Field(
+        default=30, alias="WORKSPACE_QUOTA_IDLE_MINUTES"
+    )
+    workspace_quota_check_interval_minutes: int = Field(
+        default=5, alias="WORKSPACE_QUOTA_CHECK_INTERVAL_MINUTES"
+    )
+    workspace_fork_workers: int = Field(default=8, alias="WORKSPACE_FORK_WORKERS")
+    # Hardlinks are not copy-on-write: in-place writes would show up in both sessions.
+    workspace_fork_allow_hardlinks: bool = Field(
+        default=False, alias="WORKSPACE_FORK_ALLOW_HARDLINKS"
+    )
+    # Format used by the cleanup job when archiving persistent workspaces.
+    workspace_archive_format: Literal["tar.gz", "tar.zst"] = Field(
+        default="tar.gz", alias="WORKSPACE_ARCHIVE_FORMAT"
+    )
+    # zstd tuning shared by every tar.zst writer (threads: -1 = one per CPU).
+    workspace_zstd_level: int = Field(default=3, alias="WORKSPACE_ZSTD_LEVEL")
+    workspace_zstd_threads: int = Field(default=-1, alias="WORKSPACE_ZSTD_THREADS")
+    workspace_export_upload_concurrency: int = Field(
+        default=8, alias="WORKSPACE_EXPORT_UPLOAD_CONCURRENCY"
+    )
+    workspace_export_archive_part_size_mb: int = Field(
+        default=8, alias="WORKSPACE_EXPORT_ARCHIVE_PART_SIZE_MB"
+    )
+    # When disabled, archive.zip is not built at export time; the backend assembles it
+    # from the per-file objects on the first download request.
+    workspace_export_archive_eager: bool = Field(
+        default=False, alias="WORKSPACE_EXPORT_ARCHIVE_EAGER"
+    )
+    # Format of the eager export archive; zip keeps downloads openable everywhere.
+    workspace_export_archive_format: Literal["zip", "tar.zst"] = Field(
+        default="zip", alias="WORKSPACE_EXPORT_ARCHIVE_FORMAT"
+    )
+    workspace_export_workers: int = Field(default=2, alias="WORKSPACE_EXPORT_WORKERS")
+    workspace_export_drain_timeout_seconds: int = Field(
+        default=120, alias="WORKSPACE_EXPORT_DRAIN_TIMEOUT_SECONDS"
+    )
     s3_endpoint: str | None = Field(default=None, alias="S3_ENDPOINT")
     s3_access_key: str | None = Field(default=None, alias="S3_ACCESS_KEY")
     s3_secret_key: str | None = Field(default=None, alias="S3_SECRET_KEY")
@@ -60,15 +60,42 @@ class AgentCurrentState(BaseModel):
     current_step: str | None = None
 
 
+class WorkspaceStateDelta(BaseModel):
+    """Workspace changes since the previous callback, grouped by path."""
+
+    repository: str | None = None
+    branch: str | None = None
+    total_added_lines: int = 0
+    total_deleted_lines: int = 0
+    last_change: datetime
+    file_changes: list[FileChange] = Field(default_factory=list)
+    removed_paths: list[str] = Field(default_factory=list)
+
+
+class AgentStateDelta(BaseModel):
+    """Changes to AgentCurrentState on top of state version `base_version`."""
+
+    version: int
+    base_version: int
+    todo_count: int
+    todos: dict[int, TodoItem] = Field(default_factory=dict)
+    mcp_status: list[McpStatus] | None = None
+    workspace_state: WorkspaceStateDelta | None = None
+    current_step: str | None = None
+
+
 class AgentCallbackRequest(BaseModel):
     """Agent execution callback request."""
 
     session_id: str
+    run_id: str | None = None
     time: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     status: CallbackStatus
     progress: int
     new_message: object | None = None
     state_patch: AgentCurrentState | None = None
+    state_delta: AgentStateDelta | None = None
+    state_version: int | None = None
     sdk_session_id: str | None = None
     workspace_files_prefix: str | None = None
     workspace_manifest_key: str | None = None
@@ -83,3 +110,14 @@ class CallbackReceiveResponse(BaseModel):
     session_id: str
     callback_status: CallbackStatus
     progress: int
+
+
+class CallbackStreamAck(BaseModel):
+    """Acknowledgement for one chunked NDJSON callback stream request."""
+
+    stream_id: str
+    ack: int  # highest sequence number durably accepted for this stream
+    received: int
+    duplicates: int = 0
+    rejected: int = 0
+    error: str | None = None
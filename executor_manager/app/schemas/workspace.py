@@ -10,6 +10,29 @@ class FileNode(BaseModel):
     path: str
     children: list["FileNode"] | None = None
     mimeType: str | None = None
+    etag: str | None = None
+
+
+class WorkspaceDirListing(BaseModel):
+    path: str
+    etag: str
+    entries: list[FileNode]
+    next_cursor: str | None = None
+
+
+class WorkspaceForkRequest(BaseModel):
+    user_id: str
+    source_session_id: str
+    target_session_id: str
+
+
+class WorkspaceForkResult(BaseModel):
+    session_id: str
+    source_session_id: str
+    method: Literal["reflink", "hardlink", "copy"]
+    files: int
+    bytes: int
+    duration_ms: int
 
 
 class WorkspaceExportResult(BaseModel):
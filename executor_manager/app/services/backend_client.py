@@ -1,6 +1,10 @@
+import logging
+
 import httpx
+from poco_shared.wire import WireEncoder
 
 from app.core.settings import get_settings
+from app.services.callback_forwarder import RetryableBatchError
 from app.core.observability.request_context import (
     generate_request_id,
     generate_trace_id,
@@ -8,6 +12,8 @@ from app.core.observability.request_context import (
     get_trace_id,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class BackendClient:
     """Client for communicating with the Backend service."""
@@ -15,6 +21,11 @@ class BackendClient:
     def __init__(self) -> None:
         self.settings = get_settings()
         self.base_url = self.settings.backend_url
+        self.callback_encoder = WireEncoder(
+            wire_format=self.settings.callback_forward_wire_format,
+            compression=self.settings.callback_forward_compression,
+            min_bytes=self.settings.callback_forward_compression_min_bytes,
+        )
 
     @staticmethod
     def _trace_headers() -> dict[str, str]:
@@ -49,23 +60,88 @@ class BackendClient:
     async def forward_callback(self, callback_data: dict) -> None:
         """Forward Executor callback to Backend."""
         async with httpx.AsyncClient() as client:
+            response = await self._post_callback(
+                client, "/api/v1/callback", callback_data
+            )
+            response.raise_for_status()
+
+    async def _post_callback(
+        self, client: httpx.AsyncClient, path: str, payload: dict
+    ) -> httpx.Response:
+        """POST with the negotiated callback encoding, downgrading once on 415."""
+        for _ in range(2):
+            body, headers = self.callback_encoder.encode(payload)
             response = await client.post(
-                f"{self.base_url}/api/v1/callback",
-                json=callback_data,
-                headers=self._trace_headers(),
+                f"{self.base_url}{path}",
+                content=body,
+                headers={**headers, **self._trace_headers()},
             )
+            if response.status_code != 415:
+                break
+            self.callback_encoder.reject(response.headers)
+        self.callback_encoder.observe(response.headers)
+        return response
+
+    async def forward_callbacks(self, callbacks: list[dict]) -> int:
+        """Forward a batch of callbacks for one session, in order.
+
+        Returns how many leading callbacks Backend processed; fewer than sent means
+        Backend rejected the next callback for its data. Falls back to one request
+        per callback when Backend has no batch endpoint. A batch Backend refuses as a
+        whole (a 4xx other than 408/429, e.g. a callback it cannot parse) counts as
+        none processed. Unreachable or failing Backend raises; a batch it stopped on
+        a transient failure raises RetryableBatchError.
+        """
+        async with httpx.AsyncClient() as client:
+            response = await self._post_callback(
+                client, "/api/v1/callback/batch", {"callbacks": callbacks}
+            )
+            if response.status_code in (404, 405):
+                processed = 0
+                for callback_data in callbacks:
+                    single = await self._post_callback(
+                        client, "/api/v1/callback", callback_data
+                    )
+                    if single.is_server_error or single.status_code in (408, 429):
+                        raise RetryableBatchError(
+                            processed, f"callback failed: HTTP {single.status_code}"
+                        )
+                    if single.is_error:
+                        break
+                    processed += 1
+                return processed
+
+            if response.is_client_error and response.status_code not in (408, 429):
+                logger.warning(
+                    "callback_batch_rejected",
+                    extra={
+                        "status_code": response.status_code,
+                        "batch_size": len(callbacks),
+                    },
+                )
+                return 0
             response.raise_for_status()
+            data = response.json().get("data") or {}
+            processed = int(data.get("processed", 0))
+            if data.get("retryable"):
+                raise RetryableBatchError(
+                    processed, str(data.get("error") or "callback batch interrupted")
+                )
+            return processed
 
     async def claim_run(
         self,
         worker_id: str,
         lease_seconds: int = 30,
         schedule_modes: list[str] | None = None,
+        exclude_user_ids: list[str] | None = None,
     ) -> dict | None:
-        """Claim next run from backend queue."""
+        """Claim next run from backend queue, skipping runs of `exclude_user_ids`."""
         payload: dict = {"worker_id": worker_id, "lease_seconds": lease_seconds}
         if schedule_modes:
             payload["schedule_modes"] = schedule_modes
+        if exclude_user_ids:
+            payload["exclude_user_ids"] = exclude_user_ids
 
         async with httpx.AsyncClient() as client:
             response = await client.post(
@@ -0,0 +1,323 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from app.core.settings import get_settings
+from app.services.callback_spool import CallbackSpool, SpoolRecord
+
+logger = logging.getLogger(__name__)
+
+
+# Sends payloads in order and returns how many leading payloads the backend accepted,
+# fewer meaning Backend rejected the next one; raises when the backend could not be
+# reached or failed in a way a retry may fix.
+SendBatchFn = Callable[[list[dict[str, Any]]], Awaitable[int]]
+
+
+class RetryableBatchError(Exception):
+    """Backend applied `accepted` leading callbacks, then failed transiently."""
+
+    def __init__(self, accepted: int, message: str) -> None:
+        super().__init__(message)
+        self.accepted = accepted
+
+
+class CallbackForwarder:
+    """Forwards spooled callbacks to Backend, batched and in order per session.
+
+    `submit` returns as soon as the callback is durably spooled. Each session has its
+    own FIFO; at most one batch per session is in flight, so ordering holds while other
+    sessions keep flowing. A failed batch only backs off its own session (exponential
+    with jitter) and is retried from the first undelivered callback.
+
+    Delivery is at-least-once: a batch whose response is lost, or a crash before the
+    ack reaches the spool, sends callbacks again. Each callback carries a
+    `callback_id` fixed when it is spooled, and Backend skips ids it already applied.
+    A callback Backend keeps rejecting is retried on its own and, after
+    `max_attempts` rejections, moved to the dead-letter file so the rest of its
+    session (and its spool segment) can move on. Unreachable or failing Backend
+    (transport errors, 5xx, retryable batch failures) is never dead-lettered.
+    """
+
+    def __init__(self, send_batch: SendBatchFn) -> None:
+        settings = get_settings()
+        self.send_batch = send_batch
+        self.batch_size = max(1, settings.callback_forward_batch_size)
+        self.concurrency = max(1, settings.callback_forward_concurrency)
+        self.max_backoff_seconds = max(
+            1.0, settings.callback_forward_max_backoff_seconds
+        )
+        self.drain_timeout_seconds = max(
+            0, settings.callback_forward_drain_timeout_seconds
+        )
+        self.max_attempts = max(0, settings.callback_forward_max_attempts)
+        spool_dir = settings.callback_spool_dir or str(
+            Path(settings.workspace_root) / "callback_spool"
+        )
+        self.dead_letter_path = Path(spool_dir) / "dead_letter.ndjson"
+        self.spool = CallbackSpool(
+            spool_dir,
+            fsync=settings.callback_spool_fsync,
+            segment_bytes=settings.callback_spool_segment_mb * 1024 * 1024,
+        )
+
+        self._sessions: dict[str, deque[SpoolRecord]] = {}
+        self._attempts: dict[str, int] = {}
+        # session id -> (seq of the rejected head callback, consecutive rejections)
+        self._rejections: dict[str, tuple[int, int]] = {}
+        self._scheduled: set[str] = set()
+        self._ready: asyncio.Queue[str] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._idle: asyncio.Event | None = None
+        self._stats = {
+            "spooled_total": 0,
+            "forwarded_total": 0,
+            "batches_total": 0,
+            "retries_total": 0,
+            "rejected_total": 0,
+            "dead_lettered_total": 0,
+        }
+        self._last_error: str | None = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._ready = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        for record in self.spool.open():
+            self._enqueue(record)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"callback-forwarder-{index}")
+            for index in range(self.concurrency)
+        ]
+        logger.info(
+            "callback_forwarder_started",
+            extra={"workers": self.concurrency, "pending": self.pending()},
+        )
+
+    async def submit(self, session_id: str, payload: dict[str, Any]) -> None:
+        """Spool a callback durably and queue it for forwarding."""
+        await self.submit_many([(session_id, payload)])
+
+    async def submit_many(self, items: list[tuple[str, dict[str, Any]]]) -> None:
+        """Spool `(session_id, payload)` callbacks in order with one group commit."""
+        if not items:
+            return
+        if not self._workers:
+            self.start()
+        records = await self.spool.append_many(
+            [
+                (
+                    session_id,
+                    {
+                        **payload,
+                        "callback_id": payload.get("callback_id") or uuid.uuid4().hex,
+                    },
+                )
+                for session_id, payload in items
+            ]
+        )
+        self._stats["spooled_total"] += len(records)
+        for record in records:
+            self._enqueue(record)
+
+    def pending(self) -> int:
+        return sum(len(records) for records in self._sessions.values())
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "workers": self.concurrency,
+            "pending": self.pending(),
+            "sessions": len(self._sessions),
+            "backing_off": sum(1 for n in self._attempts.values() if n > 0),
+            "last_error": self._last_error,
+            "dead_letter_path": str(self.dead_letter_path),
+            **self._stats,
+            "spool": self.spool.stats(),
+        }
+
+    async def shutdown(self) -> None:
+        """Try to deliver what is queued, then stop; undelivered callbacks stay spooled."""
+        if not self._workers or self._idle is None:
+            return
+        try:
+            await asyncio.wait_for(
+                self._idle.wait(), timeout=self.drain_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning("callback_forwarder_drain_timeout", extra=self.stats())
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await self.spool.close()
+
+    def _enqueue(self, record: SpoolRecord) -> None:
+        assert self._ready is not None and self._idle is not None
+        self._sessions.setdefault(record.session_id, deque()).append(record)
+        self._idle.clear()
+        self._schedule(record.session_id)
+
+    def _schedule(self, session_id: str) -> None:
+        # A session is either queued, in flight or backing off, never more than once.
+        if session_id in self._scheduled:
+            return
+        self._scheduled.add(session_id)
+        assert self._ready is not None
+        self._ready.put_nowait(session_id)
+
+    def _reschedule_later(self, session_id: str, delay: float) -> None:
+        def requeue() -> None:
+            self._scheduled.discard(session_id)
+            if self._sessions.get(session_id):
+                self._schedule(session_id)
+
+        asyncio.get_running_loop().call_later(delay, requeue)
+
+    async def _worker(self) -> None:
+        assert self._ready is not None
+        while True:
+            session_id = await self._ready.get()
+            queue = self._sessions.get(session_id)
+            if not queue:
+                self._scheduled.discard(session_id)
+                self._sessions.pop(session_id, None)
+                self._check_idle()
+                continue
+
+            # Once Backend rejects the head callback, send it alone until it goes
+            # through or is dead-lettered, so one bad callback is isolated.
+            limit = 1 if session_id in self._rejections else self.batch_size
+            batch = [queue[index] for index in range(min(limit, len(queue)))]
+            started = time.monotonic()
+            error: str | None = None
+            try:
+                accepted = await self.send_batch([record.payload for record in batch])
+            except RetryableBatchError as exc:
+                accepted = exc.accepted
+                error = f"{type(exc).__name__}: {exc}"
+            except Exception as exc:
+                accepted = 0
+                error = f"{type(exc).__name__}: {exc}"
+
+            accepted = max(0, min(accepted, len(batch)))
+            delivered = batch[:accepted]
+            for _ in delivered:
+                queue.popleft()
+            self.spool.ack(delivered)
+            self._stats["forwarded_total"] += len(delivered)
+            self._stats["batches_total"] += 1
+
+            retry = accepted < len(batch)
+            if retry and error is None:
+                rejected = batch[accepted]
+                previous = self._rejections.get(session_id)
+                count = (
+                    previous[1] + 1 if previous and previous[0] == rejected.seq else 1
+                )
+                self._rejections[session_id] = (rejected.seq, count)
+                self._stats["rejected_total"] += 1
+                if self.max_attempts and count >= self.max_attempts:
+                    if await self._dead_letter(rejected, count):
+                        queue.popleft()
+                        self.spool.ack([rejected])
+                        retry = False
+
+            if retry:
+                attempts = self._attempts.get(session_id, 0) + 1
+                self._attempts[session_id] = attempts
+                self._stats["retries_total"] += 1
+                self._last_error = error or "backend rejected a callback"
+                delay = min(self.max_backoff_seconds, 0.5 * 2 ** (attempts - 1))
+                delay *= random.uniform(0.8, 1.2)
+                logger.warning(
+                    "callback_forward_retry",
+                    extra={
+                        "session_id": session_id,
+                        "delivered": accepted,
+                        "remaining": len(queue),
+                        "attempt": attempts,
+                        "retry_in_seconds": round(delay, 2),
+                        "error": self._last_error,
+                    },
+                )
+                self._reschedule_later(session_id, delay)
+                continue
+
+            self._attempts.pop(session_id, None)
+            self._rejections.pop(session_id, None)
+            logger.debug(
+                "callback_batch_forwarded",
+                extra={
+                    "session_id": session_id,
+                    "count": accepted,
+                    "duration_ms": int((time.monotonic() - started) * 1000),
+                },
+            )
+            self._scheduled.discard(session_id)
+            if queue:
+                self._schedule(session_id)
+            else:
+                self._sessions.pop(session_id, None)
+                self._check_idle()
+
+    async def _dead_letter(self, record: SpoolRecord, rejections: int) -> bool:
+        """Append a callback Backend keeps rejecting to the dead-letter file."""
+        line = json.dumps(
+            {
+                "seq": record.seq,
+                "session_id": record.session_id,
+                "payload": record.payload,
+                "rejections": rejections,
+                "dead_lettered_at": datetime.now(timezone.utc).isoformat(),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        try:
+            await asyncio.to_thread(self._append_dead_letter, line)
+        except OSError:
+            logger.exception(
+                "callback_dead_letter_write_failed",
+                extra={"session_id": record.session_id, "seq": record.seq},
+            )
+            return False
+        self._stats["dead_lettered_total"] += 1
+        logger.error(
+            "callback_dead_lettered",
+            extra={
+                "session_id": record.session_id,
+                "seq": record.seq,
+                "callback_id": record.payload.get("callback_id"),
+                "rejections": rejections,
+                "path": str(self.dead_letter_path),
+            },
+        )
+        return True
+
+    def _append_dead_letter(self, line: str) -> None:
+        self.dead_letter_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.dead_letter_path, "a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+            fh.flush()
+            if self.spool.fsync:
+                os.fsync(fh.fileno())
+
+    def _check_idle(self) -> None:
+        if self._idle is not None and not self._sessions:
+            self._idle.set()
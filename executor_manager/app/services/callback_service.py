@@ -1,9 +1,21 @@
-import asyncio
+import json
 import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from datetime import datetime, timezone
+from typing import Any
 
-from app.schemas.callback import AgentCallbackRequest, CallbackReceiveResponse
+from pydantic import ValidationError
+
+from app.schemas.callback import (
+    AgentCallbackRequest,
+    CallbackReceiveResponse,
+    CallbackStreamAck,
+)
+from app.schemas.workspace import WorkspaceExportResult
 from app.services.backend_client import BackendClient
+from app.services.callback_forwarder import CallbackForwarder
+from app.services.workspace_export_queue import WorkspaceExportQueue
 from app.services.workspace_export_service import (
     WorkspaceExportService,
     workspace_manager,
@@ -16,9 +28,16 @@ backend_client = BackendClient()
 workspace_export_service = WorkspaceExportService()
 
 
+# Streams whose last acked sequence is remembered for de-duplicating resends.
+_MAX_TRACKED_STREAMS = 4096
+
+
 class CallbackService:
     """Service layer for callback processing."""
 
+    def __init__(self) -> None:
+        self._stream_acks: OrderedDict[str, int] = OrderedDict()
+
     @staticmethod
     def _is_ignored_workspace_path(path: str) -> bool:
         """Check whether a workspace-relative path should be ignored.
@@ -56,6 +75,8 @@ class CallbackService:
     def _filter_state_patch(
         cls, callback: AgentCallbackRequest
     ) -> AgentCallbackRequest:
+        if callback.state_delta is not None:
+            return cls._filter_state_delta(callback)
         state = callback.state_patch
         if not state or not state.workspace_state:
             return callback
@@ -84,6 +105,30 @@ class CallbackService:
         new_state = state.model_copy(update={"workspace_state": new_workspace_state})
         return callback.model_copy(update={"state_patch": new_state})
 
+    @classmethod
+    def _filter_state_delta(
+        cls, callback: AgentCallbackRequest
+    ) -> AgentCallbackRequest:
+        # Backend recomputes totals after merging, so only the entries are filtered.
+        delta = callback.state_delta
+        workspace_delta = delta.workspace_state if delta else None
+        if not workspace_delta or not workspace_delta.file_changes:
+            return callback
+
+        filtered_changes = [
+            fc
+            for fc in workspace_delta.file_changes
+            if not cls._is_ignored_workspace_path(fc.path)
+        ]
+        if len(filtered_changes) == len(workspace_delta.file_changes):
+            return callback
+
+        new_workspace_delta = workspace_delta.model_copy(
+            update={"file_changes": filtered_changes}
+        )
+        new_delta = delta.model_copy(update={"workspace_state": new_workspace_delta})
+        return callback.model_copy(update={"state_delta": new_delta})
+
     async def process_callback(
         self, callback: AgentCallbackRequest
     ) -> CallbackReceiveResponse:
@@ -96,11 +141,38 @@ class CallbackService:
             CallbackReceiveResponse with acknowledgment
 
         Raises:
-            AppException: If callback forwarding to backend fails
+            AppException: If the callback cannot be spooled for forwarding
         """
         from app.core.errors.error_codes import ErrorCode
         from app.core.errors.exceptions import AppException
 
+        callback, payload = self._prepare_callback(callback)
+        try:
+            # Ack once durably spooled; the forwarder delivers to Backend in order.
+            await callback_forwarder.submit(callback.session_id, payload)
+            await self._on_spooled(callback)
+
+            return CallbackReceiveResponse(
+                status="received",
+                session_id=callback.session_id,
+                callback_status=callback.status,
+                progress=callback.progress,
+            )
+
+        except Exception:
+            logger.exception(
+                "callback_spool_failed",
+                extra={"session_id": callback.session_id, "status": callback.status},
+            )
+            raise AppException(
+                error_code=ErrorCode.CALLBACK_FORWARD_FAILED,
+                message="Failed to spool callback for forwarding to backend",
+            )
+
+    def _prepare_callback(
+        self, callback: AgentCallbackRequest
+    ) -> tuple[AgentCallbackRequest, dict[str, Any]]:
+        """Logs and filters a callback; returns it with the payload to spool."""
         # High-frequency callbacks: keep RUNNING as DEBUG; only completed/failed stay at INFO.
         summary_level = (
             logging.INFO
@@ -137,61 +209,145 @@ class CallbackService:
                 },
             )
 
-        try:
-            payload_model = callback
-            if callback.status in ["completed", "failed"]:
-                payload_model = callback.model_copy(
-                    update={"workspace_export_status": "pending"}
-                )
-            payload = payload_model.model_dump(mode="json")
-
-            # Forward callback to backend
-            await backend_client.forward_callback(payload)
-
-            if callback.status in ["completed", "failed"]:
-                from app.scheduler.task_dispatcher import TaskDispatcher
-
-                logger.info(
-                    "task_terminal_callback_received",
-                    extra={
-                        "session_id": callback.session_id,
-                        "status": callback.status,
-                    },
-                )
-                asyncio.create_task(self._export_and_forward(callback))
-                await TaskDispatcher.on_task_complete(callback.session_id)
-
-            return CallbackReceiveResponse(
-                status="received",
-                session_id=callback.session_id,
-                callback_status=callback.status,
-                progress=callback.progress,
+        payload_model = callback
+        if callback.status in ["completed", "failed"]:
+            payload_model = callback.model_copy(
+                update={"workspace_export_status": "pending"}
             )
+        return callback, payload_model.model_dump(mode="json")
 
-        except Exception:
+    @staticmethod
+    async def _on_spooled(callback: AgentCallbackRequest) -> None:
+        """Starts the workspace export and frees the slot once a run has ended."""
+        if callback.status not in ["completed", "failed"]:
+            return
+        from app.scheduler.task_dispatcher import TaskDispatcher
+
+        logger.info(
+            "task_terminal_callback_received",
+            extra={
+                "session_id": callback.session_id,
+                "status": callback.status,
+            },
+        )
+        workspace_export_queue.enqueue(callback)
+        await TaskDispatcher.on_task_complete(callback.session_id)
+
+    async def process_callback_stream(
+        self, stream_id: str, chunks: AsyncIterator[bytes]
+    ) -> CallbackStreamAck:
+        """Process a chunked NDJSON stream of `{"seq", "callback"}` events.
+
+        Events are parsed as their lines complete and spooled together, in arrival
+        order, with one group commit once the request body ends. Sequences at or
+        below the stream's last ack are resends and are skipped; malformed events are
+        logged and acked so they are not resent forever. A malformed event without a
+        sequence ends parsing, and a failed spool acks nothing new, so the ack tells
+        the executor where to resume.
+        """
+        ack = self._stream_acks.get(stream_id, 0)
+        result = CallbackStreamAck(stream_id=stream_id, ack=ack, received=0)
+        # (seq, callback); None for a rejected event that is acked without spooling.
+        events: list[tuple[int, AgentCallbackRequest | None]] = []
+        last_seq = ack
+        buffer = b""
+        try:
+            async for chunk in chunks:
+                buffer += chunk
+                *lines, buffer = buffer.split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        last_seq = self._parse_stream_line(
+                            stream_id, line, result, events, last_seq
+                        )
+            if buffer.strip():
+                self._parse_stream_line(stream_id, buffer, result, events, last_seq)
+        except _StreamInterrupted as exc:
+            result.error = str(exc)
+
+        prepared = [self._prepare_callback(cb) for _, cb in events if cb is not None]
+        try:
+            await callback_forwarder.submit_many(
+                [(cb.session_id, payload) for cb, payload in prepared]
+            )
+        except Exception as exc:
             logger.exception(
-                "callback_forward_failed",
-                extra={"session_id": callback.session_id, "status": callback.status},
+                "callback_stream_spool_failed",
+                extra={"stream_id": stream_id, "events": len(prepared)},
             )
-            raise AppException(
-                error_code=ErrorCode.CALLBACK_FORWARD_FAILED,
-                message="Failed to forward callback to backend",
+            result.error = str(exc)
+            # Only rejected events ahead of the first unspooled one are done.
+            first = next(i for i, (_, cb) in enumerate(events) if cb is not None)
+            events = events[:first]
+            prepared = []
+
+        if events:
+            self._advance_stream(stream_id, max(seq for seq, _ in events), result)
+        for callback, _ in prepared:
+            try:
+                await self._on_spooled(callback)
+            except Exception:
+                logger.exception(
+                    "callback_stream_terminal_handling_failed",
+                    extra={"stream_id": stream_id, "session_id": callback.session_id},
+                )
+        return result
+
+    def _parse_stream_line(
+        self,
+        stream_id: str,
+        line: bytes,
+        result: CallbackStreamAck,
+        events: list[tuple[int, AgentCallbackRequest | None]],
+        last_seq: int,
+    ) -> int:
+        """Appends the event on `line` to `events`; returns the highest seq seen."""
+        result.received += 1
+        try:
+            event = json.loads(line)
+            seq = int(event["seq"])
+            callback = AgentCallbackRequest.model_validate(event["callback"])
+        except (ValueError, KeyError, TypeError, ValidationError) as exc:
+            seq = self._stream_event_seq(line)
+            logger.error(
+                "callback_stream_event_rejected",
+                extra={"stream_id": stream_id, "seq": seq, "error": str(exc)},
             )
+            result.rejected += 1
+            if seq is None:
+                raise _StreamInterrupted("Malformed stream event without a sequence")
+            events.append((seq, None))
+            return max(last_seq, seq)
+
+        if seq <= last_seq:
+            result.duplicates += 1
+            return last_seq
+        events.append((seq, callback))
+        return seq
+
+    def _advance_stream(
+        self, stream_id: str, seq: int, result: CallbackStreamAck
+    ) -> None:
+        result.ack = max(result.ack, seq)
+        self._stream_acks[stream_id] = result.ack
+        self._stream_acks.move_to_end(stream_id)
+        while len(self._stream_acks) > _MAX_TRACKED_STREAMS:
+            self._stream_acks.popitem(last=False)
 
-    async def _export_and_forward(self, callback: AgentCallbackRequest) -> None:
+    @staticmethod
+    def _stream_event_seq(line: bytes) -> int | None:
         try:
-            result = await asyncio.to_thread(
-                workspace_export_service.export_workspace, callback.session_id
-            )
-        except Exception:
-            logger.exception(
-                "workspace_export_failed",
-                extra={"session_id": callback.session_id},
-            )
-            result = None
+            return int(json.loads(line)["seq"])
+        except (ValueError, KeyError, TypeError):
+            return None
 
+    @staticmethod
+    async def _forward_export_result(
+        callback: AgentCallbackRequest, result: WorkspaceExportResult | None
+    ) -> None:
         payload_model = AgentCallbackRequest(
             session_id=callback.session_id,
+            run_id=callback.run_id,
             time=datetime.now(timezone.utc),
             status=callback.status,
             progress=100 if callback.status == "completed" else callback.progress,
@@ -206,9 +362,21 @@ class CallbackService:
         payload = payload_model.model_dump(mode="json")
 
         try:
-            await backend_client.forward_callback(payload)
+            # Spooled behind the session's terminal callback, so ordering is kept.
+            await callback_forwarder.submit(callback.session_id, payload)
         except Exception:
             logger.exception(
                 "workspace_export_callback_forward_failed",
                 extra={"session_id": callback.session_id},
             )
+
+
+class _StreamInterrupted(Exception):
+    pass
+
+
+callback_forwarder = CallbackForwarder(send_batch=backend_client.forward_callbacks)
+workspace_export_queue = WorkspaceExportQueue(
+    export_fn=workspace_export_service.export_workspace,
+    on_result=CallbackService._forward_export_result,
+)
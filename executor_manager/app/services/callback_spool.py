@@ -0,0 +1,236 @@
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpoolRecord:
+    seq: int
+    session_id: str
+    payload: dict[str, Any]
+    segment: int = 0
+
+
+@dataclass
+class _PendingWrite:
+    lines: list[str]
+    future: asyncio.Future[int] | None = None
+    records: list[SpoolRecord] = field(default_factory=list)
+
+
+class CallbackSpool:
+    """Append-only, segmented write-ahead log for callbacks awaiting forwarding.
+
+    Every record is one NDJSON line `{"seq", "session_id", "payload"}`; deliveries are
+    recorded as `{"ack": [seq, ...]}` lines. Concurrent appends are group-committed:
+    one writer thread writes everything queued so far and fsyncs once. Segments are
+    deleted in order once every record in them (and all older segments) is acked, so
+    an ack is never lost while the record it covers is still on disk.
+    """
+
+    def __init__(
+        self, directory: str | Path, *, fsync: bool = True, segment_bytes: int
+    ) -> None:
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.segment_bytes = max(1024 * 1024, segment_bytes)
+
+        self._next_seq = 1
+        self._segment = 0
+        self._file = None
+        self._outstanding: dict[int, int] = {}
+        self._queue: list[_PendingWrite] = []
+        self._writer: asyncio.Task[None] | None = None
+        self._bytes_spooled = 0
+
+    def open(self) -> list[SpoolRecord]:
+        """Replay existing segments and return the records not yet acked, in order."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        records: dict[int, SpoolRecord] = {}
+        acked: set[int] = set()
+        segments = self._segments()
+
+        for segment in segments:
+            path = self._segment_path(segment)
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            # A torn tail from a crash mid-write; later lines are fine.
+                            continue
+                        if "ack" in entry:
+                            acked.update(entry["ack"])
+                        elif "seq" in entry:
+                            records[entry["seq"]] = SpoolRecord(
+                                seq=entry["seq"],
+                                session_id=entry["session_id"],
+                                payload=entry["payload"],
+                                segment=segment,
+                            )
+            except OSError as e:
+                logger.error(f"Failed to read callback spool segment {path}: {e}")
+
+        pending = [records[seq] for seq in sorted(records) if seq not in acked]
+        for record in pending:
+            self._outstanding[record.segment] = (
+                self._outstanding.get(record.segment, 0) + 1
+            )
+        for segment in segments:
+            self._outstanding.setdefault(segment, 0)
+
+        self._next_seq = max(records, default=0) + 1
+        self._segment = max(segments, default=0) + 1
+        self._open_segment()
+        self._delete_acked_segments()
+
+        logger.info(
+            "callback_spool_opened",
+            extra={
+                "directory": str(self.directory),
+                "segments": len(segments),
+                "pending": len(pending),
+            },
+        )
+        return pending
+
+    async def append(self, session_id: str, payload: dict[str, Any]) -> SpoolRecord:
+        """Durably append one callback; returns once it is on disk."""
+        (record,) = await self.append_many([(session_id, payload)])
+        return record
+
+    async def append_many(
+        self, items: list[tuple[str, dict[str, Any]]]
+    ) -> list[SpoolRecord]:
+        """Durably append `(session_id, payload)` callbacks in order, in one write.
+
+        They land in the same group commit, so a whole batch costs one fsync; returns
+        once all of them are on disk.
+        """
+        if not items:
+            return []
+        records: list[SpoolRecord] = []
+        lines: list[str] = []
+        for session_id, payload in items:
+            record = SpoolRecord(
+                seq=self._next_seq, session_id=session_id, payload=payload
+            )
+            self._next_seq += 1
+            records.append(record)
+            lines.append(
+                json.dumps(
+                    {"seq": record.seq, "session_id": session_id, "payload": payload},
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                )
+            )
+        future: asyncio.Future[int] = asyncio.get_running_loop().create_future()
+        self._queue.append(_PendingWrite(lines=lines, future=future, records=records))
+        self._ensure_writer()
+        segment = await future
+        for record in records:
+            record.segment = segment
+        return records
+
+    def ack(self, records: list[SpoolRecord]) -> None:
+        """Mark records delivered. Acks ride along with the next group commit."""
+        if not records:
+            return
+        for record in records:
+            self._outstanding[record.segment] -= 1
+        self._queue.append(
+            _PendingWrite(
+                lines=[json.dumps({"ack": [record.seq for record in records]})]
+            )
+        )
+        self._ensure_writer()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "segments": len(self._outstanding),
+            "current_segment": self._segment,
+            "unacked": sum(self._outstanding.values()),
+            "bytes_spooled_total": self._bytes_spooled,
+        }
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            await self._writer
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_loop())
+
+    async def _write_loop(self) -> None:
+        while self._queue:
+            batch, self._queue = self._queue, []
+            assert self._file is not None
+            if self._file.tell() >= self.segment_bytes:
+                self._file.close()
+                self._segment += 1
+                self._open_segment()
+                self._delete_acked_segments()
+
+            data = "".join(line + "\n" for item in batch for line in item.lines).encode(
+                "utf-8"
+            )
+            try:
+                await asyncio.to_thread(self._write, data)
+            except Exception as exc:
+                logger.exception("callback_spool_write_failed")
+                for item in batch:
+                    if item.future and not item.future.done():
+                        item.future.set_exception(exc)
+                continue
+
+            self._bytes_spooled += len(data)
+            added = sum(len(item.records) for item in batch)
+            if added:
+                self._outstanding[self._segment] += added
+            for item in batch:
+                if item.future and not item.future.done():
+                    item.future.set_result(self._segment)
+
+    def _write(self, data: bytes) -> None:
+        assert self._file is not None
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _open_segment(self) -> None:
+        self._file = open(self._segment_path(self._segment), "ab")
+        self._outstanding.setdefault(self._segment, 0)
+
+    def _delete_acked_segments(self) -> None:
+        for segment in sorted(self._outstanding):
+            if segment >= self._segment or self._outstanding[segment] > 0:
+                break
+            try:
+                self._segment_path(segment).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to delete callback spool segment: {e}")
+                break
+            del self._outstanding[segment]
+
+    def _segments(self) -> list[int]:
+        segments = []
+        for path in self.directory.glob("segment-*.ndjson"):
+            try:
+                segments.append(int(path.stem.split("-", 1)[1]))
+            except ValueError:
+                continue
+        return sorted(segments)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"segment-{segment:012d}.ndjson"
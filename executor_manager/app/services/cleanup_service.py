@@ -1,8 +1,9 @@
 import logging
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from app.services.workspace_manager import WorkspaceManager
+from app.services.workspace_cleanup_runner import workspace_cleanup_runner
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +18,8 @@ class CleanupService:
             scheduler: APScheduler instance
         """
         self.scheduler = scheduler
-        self.workspace_manager = WorkspaceManager()
+        self.runner = workspace_cleanup_runner
+        self.workspace_manager = self.runner.workspace_manager
 
         self._schedule_cleanup_job()
 
@@ -32,20 +34,33 @@ class CleanupService:
             replace_existing=True,
         )
 
+        # Resume a run that was interrupted by a restart, shortly after startup.
+        if self.runner.has_unfinished_run():
+            self.scheduler.add_job(
+                self.cleanup_expired_workspaces,
+                trigger="date",
+                run_date=datetime.now(timezone.utc) + timedelta(minutes=1),
+                id="resume-cleanup-workspaces",
+                replace_existing=True,
+            )
+            logger.info("Interrupted workspace cleanup will resume in 1 minute")
+
         logger.info("Cleanup service initialized, scheduled daily at 02:00")
 
     async def cleanup_expired_workspaces(self) -> None:
-        """Clean up expired workspaces."""
+        """Clean up expired workspaces on the cleanup process pool."""
         logger.info("Starting workspace cleanup...")
 
         try:
-            stats = self.workspace_manager.cleanup_expired_workspaces()
+            stats = await self.runner.run()
+            if stats is None:
+                return
 
             logger.info(
-                f"Workspace cleanup completed: "
+                f"Workspace cleanup {'completed' if stats['completed'] else 'paused'}: "
                 f"cleaned={stats['cleaned']}, "
                 f"archived={stats['archived']}, "
-                f"errors={stats['errors']}"
+                f"errors={stats['error']}"
             )
 
             usage = self.workspace_manager.get_disk_usage()
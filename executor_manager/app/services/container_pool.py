@@ -365,6 +365,25 @@ class ContainerPool:
             except Exception as e:
                 logger.error(f"Failed to stop container {container_id}: {e}")
 
+    def list_live_session_ids(self) -> set[str]:
+        """Sessions bound to a container here or running one under this manager.
+
+        Docker is asked as well, so containers started before a restart or by another
+        manager process still count. Blocking; call it off the event loop.
+        """
+        live = set(self.session_to_container)
+        for container in list(self.containers.values()):
+            session_id = container.labels.get("session_id")
+            if session_id:
+                live.add(session_id)
+        for container in self.docker_client.containers.list(
+            filters={"label": "owner=executor_manager"}
+        ):
+            session_id = container.labels.get("session_id")
+            if session_id:
+                live.add(session_id)
+        return live
+
     def get_container_stats(self) -> dict[str, int | list[dict]]:
         """Get container statistics."""
         persistent = 0
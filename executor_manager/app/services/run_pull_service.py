@@ -14,6 +14,7 @@ from app.services.config_resolver import ConfigResolver
 from app.services.skill_stager import SkillStager
 from app.services.attachment_stager import AttachmentStager
 from app.services.slash_command_stager import SlashCommandStager
+from app.services.workspace_manager import WorkspaceManager
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,7 @@ class RunPullService:
         self.skill_stager = SkillStager()
         self.attachment_stager = AttachmentStager()
         self.slash_command_stager = SlashCommandStager()
+        self.workspace_manager = WorkspaceManager()
 
         self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
         self._semaphore = asyncio.Semaphore(self.settings.max_concurrent_tasks)
@@ -119,11 +121,15 @@ class RunPullService:
             await self._semaphore.acquire()
 
             try:
+                # Users over the hard workspace quota are not claimed at all; their
+                # runs stay queued until usage drops back under it.
+                over_quota = self.workspace_manager.users_over_hard_quota()
                 step_started = time.perf_counter()
                 claim = await self.backend_client.claim_run(
                     worker_id=self.worker_id,
                     lease_seconds=lease_seconds,
                     schedule_modes=schedule_modes,
+                    exclude_user_ids=over_quota,
                 )
                 if claim:
                     logger.info(
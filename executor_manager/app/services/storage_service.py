@@ -5,6 +5,7 @@ from typing import Any, Iterable
 import boto3
 from botocore.config import Config
 from botocore.exceptions import BotoCoreError, ClientError
+from poco_shared.s3_multipart import S3MultipartWriter as BaseS3MultipartWriter
 
 from app.core.errors.error_codes import ErrorCode
 from app.core.errors.exceptions import AppException
@@ -96,6 +97,22 @@ class S3StorageService:
                 details={"key": key, "error": str(exc)},
             ) from exc
 
+    def open_multipart_writer(
+        self,
+        *,
+        key: str,
+        content_type: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+    ) -> "S3MultipartWriter":
+        """Open a write-only stream that uploads to `key` as a multipart upload."""
+        return S3MultipartWriter.start(
+            client=self.client,
+            bucket=self.bucket,
+            key=key,
+            content_type=content_type,
+            part_size=part_size,
+        )
+
     def list_objects(self, prefix: str) -> Iterable[str]:
         try:
             paginator = self.client.get_paginator("list_objects_v2")
@@ -152,3 +169,15 @@ class S3StorageService:
                 details={"relative": relative},
             )
         return target
+
+
+class S3MultipartWriter(BaseS3MultipartWriter):
+    """Multipart upload writer that fails with this service's AppException."""
+
+    @classmethod
+    def _error(cls, message: str, details: dict[str, Any]) -> Exception:
+        return AppException(
+            error_code=ErrorCode.EXTERNAL_SERVICE_ERROR,
+            message=message,
+            details=details,
+        )
@@ -0,0 +1,293 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from app.core.settings import get_settings
+from app.services.workspace_manager import CleanupAction, WorkspaceManager
+
+logger = logging.getLogger(__name__)
+
+
+_worker_manager: WorkspaceManager | None = None
+
+
+def _init_cleanup_worker() -> None:
+    """Lower the worker's CPU priority so cleanup yields to request handling."""
+    try:
+        os.nice(10)
+    except (AttributeError, OSError):
+        pass
+
+
+def _expire_in_worker(
+    user_id: str, session_id: str, cutoff_iso: str
+) -> tuple[CleanupAction, int]:
+    global _worker_manager
+    if _worker_manager is None:
+        _worker_manager = WorkspaceManager()
+    return _worker_manager.expire_workspace(
+        user_id, session_id, cutoff=datetime.fromisoformat(cutoff_iso)
+    )
+
+
+class WorkspaceCleanupRunner:
+    """Runs expired-workspace cleanup on a process pool, off the event loop.
+
+    Sessions are expired in parallel by WORKSPACE_CLEANUP_WORKERS processes, throttled to
+    an I/O budget (bytes of workspace deleted or archived per second). Completed sessions
+    are checkpointed to index/cleanup_checkpoint.json, so a run interrupted by shutdown or
+    a crash resumes with the same cutoff instead of starting over.
+    """
+
+    def __init__(self, workspace_manager: WorkspaceManager | None = None) -> None:
+        settings = get_settings()
+        self.workspace_manager = workspace_manager or WorkspaceManager()
+        self.max_age_hours = settings.workspace_max_age_hours
+        self.worker_count = max(1, settings.workspace_cleanup_workers)
+        self.io_budget_bytes_per_second = (
+            max(0, settings.workspace_cleanup_io_budget_mb_per_second) * 1024 * 1024
+        )
+        self.checkpoint_interval_seconds = max(
+            1, settings.workspace_cleanup_checkpoint_interval_seconds
+        )
+        self.checkpoint_file = (
+            self.workspace_manager.base_dir / "index" / "cleanup_checkpoint.json"
+        )
+
+        self._running = False
+        self._stopping = False
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._progress: dict[str, int | str | None] | None = None
+        self._last_run: dict[str, int | str | bool | None] | None = None
+
+    def has_unfinished_run(self) -> bool:
+        checkpoint = self._read_checkpoint()
+        return bool(checkpoint and checkpoint.get("run"))
+
+    def stats(self) -> dict:
+        if self._last_run is None:
+            checkpoint = self._read_checkpoint() or {}
+            self._last_run = checkpoint.get("last_run")
+        return {
+            "workers": self.worker_count,
+            "io_budget_mb_per_second": self.io_budget_bytes_per_second // (1024 * 1024),
+            "running": self._running,
+            "current_run": dict(self._progress) if self._progress else None,
+            "last_run": self._last_run,
+        }
+
+    async def run(self) -> dict | None:
+        """Expire every workspace older than the cutoff; returns the run stats."""
+        if self._running:
+            logger.info("workspace_cleanup_already_running")
+            return None
+        self._running = True
+        self._stopping = False
+        self._idle.clear()
+        try:
+            return await self._run()
+        finally:
+            self._running = False
+            self._progress = None
+            self._idle.set()
+
+    async def shutdown(self, timeout: float = 30) -> None:
+        """Stop submitting sessions and wait for in-flight ones to be checkpointed."""
+        if not self._running:
+            return
+        self._stopping = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("workspace_cleanup_shutdown_timeout")
+
+    async def _run(self) -> dict:
+        checkpoint = await asyncio.to_thread(self._read_checkpoint) or {}
+        run = checkpoint.get("run")
+        if run:
+            done: set[str] = set(run.get("done") or [])
+            logger.info(
+                "workspace_cleanup_resuming",
+                extra={"run_id": run["run_id"], "done": len(done)},
+            )
+        else:
+            now = datetime.now()
+            run = {
+                "run_id": uuid.uuid4().hex,
+                "started_at": now.isoformat(),
+                "cutoff": (now - timedelta(hours=self.max_age_hours)).isoformat(),
+                "counts": {"cleaned": 0, "archived": 0, "skipped": 0, "error": 0},
+                "bytes_reclaimed": 0,
+                "archive_bytes": 0,
+                "duration_ms": 0,
+            }
+            done = set()
+        counts: dict[str, int] = run["counts"]
+
+        candidates = [
+            (user_id, session_id)
+            for user_id, session_id in await asyncio.to_thread(
+                self.workspace_manager.list_cleanup_candidates
+            )
+            if session_id not in done
+        ]
+        self._progress = {
+            "run_id": run["run_id"],
+            "started_at": run["started_at"],
+            "total": len(candidates) + len(done),
+            "processed": len(done),
+        }
+        logger.info(
+            "workspace_cleanup_started",
+            extra={"run_id": run["run_id"], "sessions": len(candidates)},
+        )
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        last_checkpoint = started
+        budget_bytes = 0
+        in_flight: dict[asyncio.Future, tuple[str, int]] = {}
+        interrupted = False
+
+        def record(future: asyncio.Future) -> None:
+            nonlocal budget_bytes, interrupted
+            session_id, size = in_flight.pop(future)
+            try:
+                action, archive_bytes = future.result()
+            except BrokenProcessPool:
+                # Not marked done: the session is retried when the run resumes.
+                logger.error(
+                    "workspace_cleanup_pool_broken", extra={"session_id": session_id}
+                )
+                interrupted = True
+                return
+            except Exception:
+                logger.exception(
+                    "workspace_cleanup_worker_failed", extra={"session_id": session_id}
+                )
+                action, archive_bytes = "error", 0
+            counts[action] = counts.get(action, 0) + 1
+            if action in ("cleaned", "archived"):
+                budget_bytes += size
+                run["bytes_reclaimed"] += size
+                run["archive_bytes"] += archive_bytes
+            self.workspace_manager.apply_cleanup_outcome(
+                session_id, action, archive_bytes
+            )
+            done.add(session_id)
+            self._progress["processed"] = len(done)
+
+        pool = ProcessPoolExecutor(
+            max_workers=self.worker_count,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_cleanup_worker,
+        )
+        try:
+            for user_id, session_id in candidates:
+                if self._stopping or interrupted:
+                    break
+                while len(in_flight) >= self.worker_count:
+                    finished, _ = await asyncio.wait(
+                        in_flight, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for future in finished:
+                        record(future)
+                await self._throttle(budget_bytes, started)
+
+                if (
+                    time.monotonic() - last_checkpoint
+                    >= self.checkpoint_interval_seconds
+                ):
+                    await self._save_run(run, done, started)
+                    last_checkpoint = time.monotonic()
+
+                try:
+                    pool_future: Future = pool.submit(
+                        _expire_in_worker, user_id, session_id, run["cutoff"]
+                    )
+                except BrokenProcessPool:
+                    logger.error("workspace_cleanup_pool_broken")
+                    interrupted = True
+                    break
+                size = self.workspace_manager.get_session_usage(session_id) or 0
+                in_flight[asyncio.wrap_future(pool_future, loop=loop)] = (
+                    session_id,
+                    size,
+                )
+
+            if in_flight:
+                finished, _ = await asyncio.wait(in_flight)
+                for future in finished:
+                    record(future)
+        finally:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+        completed = not (self._stopping or interrupted)
+        stats = {
+            "run_id": run["run_id"],
+            "started_at": run["started_at"],
+            "cutoff": run["cutoff"],
+            "completed": completed,
+            "sessions": len(done),
+            **counts,
+            "bytes_reclaimed": run["bytes_reclaimed"],
+            "archive_bytes": run["archive_bytes"],
+            "duration_ms": run["duration_ms"]
+            + int((time.monotonic() - started) * 1000),
+        }
+        if completed:
+            await asyncio.to_thread(self._write_checkpoint, {"last_run": stats})
+            self._last_run = stats
+            logger.info("workspace_cleanup_completed", extra=stats)
+        else:
+            await self._save_run(run, done, started)
+            logger.info("workspace_cleanup_interrupted", extra=stats)
+        return stats
+
+    async def _throttle(self, budget_bytes: int, started: float) -> None:
+        if not self.io_budget_bytes_per_second:
+            return
+        ahead = budget_bytes / self.io_budget_bytes_per_second - (
+            time.monotonic() - started
+        )
+        if ahead > 0:
+            await asyncio.sleep(ahead)
+
+    async def _save_run(self, run: dict, done: set[str], started: float) -> None:
+        snapshot = {
+            **run,
+            "counts": dict(run["counts"]),
+            "done": sorted(done),
+            "duration_ms": run["duration_ms"]
+            + int((time.monotonic() - started) * 1000),
+        }
+        await asyncio.to_thread(
+            self._write_checkpoint, {"run": snapshot, "last_run": self._last_run}
+        )
+
+    def _read_checkpoint(self) -> dict | None:
+        try:
+            return json.loads(self.checkpoint_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_checkpoint(self, data: dict) -> None:
+        path: Path = self.checkpoint_file
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cleanup checkpoint: {e}")
+
+
+workspace_cleanup_runner = WorkspaceCleanupRunner()
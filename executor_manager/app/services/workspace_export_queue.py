@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.settings import get_settings
+from app.schemas.callback import AgentCallbackRequest
+from app.schemas.workspace import WorkspaceExportResult
+
+logger = logging.getLogger(__name__)
+
+
+ExportFn = Callable[[str], WorkspaceExportResult]
+ResultHandler = Callable[
+    [AgentCallbackRequest, WorkspaceExportResult | None], Awaitable[None]
+]
+
+
+class WorkspaceExportQueue:
+    """Bounded, per-session deduplicated queue for terminal workspace exports.
+
+    Exports run on a dedicated thread pool sized by WORKSPACE_EXPORT_WORKERS so a burst
+    of completed runs cannot starve the event loop's default executor. A session has at
+    most one export running and one pending; a newer callback replaces the pending one.
+    """
+
+    def __init__(self, export_fn: ExportFn, on_result: ResultHandler) -> None:
+        settings = get_settings()
+        self.export_fn = export_fn
+        self.on_result = on_result
+        self.worker_count = max(1, settings.workspace_export_workers)
+        self.drain_timeout_seconds = max(
+            0, settings.workspace_export_drain_timeout_seconds
+        )
+
+        self._queue: asyncio.Queue[str] | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self._pending: dict[str, tuple[AgentCallbackRequest, float]] = {}
+        self._running: set[str] = set()
+        self._stats = {
+            "enqueued_total": 0,
+            "superseded_total": 0,
+            "completed_total": 0,
+            "failed_total": 0,
+        }
+        self._last_duration_ms: int | None = None
+        self._last_wait_ms: int | None = None
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.worker_count,
+            thread_name_prefix="workspace-export-worker",
+        )
+        self._workers = [
+            asyncio.create_task(self._worker(index), name=f"workspace-export-{index}")
+            for index in range(self.worker_count)
+        ]
+        logger.info(
+            "workspace_export_queue_started", extra={"workers": self.worker_count}
+        )
+
+    def enqueue(self, callback: AgentCallbackRequest) -> None:
+        """Schedule an export for the callback's session, superseding any pending one."""
+        self.start()
+        assert self._queue is not None
+
+        session_id = callback.session_id
+        self._stats["enqueued_total"] += 1
+        already_pending = session_id in self._pending
+        if already_pending:
+            self._stats["superseded_total"] += 1
+        self._pending[session_id] = (callback, time.monotonic())
+
+        # Running sessions are re-queued by their worker once the current export ends.
+        if not already_pending and session_id not in self._running:
+            self._queue.put_nowait(session_id)
+
+        logger.debug(
+            "workspace_export_enqueued",
+            extra={
+                "session_id": session_id,
+                "superseded": already_pending,
+                "queue_depth": len(self._pending),
+            },
+        )
+
+    def stats(self) -> dict[str, int | float | None]:
+        now = time.monotonic()
+        oldest = min((queued for _, queued in self._pending.values()), default=None)
+        return {
+            "workers": self.worker_count,
+            "queue_depth": len(self._pending),
+            "in_flight": len(self._running),
+            "oldest_pending_seconds": (
+                round(now - oldest, 3) if oldest is not None else None
+            ),
+            "last_wait_ms": self._last_wait_ms,
+            "last_duration_ms": self._last_duration_ms,
+            **self._stats,
+        }
+
+    async def shutdown(self) -> None:
+        """Drain queued exports (bounded by the drain timeout), then stop workers."""
+        if not self._workers or self._queue is None:
+            return
+
+        logger.info("workspace_export_queue_draining", extra=self.stats())
+        try:
+            await asyncio.wait_for(
+                self._queue.join(), timeout=self.drain_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning("workspace_export_queue_drain_timeout", extra=self.stats())
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._queue = None
+
+    async def _worker(self, index: int) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            session_id = await queue.get()
+            try:
+                entry = self._pending.pop(session_id, None)
+                if entry is None:
+                    continue
+                callback, queued_at = entry
+                self._running.add(session_id)
+                started = time.monotonic()
+                self._last_wait_ms = int((started - queued_at) * 1000)
+
+                result: WorkspaceExportResult | None
+                try:
+                    result = await loop.run_in_executor(
+                        self._executor, self.export_fn, session_id
+                    )
+                except Exception:
+                    logger.exception(
+                        "workspace_export_failed",
+                        extra={"session_id": session_id, "worker": index},
+                    )
+                    result = None
+
+                if result is None or result.workspace_export_status != "ready":
+                    self._stats["failed_total"] += 1
+                else:
+                    self._stats["completed_total"] += 1
+                self._last_duration_ms = int((time.monotonic() - started) * 1000)
+
+                try:
+                    await self.on_result(callback, result)
+                except Exception:
+                    logger.exception(
+                        "workspace_export_result_handler_failed",
+                        extra={"session_id": session_id},
+                    )
+            finally:
+                self._running.discard(session_id)
+                if session_id in self._pending:
+                    queue.put_nowait(session_id)
+                queue.task_done()
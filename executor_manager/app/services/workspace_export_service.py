@@ -2,14 +2,22 @@ import json
 import logging
 import mimetypes
 import os
+import shutil
+import stat
+import tarfile
+import time
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 
 from app.core.errors.exceptions import AppException
+from app.core.settings import get_settings
 from app.schemas.workspace import WorkspaceExportResult
-from app.services.storage_service import S3StorageService
+from app.services.storage_service import S3MultipartWriter, S3StorageService
 from app.services.workspace_manager import WorkspaceManager
+from app.utils.archive import ARCHIVE_CONTENT_TYPES, open_tar_stream
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +25,33 @@ logger = logging.getLogger(__name__)
 workspace_manager = WorkspaceManager()
 storage_service = S3StorageService()
 
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ExportFile:
+    """A workspace file captured during the single export walk."""
+
+    path: Path
+    rel_path: str
+    size: int
+    mtime: float
+    mode: int
+    mime_type: str | None
+
 
 class WorkspaceExportService:
+    def __init__(self) -> None:
+        settings = get_settings()
+        self.upload_concurrency = max(1, settings.workspace_export_upload_concurrency)
+        self.archive_part_size = (
+            max(5, settings.workspace_export_archive_part_size_mb) * 1024 * 1024
+        )
+        self.archive_eager = settings.workspace_export_archive_eager
+        self.archive_format = settings.workspace_export_archive_format
+        self.zstd_level = settings.workspace_zstd_level
+        self.zstd_threads = settings.workspace_zstd_threads
+
     def export_workspace(self, session_id: str) -> WorkspaceExportResult:
         user_id = workspace_manager.resolve_user_id(session_id)
         if not user_id:
@@ -39,62 +72,73 @@ class WorkspaceExportService:
         prefix = f"workspaces/{user_id}/{session_id}"
         files_prefix = f"{prefix}/files"
         manifest_key = f"{prefix}/manifest.json"
-        archive_key = f"{prefix}/archive.zip"
+        archive_key = (
+            f"{prefix}/archive.{self.archive_format}" if self.archive_eager else None
+        )
 
         try:
-            files = self._collect_files(workspace_dir)
+            started = time.monotonic()
+            files, usage_bytes = self._collect_files(workspace_dir)
+            workspace_manager.record_session_usage(user_id, session_id, usage_bytes)
+
+            # Per-file uploads run on a bounded pool while this thread streams the
+            # (optional) eager archive, so files are never staged on disk.
+            with ThreadPoolExecutor(
+                max_workers=self.upload_concurrency,
+                thread_name_prefix="workspace-export",
+            ) as pool:
+                futures = [
+                    pool.submit(
+                        storage_service.upload_file,
+                        file_path=str(item.path),
+                        key=f"{files_prefix}/{item.rel_path}",
+                        content_type=item.mime_type,
+                    )
+                    for item in files
+                ]
+                try:
+                    if archive_key:
+                        self._stream_archive(archive_key=archive_key, files=files)
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+
             manifest = {
                 "version": 1,
                 "generated_at": datetime.now(timezone.utc).isoformat(),
-                "files": [],
-            }
-
-            for file_path in files:
-                rel_path = file_path.relative_to(workspace_dir).as_posix()
-                object_key = f"{files_prefix}/{rel_path}"
-                mime_type, _ = mimetypes.guess_type(file_path.name)
-
-                storage_service.upload_file(
-                    file_path=str(file_path),
-                    key=object_key,
-                    content_type=mime_type,
-                )
-
-                manifest["files"].append(
+                "files": [
                     {
-                        "path": rel_path,
-                        "key": object_key,
-                        "size": file_path.stat().st_size,
-                        "mimeType": mime_type,
+                        "path": item.rel_path,
+                        "key": f"{files_prefix}/{item.rel_path}",
+                        "size": item.size,
+                        "mimeType": item.mime_type,
                         "status": "uploaded",
                         "last_modified": datetime.fromtimestamp(
-                            file_path.stat().st_mtime, tz=timezone.utc
+                            item.mtime, tz=timezone.utc
                         ).isoformat(),
                     }
-                )
-
+                    for item in files
+                ],
+            }
             storage_service.put_object(
                 key=manifest_key,
                 body=json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
                 content_type="application/json",
             )
 
-            archive_path = self._create_archive(
-                workspace_dir=workspace_dir,
-                session_id=session_id,
-                files=files,
-            )
-            storage_service.upload_file(
-                file_path=str(archive_path),
-                key=archive_key,
-                content_type="application/zip",
+            logger.info(
+                "workspace_export_completed",
+                extra={
+                    "session_id": session_id,
+                    "file_count": len(files),
+                    "total_bytes": sum(item.size for item in files),
+                    "duration_ms": int((time.monotonic() - started) * 1000),
+                },
             )
 
-            try:
-                archive_path.unlink(missing_ok=True)
-            except Exception:
-                logger.warning(f"Failed to cleanup archive temp file: {archive_path}")
-
             return WorkspaceExportResult(
                 workspace_files_prefix=files_prefix,
                 workspace_manifest_key=manifest_key,
@@ -112,59 +156,129 @@ class WorkspaceExportService:
                 error=str(exc), workspace_export_status="failed"
             )
 
-    def _collect_files(self, workspace_dir: Path) -> list[Path]:
-        files: list[Path] = []
+    def _collect_files(self, workspace_dir: Path) -> tuple[list[ExportFile], int]:
+        """Walk the session directory once, capturing stat info of exported files.
+
+        Returns the exported files and the bytes the whole session directory uses.
+        Ignored entries (node_modules, .venv, build output) and the session files
+        next to the workspace are not exported but still count toward usage, so
+        they are walked for their size only.
+        """
+        files: list[ExportFile] = []
+        total_bytes = 0
         ignore_names = workspace_manager._ignore_names
         ignore_dot = workspace_manager.ignore_dot_files
+        workspace_path = str(workspace_dir)
 
-        for root, dirnames, filenames in os.walk(workspace_dir):
-            root_path = Path(root)
-            dirnames[:] = [
-                d
-                for d in dirnames
-                if not self._should_skip(root_path / d, ignore_names, ignore_dot)
-            ]
-            for filename in filenames:
-                file_path = root_path / filename
-                if self._should_skip(file_path, ignore_names, ignore_dot):
+        # (directory, workspace-relative prefix); a None prefix is walked for size only.
+        pending: list[tuple[str, str | None]] = [(str(workspace_dir.parent), None)]
+        while pending:
+            current, rel_prefix = pending.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if rel_prefix is None and entry.path == workspace_path:
+                        pending.append((entry.path, ""))
+                        continue
+                    exported = rel_prefix is not None and not self._should_skip(
+                        entry.name, ignore_names, ignore_dot
+                    )
+                    rel_path = (
+                        f"{rel_prefix}/{entry.name}" if rel_prefix else entry.name
+                    )
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append((entry.path, rel_path if exported else None))
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
                     continue
-                if file_path.is_symlink():
+                if not stat.S_ISREG(st.st_mode):
                     continue
-                if not file_path.is_file():
+                total_bytes += st.st_size
+                if not exported:
                     continue
-                files.append(file_path)
+                mime_type, _ = mimetypes.guess_type(entry.name)
+                files.append(
+                    ExportFile(
+                        path=Path(entry.path),
+                        rel_path=rel_path,
+                        size=st.st_size,
+                        mtime=st.st_mtime,
+                        mode=st.st_mode,
+                        mime_type=mime_type,
+                    )
+                )
 
-        return files
+        files.sort(key=lambda item: item.rel_path)
+        return files, total_bytes
 
-    def _create_archive(
-        self,
-        *,
-        workspace_dir: Path,
-        session_id: str,
-        files: list[Path],
-    ) -> Path:
-        temp_dir = workspace_manager.temp_dir
-        temp_dir.mkdir(parents=True, exist_ok=True)
-        archive_path = temp_dir / f"{session_id}.zip"
+    def _stream_archive(self, *, archive_key: str, files: list[ExportFile]) -> None:
+        """Build the archive directly into an S3 multipart upload."""
+        with storage_service.open_multipart_writer(
+            key=archive_key,
+            content_type=ARCHIVE_CONTENT_TYPES[self.archive_format],
+            part_size=self.archive_part_size,
+        ) as writer:
+            if self.archive_format == "zip":
+                self._write_zip(writer, files)
+            else:
+                self._write_tar(writer, files)
 
+    def _write_zip(self, writer: S3MultipartWriter, files: list[ExportFile]) -> None:
         with zipfile.ZipFile(
-            archive_path,
+            writer,
             "w",
             compression=zipfile.ZIP_DEFLATED,
         ) as zipf:
-            for file_path in files:
-                rel_path = file_path.relative_to(workspace_dir).as_posix()
-                zipf.write(file_path, arcname=f"workspace/{rel_path}")
+            for item in files:
+                zinfo = zipfile.ZipInfo(
+                    filename=f"workspace/{item.rel_path}",
+                    date_time=self._zip_date_time(item.mtime),
+                )
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zinfo.external_attr = (item.mode & 0xFFFF) << 16
+                # Lets zipfile decide on zip64 up front; the stream is not seekable.
+                zinfo.file_size = item.size
+                with (
+                    open(item.path, "rb") as src,
+                    zipf.open(zinfo, "w") as dst,
+                ):
+                    shutil.copyfileobj(src, dst, _COPY_CHUNK_SIZE)
 
-        return archive_path
+    def _write_tar(self, writer: S3MultipartWriter, files: list[ExportFile]) -> None:
+        with open_tar_stream(
+            writer,
+            "tar.zst",
+            zstd_level=self.zstd_level,
+            zstd_threads=self.zstd_threads,
+        ) as tar:
+            for item in files:
+                tarinfo = tarfile.TarInfo(name=f"workspace/{item.rel_path}")
+                tarinfo.size = item.size
+                tarinfo.mtime = int(item.mtime)
+                tarinfo.mode = stat.S_IMODE(item.mode)
+                with open(item.path, "rb") as src:
+                    tar.addfile(tarinfo, src)
 
     @staticmethod
-    def _should_skip(path: Path, ignore_names: set[str], ignore_dot: bool) -> bool:
-        name = path.name
+    def _zip_date_time(mtime: float) -> tuple[int, int, int, int, int, int]:
+        date_time = time.localtime(mtime)[:6]
+        # The zip format cannot represent timestamps before 1980.
+        if date_time[0] < 1980:
+            return (1980, 1, 1, 0, 0, 0)
+        return date_time  # type: ignore[return-value]
+
+    @staticmethod
+    def _should_skip(name: str, ignore_names: set[str], ignore_dot: bool) -> bool:
         if name in ignore_names:
             return True
         if ignore_dot and name.startswith("."):
             return True
-        if path.is_symlink():
-            return True
         return False
@@ -1,14 +1,22 @@
+import base64
+import bisect
 import json
 import logging
 import mimetypes
+import os
 import shutil
-import tarfile
-from dataclasses import dataclass, asdict
-from datetime import datetime, timedelta
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, asdict, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Literal
 
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
 from app.core.settings import Settings, get_settings
+from app.utils.archive import open_tar_stream
+from app.utils.fs_clone import clone_tree
 
 logger = logging.getLogger(__name__)
 
@@ -28,12 +36,47 @@ class WorkspaceMeta:
         return asdict(self)
 
 
+@dataclass
+class _DiskUsageCache:
+    """Process-wide disk usage numbers shared by every WorkspaceManager instance.
+
+    Per-session sizes are refreshed after each export and by the periodic recount;
+    archive/temp totals only change on recount or archival.
+    """
+
+    sessions: dict[str, tuple[str, int]] = field(default_factory=dict)
+    archive_bytes: int = 0
+    archived_workspaces: int = 0
+    temp_bytes: int = 0
+    computed_at: str | None = None
+    loaded: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def to_dict(self) -> dict:
+        return {
+            "sessions": {
+                session_id: [user_id, size]
+                for session_id, (user_id, size) in self.sessions.items()
+            },
+            "archive_bytes": self.archive_bytes,
+            "archived_workspaces": self.archived_workspaces,
+            "temp_bytes": self.temp_bytes,
+            "computed_at": self.computed_at,
+        }
+
+
+_usage_cache = _DiskUsageCache()
+
+CleanupAction = Literal["cleaned", "archived", "skipped", "error"]
+
+
 class WorkspaceManager:
     settings: Settings
     base_dir: Path
     active_dir: Path
     archive_dir: Path
     temp_dir: Path
+    session_index_dir: Path
 
     def __init__(self):
         self.settings = get_settings()
@@ -41,6 +84,10 @@ class WorkspaceManager:
         self.active_dir = self.base_dir / "active"
         self.archive_dir = self.base_dir / "archive"
         self.temp_dir = self.base_dir / "temp"
+        # session_id -> active/<user_id>/<session_id> symlinks, kept outside active/
+        # so user directory scans never see them.
+        self.session_index_dir = self.base_dir / "index" / "by_session"
+        self.usage_snapshot_file = self.base_dir / "index" / "usage.json"
         self.ignore_dot_files = self.settings.workspace_ignore_dot_files
 
         self._init_directories()
@@ -68,6 +115,47 @@ class WorkspaceManager:
             directory.mkdir(parents=True, exist_ok=True)
             logger.debug("workspace_dir_ready", extra={"path": str(directory)})
 
+        if not self.session_index_dir.exists():
+            self.session_index_dir.mkdir(parents=True, exist_ok=True)
+            self.rebuild_session_index()
+
+        self._load_usage_snapshot()
+
+    def rebuild_session_index(self) -> int:
+        """Rebuild the session -> user index from the active workspace tree."""
+        indexed = 0
+        for user_dir in self.active_dir.iterdir():
+            if not user_dir.is_dir():
+                continue
+            for session_dir in user_dir.iterdir():
+                if session_dir.is_dir():
+                    self._index_session(user_dir.name, session_dir.name)
+                    indexed += 1
+        logger.info("workspace_session_index_rebuilt", extra={"sessions": indexed})
+        return indexed
+
+    def _index_session(self, user_id: str, session_id: str) -> None:
+        link = self.session_index_dir / session_id
+        target = os.path.join("..", "..", "active", user_id, session_id)
+        try:
+            if os.readlink(link) == target:
+                return
+        except OSError:
+            pass
+        tmp_link = self.session_index_dir / f".{session_id}.{os.getpid()}.tmp"
+        try:
+            tmp_link.unlink(missing_ok=True)
+            os.symlink(target, tmp_link)
+            os.replace(tmp_link, link)
+        except OSError as e:
+            logger.warning(f"Failed to index session {session_id}: {e}")
+
+    def _unindex_session(self, session_id: str) -> None:
+        try:
+            (self.session_index_dir / session_id).unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Failed to unindex session {session_id}: {e}")
+
     def get_workspace_path(
         self,
         user_id: str,
@@ -86,6 +174,9 @@ class WorkspaceManager:
             (session_dir / "logs").mkdir(exist_ok=True)
 
             self._write_meta(session_dir, user_id, session_id)
+            self._index_session(user_id, session_id)
+            with _usage_cache.lock:
+                _usage_cache.sessions.setdefault(session_id, (user_id, 0))
 
         return session_dir
 
@@ -102,13 +193,27 @@ class WorkspaceManager:
         return workspace_dir
 
     def resolve_user_id(self, session_id: str) -> str | None:
-        """Resolve user_id for a session by scanning workspace roots."""
+        """Resolve user_id for a session via the session index.
+
+        Falls back to scanning user directories for sessions missing from the index.
+        """
+        link = self.session_index_dir / session_id
+        try:
+            target = Path(os.readlink(link))
+        except OSError:
+            target = None
+        if target is not None:
+            if link.exists():
+                return target.parent.name
+            self._unindex_session(session_id)
+
         if not self.active_dir.exists():
             return None
         for user_dir in self.active_dir.iterdir():
             if not user_dir.is_dir():
                 continue
             if (user_dir / session_id).exists():
+                self._index_session(user_dir.name, session_id)
                 return user_dir.name
         return None
 
@@ -187,7 +292,138 @@ class WorkspaceManager:
 
             return nodes
 
-        return build_dir(base, "", 0)
+        nodes = build_dir(base, "", 0)
+        if counter["count"] >= max_entries:
+            logger.warning(
+                "workspace_file_list_truncated",
+                extra={"session_id": session_id, "max_entries": max_entries},
+            )
+        return nodes
+
+    def list_workspace_dir(
+        self,
+        user_id: str,
+        session_id: str,
+        *,
+        path: str = "/",
+        cursor: str | None = None,
+        limit: int = 500,
+    ) -> dict | None:
+        """List a single directory level, paginated by an opaque cursor.
+
+        Only entries on the returned page are mime-typed or stat'ed. The response and
+        every folder entry carry an mtime-based ETag, so clients can skip re-listing
+        directories whose entries have not changed.
+        """
+        workspace_dir = self.get_session_workspace_dir(
+            user_id=user_id, session_id=session_id
+        )
+        if not workspace_dir:
+            return None
+
+        base = workspace_dir.resolve()
+        clean = (path or "").strip().strip("/")
+        target = (base / clean).resolve() if clean else base
+        try:
+            target.relative_to(base)
+            dir_stat = os.stat(target)
+        except (ValueError, OSError):
+            return None
+        if not target.is_dir():
+            return None
+
+        rel_dir = "/" + target.relative_to(base).as_posix() if clean else ""
+        rows: list[tuple[tuple[int, str, str], os.DirEntry]] = []
+        try:
+            with os.scandir(target) as it:
+                for entry in it:
+                    if entry.name in self._ignore_names:
+                        continue
+                    if self.ignore_dot_files and entry.name.startswith("."):
+                        continue
+                    try:
+                        if entry.is_symlink():
+                            continue
+                        if entry.is_dir(follow_symlinks=False):
+                            kind = 0
+                        elif entry.is_file(follow_symlinks=False):
+                            kind = 1
+                        else:
+                            continue
+                    except OSError:
+                        continue
+                    rows.append(((kind, entry.name.lower(), entry.name), entry))
+        except OSError:
+            return None
+
+        rows.sort(key=lambda row: row[0])
+        keys = [key for key, _ in rows]
+        start = 0
+        after = self._decode_dir_cursor(cursor)
+        if after is not None:
+            start = bisect.bisect_right(keys, after)
+        limit = max(1, limit)
+        page = rows[start : start + limit]
+        has_more = start + limit < len(rows)
+
+        nodes: list[dict] = []
+        for (kind, _, name), entry in page:
+            rel_path = f"{rel_dir}/{name}"
+            if kind == 0:
+                try:
+                    child_etag = self._dir_etag(entry.stat(follow_symlinks=False))
+                except OSError:
+                    child_etag = None
+                nodes.append(
+                    {
+                        "id": rel_path,
+                        "name": name,
+                        "type": "folder",
+                        "path": rel_path,
+                        "etag": child_etag,
+                    }
+                )
+            else:
+                mime_type, _ = mimetypes.guess_type(name)
+                nodes.append(
+                    {
+                        "id": rel_path,
+                        "name": name,
+                        "type": "file",
+                        "path": rel_path,
+                        "mimeType": mime_type,
+                    }
+                )
+
+        return {
+            "path": rel_dir or "/",
+            "etag": self._dir_etag(dir_stat),
+            "entries": nodes,
+            "next_cursor": (
+                self._encode_dir_cursor(page[-1][0]) if has_more and page else None
+            ),
+        }
+
+    @staticmethod
+    def _dir_etag(st: os.stat_result) -> str:
+        # A directory's mtime changes whenever an entry is added, removed or renamed.
+        return f'W/"{st.st_ino:x}-{st.st_mtime_ns:x}"'
+
+    @staticmethod
+    def _encode_dir_cursor(key: tuple[int, str, str]) -> str:
+        raw = json.dumps(list(key), ensure_ascii=False).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_dir_cursor(cursor: str | None) -> tuple[int, str, str] | None:
+        if not cursor:
+            return None
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            kind, lower, name = json.loads(base64.urlsafe_b64decode(padded))
+            return (int(kind), str(lower), str(name))
+        except Exception:
+            return None
 
     def resolve_workspace_file(
         self,
@@ -270,16 +506,95 @@ class WorkspaceManager:
         meta = self.get_meta(user_id, session_id)
         if meta:
             meta.status = status
-            meta_file = self.active_dir / user_id / session_id / "meta.json"
-            _ = meta_file.write_text(
-                json.dumps(meta.to_dict(), indent=2), encoding="utf-8"
-            )
+            self._save_meta(user_id, session_id, meta)
+
+    def _save_meta(self, user_id: str, session_id: str, meta: WorkspaceMeta) -> None:
+        meta_file = self.active_dir / user_id / session_id / "meta.json"
+        _ = meta_file.write_text(json.dumps(meta.to_dict(), indent=2), encoding="utf-8")
 
     def get_workspace_volume(self, user_id: str, session_id: str) -> str:
         """Get container mount path."""
         workspace_dir = self.get_workspace_path(user_id, session_id, create=True)
         return str(workspace_dir / "workspace")
 
+    def fork_workspace(
+        self,
+        user_id: str,
+        source_session_id: str,
+        target_session_id: str,
+    ) -> dict[str, str | int]:
+        """Create `target_session_id` as a copy-on-write clone of a session workspace.
+
+        The whole `workspace/` tree (including `.claude_data`) is reflinked where the
+        filesystem supports it, otherwise copied in parallel. Run it off the event loop.
+        """
+        for value in (user_id, source_session_id, target_session_id):
+            if not value or "/" in value or value in (".", ".."):
+                raise AppException(
+                    error_code=ErrorCode.BAD_REQUEST,
+                    message=f"Invalid workspace identifier: {value!r}",
+                )
+
+        source_dir = self.get_session_workspace_dir(user_id, source_session_id)
+        if not source_dir:
+            raise AppException(
+                error_code=ErrorCode.WORKSPACE_NOT_FOUND,
+                message=f"Source workspace not found: {source_session_id}",
+            )
+
+        target_session_dir = self.active_dir / user_id / target_session_id
+        if target_session_dir.exists():
+            raise AppException(
+                error_code=ErrorCode.BAD_REQUEST,
+                message=f"Workspace already exists: {target_session_id}",
+            )
+
+        started = datetime.now()
+        source_meta = self.get_meta(user_id, source_session_id)
+        target_session_dir = self.get_workspace_path(user_id, target_session_id)
+        try:
+            result = clone_tree(
+                source_dir,
+                target_session_dir / "workspace",
+                workers=self.settings.workspace_fork_workers,
+                allow_hardlinks=self.settings.workspace_fork_allow_hardlinks,
+            )
+        except Exception:
+            shutil.rmtree(target_session_dir, ignore_errors=True)
+            self._unindex_session(target_session_id)
+            self._forget_session_usage(target_session_id)
+            raise
+
+        meta = self.get_meta(user_id, target_session_id)
+        if meta:
+            if source_meta:
+                meta.container_mode = source_meta.container_mode
+            meta.size_bytes = result.bytes
+            self._save_meta(user_id, target_session_id, meta)
+        with _usage_cache.lock:
+            _usage_cache.sessions[target_session_id] = (user_id, result.bytes)
+
+        duration_ms = int((datetime.now() - started).total_seconds() * 1000)
+        logger.info(
+            "workspace_forked",
+            extra={
+                "source_session_id": source_session_id,
+                "session_id": target_session_id,
+                "method": result.method,
+                "files": result.files,
+                "bytes": result.bytes,
+                "duration_ms": duration_ms,
+            },
+        )
+        return {
+            "session_id": target_session_id,
+            "source_session_id": source_session_id,
+            "method": result.method,
+            "files": result.files,
+            "bytes": result.bytes,
+            "duration_ms": duration_ms,
+        }
+
     def archive_workspace(
         self,
         user_id: str,
@@ -298,14 +613,28 @@ class WorkspaceManager:
             archive_user_dir = self.archive_dir / user_id / date_str
             archive_user_dir.mkdir(parents=True, exist_ok=True)
 
-            archive_file = archive_user_dir / f"{session_id}.tar.gz"
-
-            with tarfile.open(archive_file, "w:gz") as tar:
+            archive_format = self.settings.workspace_archive_format
+            archive_file = archive_user_dir / f"{session_id}.{archive_format}"
+
+            with (
+                open(archive_file, "wb") as fileobj,
+                open_tar_stream(
+                    fileobj,
+                    archive_format,
+                    zstd_level=self.settings.workspace_zstd_level,
+                    zstd_threads=self.settings.workspace_zstd_threads,
+                ) as tar,
+            ):
                 tar.add(session_dir, arcname=session_id)
 
             self.update_meta_status(user_id, session_id, "archived")
 
             shutil.rmtree(session_dir)
+            self._unindex_session(session_id)
+            self._forget_session_usage(session_id)
+            with _usage_cache.lock:
+                _usage_cache.archive_bytes += archive_file.stat().st_size
+                _usage_cache.archived_workspaces += 1
 
             logger.info(f"Archived workspace: {session_dir} -> {archive_file}")
             return str(archive_file)
@@ -337,6 +666,8 @@ class WorkspaceManager:
 
         try:
             shutil.rmtree(session_dir)
+            self._unindex_session(session_id)
+            self._forget_session_usage(session_id)
             logger.info(f"Deleted workspace: {session_dir}")
             return True
         except Exception as e:
@@ -344,60 +675,96 @@ class WorkspaceManager:
             return False
 
     def cleanup_expired_workspaces(self, max_age_hours: int = 24) -> dict[str, int]:
-        """Clean up expired workspaces."""
-        now = datetime.now()
-        cleaned = 0
-        archived = 0
-        errors = 0
-
-        for user_dir in self.active_dir.iterdir():
-            if not user_dir.is_dir():
-                continue
-
-            for session_dir in user_dir.iterdir():
-                if not session_dir.is_dir():
-                    continue
-
-                meta = self.get_meta(user_dir.name, session_dir.name)
-
-                if not meta:
-                    if self.delete_workspace(
-                        user_dir.name, session_dir.name, force=True
-                    ):
-                        cleaned += 1
-                    continue
+        """Clean up expired workspaces (synchronously, in this process)."""
+        cutoff = datetime.now() - timedelta(hours=max_age_hours)
+        stats = {"cleaned": 0, "archived": 0, "errors": 0}
+
+        for user_id, session_id in self.list_cleanup_candidates():
+            action, _ = self.expire_workspace(user_id, session_id, cutoff=cutoff)
+            if action == "cleaned":
+                stats["cleaned"] += 1
+            elif action == "archived":
+                stats["archived"] += 1
+            elif action == "error":
+                stats["errors"] += 1
+
+        return stats
+
+    def list_cleanup_candidates(self) -> list[tuple[str, str]]:
+        """List every active (user_id, session_id) pair in a stable order."""
+        candidates = [
+            (user_entry.name, session_entry.name)
+            for user_entry in self._iter_dirs(self.active_dir)
+            for session_entry in self._iter_dirs(Path(user_entry.path))
+        ]
+        candidates.sort()
+        return candidates
+
+    def expire_workspace(
+        self, user_id: str, session_id: str, *, cutoff: datetime
+    ) -> tuple[CleanupAction, int]:
+        """Delete or archive one workspace if it was created before `cutoff`.
+
+        Returns the action taken and the size of the archive written (0 otherwise).
+        """
+        try:
+            meta = self.get_meta(user_id, session_id)
 
-                created_at = datetime.fromisoformat(meta.created_at)
-                age = now - created_at
+            if not meta:
+                if self.delete_workspace(user_id, session_id, force=True):
+                    return "cleaned", 0
+                return "error", 0
 
-                if meta.status == "active":
-                    if age > timedelta(hours=max_age_hours):
-                        logger.info(
-                            f"Workspace {session_dir.name} expired (age: {age})"
-                        )
+            if meta.status != "active":
+                return "skipped", 0
 
-                        if meta.container_mode == "ephemeral":
-                            if self.delete_workspace(
-                                user_dir.name, session_dir.name, force=True
-                            ):
-                                cleaned += 1
-                        else:
-                            if self.archive_workspace(user_dir.name, session_dir.name):
-                                archived += 1
+            created_at = datetime.fromisoformat(meta.created_at)
+            if created_at >= cutoff:
+                return "skipped", 0
 
-        return {
-            "cleaned": cleaned,
-            "archived": archived,
-            "errors": errors,
-        }
+            logger.info(
+                f"Workspace {session_id} expired (age: {datetime.now() - created_at})"
+            )
+            if meta.container_mode == "ephemeral":
+                if self.delete_workspace(user_id, session_id, force=True):
+                    return "cleaned", 0
+                return "error", 0
+
+            archive_path = self.archive_workspace(user_id, session_id)
+            if not archive_path:
+                return "error", 0
+            return "archived", os.path.getsize(archive_path)
+        except Exception as e:
+            logger.error(f"Failed to expire workspace {session_id}: {e}")
+            return "error", 0
 
-    def get_disk_usage(self) -> dict[str, float | int | str]:
-        """Get disk usage statistics."""
+    def apply_cleanup_outcome(
+        self, session_id: str, action: CleanupAction, archive_bytes: int
+    ) -> None:
+        """Mirror a cleanup done in another process into this process's usage cache."""
+        if action not in ("cleaned", "archived"):
+            return
+        self._forget_session_usage(session_id)
+        if action == "archived":
+            with _usage_cache.lock:
+                _usage_cache.archive_bytes += archive_bytes
+                _usage_cache.archived_workspaces += 1
+
+    def get_disk_usage(self) -> dict[str, float | int | str | None]:
+        """Get disk usage statistics from the incrementally maintained cache.
+
+        Filesystem totals are always live (a single statvfs); workspace sizes come from
+        the last recount plus per-session refreshes, as of `computed_at`.
+        """
         total, used, free = shutil.disk_usage(self.base_dir)
 
-        active_size = self._get_dir_size(self.active_dir)
-        archive_size = self._get_dir_size(self.archive_dir)
-        temp_size = self._get_dir_size(self.temp_dir)
+        with _usage_cache.lock:
+            active_size = sum(size for _, size in _usage_cache.sessions.values())
+            active_workspaces = len(_usage_cache.sessions)
+            archive_size = _usage_cache.archive_bytes
+            archived_workspaces = _usage_cache.archived_workspaces
+            temp_size = _usage_cache.temp_bytes
+            computed_at = _usage_cache.computed_at
 
         return {
             "base_dir": str(self.base_dir),
@@ -408,16 +775,282 @@ class WorkspaceManager:
             "active_size_gb": round(active_size / (1024**3), 2),
             "archive_size_gb": round(archive_size / (1024**3), 2),
             "temp_size_gb": round(temp_size / (1024**3), 2),
-            "active_workspaces": sum(1 for _ in self.active_dir.rglob("meta.json")),
-            "archived_workspaces": sum(1 for _ in self.archive_dir.rglob("*.tar.gz")),
+            "active_workspaces": active_workspaces,
+            "archived_workspaces": archived_workspaces,
+            "computed_at": computed_at,
         }
 
+    def refresh_session_usage(self, user_id: str, session_id: str) -> int:
+        """Re-measure one session directory and update its cached usage.
+
+        Walks everything the session holds, including the dependency and build
+        directories that exports skip, since those count toward the quota.
+        """
+        size = self._get_dir_size(self.active_dir / user_id / session_id)
+        self.record_session_usage(user_id, session_id, size)
+        return size
+
+    def record_session_usage(
+        self, user_id: str, session_id: str, size_bytes: int
+    ) -> None:
+        """Set a session's cached usage and the size recorded in its meta."""
+        with _usage_cache.lock:
+            _usage_cache.sessions[session_id] = (user_id, int(size_bytes))
+
+        meta = self.get_meta(user_id, session_id)
+        if meta and meta.size_bytes != size_bytes:
+            meta.size_bytes = int(size_bytes)
+            self._save_meta(user_id, session_id, meta)
+
+    def get_user_usage(self, user_id: str) -> dict[str, int | bool | str | None]:
+        """Get a user's active workspace usage against the configured quotas."""
+        with _usage_cache.lock:
+            sizes = [
+                size
+                for owner, size in _usage_cache.sessions.values()
+                if owner == user_id
+            ]
+            computed_at = _usage_cache.computed_at
+
+        used = sum(sizes)
+        soft_limit = self.settings.workspace_user_soft_quota_mb * 1024 * 1024
+        hard_limit = self.settings.workspace_user_hard_quota_mb * 1024 * 1024
+        return {
+            "user_id": user_id,
+            "used_bytes": used,
+            "active_workspaces": len(sizes),
+            "soft_limit_bytes": soft_limit or None,
+            "hard_limit_bytes": hard_limit or None,
+            "over_soft_limit": bool(soft_limit) and used > soft_limit,
+            "over_hard_limit": bool(hard_limit) and used > hard_limit,
+            "computed_at": computed_at,
+        }
+
+    def users_over_hard_quota(self) -> list[str]:
+        """Users whose active workspaces use more than the hard quota.
+
+        Their runs are left out of claims, so they stay queued until usage drops.
+        """
+        hard_limit = self.settings.workspace_user_hard_quota_mb * 1024 * 1024
+        if not hard_limit:
+            return []
+        used: dict[str, int] = {}
+        with _usage_cache.lock:
+            for user_id, size in _usage_cache.sessions.values():
+                used[user_id] = used.get(user_id, 0) + size
+        return sorted(user_id for user_id, size in used.items() if size > hard_limit)
+
+    def enforce_user_quotas(
+        self, is_session_live: Callable[[str], bool]
+    ) -> dict[str, int]:
+        """Archive idle workspaces, least recently active first, of users over the
+        soft quota until they are back under it.
+
+        `is_session_live` reports whether a session still has a container or run;
+        those sessions are never archived, however long their files sit unchanged.
+        Reads cached usage only; run it off the event loop since archival is slow.
+        """
+        soft_limit = self.settings.workspace_user_soft_quota_mb * 1024 * 1024
+        stats = {
+            "users_over_soft_limit": 0,
+            "archived": 0,
+            "reclaimed_bytes": 0,
+            "skipped_live": 0,
+        }
+        if not soft_limit:
+            return stats
+
+        with _usage_cache.lock:
+            by_user: dict[str, list[tuple[str, int]]] = {}
+            for session_id, (user_id, size) in _usage_cache.sessions.items():
+                by_user.setdefault(user_id, []).append((session_id, size))
+
+        idle_before = datetime.now().timestamp() - (
+            self.settings.workspace_quota_idle_minutes * 60
+        )
+        for user_id, sessions in by_user.items():
+            used = sum(size for _, size in sessions)
+            if used <= soft_limit:
+                continue
+            stats["users_over_soft_limit"] += 1
+
+            idle: list[tuple[float, str, int]] = []
+            for session_id, size in sessions:
+                if is_session_live(session_id):
+                    stats["skipped_live"] += 1
+                    continue
+                last_active = self._last_activity(user_id, session_id, idle_before)
+                if last_active is not None and last_active < idle_before:
+                    idle.append((last_active, session_id, size))
+            idle.sort()
+
+            for _, session_id, size in idle:
+                if used <= soft_limit:
+                    break
+                meta = self.get_meta(user_id, session_id)
+                if not meta or meta.status != "active":
+                    continue
+                # A run may have claimed the session while the others were walked.
+                if is_session_live(session_id):
+                    stats["skipped_live"] += 1
+                    continue
+                if self.archive_workspace(user_id, session_id):
+                    used -= size
+                    stats["archived"] += 1
+                    stats["reclaimed_bytes"] += size
+
+            logger.info(
+                "workspace_user_quota_enforced",
+                extra={
+                    "user_id": user_id,
+                    "used_bytes": used,
+                    "soft_limit_bytes": soft_limit,
+                },
+            )
+        return stats
+
+    def _last_activity(
+        self, user_id: str, session_id: str, idle_before: float
+    ) -> float | None:
+        """Newest mtime of anything in the session directory, walked recursively.
+
+        A directory's own mtime only moves when entries are added or removed, so an
+        agent editing files deep in the tree leaves the top level untouched. The walk
+        stops at the first entry newer than `idle_before`; active sessions are cheap.
+        """
+        newest: float | None = None
+        pending = [str(self.active_dir / user_id / session_id)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        try:
+                            mtime = entry.stat(follow_symlinks=False).st_mtime
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                        except OSError:
+                            continue
+                        if newest is None or mtime > newest:
+                            newest = mtime
+                            if newest >= idle_before:
+                                return newest
+            except OSError:
+                continue
+        return newest
+
+    def get_session_usage(self, session_id: str) -> int | None:
+        with _usage_cache.lock:
+            entry = _usage_cache.sessions.get(session_id)
+        return entry[1] if entry else None
+
+    def recount_disk_usage(self) -> dict[str, float | int | str | None]:
+        """Walk the workspace root once and replace the cached usage numbers.
+
+        This is the slow path; run it off the event loop.
+        """
+        started = datetime.now()
+        sessions: dict[str, tuple[str, int]] = {}
+        for user_dir in self._iter_dirs(self.active_dir):
+            for session_dir in self._iter_dirs(Path(user_dir.path)):
+                sessions[session_dir.name] = (
+                    user_dir.name,
+                    self._get_dir_size(Path(session_dir.path)),
+                )
+
+        archived_workspaces = 0
+        archive_bytes = 0
+        pending = [str(self.archive_dir)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            archive_bytes += entry.stat(follow_symlinks=False).st_size
+                            if entry.name.endswith((".tar.gz", ".tar.zst")):
+                                archived_workspaces += 1
+            except OSError:
+                continue
+
+        temp_bytes = self._get_dir_size(self.temp_dir)
+
+        with _usage_cache.lock:
+            _usage_cache.sessions = sessions
+            _usage_cache.archive_bytes = archive_bytes
+            _usage_cache.archived_workspaces = archived_workspaces
+            _usage_cache.temp_bytes = temp_bytes
+            _usage_cache.computed_at = datetime.now(timezone.utc).isoformat()
+            _usage_cache.loaded = True
+            snapshot = _usage_cache.to_dict()
+
+        try:
+            tmp_file = self.usage_snapshot_file.with_suffix(".tmp")
+            tmp_file.write_text(json.dumps(snapshot), encoding="utf-8")
+            os.replace(tmp_file, self.usage_snapshot_file)
+        except OSError as e:
+            logger.warning(f"Failed to persist disk usage snapshot: {e}")
+
+        logger.info(
+            "workspace_disk_usage_recounted",
+            extra={
+                "active_workspaces": len(sessions),
+                "duration_ms": int((datetime.now() - started).total_seconds() * 1000),
+            },
+        )
+        return self.get_disk_usage()
+
+    def _load_usage_snapshot(self) -> None:
+        with _usage_cache.lock:
+            if _usage_cache.loaded:
+                return
+            _usage_cache.loaded = True
+            try:
+                data = json.loads(self.usage_snapshot_file.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load disk usage snapshot: {e}")
+                return
+            _usage_cache.sessions = {
+                session_id: (str(entry[0]), int(entry[1]))
+                for session_id, entry in (data.get("sessions") or {}).items()
+            }
+            _usage_cache.archive_bytes = int(data.get("archive_bytes") or 0)
+            _usage_cache.archived_workspaces = int(data.get("archived_workspaces") or 0)
+            _usage_cache.temp_bytes = int(data.get("temp_bytes") or 0)
+            _usage_cache.computed_at = data.get("computed_at")
+
+    @staticmethod
+    def _forget_session_usage(session_id: str) -> None:
+        with _usage_cache.lock:
+            _usage_cache.sessions.pop(session_id, None)
+
+    @staticmethod
+    def _iter_dirs(path: Path) -> list[os.DirEntry]:
+        try:
+            with os.scandir(path) as it:
+                return [e for e in it if e.is_dir(follow_symlinks=False)]
+        except OSError:
+            return []
+
     def _get_dir_size(self, path: Path) -> int:
-        """Get directory size."""
+        """Get directory size (single scandir walk, symlinks not followed)."""
         total = 0
-        for item in path.rglob("*"):
-            if item.is_file():
-                total += item.stat().st_size
+        pending = [str(path)]
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            continue
+            except OSError:
+                continue
         return total
 
     def get_user_workspaces(self, user_id: str) -> list[dict[str, str | int]]:
@@ -434,6 +1067,9 @@ class WorkspaceManager:
 
             meta = self.get_meta(user_id, session_dir.name)
             if meta:
+                size = self.get_session_usage(session_dir.name)
+                if size is not None:
+                    meta.size_bytes = size
                 workspaces.append(meta.to_dict())
 
         return workspaces
@@ -0,0 +1,51 @@
+import tarfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO, Literal
+
+from app.core.errors.error_codes import ErrorCode
+from app.core.errors.exceptions import AppException
+
+ArchiveFormat = Literal["zip", "tar.gz", "tar.zst"]
+
+ARCHIVE_CONTENT_TYPES: dict[str, str] = {
+    "zip": "application/zip",
+    "tar.gz": "application/gzip",
+    "tar.zst": "application/zstd",
+}
+
+
+def _zstd_module():
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise AppException(
+            error_code=ErrorCode.INTERNAL_ERROR,
+            message="tar.zst archives require the 'zstandard' package",
+        ) from exc
+    return zstandard
+
+
+@contextmanager
+def open_tar_stream(
+    fileobj: IO[bytes],
+    archive_format: Literal["tar.gz", "tar.zst"],
+    *,
+    zstd_level: int = 3,
+    zstd_threads: int = -1,
+) -> Iterator[tarfile.TarFile]:
+    """Open a write-only, non-seeking tar stream over `fileobj`.
+
+    tar.zst compresses on `zstd_threads` worker threads (-1 = one per CPU, 0 = inline).
+    The caller owns `fileobj`; it is flushed but not closed.
+    """
+    if archive_format == "tar.gz":
+        with tarfile.open(fileobj=fileobj, mode="w|gz") as tar:
+            yield tar
+        return
+
+    zstandard = _zstd_module()
+    compressor = zstandard.ZstdCompressor(level=zstd_level, threads=zstd_threads)
+    with compressor.stream_writer(fileobj, closefd=False) as writer:
+        with tarfile.open(fileobj=writer, mode="w|") as tar:
+            yield tar
@@ -0,0 +1,87 @@
+import os
+import threading
+from typing import Any
+
+from starlette.responses import FileResponse
+from starlette.types import Message, Receive, Scope, Send
+
+
+def strong_file_etag(st: os.stat_result) -> str:
+    """Strong validator from inode, mtime and size; changes on any rewrite."""
+    return f'"{st.st_ino:x}-{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class FileTransferStats:
+    """Process-wide counters for bytes served vs. bytes avoided by 304s and ranges."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0,
+            "not_modified": 0,
+            "partial": 0,
+            "full": 0,
+            "bytes_sent": 0,
+            "bytes_saved": 0,
+        }
+
+    def record(self, *, file_size: int, bytes_sent: int, kind: str) -> None:
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters[kind] += 1
+            self._counters["bytes_sent"] += bytes_sent
+            self._counters["bytes_saved"] += max(0, file_size - bytes_sent)
+
+    def snapshot(self) -> dict[str, int | float]:
+        with self._lock:
+            data: dict[str, int | float] = dict(self._counters)
+        total = data["bytes_sent"] + data["bytes_saved"]
+        data["saved_ratio"] = round(data["bytes_saved"] / total, 4) if total else 0.0
+        return data
+
+
+file_transfer_stats = FileTransferStats()
+
+
+class WorkspaceFileResponse(FileResponse):
+    """FileResponse that stats the file once and records transfer savings.
+
+    Range / If-Range handling comes from Starlette. Full-file responses use the ASGI
+    `http.response.pathsend` extension when the server offers it, letting the server
+    sendfile() the file without copying it through Python.
+    """
+
+    chunk_size = 1024 * 1024
+
+    def __init__(self, path: str, stat_result: os.stat_result, **kwargs: Any) -> None:
+        super().__init__(path, stat_result=stat_result, **kwargs)
+        self._file_size = stat_result.st_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        sent = 0
+        status = self.status_code
+
+        async def counting_send(message: Message) -> None:
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            elif message["type"] == "http.response.pathsend":
+                sent = self._file_size
+            await send(message)
+
+        await super().__call__(scope, receive, counting_send)
+        if status in (200, 206):
+            file_transfer_stats.record(
+                file_size=self._file_size,
+                bytes_sent=sent,
+                kind="partial" if status == 206 else "full",
+            )
@@ -0,0 +1,156 @@
+import errno
+import os
+import shutil
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Literal
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None  # type: ignore[assignment]
+
+# linux/fs.h: _IOW(0x94, 9, int)
+FICLONE = 0x40049409
+
+CloneMethod = Literal["reflink", "hardlink", "copy"]
+
+# Errors meaning "this filesystem (pair) cannot reflink", as opposed to real I/O errors.
+_NO_REFLINK_ERRNOS = {
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+}
+_NO_HARDLINK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+
+@dataclass
+class CloneResult:
+    method: CloneMethod
+    files: int = 0
+    bytes: int = 0
+
+
+class _TreeCloner:
+    def __init__(self, allow_hardlinks: bool) -> None:
+        self._lock = threading.Lock()
+        self._reflink = fcntl is not None
+        self._hardlink = allow_hardlinks
+        self._used: set[CloneMethod] = set()
+
+    @property
+    def method(self) -> CloneMethod:
+        # Report the weakest method any file needed.
+        for method in ("copy", "hardlink", "reflink"):
+            if method in self._used:
+                return method  # type: ignore[return-value]
+        return "reflink" if self._reflink else "copy"
+
+    def clone_file(self, src: str, dst: str, st: os.stat_result) -> None:
+        if self._reflink and self._try_reflink(src, dst):
+            self._mark("reflink")
+        elif self._hardlink and self._try_hardlink(src, dst):
+            self._mark("hardlink")
+            return
+        else:
+            shutil.copyfile(src, dst)
+            self._mark("copy")
+        os.chmod(dst, stat.S_IMODE(st.st_mode))
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    def _mark(self, method: CloneMethod) -> None:
+        if method not in self._used:
+            with self._lock:
+                self._used.add(method)
+
+    def _try_reflink(self, src: str, dst: str) -> bool:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                fcntl.ioctl(dst_fd, FICLONE, src_fd)
+                return True
+            except OSError as exc:
+                if exc.errno not in _NO_REFLINK_ERRNOS:
+                    raise
+                self._reflink = False
+                return False
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    def _try_hardlink(self, src: str, dst: str) -> bool:
+        try:
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            os.link(src, dst)
+            return True
+        except OSError as exc:
+            if exc.errno not in _NO_HARDLINK_ERRNOS:
+                raise
+            self._hardlink = False
+            return False
+
+
+def clone_tree(
+    src: str | os.PathLike[str],
+    dst: str | os.PathLike[str],
+    *,
+    workers: int = 8,
+    allow_hardlinks: bool = False,
+) -> CloneResult:
+    """Copy the tree under `src` into the existing directory `dst`.
+
+    Files are reflinked (FICLONE, copy-on-write on XFS/btrfs) and fall back to
+    hardlinks when `allow_hardlinks` is set, then to kernel-side copies on a thread
+    pool. Hardlinks share data with the source, so in-place writes show up in both
+    trees; they are off by default. Symlinks are recreated as-is.
+    """
+    src_root = os.fspath(src)
+    dst_root = os.fspath(dst)
+    cloner = _TreeCloner(allow_hardlinks)
+    files: list[tuple[str, str, os.stat_result]] = []
+    dir_times: list[tuple[str, os.stat_result]] = []
+
+    pending = [(src_root, dst_root)]
+    while pending:
+        src_dir, dst_dir = pending.pop()
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                target = os.path.join(dst_dir, entry.name)
+                st = entry.stat(follow_symlinks=False)
+                if stat.S_ISLNK(st.st_mode):
+                    os.symlink(os.readlink(entry.path), target)
+                elif stat.S_ISDIR(st.st_mode):
+                    os.mkdir(target, stat.S_IMODE(st.st_mode) | stat.S_IRWXU)
+                    dir_times.append((target, st))
+                    pending.append((entry.path, target))
+                elif stat.S_ISREG(st.st_mode):
+                    files.append((entry.path, target, st))
+
+    # Probe on one file first so a filesystem without reflink support is detected
+    # once instead of by every worker.
+    if files:
+        cloner.clone_file(*files[0])
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="workspace-fork"
+    ) as pool:
+        for future in [pool.submit(cloner.clone_file, *item) for item in files[1:]]:
+            future.result()
+
+    # Directory mtimes change while they are populated; restore them last.
+    for target, st in reversed(dir_times):
+        os.chmod(target, stat.S_IMODE(st.st_mode))
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    return CloneResult(
+        method=cloner.method,
+        files=len(files),
+        bytes=sum(st.st_size for _, _, st in files),
+    )
@@ -0,0 +1,112 @@
+"""Compare archive formats (wall time and compression ratio) on real workspaces.
+
+Each workspace directory is archived in memory-less streaming mode (output bytes are
+counted and discarded), so results reflect CPU and read cost only.
+
+Usage (from executor_manager/):
+    uv run python -m scripts.benchmark_archive_formats /var/lib/opencowork/workspaces/active/<user>/<session>/workspace
+    uv run python -m scripts.benchmark_archive_formats --zstd-levels 1 3 9 --zstd-threads -1 <dir>...
+"""
+
+import argparse
+import os
+import shutil
+import time
+import zipfile
+from collections.abc import Callable
+from pathlib import Path
+
+from app.utils.archive import open_tar_stream
+
+
+class _CountingSink:
+    """Write-only, non-seekable sink that only counts bytes."""
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        return None
+
+
+def _iter_files(root: Path) -> list[tuple[Path, str, int]]:
+    files: list[tuple[Path, str, int]] = []
+    for current, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(current) / filename
+            if path.is_symlink() or not path.is_file():
+                continue
+            files.append((path, path.relative_to(root).as_posix(), path.stat().st_size))
+    return files
+
+
+def _run_zip(files: list[tuple[Path, str, int]]) -> int:
+    sink = _CountingSink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        for path, rel_path, _size in files:
+            zinfo = zipfile.ZipInfo.from_file(path, arcname=f"workspace/{rel_path}")
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+            with open(path, "rb") as src, zipf.open(zinfo, "w") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+    return sink.size
+
+
+def _run_tar(
+    files: list[tuple[Path, str, int]], fmt: str, level: int = 3, threads: int = -1
+) -> int:
+    sink = _CountingSink()
+    with open_tar_stream(
+        sink,  # type: ignore[arg-type]
+        fmt,  # type: ignore[arg-type]
+        zstd_level=level,
+        zstd_threads=threads,
+    ) as tar:
+        for path, rel_path, _ in files:
+            tar.add(path, arcname=f"workspace/{rel_path}", recursive=False)
+    return sink.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("workspaces", nargs="+", type=Path)
+    parser.add_argument("--zstd-levels", nargs="+", type=int, default=[1, 3, 9])
+    parser.add_argument("--zstd-threads", type=int, default=-1)
+    args = parser.parse_args()
+
+    for workspace in args.workspaces:
+        files = _iter_files(workspace)
+        raw = sum(size for _, _, size in files)
+        print(f"\n{workspace} — {len(files)} files, {raw / 1024**2:.1f} MB")
+        print(f"{'format':<18}{'wall (s)':>10}{'size (MB)':>12}{'ratio':>8}")
+
+        cases: list[tuple[str, Callable[[], int]]] = [
+            ("zip (deflate)", lambda files=files: _run_zip(files)),
+            ("tar.gz", lambda files=files: _run_tar(files, "tar.gz")),
+        ]
+        for level in args.zstd_levels:
+            cases.append(
+                (
+                    f"tar.zst -{level}",
+                    lambda files=files, level=level: _run_tar(
+                        files, "tar.zst", level, args.zstd_threads
+                    ),
+                )
+            )
+
+        for label, fn in cases:
+            started = time.perf_counter()
+            size = fn()
+            elapsed = time.perf_counter() - started
+            ratio = raw / size if size else 0.0
+            print(f"{label:<18}{elapsed:>10.2f}{size / 1024**2:>12.1f}{ratio:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
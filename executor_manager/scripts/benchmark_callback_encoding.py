@@ -0,0 +1,225 @@
+"""Compare callback body encodings: bytes on the wire and CPU per callback.
+
+Runs synthetic "typical" (chat/tool messages with small state deltas) and "diff-heavy"
+(full state snapshots with per-file diffs) workloads, plus real callbacks replayed from
+a callback spool directory when `--spool` is given. Encode CPU is what the sender pays
+(WireEncoder), decode CPU what WireDecodingMiddleware pays to hand routes plain JSON.
+
+Usage (from executor_manager/):
+    uv run python -m scripts.benchmark_callback_encoding
+    uv run python -m scripts.benchmark_callback_encoding --spool /var/lib/opencowork/workspaces/callback_spool
+"""
+
+import argparse
+import json
+import random
+import string
+import time
+from pathlib import Path
+from typing import Any
+
+from poco_shared.wire import (
+    MSGPACK_CONTENT_TYPE,
+    WireEncoder,
+    decompress,
+    msgpack,
+    msgpack_to_json,
+    supported_content_types,
+    supported_encodings,
+    zstandard,
+)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+        for _ in range(count)
+    )
+
+
+def _diff(rng: random.Random, lines: int) -> str:
+    body = [f"@@ -1,{lines} +1,{lines} @@"]
+    for _ in range(lines):
+        prefix = rng.choice(" +-")
+        body.append(f"{prefix}    {_words(rng, rng.randint(3, 10))}")
+    return "\n".join(body)
+
+
+def _typical(rng: random.Random, index: int) -> dict[str, Any]:
+    if index % 3:
+        message = {
+            "_type": "AssistantMessage",
+            "content": [
+                {"_type": "TextBlock", "text": _words(rng, rng.randint(20, 120))}
+            ],
+            "model": "model",
+        }
+    else:
+        message = {
+            "_type": "AssistantMessage",
+            "content": [
+                {
+                    "_type": "ToolUseBlock",
+                    "id": f"toolu_{index:08d}",
+                    "name": "Edit",
+                    "input": {
+                        "file_path": f"/workspace/src/module_{index % 7}.py",
+                        "old_string": _words(rng, 15),
+                        "new_string": _words(rng, 18),
+                    },
+                }
+            ],
+            "model": "model",
+        }
+    return {
+        "session_id": "00000000-0000-0000-0000-000000000001",
+        "time": "2026-01-01T00:00:00+00:00",
+        "status": "running",
+        "progress": index % 100,
+        "new_message": message,
+        "state_delta": {
+            "version": index + 2,
+            "base_version": index + 1,
+            "todo_count": 5,
+            "todos": {
+                str(index % 5): {"content": _words(rng, 6), "status": "completed"}
+            },
+            "current_step": _words(rng, 4),
+        },
+        "state_version": index + 2,
+    }
+
+
+def _diff_heavy(rng: random.Random, index: int, files: int) -> dict[str, Any]:
+    return {
+        "session_id": "00000000-0000-0000-0000-000000000001",
+        "time": "2026-01-01T00:00:00+00:00",
+        "status": "running",
+        "progress": index % 100,
+        "new_message": {
+            "_type": "UserMessage",
+            "content": [{"_type": "ToolResultBlock", "content": _words(rng, 200)}],
+        },
+        "state_patch": {
+            "todos": [
+                {"content": _words(rng, 6), "status": "pending"} for _ in range(8)
+            ],
+            "mcp_status": [],
+            "workspace_state": {
+                "branch": "main",
+                "total_added_lines": 0,
+                "total_deleted_lines": 0,
+                "last_change": "2026-01-01T00:00:00+00:00",
+                "file_changes": [
+                    {
+                        "path": f"src/pkg_{n % 5}/file_{n}.py",
+                        "status": "modified",
+                        "added_lines": 20,
+                        "deleted_lines": 12,
+                        "diff": _diff(rng, rng.randint(20, 120)),
+                    }
+                    for n in range(files)
+                ],
+            },
+            "current_step": _words(rng, 4),
+        },
+        "state_version": index + 1,
+    }
+
+
+def _spooled(spool_dir: Path, limit: int) -> list[dict[str, Any]]:
+    payloads: list[dict[str, Any]] = []
+    for path in sorted(spool_dir.glob("segment-*.ndjson")):
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "payload" in entry:
+                    payloads.append(entry["payload"])
+                    if len(payloads) >= limit:
+                        return payloads
+    return payloads
+
+
+def _measure(
+    payloads: list[dict[str, Any]], wire_format: str, compression: str
+) -> tuple[float, float, float]:
+    encoder = WireEncoder(
+        wire_format=wire_format,  # type: ignore[arg-type]
+        compression=compression,  # type: ignore[arg-type]
+        min_bytes=0,
+    )
+    encoder.observe(
+        {
+            "accept-encoding": ", ".join(supported_encodings()),
+            "x-accept-content-type": ", ".join(supported_content_types()),
+        }
+    )
+
+    started = time.process_time()
+    bodies = [encoder.encode(payload) for payload in payloads]
+    encode_cpu = time.process_time() - started
+
+    started = time.process_time()
+    for body, headers in bodies:
+        data = decompress(body, headers.get("Content-Encoding", ""), max_bytes=1 << 30)
+        if headers["Content-Type"] == MSGPACK_CONTENT_TYPE:
+            data, _ = msgpack_to_json(data)
+        json.loads(data)
+    decode_cpu = time.process_time() - started
+
+    count = len(payloads)
+    total_bytes = sum(len(body) for body, _ in bodies)
+    return total_bytes / count, encode_cpu / count * 1e6, decode_cpu / count * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--callbacks", type=int, default=500)
+    parser.add_argument("--diff-files", type=int, default=40)
+    parser.add_argument("--spool", type=Path, help="replay payloads from a spool dir")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    workloads = {
+        "typical": [_typical(rng, i) for i in range(args.callbacks)],
+        "diff-heavy": [
+            _diff_heavy(rng, i, args.diff_files)
+            for i in range(max(1, args.callbacks // 10))
+        ],
+    }
+    if args.spool:
+        workloads["spool"] = _spooled(args.spool, args.callbacks)
+
+    formats = ["json"] + (["msgpack"] if msgpack is not None else [])
+    compressions = ["none", "gzip"] + (["zstd"] if zstandard is not None else [])
+
+    for name, payloads in workloads.items():
+        if not payloads:
+            continue
+        print(f"\n{name} — {len(payloads)} callbacks")
+        print(
+            f"{'encoding':<18}{'bytes/cb':>12}{'ratio':>8}"
+            f"{'encode µs/cb':>15}{'decode µs/cb':>15}"
+        )
+        baseline = None
+        for wire_format in formats:
+            for compression in compressions:
+                size, encode_us, decode_us = _measure(
+                    payloads, wire_format, compression
+                )
+                baseline = baseline or size
+                label = wire_format + (
+                    "" if compression == "none" else f"+{compression}"
+                )
+                print(
+                    f"{label:<18}{size:>12.0f}{baseline / size:>8.2f}"
+                    f"{encode_us:>15.1f}{decode_us:>15.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark workspace export against the configured S3 bucket.
+
+Generates a synthetic workspace (default: 10k files / 2 GB) under WORKSPACE_ROOT and
+exports it with the streaming pipeline, optionally alongside the previous serial
+upload + temp-zip strategy for comparison.
+
+Usage (from executor_manager/):
+    uv run python -m scripts.benchmark_workspace_export --files 10000 --total-mb 2048
+    uv run python -m scripts.benchmark_workspace_export --baseline
+"""
+
+import argparse
+import os
+import shutil
+import time
+import uuid
+import zipfile
+from pathlib import Path
+
+from app.services.workspace_export_service import (
+    WorkspaceExportService,
+    storage_service,
+    workspace_manager,
+)
+
+
+def _generate_workspace(root: Path, *, files: int, total_bytes: int) -> None:
+    per_file = max(1, total_bytes // max(1, files))
+    # Half-compressible payload: random bytes followed by a repeated pattern.
+    for index in range(files):
+        target = root / f"dir_{index % 100:03d}" / f"sub_{index % 7}" / f"f_{index}.txt"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        random_part = os.urandom(per_file // 2)
+        pattern_part = b"poco-benchmark\n" * ((per_file - len(random_part)) // 15 + 1)
+        target.write_bytes((random_part + pattern_part)[:per_file])
+
+
+def _baseline_export(service: WorkspaceExportService, session_id: str) -> None:
+    """Previous strategy: serial per-file uploads, then a temp zip uploaded afterwards."""
+    user_id = workspace_manager.resolve_user_id(session_id)
+    workspace_dir = workspace_manager.get_session_workspace_dir(
+        user_id=user_id or "", session_id=session_id
+    )
+    assert workspace_dir is not None
+    prefix = f"workspaces/{user_id}/{session_id}-baseline"
+    files = service._collect_files(workspace_dir)
+    for item in files:
+        storage_service.upload_file(
+            file_path=str(item.path),
+            key=f"{prefix}/files/{item.rel_path}",
+            content_type=item.mime_type,
+        )
+    archive_path = workspace_manager.temp_dir / f"{session_id}.zip"
+    with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as zipf:
+        for item in files:
+            zipf.write(item.path, arcname=f"workspace/{item.rel_path}")
+    storage_service.upload_file(
+        file_path=str(archive_path),
+        key=f"{prefix}/archive.zip",
+        content_type="application/zip",
+    )
+    archive_path.unlink(missing_ok=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--total-mb", type=int, default=2048)
+    parser.add_argument("--baseline", action="store_true")
+    parser.add_argument("--keep", action="store_true", help="Keep the workspace")
+    args = parser.parse_args()
+
+    user_id = "benchmark"
+    session_id = f"bench-{uuid.uuid4().hex[:8]}"
+    session_dir = workspace_manager.get_workspace_path(user_id, session_id)
+    workspace_dir = session_dir / "workspace"
+
+    print(f"Generating {args.files} files / {args.total_mb} MB in {workspace_dir}")
+    _generate_workspace(
+        workspace_dir, files=args.files, total_bytes=args.total_mb * 1024 * 1024
+    )
+
+    service = WorkspaceExportService()
+    try:
+        if args.baseline:
+            started = time.perf_counter()
+            _baseline_export(service, session_id)
+            elapsed = time.perf_counter() - started
+            print(f"baseline  : {elapsed:8.2f}s")
+
+        started = time.perf_counter()
+        result = service.export_workspace(session_id)
+        elapsed = time.perf_counter() - started
+        print(
+            f"streaming : {elapsed:8.2f}s "
+            f"({args.total_mb / elapsed:.1f} MB/s, status={result.workspace_export_status})"
+        )
+    finally:
+        if not args.keep:
+            shutil.rmtree(session_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
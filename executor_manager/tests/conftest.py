@@ -0,0 +1,30 @@
+import os
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from app.core.settings import get_settings
+
+# Service modules build their workspace manager and S3 client at import; keep them
+# off real workspaces and storage.
+os.environ["WORKSPACE_ROOT"] = tempfile.mkdtemp(prefix="executor-manager-tests-")
+for name, value in {
+    "S3_ENDPOINT": "http://localhost:9000",
+    "S3_ACCESS_KEY": "test",
+    "S3_SECRET_KEY": "test",
+    "S3_BUCKET": "test",
+}.items():
+    os.environ.setdefault(name, value)
+
+
+@pytest.fixture(autouse=True)
+def settings_env(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Points the settings at a scratch workspace root for each test."""
+    workspace_root = tmp_path / "workspaces"
+    workspace_root.mkdir()
+    monkeypatch.setenv("WORKSPACE_ROOT", str(workspace_root))
+    get_settings.cache_clear()
+    yield workspace_root
+    get_settings.cache_clear()
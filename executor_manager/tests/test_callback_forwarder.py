@@ -0,0 +1,101 @@
+"""Only callbacks Backend rejects for their data may be dead-lettered."""
+
+import asyncio
+import json
+from typing import Any
+
+import httpx
+import pytest
+
+from app.core.settings import get_settings
+from app.services import backend_client as backend_client_module
+from app.services import callback_forwarder as forwarder_module
+from app.services.backend_client import BackendClient
+from app.services.callback_forwarder import CallbackForwarder
+from app.services.callback_spool import CallbackSpool
+
+MAX_ATTEMPTS = 3
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CALLBACK_FORWARD_MAX_ATTEMPTS", str(MAX_ATTEMPTS))
+    monkeypatch.setenv("CALLBACK_FORWARD_WIRE_FORMAT", "json")
+    monkeypatch.setenv("CALLBACK_FORWARD_COMPRESSION", "none")
+    get_settings.cache_clear()
+    # Zero jitter makes every backoff zero seconds.
+    monkeypatch.setattr(forwarder_module.random, "uniform", lambda a, b: 0.0)
+
+
+def _backend_answering(
+    monkeypatch: pytest.MonkeyPatch, data: dict[str, Any]
+) -> list[list[dict[str, Any]]]:
+    """Routes BackendClient to a fake batch endpoint; returns the batches it got."""
+    batches: list[list[dict[str, Any]]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batches.append(json.loads(request.content)["callbacks"])
+        return httpx.Response(200, json={"code": 0, "data": data})
+
+    transport = httpx.MockTransport(handler)
+    async_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        backend_client_module.httpx,
+        "AsyncClient",
+        lambda: async_client(transport=transport),
+    )
+    return batches
+
+
+async def _forward_until(
+    batches: list[list[dict[str, Any]]], sends: int
+) -> CallbackForwarder:
+    forwarder = CallbackForwarder(BackendClient().forward_callbacks)
+    await forwarder.submit("session-1", {"status": "running", "progress": 10})
+    async with asyncio.timeout(5):
+        while len(batches) < sends:
+            await asyncio.sleep(0.01)
+    forwarder.drain_timeout_seconds = 0
+    await forwarder.shutdown()
+    return forwarder
+
+
+def _still_spooled(forwarder: CallbackForwarder) -> list[dict[str, Any]]:
+    spool = CallbackSpool(
+        forwarder.spool.directory, segment_bytes=forwarder.spool.segment_bytes
+    )
+    return [record.payload for record in spool.open()]
+
+
+def test_backend_database_outage_is_never_dead_lettered(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    batches = _backend_answering(
+        monkeypatch,
+        {
+            "processed": 0,
+            "error": "(psycopg.OperationalError) server closed the connection",
+            "retryable": True,
+        },
+    )
+    forwarder = asyncio.run(_forward_until(batches, MAX_ATTEMPTS * 3))
+
+    stats = forwarder.stats()
+    assert stats["dead_lettered_total"] == 0
+    assert stats["rejected_total"] == 0
+    assert not forwarder.dead_letter_path.exists()
+    assert _still_spooled(forwarder) == [batches[0][0]]
+
+
+def test_rejected_callback_is_dead_lettered_after_max_attempts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    batches = _backend_answering(
+        monkeypatch,
+        {"processed": 0, "error": "value too long", "retryable": False},
+    )
+    forwarder = asyncio.run(_forward_until(batches, MAX_ATTEMPTS))
+
+    assert forwarder.stats()["dead_lettered_total"] == 1
+    assert forwarder.dead_letter_path.exists()
+    assert _still_spooled(forwarder) == []
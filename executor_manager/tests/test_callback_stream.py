@@ -0,0 +1,94 @@
+"""A callback stream request is spooled with one group commit."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+
+from app.schemas.callback import CallbackStreamAck
+from app.services import callback_service as callback_service_module
+from app.services.callback_forwarder import CallbackForwarder
+from app.services.callback_service import CallbackService
+from app.services.callback_spool import CallbackSpool
+
+EVENTS = 200
+
+
+def _event(seq: int) -> bytes:
+    callback = {
+        "session_id": "session-1",
+        "time": "2026-01-01T00:00:00Z",
+        "status": "running",
+        "progress": seq % 100,
+    }
+    return json.dumps({"seq": seq, "callback": callback}).encode() + b"\n"
+
+
+async def _chunks(body: bytes, size: int = 4096) -> AsyncIterator[bytes]:
+    for start in range(0, len(body), size):
+        yield body[start : start + size]
+
+
+@pytest.fixture
+def spool_writes(monkeypatch: pytest.MonkeyPatch) -> list[bytes]:
+    """Collects the spool writes that carry callbacks (not acks)."""
+    writes: list[bytes] = []
+    write = CallbackSpool._write
+
+    def recording_write(self: CallbackSpool, data: bytes) -> None:
+        if b'"payload"' in data:
+            writes.append(data)
+        write(self, data)
+
+    monkeypatch.setattr(CallbackSpool, "_write", recording_write)
+    return writes
+
+
+async def _stream(
+    monkeypatch: pytest.MonkeyPatch, service: CallbackService, body: bytes
+) -> tuple[CallbackStreamAck, CallbackForwarder]:
+    """Sends one stream request through a fresh forwarder that Backend accepts."""
+
+    async def send_batch(payloads: list[dict[str, Any]]) -> int:
+        return len(payloads)
+
+    forwarder = CallbackForwarder(send_batch)
+    monkeypatch.setattr(callback_service_module, "callback_forwarder", forwarder)
+    result = await service.process_callback_stream("stream-1", _chunks(body))
+    forwarder.drain_timeout_seconds = 0
+    await forwarder.shutdown()
+    return result, forwarder
+
+
+def test_stream_is_spooled_with_one_write(
+    monkeypatch: pytest.MonkeyPatch, spool_writes: list[bytes]
+) -> None:
+    body = b"".join(_event(seq) for seq in range(1, EVENTS + 1))
+
+    result, forwarder = asyncio.run(_stream(monkeypatch, CallbackService(), body))
+
+    assert result.ack == EVENTS
+    assert result.received == EVENTS
+    assert result.error is None
+    assert forwarder.stats()["spooled_total"] == EVENTS
+    assert len(spool_writes) == 1
+    assert spool_writes[0].count(b"\n") == EVENTS
+
+
+def test_resent_events_are_acked_without_spooling_again(
+    monkeypatch: pytest.MonkeyPatch, spool_writes: list[bytes]
+) -> None:
+    service = CallbackService()
+    asyncio.run(
+        _stream(monkeypatch, service, b"".join(_event(seq) for seq in range(1, 11)))
+    )
+
+    result, forwarder = asyncio.run(
+        _stream(monkeypatch, service, b"".join(_event(seq) for seq in range(6, 16)))
+    )
+
+    assert result.ack == 15
+    assert result.duplicates == 5
+    assert forwarder.stats()["spooled_total"] == 5
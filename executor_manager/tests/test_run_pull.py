@@ -0,0 +1,82 @@
+"""Runs of users over the hard workspace quota are never claimed."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.settings import get_settings
+from app.scheduler.task_dispatcher import TaskDispatcher
+from app.services.run_pull_service import RunPullService
+
+
+class FakeBackend:
+    """A run queue that honours claim exclusions, like Backend's claim query."""
+
+    def __init__(self, queued: list[dict[str, Any]]) -> None:
+        self.queued = queued
+        self.claimed: list[dict[str, Any]] = []
+        self.failed: list[str] = []
+
+    async def claim_run(
+        self,
+        worker_id: str,
+        lease_seconds: int = 30,
+        schedule_modes: list[str] | None = None,
+        exclude_user_ids: list[str] | None = None,
+    ) -> dict[str, Any] | None:
+        for claim in self.queued:
+            if claim["user_id"] not in (exclude_user_ids or []):
+                self.queued.remove(claim)
+                self.claimed.append(claim)
+                return claim
+        return None
+
+    async def fail_run(
+        self, run_id: str, worker_id: str, error_message: str | None = None
+    ) -> dict[str, Any]:
+        self.failed.append(run_id)
+        return {}
+
+
+def _claim(run_id: str, user_id: str) -> dict[str, Any]:
+    return {
+        "run": {"run_id": run_id, "session_id": f"session-{run_id}"},
+        "user_id": user_id,
+        "prompt": "hello",
+    }
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> RunPullService:
+    monkeypatch.setenv("WORKSPACE_USER_HARD_QUOTA_MB", "1")
+    get_settings.cache_clear()
+    monkeypatch.setattr(TaskDispatcher, "get_container_pool", lambda: None)
+    service = RunPullService()
+    service.workspace_manager.record_session_usage(
+        "user-over", "session-big", 2 * 1024 * 1024
+    )
+    service.workspace_manager.record_session_usage("user-ok", "session-small", 1024)
+    return service
+
+
+def test_over_quota_user_run_stays_queued(service: RunPullService) -> None:
+    over_quota = _claim("run-1", "user-over")
+    backend = FakeBackend([over_quota, _claim("run-2", "user-ok")])
+    service.backend_client = backend
+    dispatched: list[str] = []
+
+    async def handle_claim(claim: dict[str, Any]) -> None:
+        dispatched.append(claim["run"]["run_id"])
+
+    service._handle_claim = handle_claim
+
+    async def poll() -> None:
+        await service.poll()
+        await asyncio.gather(*service._tasks)
+
+    asyncio.run(poll())
+
+    assert dispatched == ["run-2"]
+    assert backend.queued == [over_quota]
+    assert backend.failed == []
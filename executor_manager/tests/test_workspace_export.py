@@ -0,0 +1,61 @@
+"""The workspace export walks the session directory once and records its usage."""
+
+from pathlib import Path
+
+import pytest
+
+from app.services import workspace_export_service as export_module
+from app.services.workspace_export_service import WorkspaceExportService
+from app.services.workspace_manager import WorkspaceManager
+
+
+def _write(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def manager(monkeypatch: pytest.MonkeyPatch) -> WorkspaceManager:
+    manager = WorkspaceManager()
+    monkeypatch.setattr(export_module, "workspace_manager", manager)
+    return manager
+
+
+def test_export_reuses_its_walk_for_usage(
+    monkeypatch: pytest.MonkeyPatch, manager: WorkspaceManager
+) -> None:
+    session_dir = manager.get_workspace_path("user-1", "session-1")
+    workspace = session_dir / "workspace"
+    _write(workspace / "README.md", 100)
+    _write(workspace / "src" / "app.py", 200)
+    _write(workspace / "node_modules" / "pkg" / "index.js", 4000)
+    _write(workspace / ".venv" / "lib" / "site.py", 8000)
+    _write(session_dir / "logs" / "run.log", 50)
+    expected_usage = manager._get_dir_size(session_dir)
+
+    uploaded: list[str] = []
+    monkeypatch.setattr(
+        export_module.storage_service,
+        "upload_file",
+        lambda *, file_path, key, content_type: uploaded.append(key),
+    )
+    monkeypatch.setattr(
+        export_module.storage_service, "put_object", lambda **kwargs: None
+    )
+
+    def no_rescan(self: WorkspaceManager, path: Path) -> int:
+        raise AssertionError("the export must not walk the session again")
+
+    monkeypatch.setattr(WorkspaceManager, "_get_dir_size", no_rescan)
+    service = WorkspaceExportService()
+    service.archive_eager = False
+
+    result = service.export_workspace("session-1")
+
+    assert result.workspace_export_status == "ready", result.error
+    assert sorted(uploaded) == [
+        "workspaces/user-1/session-1/files/README.md",
+        "workspaces/user-1/session-1/files/src/app.py",
+    ]
+    assert manager.get_meta("user-1", "session-1").size_bytes == expected_usage
+    assert manager.get_user_usage("user-1")["used_bytes"] == expected_usage
@@ -62,6 +62,8 @@ async function proxyRequest(
     method,
     headers,
     redirect: "manual",
+    // Closes streamed responses (session events) upstream when the client leaves.
+    signal: request.signal,
   };
 
   if (hasBody) {
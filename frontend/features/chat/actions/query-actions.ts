@@ -15,6 +15,15 @@ const getMessagesSchema = sessionIdSchema.extend({
   realUserMessageIds: z.array(z.number().int()).optional(),
 });
 
+const getSessionChangesSchema = sessionIdSchema.extend({
+  sinceVersion: z.number().int().min(0).optional(),
+  afterId: z.number().int().optional(),
+});
+
+const getMessageSchema = z.object({
+  messageId: z.number().int().positive(),
+});
+
 const executionSessionSchema = sessionIdSchema.extend({
   currentProgress: z.number().min(0).optional(),
 });
@@ -22,6 +31,8 @@ const executionSessionSchema = sessionIdSchema.extend({
 export type ListSessionsInput = z.infer<typeof listSessionsSchema>;
 export type GetExecutionSessionInput = z.infer<typeof executionSessionSchema>;
 export type GetMessagesInput = z.infer<typeof getMessagesSchema>;
+export type GetSessionChangesInput = z.infer<typeof getSessionChangesSchema>;
+export type GetMessageInput = z.infer<typeof getMessageSchema>;
 export type GetFilesInput = z.infer<typeof sessionIdSchema>;
 export type GetRunsBySessionInput = z.infer<typeof sessionIdSchema>;
 
@@ -42,6 +53,17 @@ export async function getMessagesAction(input: GetMessagesInput) {
   return chatService.getMessages(sessionId, { realUserMessageIds });
 }
 
+export async function getSessionChangesAction(input: GetSessionChangesInput) {
+  const { sessionId, sinceVersion, afterId } =
+    getSessionChangesSchema.parse(input);
+  return chatService.getSessionChanges(sessionId, { sinceVersion, afterId });
+}
+
+export async function getMessageAction(input: GetMessageInput) {
+  const { messageId } = getMessageSchema.parse(input);
+  return chatService.getMessage(messageId);
+}
+
 export async function getFilesAction(input: GetFilesInput) {
   const { sessionId } = sessionIdSchema.parse(input);
   return chatService.getFiles(sessionId);
@@ -14,6 +14,7 @@ export interface ChatMessageListProps {
   isTyping?: boolean;
   internalContextsByUserMessageId?: Record<string, string[]>;
   runUsageByUserMessageId?: Record<string, UsageResponse | null>;
+  onExpandTruncated?: (messageIds: number[]) => Promise<void>;
 }
 
 export function ChatMessageList({
@@ -21,6 +22,7 @@ export function ChatMessageList({
   isTyping,
   internalContextsByUserMessageId,
   runUsageByUserMessageId,
+  onExpandTruncated,
 }: ChatMessageListProps) {
   const { t } = useT("translation");
   const scrollRef = React.useRef<HTMLDivElement>(null);
@@ -192,6 +194,8 @@ export function ChatMessageList({
                     key={message.id}
                     content={message.content}
                     attachments={message.attachments}
+                    truncatedMessageIds={message.truncatedMessageIds}
+                    onExpandTruncated={onExpandTruncated}
                   />
                 );
               }
@@ -201,6 +205,8 @@ export function ChatMessageList({
                   <UserMessage
                     content={message.content}
                     attachments={message.attachments}
+                    truncatedMessageIds={message.truncatedMessageIds}
+                    onExpandTruncated={onExpandTruncated}
                   />
                   <div className="flex justify-end w-full">
                     <div className="max-w-[85%] w-full rounded-md border border-border/60 bg-muted/20 px-3 py-2">
@@ -275,6 +281,7 @@ export function ChatMessageList({
                 key={message.id}
                 message={message}
                 runUsage={runUsage}
+                onExpandTruncated={onExpandTruncated}
               />
             );
           })}
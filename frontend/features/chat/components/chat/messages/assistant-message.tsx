@@ -3,6 +3,7 @@
 import * as React from "react";
 import { Bot, Copy, ThumbsUp, Check } from "lucide-react";
 import { MessageContent } from "./message-content";
+import { TruncatedNotice } from "./truncated-notice";
 import { TypingIndicator } from "./typing-indicator";
 import type {
   ChatMessage,
@@ -15,6 +16,7 @@ import { useT } from "@/lib/i18n/client";
 interface AssistantMessageProps {
   message: ChatMessage;
   runUsage?: UsageResponse | null;
+  onExpandTruncated?: (messageIds: number[]) => Promise<void>;
 }
 
 function pickNumber(value: unknown): number | null {
@@ -35,7 +37,11 @@ function formatDurationMs(value: number | null | undefined): string | null {
   return seconds >= 60 ? `${Math.round(seconds)}s` : `${seconds.toFixed(1)}s`;
 }
 
-export function AssistantMessage({ message, runUsage }: AssistantMessageProps) {
+export function AssistantMessage({
+  message,
+  runUsage,
+  onExpandTruncated,
+}: AssistantMessageProps) {
   const { t } = useT("translation");
   const [isCopied, setIsCopied] = React.useState(false);
   const [isLiked, setIsLiked] = React.useState(false);
@@ -130,6 +136,10 @@ export function AssistantMessage({ message, runUsage }: AssistantMessageProps) {
 
         <div className="text-foreground text-base break-words w-full min-w-0">
           <MessageContent content={message.content} />
+          <TruncatedNotice
+            messageIds={message.truncatedMessageIds}
+            onExpand={onExpandTruncated}
+          />
           {message.status === "streaming" && <TypingIndicator />}
         </div>
 
@@ -0,0 +1,61 @@
+"use client";
+
+import * as React from "react";
+import { Loader2 } from "lucide-react";
+import { Button } from "@/components/ui/button";
+import { useT } from "@/lib/i18n/client";
+
+interface TruncatedNoticeProps {
+  messageIds?: number[];
+  onExpand?: (messageIds: number[]) => Promise<void>;
+}
+
+/**
+ * Marks content shown from a stored preview and loads the full messages on click.
+ */
+export function TruncatedNotice({
+  messageIds,
+  onExpand,
+}: TruncatedNoticeProps) {
+  const { t } = useT("translation");
+  const [isLoading, setIsLoading] = React.useState(false);
+
+  if (!messageIds || messageIds.length === 0) return null;
+
+  const onShowFull = async () => {
+    if (!onExpand) return;
+    setIsLoading(true);
+    try {
+      await onExpand(messageIds);
+    } catch (err) {
+      console.error("Failed to load full message", err);
+    } finally {
+      setIsLoading(false);
+    }
+  };
+
+  return (
+    <div className="flex items-center gap-2 text-xs text-muted-foreground">
+      <span>{t("chat.contentTruncated")}</span>
+      {onExpand && (
+        <Button
+          type="button"
+          variant="ghost"
+          size="sm"
+          className="h-7 px-2 text-xs text-muted-foreground hover:text-foreground"
+          disabled={isLoading}
+          onClick={onShowFull}
+        >
+          {isLoading ? (
+            <>
+              <Loader2 className="size-3 animate-spin" />
+              {t("chat.contentTruncatedLoading")}
+            </>
+          ) : (
+            t("chat.contentTruncatedShowFull")
+          )}
+        </Button>
+      )}
+    </div>
+  );
+}
@@ -2,13 +2,18 @@
 
 import { FileCard } from "@/components/shared/file-card";
 import type { MessageBlock, InputFile } from "@/features/chat/types";
+import { TruncatedNotice } from "./truncated-notice";
 
 export function UserMessage({
   content,
   attachments,
+  truncatedMessageIds,
+  onExpandTruncated,
 }: {
   content: string | MessageBlock[];
   attachments?: InputFile[];
+  truncatedMessageIds?: number[];
+  onExpandTruncated?: (messageIds: number[]) => Promise<void>;
 }) {
   // Parse content if it's an array of blocks
   const parseContent = (content: string | MessageBlock[]): string => {
@@ -44,6 +49,10 @@ export function UserMessage({
           </p>
         </div>
       )}
+      <TruncatedNotice
+        messageIds={truncatedMessageIds}
+        onExpand={onExpandTruncated}
+      />
     </div>
   );
 }
@@ -62,6 +62,7 @@ export function ChatPanel({
     sendMessage,
     internalContextsByUserMessageId,
     runUsageByUserMessageId,
+    expandTruncated,
   } = useChatMessages({ session });
 
   // Pending message queue hook
@@ -155,6 +156,7 @@ export function ChatPanel({
             isTyping={showTypingIndicator}
             internalContextsByUserMessageId={internalContextsByUserMessageId}
             runUsageByUserMessageId={runUsageByUserMessageId}
+            onExpandTruncated={expandTruncated}
           />
         )}
       </div>
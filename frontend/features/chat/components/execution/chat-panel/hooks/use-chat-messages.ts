@@ -1,16 +1,24 @@
 import { useEffect, useRef, useState, useCallback, useMemo } from "react";
 import { sendMessageAction } from "@/features/chat/actions/session-actions";
 import {
-  getMessagesAction,
-  getRunsBySessionAction,
+  getMessageAction,
+  getSessionChangesAction,
 } from "@/features/chat/actions/query-actions";
+import { useSessionEvents } from "@/features/chat/hooks/use-session-events";
+import { buildChatMessages } from "@/features/chat/services/chat-service";
 import type {
   ChatMessage,
   ExecutionSession,
   InputFile,
+  MessageWithFilesResponse,
+  RunResponse,
+  SessionChangesResponse,
+  SessionEventType,
   UsageResponse,
 } from "@/features/chat/types";
 
+const MESSAGE_EVENT_TYPES: SessionEventType[] = ["message", "run"];
+
 interface UseChatMessagesOptions {
   session: ExecutionSession | null;
   pollingInterval?: number;
@@ -25,6 +33,7 @@ interface UseChatMessagesReturn {
   sendMessage: (content: string, attachments?: InputFile[]) => Promise<void>;
   internalContextsByUserMessageId: Record<string, string[]>;
   runUsageByUserMessageId: Record<string, UsageResponse | null>;
+  expandTruncated: (messageIds: number[]) => Promise<void>;
 }
 
 /**
@@ -32,8 +41,10 @@ interface UseChatMessagesReturn {
  *
  * Responsibilities:
  * - Load message history when session changes
- * - Poll for new messages during active sessions
+ * - Sync changes (new messages, run updates) when the backend pushes events,
+ *   polling during active sessions while the event stream is down
  * - Merge local optimistic messages with server messages
+ * - Load the full body of messages the server sent as previews, on request
  * - Calculate display messages with streaming status
  * - Handle typing indicator state
  */
@@ -52,47 +63,71 @@ export function useChatMessages({
   >({});
 
   const lastLoadedSessionIdRef = useRef<string | null>(null);
-  const realUserMessageIdsRef = useRef<number[] | null>(null);
-
-  const refreshRealUserMessageIds = useCallback(async () => {
-    if (!session?.session_id) return;
-    try {
-      const runs = await getRunsBySessionAction({
-        sessionId: session.session_id,
-      });
-      const ids = runs
-        .map((r) => r.user_message_id)
-        .filter((id): id is number => typeof id === "number" && id > 0);
-
-      realUserMessageIdsRef.current = ids;
-      const usageByMessageId: Record<string, UsageResponse | null> = {};
-      runs.forEach((r) => {
-        const key = String(r.user_message_id);
-        usageByMessageId[key] = r.usage ?? null;
-      });
-      setRunUsageByUserMessageId(usageByMessageId);
-    } catch (error) {
-      console.error("[Chat] Failed to load runs:", error);
-      // Keep as null so message rendering falls back to showing all user messages.
-      realUserMessageIdsRef.current = null;
-      setRunUsageByUserMessageId({});
-    }
-  }, [session?.session_id]);
-
-  const fetchMessagesWithFilter = useCallback(
+  // Raw server state, kept across polls so each poll only fetches what changed.
+  const rawMessagesRef = useRef<MessageWithFilesResponse[]>([]);
+  const runsByIdRef = useRef<Map<string, RunResponse>>(new Map());
+  const changeVersionRef = useRef<number | null>(null);
+  const syncQueueRef = useRef<Promise<unknown>>(Promise.resolve());
+
+  /** Rebuilds the chat timeline from the raw server state. */
+  const rebuildMessages = useCallback(() => {
+    const runs = Array.from(runsByIdRef.current.values());
+    const usageByMessageId: Record<string, UsageResponse | null> = {};
+    runs.forEach((r) => {
+      usageByMessageId[String(r.user_message_id)] = r.usage ?? null;
+    });
+    setRunUsageByUserMessageId(usageByMessageId);
+
+    // Runs give the whitelist of real user input message ids (one per run).
+    const realUserMessageIds = runs
+      .map((r) => r.user_message_id)
+      .filter((id): id is number => typeof id === "number" && id > 0);
+    return buildChatMessages(rawMessagesRef.current, realUserMessageIds);
+  }, []);
+
+  /**
+   * Pulls new messages and changed runs since the last sync.
+   * Returns null when nothing changed (one cheap request in steady state).
+   */
+  const pullChanges = useCallback(
     async (sessionId: string) => {
-      // Ensure we have a whitelist of real user input message ids (per run).
-      if (realUserMessageIdsRef.current === null) {
-        await refreshRealUserMessageIds();
-      }
+      const sinceVersion = changeVersionRef.current ?? undefined;
+      let changed = false;
+      let changes: SessionChangesResponse;
+      do {
+        changes = await getSessionChangesAction({
+          sessionId,
+          sinceVersion,
+          afterId: rawMessagesRef.current.at(-1)?.id,
+        });
+        if (lastLoadedSessionIdRef.current !== sessionId) return null;
+        rawMessagesRef.current = [
+          ...rawMessagesRef.current,
+          ...changes.messages,
+        ];
+        changes.runs.forEach((run) =>
+          runsByIdRef.current.set(run.run_id, run),
+        );
+        changed ||= changes.messages.length > 0 || changes.runs.length > 0;
+      } while (changes.has_more);
+      // Only advance once every page is in: the server skips work for a version
+      // the client already has.
+      changeVersionRef.current = changes.change_version;
+      if (!changed) return null;
+      return rebuildMessages();
+    },
+    [rebuildMessages],
+  );
 
-      const realUserMessageIds = realUserMessageIdsRef.current ?? undefined;
-      return getMessagesAction({
-        sessionId,
-        realUserMessageIds,
-      });
+  // Polls, sends and status changes all sync; run them one at a time so the
+  // same page is never appended twice.
+  const syncChanges = useCallback(
+    (sessionId: string) => {
+      const next = syncQueueRef.current.then(() => pullChanges(sessionId));
+      syncQueueRef.current = next.catch(() => undefined);
+      return next;
     },
-    [refreshRealUserMessageIds],
+    [pullChanges],
   );
 
   // Helper to merge new server messages with local optimistic messages
@@ -176,28 +211,79 @@ export function useChatMessages({
         });
         console.log("[Chat] Message sent successfully");
 
-        // Refresh runs so multi-turn conversations only show real user inputs.
-        await refreshRealUserMessageIds();
-
-        // Fetch latest messages immediately to confirm sync
-        const server = await fetchMessagesWithFilter(sessionId);
-        setInternalContextsByUserMessageId(
-          server.internalContextsByUserMessageId,
-        );
-        setMessages((prev) => mergeMessages(prev, server.messages));
+        // Fetch the new message and run immediately to confirm sync
+        const server = await syncChanges(sessionId);
+        if (server) {
+          setInternalContextsByUserMessageId(
+            server.internalContextsByUserMessageId,
+          );
+          setMessages((prev) => mergeMessages(prev, server.messages));
+        }
       } catch (error) {
         console.error("[Chat] Failed to send message or get reply:", error);
         setIsTyping(false);
       }
     },
-    [
-      session,
-      mergeMessages,
-      refreshRealUserMessageIds,
-      fetchMessagesWithFilter,
-    ],
+    [session, mergeMessages, syncChanges],
+  );
+
+  const sessionId = session?.session_id;
+
+  const fetchMessages = useCallback(async () => {
+    if (!sessionId) return;
+    try {
+      const history = await syncChanges(sessionId);
+      if (!history) return;
+      setInternalContextsByUserMessageId(
+        history.internalContextsByUserMessageId,
+      );
+
+      setMessages((prev) => {
+        // If it's the first load (empty prev), just set it
+        // Otherwise merge
+        return mergeMessages(prev, history.messages);
+      });
+    } catch (error) {
+      console.error("[Chat] Failed to load messages:", error);
+    } finally {
+      setIsLoadingHistory(false);
+    }
+  }, [sessionId, syncChanges, mergeMessages]);
+
+  // Swaps stored previews for the full bodies from GET /messages/{id}; queued
+  // behind syncs so a concurrent poll never drops the swap.
+  const expandTruncated = useCallback(
+    async (messageIds: number[]) => {
+      if (!sessionId || messageIds.length === 0) return;
+      const next = syncQueueRef.current.then(async () => {
+        const fullMessages = await Promise.all(
+          messageIds.map((messageId) => getMessageAction({ messageId })),
+        );
+        if (lastLoadedSessionIdRef.current !== sessionId) return null;
+        const fullById = new Map(fullMessages.map((m) => [m.id, m]));
+        rawMessagesRef.current = rawMessagesRef.current.map((m) => {
+          const full = fullById.get(m.id);
+          return full ? { ...m, ...full } : m;
+        });
+        return rebuildMessages();
+      });
+      syncQueueRef.current = next.catch(() => undefined);
+
+      const rebuilt = await next;
+      if (!rebuilt) return;
+      setInternalContextsByUserMessageId(
+        rebuilt.internalContextsByUserMessageId,
+      );
+      setMessages((prev) => mergeMessages(prev, rebuilt.messages));
+    },
+    [sessionId, rebuildMessages, mergeMessages],
   );
 
+  const isStreamConnected = useSessionEvents(sessionId, {
+    types: MESSAGE_EVENT_TYPES,
+    onChange: fetchMessages,
+  });
+
   // Load and poll for messages
   useEffect(() => {
     if (!session?.session_id) return;
@@ -208,49 +294,31 @@ export function useChatMessages({
       setMessages([]);
       setIsTyping(false);
       setInternalContextsByUserMessageId({});
-      realUserMessageIdsRef.current = null;
       setRunUsageByUserMessageId({});
+      rawMessagesRef.current = [];
+      runsByIdRef.current = new Map();
+      changeVersionRef.current = null;
       lastLoadedSessionIdRef.current = session.session_id;
     }
 
-    const fetchMessages = async () => {
-      try {
-        const history = await fetchMessagesWithFilter(session.session_id);
-        setInternalContextsByUserMessageId(
-          history.internalContextsByUserMessageId,
-        );
-
-        setMessages((prev) => {
-          // If it's the first load (empty prev), just set it
-          // Otherwise merge
-          return mergeMessages(prev, history.messages);
-        });
-      } catch (error) {
-        console.error("[Chat] Failed to load messages:", error);
-      } finally {
-        setIsLoadingHistory(false);
-      }
-    };
-
     // Initial fetch
     fetchMessages();
 
-    // Setup polling
+    // Setup polling; pushed events replace it while the stream is connected
     let interval: NodeJS.Timeout;
 
     const isTerminal = ["completed", "failed", "stopped"].includes(
       session.status,
     );
 
-    if (session.session_id && !isTerminal) {
+    if (session.session_id && !isTerminal && !isStreamConnected) {
       interval = setInterval(fetchMessages, pollingInterval);
     } else if (session.session_id && isTerminal) {
+      // The fetch above already picked up the final run usage (cost/tokens).
       console.log(
         `%c [Message Polling] Stopped for session ${session.session_id}`,
         "color: #f59e0b; font-weight: bold;",
       );
-      // Refresh run usage once the session becomes terminal so UI can display cost/tokens.
-      void refreshRealUserMessageIds();
     }
 
     return () => {
@@ -259,10 +327,9 @@ export function useChatMessages({
   }, [
     session?.session_id,
     session?.status,
-    mergeMessages,
+    fetchMessages,
+    isStreamConnected,
     pollingInterval,
-    fetchMessagesWithFilter,
-    refreshRealUserMessageIds,
   ]);
 
   // Manage isTyping state based on messages
@@ -309,5 +376,6 @@ export function useChatMessages({
     sendMessage,
     internalContextsByUserMessageId,
     runUsageByUserMessageId,
+    expandTruncated,
   };
 }
@@ -1,6 +1,10 @@
 import { useCallback, useEffect, useRef, useState } from "react";
+import { useSessionEvents } from "@/features/chat/hooks/use-session-events";
 import { userInputService } from "@/features/chat/services/user-input-service";
-import type { UserInputRequest } from "@/features/chat/types";
+import type {
+  SessionEventType,
+  UserInputRequest,
+} from "@/features/chat/types";
 
 interface UseUserInputRequestsReturn {
   requests: UserInputRequest[];
@@ -13,6 +17,7 @@ interface UseUserInputRequestsReturn {
 }
 
 const POLLING_INTERVAL = 1500;
+const USER_INPUT_EVENT_TYPES: SessionEventType[] = ["user_input_request"];
 
 export function useUserInputRequests(
   sessionId?: string,
@@ -37,6 +42,12 @@ export function useUserInputRequests(
     }
   }, [sessionId]);
 
+  const isStreamConnected = useSessionEvents(sessionId, {
+    types: USER_INPUT_EVENT_TYPES,
+    onChange: fetchRequests,
+    enabled,
+  });
+
   useEffect(() => {
     if (!sessionId) {
       setRequests([]);
@@ -52,7 +63,10 @@ export function useUserInputRequests(
     }
 
     fetchRequests();
-    timerRef.current = window.setInterval(fetchRequests, POLLING_INTERVAL);
+    // Pushed events replace polling while the stream is connected.
+    if (!isStreamConnected) {
+      timerRef.current = window.setInterval(fetchRequests, POLLING_INTERVAL);
+    }
 
     return () => {
       if (timerRef.current) {
@@ -60,7 +74,7 @@ export function useUserInputRequests(
         timerRef.current = null;
       }
     };
-  }, [fetchRequests, sessionId, enabled]);
+  }, [fetchRequests, sessionId, enabled, isStreamConnected]);
 
   const submitAnswer = useCallback(
     async (requestId: string, answers: Record<string, string>) => {
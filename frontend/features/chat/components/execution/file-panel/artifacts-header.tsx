@@ -7,6 +7,9 @@ import type { FileNode } from "@/features/chat/types";
 import { apiClient, API_ENDPOINTS } from "@/lib/api-client";
 import { toast } from "sonner";
 
+const ARCHIVE_POLL_INTERVAL_MS = 2000;
+const ARCHIVE_POLL_MAX_ATTEMPTS = 90;
+
 interface ArtifactsHeaderProps {
   title?: string;
   selectedFile?: FileNode;
@@ -31,10 +34,22 @@ export function ArtifactsHeader({
   const handleDownload = async () => {
     if (!sessionId) return;
     try {
-      const response = await apiClient.get<{
+      // The archive is built on first request; poll while the backend reports "building".
+      let response: {
         url?: string | null;
         filename?: string | null;
-      }>(API_ENDPOINTS.sessionWorkspaceArchive(sessionId));
+        status?: string | null;
+      } = {};
+      for (let attempt = 0; attempt < ARCHIVE_POLL_MAX_ATTEMPTS; attempt++) {
+        response = await apiClient.get<typeof response>(
+          API_ENDPOINTS.sessionWorkspaceArchive(sessionId),
+        );
+        if (response.status !== "building") break;
+        if (attempt === 0) toast.info("正在准备工作区归档…");
+        await new Promise((resolve) =>
+          setTimeout(resolve, ARCHIVE_POLL_INTERVAL_MS),
+        );
+      }
 
       if (response.url) {
         // Trigger download
@@ -1,9 +1,15 @@
 import { useState, useCallback, useEffect, useRef } from "react";
 import { getExecutionSessionAction } from "@/features/chat/actions/query-actions";
 import { useAdaptivePolling } from "./use-adaptive-polling";
-import type { ExecutionSession } from "@/features/chat/types";
+import { useSessionEvents } from "./use-session-events";
+import type {
+  ExecutionSession,
+  SessionEventType,
+} from "@/features/chat/types";
 import { playTaskCompleteSound } from "@/lib/utils/sound";
 
+const SESSION_EVENT_TYPES: SessionEventType[] = ["session", "run"];
+
 interface UseExecutionSessionOptions {
   /**
    * Session ID to poll
@@ -62,7 +68,8 @@ interface UseExecutionSessionReturn {
  *
  * Features:
  * - Fetches session data from API
- * - Automatically polls while session is active
+ * - Refetches on session and run events pushed by the backend
+ * - Polls while session is active and the event stream is down
  * - Adaptive polling with exponential backoff on errors
  * - Persists user_prompt across session updates
  * - Polling interval controlled by NEXT_PUBLIC_SESSION_POLLING_INTERVAL env variable
@@ -188,9 +195,14 @@ export function useExecutionSession({
     }
   }, [session, sessionId, onPollingStop]);
 
+  const isStreamConnected = useSessionEvents(sessionId, {
+    types: SESSION_EVENT_TYPES,
+    onChange: fetchSession,
+  });
+
   const { currentInterval, errorCount, trigger } = useAdaptivePolling({
     callback: fetchSession,
-    isActive: isSessionActive,
+    isActive: isSessionActive && !isStreamConnected,
     interval: pollingInterval,
     enableBackoff,
   });
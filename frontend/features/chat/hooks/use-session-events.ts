@@ -0,0 +1,161 @@
+import { useEffect, useRef, useState } from "react";
+import { API_ENDPOINTS, API_PREFIX, getApiBaseUrl } from "@/lib/api-client";
+import type { SessionEvent, SessionEventType } from "@/features/chat/types";
+
+const EVENT_TYPES: SessionEventType[] = [
+  "ready",
+  "message",
+  "run",
+  "session",
+  "user_input_request",
+  "resync",
+];
+
+type Listener = (event: SessionEvent) => void;
+
+interface SessionStream {
+  source: EventSource;
+  listeners: Set<Listener>;
+  connectedListeners: Set<(connected: boolean) => void>;
+  connected: boolean;
+}
+
+// One EventSource per session, shared by every hook that subscribes to it.
+const streams = new Map<string, SessionStream>();
+
+function openStream(sessionId: string): SessionStream {
+  const url = `${getApiBaseUrl()}${API_PREFIX}${API_ENDPOINTS.sessionEvents(sessionId)}`;
+  const stream: SessionStream = {
+    source: new EventSource(url),
+    listeners: new Set(),
+    connectedListeners: new Set(),
+    connected: false,
+  };
+  const setConnected = (connected: boolean) => {
+    if (stream.connected === connected) return;
+    stream.connected = connected;
+    stream.connectedListeners.forEach((listener) => listener(connected));
+  };
+
+  EVENT_TYPES.forEach((type) => {
+    stream.source.addEventListener(type, (message) => {
+      if (type === "ready") setConnected(true);
+      let event: SessionEvent;
+      try {
+        event = JSON.parse((message as MessageEvent<string>).data);
+      } catch {
+        return;
+      }
+      stream.listeners.forEach((listener) => listener(event));
+    });
+  });
+  // EventSource reconnects by itself; poll until the next `ready` arrives.
+  stream.source.onerror = () => setConnected(false);
+  return stream;
+}
+
+function subscribe(
+  sessionId: string,
+  listener: Listener,
+  onConnectedChange: (connected: boolean) => void,
+): () => void {
+  let stream = streams.get(sessionId);
+  if (!stream) {
+    stream = openStream(sessionId);
+    streams.set(sessionId, stream);
+  }
+  stream.listeners.add(listener);
+  stream.connectedListeners.add(onConnectedChange);
+  onConnectedChange(stream.connected);
+
+  const current = stream;
+  return () => {
+    current.listeners.delete(listener);
+    current.connectedListeners.delete(onConnectedChange);
+    if (current.listeners.size === 0) {
+      current.source.close();
+      streams.delete(sessionId);
+    }
+  };
+}
+
+interface UseSessionEventsOptions {
+  /** Event types that call `onChange`; `ready` and `resync` always do. */
+  types: SessionEventType[];
+  /** Refetches what the events announce. */
+  onChange: () => Promise<unknown> | void;
+  enabled?: boolean;
+}
+
+/**
+ * Subscribes to a session's server-sent events.
+ *
+ * Events say what changed, not the full state, so `onChange` refetches through
+ * the regular endpoints. Events arriving while it runs are coalesced into a
+ * single rerun. `ready` (also sent after every reconnect) and `resync` mean
+ * events may have been missed and refresh too.
+ *
+ * Returns whether the stream is connected; callers keep polling while it is not.
+ */
+export function useSessionEvents(
+  sessionId: string | undefined,
+  { types, onChange, enabled = true }: UseSessionEventsOptions,
+): boolean {
+  const [connected, setConnected] = useState(false);
+  const onChangeRef = useRef(onChange);
+  const typesRef = useRef(types);
+
+  useEffect(() => {
+    onChangeRef.current = onChange;
+    typesRef.current = types;
+  }, [onChange, types]);
+
+  useEffect(() => {
+    if (!sessionId || !enabled || typeof EventSource === "undefined") {
+      setConnected(false);
+      return;
+    }
+
+    let running = false;
+    let rerun = false;
+    const run = async () => {
+      if (running) {
+        rerun = true;
+        return;
+      }
+      running = true;
+      try {
+        do {
+          rerun = false;
+          try {
+            await onChangeRef.current();
+          } catch (error) {
+            console.error("[SessionEvents] Refresh failed:", error);
+          }
+        } while (rerun);
+      } finally {
+        running = false;
+      }
+    };
+
+    const unsubscribe = subscribe(
+      sessionId,
+      (event) => {
+        if (
+          event.type === "ready" ||
+          event.type === "resync" ||
+          typesRef.current.includes(event.type)
+        ) {
+          void run();
+        }
+      },
+      setConnected,
+    );
+    return () => {
+      unsubscribe();
+      setConnected(false);
+    };
+  }, [sessionId, enabled]);
+
+  return connected;
+}
@@ -15,7 +15,10 @@ import type {
   TaskConfig,
   InputFile,
   ConfigSnapshot,
+  MessageResponse,
+  MessageWithFilesResponse,
   RunResponse,
+  SessionChangesResponse,
 } from "@/features/chat/types";
 
 interface MessageContentBlock {
@@ -118,6 +121,8 @@ function createDefaultSession(sessionId: string): ExecutionSession {
   };
 }
 
+const MESSAGES_PAGE_SIZE = 500;
+
 function buildQuery(params?: Record<string, string | number | undefined>) {
   if (!params) return "";
   const searchParams = new URLSearchParams();
@@ -128,6 +133,307 @@ function buildQuery(params?: Record<string, string | number | undefined>) {
   return query ? `?${query}` : "";
 }
 
+/**
+ * Turns raw session messages (oldest first) into chat timeline messages.
+ * Pure, so pollers can keep the raw list and rebuild after appending new ones.
+ */
+// Remembers that `target` shows a stored preview of `msg`, so the view can offer
+// to load the full body.
+function markTruncated(
+  target: ChatMessage | undefined,
+  msg: MessageWithFilesResponse,
+): void {
+  if (!target || !msg.content_truncated) return;
+  const ids = target.truncatedMessageIds ?? [];
+  if (!ids.includes(msg.id)) target.truncatedMessageIds = [...ids, msg.id];
+}
+
+export function buildChatMessages(
+  messages: MessageWithFilesResponse[],
+  realUserMessageIds?: number[],
+): {
+  messages: ChatMessage[];
+  internalContextsByUserMessageId: Record<string, string[]>;
+} {
+  const realUserMessageIdSet = new Set(realUserMessageIds ?? []);
+  // If we can't reliably identify "real user inputs" (runs not available),
+  // fall back to showing all user messages and do not build internal contexts.
+  const canClassifyUserMessages = realUserMessageIdSet.size > 0;
+
+  const processedMessages: ChatMessage[] = [];
+  const internalContextsByUserMessageId: Record<string, string[]> = {};
+  const subagentTranscriptByToolUseId: Record<string, string[]> = {};
+  const truncatedSubagentIdsByToolUseId: Record<string, number[]> = {};
+  let currentAssistantMessage: ChatMessage | null = null;
+  let currentTurnUserMessageId: string | null = null;
+
+  for (const msg of messages) {
+    const contentObj = msg.content as MessageContentShape;
+    if (
+      typeIncludes(contentObj._type, "SystemMessage") &&
+      contentObj.subtype === "init"
+    ) {
+      continue;
+    }
+
+    const parentToolUseId = isNonEmptyString(contentObj.parent_tool_use_id)
+      ? contentObj.parent_tool_use_id.trim()
+      : null;
+
+    // Subagent messages are nested under a parent tool call (e.g., Task).
+    // We keep them out of the main timeline and attach a flattened transcript to the parent ToolUseBlock.
+    if (parentToolUseId) {
+      const nestedTexts: string[] = [];
+      if (isNonEmptyString(contentObj.text)) {
+        nestedTexts.push(cleanText(contentObj.text));
+      }
+      if (Array.isArray(contentObj.content)) {
+        for (const block of contentObj.content) {
+          if (!typeIncludes(block?._type, "TextBlock")) continue;
+          if (isNonEmptyString(block.text)) {
+            nestedTexts.push(cleanText(block.text));
+          }
+        }
+      }
+      const cleaned = nestedTexts
+        .map((t) => t.trim())
+        .filter(Boolean)
+        .join("\n\n");
+      if (cleaned) {
+        subagentTranscriptByToolUseId[parentToolUseId] = [
+          ...(subagentTranscriptByToolUseId[parentToolUseId] || []),
+          cleaned,
+        ];
+      }
+      if (msg.content_truncated) {
+        truncatedSubagentIdsByToolUseId[parentToolUseId] = [
+          ...(truncatedSubagentIdsByToolUseId[parentToolUseId] || []),
+          msg.id,
+        ];
+      }
+      continue;
+    }
+
+    if (msg.role === "assistant" && Array.isArray(contentObj.content)) {
+      const blocks = contentObj.content;
+
+      const toolUseBlocks = blocks.filter((b) =>
+        typeIncludes(b?._type, "ToolUseBlock"),
+      );
+
+      if (toolUseBlocks.length > 0) {
+        if (!currentAssistantMessage) {
+          currentAssistantMessage = {
+            id: msg.id.toString(),
+            role: "assistant",
+            content: [],
+            status: "completed",
+            timestamp: msg.created_at,
+          };
+          processedMessages.push(currentAssistantMessage);
+        }
+
+        const existingBlocks =
+          currentAssistantMessage.content as MessageBlock[];
+
+        const uiToolBlocks = toolUseBlocks.map((b) => ({
+          _type: "ToolUseBlock" as const,
+          id: typeof b.id === "string" ? b.id : String(b.id ?? ""),
+          name: typeof b.name === "string" ? b.name : String(b.name ?? ""),
+          input:
+            b.input && typeof b.input === "object"
+              ? (b.input as Record<string, unknown>)
+              : {},
+        }));
+
+        currentAssistantMessage.content = [
+          ...existingBlocks,
+          ...uiToolBlocks,
+        ];
+        markTruncated(currentAssistantMessage, msg);
+      }
+    }
+
+    // ToolResultBlock is typically a user-role message (Anthropic style), but some providers
+    // may emit it under assistant-role. Don't rely on msg.role to attach results.
+    if (Array.isArray(contentObj.content)) {
+      const blocks = contentObj.content;
+      const toolResultBlocks = blocks.filter((b) =>
+        typeIncludes(b?._type, "ToolResultBlock"),
+      );
+
+      if (toolResultBlocks.length > 0) {
+        if (!currentAssistantMessage) {
+          currentAssistantMessage = {
+            id: msg.id.toString(),
+            role: "assistant",
+            content: [],
+            status: "completed",
+            timestamp: msg.created_at,
+          };
+          processedMessages.push(currentAssistantMessage);
+        }
+
+        const uiResultBlocks = toolResultBlocks.map((b) => ({
+          _type: "ToolResultBlock" as const,
+          tool_use_id:
+            typeof b.tool_use_id === "string"
+              ? b.tool_use_id
+              : String(b.tool_use_id ?? ""),
+          content: cleanText(
+            typeof b.content === "string"
+              ? b.content
+              : (JSON.stringify(b.content) ?? ""),
+          ),
+          is_error: !!b.is_error,
+        }));
+        const existingBlocks =
+          currentAssistantMessage.content as MessageBlock[];
+        currentAssistantMessage.content = [
+          ...existingBlocks,
+          ...uiResultBlocks,
+        ];
+        markTruncated(currentAssistantMessage, msg);
+
+        // Keep ToolResultBlock out of the user timeline.
+        if (msg.role === "user") continue;
+      }
+    }
+
+    if (msg.role === "assistant" && Array.isArray(contentObj.content)) {
+      const blocks = contentObj.content;
+      const thinkingBlocks = blocks.filter((b) =>
+        typeIncludes(b?._type, "ThinkingBlock"),
+      );
+
+      const uiThinkingBlocks = thinkingBlocks
+        .map((b) => ({
+          _type: "ThinkingBlock" as const,
+          thinking: cleanText(b.thinking || ""),
+          signature: b.signature,
+        }))
+        .filter((b) => b.thinking.trim().length > 0);
+
+      if (uiThinkingBlocks.length > 0) {
+        if (!currentAssistantMessage) {
+          currentAssistantMessage = {
+            id: msg.id.toString(),
+            role: "assistant",
+            content: [],
+            status: "completed",
+            timestamp: msg.created_at,
+          };
+          processedMessages.push(currentAssistantMessage);
+        }
+
+        const existingBlocks =
+          currentAssistantMessage.content as MessageBlock[];
+
+        currentAssistantMessage.content = [
+          ...existingBlocks,
+          ...uiThinkingBlocks,
+        ];
+        markTruncated(currentAssistantMessage, msg);
+      }
+    }
+
+    let textContent = "";
+    if (isNonEmptyString(contentObj.text)) {
+      textContent = cleanText(contentObj.text);
+    } else if (Array.isArray(contentObj.content)) {
+      const textBlocks = contentObj.content
+        .filter((b) => typeIncludes(b?._type, "TextBlock"))
+        .map((b) => (isNonEmptyString(b.text) ? cleanText(b.text) : ""))
+        .filter((t) => t.trim().length > 0);
+      if (textBlocks.length > 0) textContent = textBlocks.join("\n\n");
+    }
+
+    if (textContent) {
+      if (msg.role === "user") {
+        // A user-role message from the SDK is not always a real user input.
+        // Real user inputs are identified by AgentRun.user_message_id (per turn).
+        const isRealUserMessage = canClassifyUserMessages
+          ? realUserMessageIdSet.has(msg.id)
+          : true;
+
+        if (!isRealUserMessage) {
+          // Keep internal user-role text for optional inline display (debug/UX),
+          // but do not render it as a user bubble.
+          if (currentTurnUserMessageId) {
+            internalContextsByUserMessageId[currentTurnUserMessageId] = [
+              ...(internalContextsByUserMessageId[
+                currentTurnUserMessageId
+              ] || []),
+              textContent,
+            ];
+            markTruncated(
+              processedMessages.find((m) => m.id === currentTurnUserMessageId),
+              msg,
+            );
+          }
+          continue;
+        }
+
+        currentAssistantMessage = null;
+        currentTurnUserMessageId = msg.id.toString();
+        const userMessage: ChatMessage = {
+          id: msg.id.toString(),
+          role: "user",
+          content: textContent,
+          status: "completed",
+          timestamp: msg.created_at,
+          attachments: msg.attachments,
+        };
+        markTruncated(userMessage, msg);
+        processedMessages.push(userMessage);
+      } else {
+        if (currentAssistantMessage) {
+          const existingBlocks =
+            currentAssistantMessage.content as MessageBlock[];
+          existingBlocks.push({
+            _type: "TextBlock",
+            text: textContent,
+          });
+          markTruncated(currentAssistantMessage, msg);
+        } else {
+          const assistantMessage: ChatMessage = {
+            id: msg.id.toString(),
+            role: "assistant",
+            content: textContent,
+            status: "completed",
+            timestamp: msg.created_at,
+          };
+          markTruncated(assistantMessage, msg);
+          processedMessages.push(assistantMessage);
+        }
+      }
+    }
+  }
+
+  // Attach subagent transcript to tool blocks (main timeline only).
+  for (const message of processedMessages) {
+    if (message.role !== "assistant") continue;
+    if (!Array.isArray(message.content)) continue;
+    message.content = (message.content as MessageBlock[]).map((block) => {
+      if (block._type !== "ToolUseBlock") return block;
+      const truncatedIds = truncatedSubagentIdsByToolUseId[block.id] || [];
+      if (truncatedIds.length > 0) {
+        message.truncatedMessageIds = Array.from(
+          new Set([...(message.truncatedMessageIds ?? []), ...truncatedIds]),
+        );
+      }
+      const transcript = subagentTranscriptByToolUseId[block.id];
+      if (!transcript || transcript.length === 0) return block;
+      return { ...block, subagent_transcript: transcript };
+    });
+  }
+
+  return {
+    messages: processedMessages,
+    internalContextsByUserMessageId,
+  };
+}
+
 export const chatService = {
   listSessions: async (params?: {
     user_id?: string;
@@ -244,275 +550,43 @@ export const chatService = {
     internalContextsByUserMessageId: Record<string, string[]>;
   }> => {
     try {
-      const realUserMessageIdSet = new Set(options?.realUserMessageIds ?? []);
-      // If we can't reliably identify "real user inputs" (runs not available),
-      // fall back to showing all user messages and do not build internal contexts.
-      const canClassifyUserMessages = realUserMessageIdSet.size > 0;
-
-      const messages = await apiClient.get<
-        {
-          id: number;
-          role: string;
-          content: Record<string, unknown>;
-          attachments?: InputFile[];
-          created_at: string;
-          updated_at: string;
-        }[]
-      >(API_ENDPOINTS.sessionMessagesWithFiles(sessionId));
-
-      const processedMessages: ChatMessage[] = [];
-      const internalContextsByUserMessageId: Record<string, string[]> = {};
-      const subagentTranscriptByToolUseId: Record<string, string[]> = {};
-      let currentAssistantMessage: ChatMessage | null = null;
-      let currentTurnUserMessageId: string | null = null;
-
-      for (const msg of messages) {
-        const contentObj = msg.content as MessageContentShape;
-        if (
-          typeIncludes(contentObj._type, "SystemMessage") &&
-          contentObj.subtype === "init"
-        ) {
-          continue;
-        }
-
-        const parentToolUseId = isNonEmptyString(contentObj.parent_tool_use_id)
-          ? contentObj.parent_tool_use_id.trim()
-          : null;
-
-        // Subagent messages are nested under a parent tool call (e.g., Task).
-        // We keep them out of the main timeline and attach a flattened transcript to the parent ToolUseBlock.
-        if (parentToolUseId) {
-          const nestedTexts: string[] = [];
-          if (isNonEmptyString(contentObj.text)) {
-            nestedTexts.push(cleanText(contentObj.text));
-          }
-          if (Array.isArray(contentObj.content)) {
-            for (const block of contentObj.content) {
-              if (!typeIncludes(block?._type, "TextBlock")) continue;
-              if (isNonEmptyString(block.text)) {
-                nestedTexts.push(cleanText(block.text));
-              }
-            }
-          }
-          const cleaned = nestedTexts
-            .map((t) => t.trim())
-            .filter(Boolean)
-            .join("\n\n");
-          if (cleaned) {
-            subagentTranscriptByToolUseId[parentToolUseId] = [
-              ...(subagentTranscriptByToolUseId[parentToolUseId] || []),
-              cleaned,
-            ];
-          }
-          continue;
-        }
-
-        if (msg.role === "assistant" && Array.isArray(contentObj.content)) {
-          const blocks = contentObj.content;
-
-          const toolUseBlocks = blocks.filter((b) =>
-            typeIncludes(b?._type, "ToolUseBlock"),
-          );
-
-          if (toolUseBlocks.length > 0) {
-            if (!currentAssistantMessage) {
-              currentAssistantMessage = {
-                id: msg.id.toString(),
-                role: "assistant",
-                content: [],
-                status: "completed",
-                timestamp: msg.created_at,
-              };
-              processedMessages.push(currentAssistantMessage);
-            }
-
-            const existingBlocks =
-              currentAssistantMessage.content as MessageBlock[];
-
-            const uiToolBlocks = toolUseBlocks.map((b) => ({
-              _type: "ToolUseBlock" as const,
-              id: typeof b.id === "string" ? b.id : String(b.id ?? ""),
-              name: typeof b.name === "string" ? b.name : String(b.name ?? ""),
-              input:
-                b.input && typeof b.input === "object"
-                  ? (b.input as Record<string, unknown>)
-                  : {},
-            }));
-
-            currentAssistantMessage.content = [
-              ...existingBlocks,
-              ...uiToolBlocks,
-            ];
-          }
-        }
-
-        // ToolResultBlock is typically a user-role message (Anthropic style), but some providers
-        // may emit it under assistant-role. Don't rely on msg.role to attach results.
-        if (Array.isArray(contentObj.content)) {
-          const blocks = contentObj.content;
-          const toolResultBlocks = blocks.filter((b) =>
-            typeIncludes(b?._type, "ToolResultBlock"),
-          );
-
-          if (toolResultBlocks.length > 0) {
-            if (!currentAssistantMessage) {
-              currentAssistantMessage = {
-                id: msg.id.toString(),
-                role: "assistant",
-                content: [],
-                status: "completed",
-                timestamp: msg.created_at,
-              };
-              processedMessages.push(currentAssistantMessage);
-            }
-
-            const uiResultBlocks = toolResultBlocks.map((b) => ({
-              _type: "ToolResultBlock" as const,
-              tool_use_id:
-                typeof b.tool_use_id === "string"
-                  ? b.tool_use_id
-                  : String(b.tool_use_id ?? ""),
-              content: cleanText(
-                typeof b.content === "string"
-                  ? b.content
-                  : (JSON.stringify(b.content) ?? ""),
-              ),
-              is_error: !!b.is_error,
-            }));
-            const existingBlocks =
-              currentAssistantMessage.content as MessageBlock[];
-            currentAssistantMessage.content = [
-              ...existingBlocks,
-              ...uiResultBlocks,
-            ];
-
-            // Keep ToolResultBlock out of the user timeline.
-            if (msg.role === "user") continue;
-          }
-        }
-
-        if (msg.role === "assistant" && Array.isArray(contentObj.content)) {
-          const blocks = contentObj.content;
-          const thinkingBlocks = blocks.filter((b) =>
-            typeIncludes(b?._type, "ThinkingBlock"),
-          );
-
-          const uiThinkingBlocks = thinkingBlocks
-            .map((b) => ({
-              _type: "ThinkingBlock" as const,
-              thinking: cleanText(b.thinking || ""),
-              signature: b.signature,
-            }))
-            .filter((b) => b.thinking.trim().length > 0);
-
-          if (uiThinkingBlocks.length > 0) {
-            if (!currentAssistantMessage) {
-              currentAssistantMessage = {
-                id: msg.id.toString(),
-                role: "assistant",
-                content: [],
-                status: "completed",
-                timestamp: msg.created_at,
-              };
-              processedMessages.push(currentAssistantMessage);
-            }
-
-            const existingBlocks =
-              currentAssistantMessage.content as MessageBlock[];
-
-            currentAssistantMessage.content = [
-              ...existingBlocks,
-              ...uiThinkingBlocks,
-            ];
-          }
-        }
-
-        let textContent = "";
-        if (isNonEmptyString(contentObj.text)) {
-          textContent = cleanText(contentObj.text);
-        } else if (Array.isArray(contentObj.content)) {
-          const textBlocks = contentObj.content
-            .filter((b) => typeIncludes(b?._type, "TextBlock"))
-            .map((b) => (isNonEmptyString(b.text) ? cleanText(b.text) : ""))
-            .filter((t) => t.trim().length > 0);
-          if (textBlocks.length > 0) textContent = textBlocks.join("\n\n");
-        }
-
-        if (textContent) {
-          if (msg.role === "user") {
-            // A user-role message from the SDK is not always a real user input.
-            // Real user inputs are identified by AgentRun.user_message_id (per turn).
-            const isRealUserMessage = canClassifyUserMessages
-              ? realUserMessageIdSet.has(msg.id)
-              : true;
-
-            if (!isRealUserMessage) {
-              // Keep internal user-role text for optional inline display (debug/UX),
-              // but do not render it as a user bubble.
-              if (currentTurnUserMessageId) {
-                internalContextsByUserMessageId[currentTurnUserMessageId] = [
-                  ...(internalContextsByUserMessageId[
-                    currentTurnUserMessageId
-                  ] || []),
-                  textContent,
-                ];
-              }
-              continue;
-            }
-
-            currentAssistantMessage = null;
-            currentTurnUserMessageId = msg.id.toString();
-            processedMessages.push({
-              id: msg.id.toString(),
-              role: "user",
-              content: textContent,
-              status: "completed",
-              timestamp: msg.created_at,
-              attachments: msg.attachments,
-            });
-          } else {
-            if (currentAssistantMessage) {
-              const existingBlocks =
-                currentAssistantMessage.content as MessageBlock[];
-              existingBlocks.push({
-                _type: "TextBlock",
-                text: textContent,
-              });
-            } else {
-              processedMessages.push({
-                id: msg.id.toString(),
-                role: "assistant",
-                content: textContent,
-                status: "completed",
-                timestamp: msg.created_at,
-              });
-            }
-          }
-        }
-      }
-
-      // Attach subagent transcript to tool blocks (main timeline only).
-      for (const message of processedMessages) {
-        if (message.role !== "assistant") continue;
-        if (!Array.isArray(message.content)) continue;
-        message.content = (message.content as MessageBlock[]).map((block) => {
-          if (block._type !== "ToolUseBlock") return block;
-          const transcript = subagentTranscriptByToolUseId[block.id];
-          if (!transcript || transcript.length === 0) return block;
-          return { ...block, subagent_transcript: transcript };
-        });
+      const messages: MessageWithFilesResponse[] = [];
+      // The endpoint is cursor-paged: keep asking for messages after the last one
+      // until a short page comes back.
+      for (;;) {
+        const page = await apiClient.get<MessageWithFilesResponse[]>(
+          `${API_ENDPOINTS.sessionMessagesWithFiles(sessionId)}${buildQuery({
+            limit: MESSAGES_PAGE_SIZE,
+            after_id: messages.at(-1)?.id,
+          })}`,
+        );
+        messages.push(...page);
+        if (page.length < MESSAGES_PAGE_SIZE) break;
       }
-
-      return {
-        messages: processedMessages,
-        internalContextsByUserMessageId,
-      };
+      return buildChatMessages(messages, options?.realUserMessageIds);
     } catch (error) {
       console.error("[Chat Service] Failed to get messages:", error);
       return { messages: [], internalContextsByUserMessageId: {} };
     }
   },
 
+  getMessage: async (messageId: number): Promise<MessageResponse> => {
+    return apiClient.get<MessageResponse>(API_ENDPOINTS.message(messageId));
+  },
+
+  getSessionChanges: async (
+    sessionId: string,
+    params?: { sinceVersion?: number; afterId?: number },
+  ): Promise<SessionChangesResponse> => {
+    const query = buildQuery({
+      since_version: params?.sinceVersion,
+      after_id: params?.afterId,
+    });
+    return apiClient.get<SessionChangesResponse>(
+      `${API_ENDPOINTS.sessionChanges(sessionId)}${query}`,
+    );
+  },
+
   getFiles: async (sessionId?: string): Promise<FileNode[]> => {
     if (!sessionId) return [];
 
@@ -3,6 +3,7 @@
  */
 
 import type { ApiStatePatch } from "./callback";
+import type { RunResponse } from "./run";
 
 export interface SessionCreateRequest {
   config?: TaskConfig | null;
@@ -34,6 +35,7 @@ export interface SessionResponse {
   workspace_manifest_key?: string | null;
   workspace_archive_key?: string | null;
   status: string;
+  change_version?: number;
   created_at: string; // ISO datetime
   updated_at: string; // ISO datetime
 }
@@ -43,6 +45,7 @@ export interface SessionStateResponse {
   status: string;
   state_patch?: ApiStatePatch | null;
   workspace_export_status?: string | null;
+  change_version?: number;
   updated_at: string;
 }
 
@@ -50,10 +53,41 @@ export interface MessageResponse {
   id: number;
   role: string;
   content: Record<string, unknown>;
+  content_truncated?: boolean; // preview; GET /messages/{id} is complete
   created_at: string; // ISO datetime
   updated_at: string; // ISO datetime
 }
 
+export interface MessageWithFilesResponse extends MessageResponse {
+  attachments?: InputFile[];
+}
+
+/** GET /sessions/{id}/changes: what changed since the client's last poll. */
+export interface SessionChangesResponse {
+  session_id: string;
+  status: string;
+  change_version: number;
+  messages: MessageWithFilesResponse[]; // after the requested after_id, oldest first
+  runs: RunResponse[]; // written after the requested since_version
+  has_more: boolean;
+}
+
+export type SessionEventType =
+  | "ready"
+  | "message"
+  | "run"
+  | "session"
+  | "user_input_request"
+  | "resync";
+
+/** One event of GET /sessions/{id}/events (Server-Sent Events). */
+export interface SessionEvent {
+  session_id: string;
+  type: SessionEventType;
+  change_version: number | null;
+  data: Record<string, unknown> | null; // null when too large to push; refetch
+}
+
 export interface ToolExecutionResponse {
   id: string; // UUID
   message_id: number | null;
@@ -61,6 +95,9 @@ export interface ToolExecutionResponse {
   tool_name: string;
   tool_input: Record<string, unknown> | null;
   tool_output: Record<string, unknown> | null;
+  result_message_id?: number | null; // has the full output when truncated
+  tool_input_truncated?: boolean; // preview; message_id has the full input
+  tool_output_truncated?: boolean; // preview; result_message_id has the full output
   is_error: boolean;
   duration_ms: number | null;
   created_at: string; // ISO datetime
@@ -72,6 +109,18 @@ export interface UsageResponse {
   usage_json: Record<string, unknown> | null;
 }
 
+export interface DailyUsageResponse extends UsageResponse {
+  day: string; // ISO date (UTC)
+}
+
+export interface UserUsageResponse {
+  user_id: string;
+  start_date: string; // ISO date
+  end_date: string; // ISO date
+  total: UsageResponse;
+  days: DailyUsageResponse[];
+}
+
 export interface InputFile {
   [x: string]: unknown;
   id?: string | null;
@@ -68,6 +68,8 @@ export type ChatMessage = {
   };
   parentId?: string;
   attachments?: InputFile[];
+  // Server messages shown here from a stored preview; GET /messages/{id} has the full body.
+  truncatedMessageIds?: number[];
 };
 
 export type ChatSession = {
@@ -12,6 +12,8 @@ export const API_ENDPOINTS = {
   sessionMessages: (sessionId: string) => `/sessions/${sessionId}/messages`,
   sessionMessagesWithFiles: (sessionId: string) =>
     `/sessions/${sessionId}/messages-with-files`,
+  sessionChanges: (sessionId: string) => `/sessions/${sessionId}/changes`,
+  sessionEvents: (sessionId: string) => `/sessions/${sessionId}/events`,
   sessionToolExecutions: (sessionId: string) =>
     `/sessions/${sessionId}/tool-executions`,
   sessionUsage: (sessionId: string) => `/sessions/${sessionId}/usage`,
@@ -20,6 +22,9 @@ export const API_ENDPOINTS = {
   sessionWorkspaceArchive: (sessionId: string) =>
     `/sessions/${sessionId}/workspace/archive`,
 
+  // Usage of the current user, per UTC day
+  usage: "/usage",
+
   // User Input Requests (AskUserQuestion)
   userInputRequests: "/user-input-requests",
   userInputRequest: (requestId: string) => `/user-input-requests/${requestId}`,
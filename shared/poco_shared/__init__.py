@@ -0,0 +1 @@
+"""Code shared by the Poco Python services."""
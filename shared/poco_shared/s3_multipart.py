@@ -0,0 +1,160 @@
+"""Streaming S3 multipart uploads."""
+
+import logging
+from typing import Any, Self
+
+from botocore.exceptions import BotoCoreError, ClientError
+
+logger = logging.getLogger(__name__)
+
+
+class S3MultipartError(Exception):
+    def __init__(self, message: str, details: dict[str, Any]) -> None:
+        super().__init__(message)
+        self.details = details
+
+
+class S3MultipartWriter:
+    """Non-seekable file-like object that streams writes into an S3 multipart upload.
+
+    Data is buffered until a full part is available, so memory stays bounded by
+    `part_size` regardless of the total object size. `close()` completes the upload;
+    `abort()` discards it.
+    """
+
+    # S3 rejects non-final parts smaller than 5 MiB.
+    MIN_PART_SIZE = 5 * 1024 * 1024
+
+    @classmethod
+    def start(
+        cls,
+        *,
+        client: Any,
+        bucket: str,
+        key: str,
+        content_type: str | None = None,
+        part_size: int = 8 * 1024 * 1024,
+    ) -> Self:
+        """Start a multipart upload to `key` and return a writer for it."""
+        kwargs: dict[str, Any] = {"Bucket": bucket, "Key": key}
+        if content_type:
+            kwargs["ContentType"] = content_type
+        try:
+            response = client.create_multipart_upload(**kwargs)
+        except (ClientError, BotoCoreError) as exc:
+            logger.error(f"Failed to start multipart upload {key}: {exc}")
+            raise cls._error(
+                "Failed to start multipart upload",
+                {"key": key, "error": str(exc)},
+            ) from exc
+        return cls(
+            client=client,
+            bucket=bucket,
+            key=key,
+            upload_id=response["UploadId"],
+            part_size=part_size,
+        )
+
+    @classmethod
+    def _error(cls, message: str, details: dict[str, Any]) -> Exception:
+        """The exception raised for a failed S3 call; services override it."""
+        return S3MultipartError(message, details)
+
+    def __init__(
+        self,
+        *,
+        client: Any,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_size: int,
+    ) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.upload_id = upload_id
+        self.part_size = max(int(part_size), self.MIN_PART_SIZE)
+        self._buffer = bytearray()
+        self._parts: list[dict[str, Any]] = []
+        self._position = 0
+        self._closed = False
+
+    def write(self, data: bytes) -> int:
+        if self._closed:
+            raise ValueError("write to closed multipart writer")
+        self._buffer.extend(data)
+        self._position += len(data)
+        while len(self._buffer) >= self.part_size:
+            chunk = bytes(self._buffer[: self.part_size])
+            del self._buffer[: self.part_size]
+            self._upload_part(chunk)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        # Parts are only sent once full; nothing to do until close().
+        return None
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if self._buffer or not self._parts:
+            self._upload_part(bytes(self._buffer))
+            self._buffer.clear()
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                MultipartUpload={"Parts": self._parts},
+            )
+        except (ClientError, BotoCoreError) as exc:
+            self.abort()
+            logger.error(f"Failed to complete multipart upload {self.key}: {exc}")
+            raise self._error(
+                "Failed to complete multipart upload",
+                {"key": self.key, "error": str(exc)},
+            ) from exc
+        self._closed = True
+
+    def abort(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._buffer.clear()
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self.bucket, Key=self.key, UploadId=self.upload_id
+            )
+        except (ClientError, BotoCoreError) as exc:
+            logger.warning(f"Failed to abort multipart upload {self.key}: {exc}")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _upload_part(self, chunk: bytes) -> None:
+        part_number = len(self._parts) + 1
+        try:
+            response = self.client.upload_part(
+                Bucket=self.bucket,
+                Key=self.key,
+                UploadId=self.upload_id,
+                PartNumber=part_number,
+                Body=chunk,
+            )
+        except (ClientError, BotoCoreError) as exc:
+            self.abort()
+            logger.error(f"Failed to upload part {part_number} of {self.key}: {exc}")
+            raise self._error(
+                "Failed to upload multipart chunk",
+                {"key": self.key, "part": part_number, "error": str(exc)},
+            ) from exc
+        self._parts.append({"ETag": response["ETag"], "PartNumber": part_number})
@@ -0,0 +1,243 @@
+"""Request body encodings for the Executor -> Executor Manager -> Backend chain.
+
+Bodies are JSON (or NDJSON) or msgpack, optionally compressed with zstd or gzip and
+labelled with Content-Encoding. Senders start with plain JSON and upgrade once the
+receiver has advertised what it decodes: `Accept-Encoding` on its responses (RFC 7694)
+and `X-Accept-Content-Type` for msgpack. A 415 reply downgrades back to plain JSON.
+"""
+
+import gzip
+import json
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from typing import Any, Literal
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional
+    zstandard = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional
+    msgpack = None  # type: ignore[assignment]
+
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+ACCEPT_CONTENT_TYPE_HEADER = "X-Accept-Content-Type"
+
+WireFormat = Literal["json", "msgpack"]
+Compression = Literal["auto", "zstd", "gzip", "none"]
+
+
+class WireDecodeError(ValueError):
+    """Body could not be decoded; `unsupported` means an unknown coding or type."""
+
+    def __init__(self, message: str, *, unsupported: bool = False) -> None:
+        super().__init__(message)
+        self.unsupported = unsupported
+
+
+def supported_encodings() -> list[str]:
+    """Content codings this process can decode, best first."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def supported_content_types() -> list[str]:
+    return [JSON_CONTENT_TYPE] + ([MSGPACK_CONTENT_TYPE] if msgpack is not None else [])
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=5)
+    return data
+
+
+def decompress(data: bytes, encoding: str, *, max_bytes: int) -> bytes:
+    """Undo Content-Encoding, refusing output larger than `max_bytes`."""
+    encoding = encoding.strip().lower()
+    try:
+        if encoding in ("", "identity"):
+            out = data
+        elif encoding in ("gzip", "x-gzip"):
+            inflater = zlib.decompressobj(wbits=31)
+            out = inflater.decompress(data, max_bytes + 1)
+        elif encoding == "zstd" and zstandard is not None:
+            with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+                out = reader.read(max_bytes + 1)
+        else:
+            raise WireDecodeError(
+                f"Unsupported Content-Encoding: {encoding}", unsupported=True
+            )
+    except (zlib.error, EOFError) as exc:
+        raise WireDecodeError(f"Invalid {encoding} body: {exc}") from exc
+    except Exception as exc:
+        if zstandard is not None and isinstance(exc, zstandard.ZstdError):
+            raise WireDecodeError(f"Invalid {encoding} body: {exc}") from exc
+        raise
+    if len(out) > max_bytes:
+        raise WireDecodeError(f"Decoded body exceeds {max_bytes} bytes")
+    return out
+
+
+def msgpack_to_json(data: bytes) -> tuple[bytes, str]:
+    """Re-encode a msgpack body as JSON, or as NDJSON when it holds several objects."""
+    if msgpack is None:
+        raise WireDecodeError("msgpack bodies are not supported", unsupported=True)
+    try:
+        unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+        unpacker.feed(data)
+        items = list(unpacker)
+    except Exception as exc:
+        raise WireDecodeError(f"Invalid msgpack body: {exc}") from exc
+    if len(items) == 1:
+        return _dumps(items[0]), JSON_CONTENT_TYPE
+    return b"".join(_dumps(item) + b"\n" for item in items), NDJSON_CONTENT_TYPE
+
+
+async def compress_stream(
+    chunks: AsyncIterable[bytes], encoding: str | None
+) -> AsyncIterator[bytes]:
+    """Compress a body chunk by chunk, so it never has to be held in memory."""
+    if not encoding:
+        async for chunk in chunks:
+            yield chunk
+        return
+    if encoding == "zstd":
+        compressor: Any = zstandard.ZstdCompressor(level=3).compressobj()
+    else:
+        compressor = zlib.compressobj(5, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def _parse_tokens(value: str | None) -> set[str]:
+    if value is None:
+        return set()
+    return {
+        token.split(";", 1)[0].strip().lower()
+        for token in value.split(",")
+        if token.strip()
+    }
+
+
+class WireEncoder:
+    """Sender-side body encoder that tracks what the receiver accepts."""
+
+    def __init__(
+        self,
+        *,
+        wire_format: WireFormat = "json",
+        compression: Compression = "auto",
+        min_bytes: int = 1024,
+    ) -> None:
+        if wire_format == "msgpack" and msgpack is None:
+            raise RuntimeError("msgpack wire format requested but msgpack is missing")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression requested but zstandard is missing")
+        self.wire_format = wire_format
+        self.compression = compression
+        self.min_bytes = max(0, min_bytes)
+        # None until the receiver has told us; plain JSON is always safe.
+        self._accept_encodings: set[str] | None = None
+        self._accept_content_types: set[str] | None = None
+
+    def observe(self, headers: Any) -> None:
+        """Learn what the receiver decodes from a response's headers."""
+        accept_encoding = headers.get("accept-encoding")
+        if accept_encoding is not None:
+            self._accept_encodings = _parse_tokens(accept_encoding)
+        accept_types = headers.get(ACCEPT_CONTENT_TYPE_HEADER.lower())
+        if accept_types is not None:
+            self._accept_content_types = _parse_tokens(accept_types)
+
+    def reject(self, headers: Any) -> None:
+        """Handle a 415: drop to what the receiver advertised, else to plain JSON."""
+        self._accept_encodings = _parse_tokens(headers.get("accept-encoding"))
+        self._accept_content_types = _parse_tokens(
+            headers.get(ACCEPT_CONTENT_TYPE_HEADER.lower())
+        )
+
+    def uses_msgpack(self) -> bool:
+        return (
+            self.wire_format == "msgpack"
+            and msgpack is not None
+            and MSGPACK_CONTENT_TYPE in (self._accept_content_types or ())
+        )
+
+    def encode(self, payload: Any) -> tuple[bytes, dict[str, str]]:
+        """Encode one JSON-compatible payload; returns the body and its headers."""
+        if self.uses_msgpack():
+            return self._finish(msgpack.packb(payload), MSGPACK_CONTENT_TYPE)
+        return self._finish(_dumps(payload), JSON_CONTENT_TYPE)
+
+    def encode_json(
+        self, body: bytes, content_type: str = JSON_CONTENT_TYPE
+    ) -> tuple[bytes, dict[str, str]]:
+        """Compress an already serialized JSON/NDJSON body."""
+        return self._finish(body, content_type)
+
+    def encode_stream(self, payloads: list[Any]) -> tuple[bytes, dict[str, str]]:
+        """Encode payloads as NDJSON, or as a sequence of msgpack objects."""
+        if self.uses_msgpack():
+            body = b"".join(msgpack.packb(payload) for payload in payloads)
+            return self._finish(body, MSGPACK_CONTENT_TYPE)
+        body = b"".join(_dumps(payload) + b"\n" for payload in payloads)
+        return self._finish(body, NDJSON_CONTENT_TYPE)
+
+    def encode_stream_chunks(
+        self, payloads: Iterable[bytes], *, size_hint: int
+    ) -> tuple[AsyncIterator[bytes], dict[str, str]]:
+        """Stream already serialized JSON payloads as NDJSON or msgpack objects.
+
+        The body is produced and compressed as it is sent; `size_hint` (the total
+        JSON size) decides whether it is worth compressing.
+        """
+        if self.uses_msgpack():
+            content_type = MSGPACK_CONTENT_TYPE
+            chunks = (msgpack.packb(json.loads(payload)) for payload in payloads)
+        else:
+            content_type = NDJSON_CONTENT_TYPE
+            chunks = (payload + b"\n" for payload in payloads)
+
+        async def body() -> AsyncIterator[bytes]:
+            for chunk in chunks:
+                yield chunk
+
+        headers = {"Content-Type": content_type}
+        encoding = self._choose_encoding(size_hint)
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return compress_stream(body(), encoding), headers
+
+    def _finish(self, body: bytes, content_type: str) -> tuple[bytes, dict[str, str]]:
+        headers = {"Content-Type": content_type}
+        encoding = self._choose_encoding(len(body))
+        if encoding:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+        return body, headers
+
+    def _choose_encoding(self, size: int) -> str | None:
+        if self.compression == "none" or size < self.min_bytes:
+            return None
+        accepted = self._accept_encodings or set()
+        candidates = (
+            supported_encodings() if self.compression == "auto" else [self.compression]
+        )
+        for encoding in candidates:
+            if encoding in accepted and encoding in supported_encodings():
+                return encoding
+        return None
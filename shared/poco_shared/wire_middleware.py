@@ -0,0 +1,88 @@
+"""ASGI middleware that decodes the request bodies `poco_shared.wire` produces."""
+
+from starlette.datastructures import MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from poco_shared.wire import (
+    ACCEPT_CONTENT_TYPE_HEADER,
+    MSGPACK_CONTENT_TYPE,
+    WireDecodeError,
+    decompress,
+    msgpack_to_json,
+    supported_content_types,
+    supported_encodings,
+)
+
+
+class WireDecodingMiddleware:
+    """Decode compressed and msgpack request bodies into plain JSON for the routes.
+
+    Every response advertises the accepted request codings (RFC 7694) so clients can
+    switch to them; unknown codings get a 415 carrying the same headers. Services
+    override `error_response` to return errors in their own envelope.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int = 64 * 1024 * 1024) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes
+        self.accept_encoding = ", ".join(supported_encodings())
+        self.accept_content_type = ", ".join(supported_content_types())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_accept(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.setdefault("Accept-Encoding", self.accept_encoding)
+                headers.setdefault(ACCEPT_CONTENT_TYPE_HEADER, self.accept_content_type)
+            await send(message)
+
+        request_headers = MutableHeaders(scope=scope)
+        encoding = request_headers.get("content-encoding", "").strip().lower()
+        content_type = request_headers.get("content-type", "").split(";", 1)[0]
+        is_msgpack = content_type.strip().lower() == MSGPACK_CONTENT_TYPE
+        if encoding in ("", "identity") and not is_msgpack:
+            await self.app(scope, receive, send_with_accept)
+            return
+
+        chunks: list[bytes] = []
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        try:
+            body = decompress(b"".join(chunks), encoding, max_bytes=self.max_body_bytes)
+            if is_msgpack:
+                body, content_type = msgpack_to_json(body)
+        except WireDecodeError as exc:
+            response = self.error_response(
+                str(exc), status_code=415 if exc.unsupported else 400
+            )
+            await response(scope, receive, send_with_accept)
+            return
+
+        del request_headers["content-encoding"]
+        request_headers["content-type"] = content_type
+        request_headers["content-length"] = str(len(body))
+
+        delivered = False
+
+        async def receive_decoded() -> Message:
+            nonlocal delivered
+            if not delivered:
+                delivered = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app(scope, receive_decoded, send_with_accept)
+
+    def error_response(self, message: str, *, status_code: int) -> ASGIApp:
+        return JSONResponse({"message": message}, status_code=status_code)